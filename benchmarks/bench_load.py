@@ -0,0 +1,571 @@
+"""Load-test the dev server's WebSocket API with many simulated tablets.
+
+Usage:
+    python benchmarks/bench_load.py [--clients 25 50 100 200 400] [--duration 20]
+        [--admins 0.1] [--rate 1] [--mix claim=3,complete=3,approve=3,add_todo=1]
+        [--records 2000 | --url ws://host:8123/api/websocket] [--delta] [--json out.json]
+
+Runs one stage per ``--clients`` value. Each stage opens that many
+connections, authenticates and sends ``famdo/subscribe`` on each. Kiosks
+then only watch their pushes. Admins, ``--admins`` of the connections,
+also send commands drawn from ``--mix``. Each admin waits for its reply,
+then thinks for an exponential ``1 / --rate`` seconds. Commands walk
+chores through claim, complete and approve. When a step has no chore to work
+on, it falls back to the step before, and ``add_chore`` makes new ones.
+
+Per stage:
+
+``cmd/s``, ``p50`` ``p95`` ``p99``
+    Completed commands per second, and their round-trip latency in ms.
+``fan p50`` ``p95`` ``p99``
+    Time from sending a write until each subscriber receives a push that
+    shows it (the chore in its new status, or the new record by its unique
+    name), in ms. ``all p99`` waits for the last subscriber.
+``push/s``, ``errors``
+    Pushes received over all connections; failed commands and dropped
+    connections.
+``rss MB``, ``conn p95``
+    Server resident memory after the stage (from ``/metrics``, Linux only);
+    time to connect, authenticate and receive the initial snapshot.
+
+Without ``--url`` a dev server is started on a free port with a synthetic
+store of ``--records`` records (see ``devserver/seed_data.py``). The server
+runs in its own process, but decoding hundreds of full snapshots costs CPU
+here too; ``--delta`` subscribes for diffs instead.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable
+
+import aiohttp
+
+_REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_REPO_ROOT))
+
+from devserver.json_codec import get_codec  # noqa: E402
+
+DEFAULT_MIX = "claim=3,complete=3,approve=3,add_todo=1"
+MIX_KINDS = ("claim", "complete", "approve", "add_chore", "add_todo")
+# Connections opened at once while a stage starts
+CONNECT_CONCURRENCY = 20
+SERVER_START_TIMEOUT = 120
+
+_codec = get_codec()
+
+
+class CommandFailed(Exception):
+    """The server answered a command with an error."""
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Return the nearest-rank *pct*-th percentile of sorted *values*."""
+    if not values:
+        return float("nan")
+    rank = max(1, -(-len(values) * pct // 100))
+    return values[int(rank) - 1]
+
+
+# Chore statuses in workflow order; a push showing a later one includes the write
+_STATUS_RANK = {
+    "pending": 0, "overdue": 0, "claimed": 1, "awaiting_approval": 2, "completed": 3,
+}
+
+# What a write changes: (collection, field, value, status the record reaches)
+_WriteKey = tuple[str, str, str, "str | None"]
+
+
+class _Write:
+    __slots__ = ("key", "sent", "failed", "seen", "last_seen")
+
+    def __init__(self, key: _WriteKey, sent: float) -> None:
+        self.key = key
+        self.sent = sent
+        self.failed = False
+        self.seen = 0
+        self.last_seen = 0.0
+
+    def shown_by(self, record: dict) -> bool:
+        status = self.key[3]
+        return status is None or (
+            _STATUS_RANK.get(record.get("status"), -1) >= _STATUS_RANK[status]
+        )
+
+
+def _push_records(event: dict, collection: str) -> list[dict]:
+    if "delta" in event:
+        return event["delta"]["changes"].get(collection, {}).get("upserted", [])
+    return event.get("data", {}).get(collection, [])
+
+
+class FanOut:
+    """Match the writes in flight against what each subscriber's pushes show."""
+
+    def __init__(self) -> None:
+        self.writes: list[_Write] = []
+        self.samples: list[float] = []
+        self.pushes = 0
+
+    def start(self, key: _WriteKey) -> _Write:
+        write = _Write(key, time.perf_counter())
+        self.writes.append(write)
+        return write
+
+    def pushed(self, conn: Connection, received: float, event: dict) -> None:
+        """Record one push to *conn* and every write it shows for the first time."""
+        self.pushes += 1
+        writes = self.writes
+        pending = [
+            i for i in range(conn.cursor, len(writes))
+            if i not in conn.seen and not writes[i].failed
+        ]
+        if pending:
+            wanted = {writes[i].key[:3] for i in pending}
+            found: dict[tuple[str, str, str], dict] = {}
+            for collection, field in {key[:2] for key in wanted}:
+                for record in _push_records(event, collection):
+                    key = (collection, field, record.get(field))
+                    if key in wanted:
+                        found[key] = record
+            for i in pending:
+                write = writes[i]
+                record = found.get(write.key[:3])
+                if record is not None and write.shown_by(record):
+                    self.samples.append(received - write.sent)
+                    write.seen += 1
+                    write.last_seen = max(write.last_seen, received)
+                    conn.seen.add(i)
+        while conn.cursor < len(writes) and (
+            conn.cursor in conn.seen or writes[conn.cursor].failed
+        ):
+            conn.seen.discard(conn.cursor)
+            conn.cursor += 1
+
+    def everyone(self, subscribers: int) -> list[float]:
+        """Return the time each write took to reach all *subscribers*."""
+        return sorted(
+            w.last_seen - w.sent for w in self.writes if not w.failed and w.seen == subscribers
+        )
+
+
+class Connection:
+    """One simulated tablet: request/response calls plus a subscription."""
+
+    def __init__(self, ws: aiohttp.ClientWebSocketResponse, fanout: FanOut) -> None:
+        self._ws = ws
+        self._fanout = fanout
+        self._next_id = 0
+        self._pending: dict[int, asyncio.Future] = {}
+        self._subscription: int | None = None
+        self._measuring = False
+        # First write not yet shown to this subscriber, and later ones already shown
+        self.cursor = 0
+        self.seen: set[int] = set()
+        self._reader: asyncio.Task | None = None
+        self.dropped = False
+
+    async def authenticate(self, token: str) -> None:
+        await self._receive()  # auth_required
+        await self._ws.send_bytes(_codec.dumps({"type": "auth", "access_token": token}))
+        msg = await self._receive()
+        if msg.get("type") != "auth_ok":
+            raise CommandFailed(f"Authentication failed: {msg}")
+        self._reader = asyncio.create_task(self._read())
+
+    async def call(self, msg_type: str, **params: Any) -> Any:
+        self._next_id += 1
+        msg_id = self._next_id
+        future = self._pending[msg_id] = asyncio.get_running_loop().create_future()
+        await self._ws.send_bytes(_codec.dumps({"id": msg_id, "type": msg_type, **params}))
+        return await future
+
+    async def send(self, msg: dict[str, Any]) -> asyncio.Future:
+        """Send *msg* under its own id; return a future for the reply."""
+        future = self._pending[msg["id"]] = asyncio.get_running_loop().create_future()
+        if msg.get("type") == "famdo/subscribe":
+            self._subscription = msg["id"]
+        await self._ws.send_bytes(_codec.dumps(msg))
+        return future
+
+    async def subscribe(self, delta: bool, throttle_ms: int | None) -> dict:
+        """Subscribe and return the initial data."""
+        self._subscription = self._next_id + 1
+        params: dict[str, Any] = {"delta": delta}
+        if throttle_ms is not None:
+            params["throttle_ms"] = throttle_ms
+        result = await self.call("famdo/subscribe", **params)
+        return result["data"] if delta else result
+
+    def measure(self) -> None:
+        """Count pushes from now on, against writes started from now on."""
+        self.cursor = len(self._fanout.writes)
+        self._measuring = True
+
+    async def close(self) -> None:
+        self._measuring = False
+        await self._ws.close()
+        if self._reader is not None:
+            await self._reader
+
+    async def _receive(self) -> dict:
+        raw = await self._ws.receive()
+        if raw.type not in (aiohttp.WSMsgType.TEXT, aiohttp.WSMsgType.BINARY):
+            raise ConnectionError(f"Connection closed ({raw.type.name})")
+        return _codec.loads(raw.data)
+
+    async def _read(self) -> None:
+        async for raw in self._ws:
+            if raw.type not in (aiohttp.WSMsgType.TEXT, aiohttp.WSMsgType.BINARY):
+                continue
+            received = time.perf_counter()
+            msg = _codec.loads(raw.data)
+            msg_id = msg.get("id")
+            if msg.get("type") == "event":
+                if msg_id == self._subscription and self._measuring:
+                    self._fanout.pushed(self, received, msg.get("event", {}))
+                continue
+            future = self._pending.pop(msg_id, None)
+            if future is None or future.done():
+                continue
+            if msg.get("success"):
+                future.set_result(msg.get("result"))
+            else:
+                error = msg.get("error", {})
+                future.set_exception(
+                    CommandFailed(f"{error.get('code')}: {error.get('message')}")
+                )
+        self.dropped = self._measuring
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError("Connection closed"))
+        self._pending.clear()
+
+
+class _Workflow:
+    """Chores in each step of claim, complete and approve, shared by all admins."""
+
+    def __init__(self, data: dict, rng: random.Random) -> None:
+        self._rng = rng
+        members = data.get("members", [])
+        self._parents = [m["id"] for m in members if m.get("role") == "parent"]
+        self._kids = [m["id"] for m in members if m.get("role") != "parent"] or self._parents
+        chores = [c for c in data.get("chores", []) if not c.get("is_template")]
+        self._claimable = deque(
+            c["id"] for c in chores if c.get("status") in ("pending", "overdue")
+        )
+        self._claimed = deque(
+            (c["id"], c["claimed_by"]) for c in chores if c.get("status") == "claimed"
+        )
+        self._awaiting = deque(
+            c["id"] for c in chores if c.get("status") == "awaiting_approval"
+        )
+        self._added = 0
+
+    def next(self, kind: str) -> tuple[str, dict[str, Any], _WriteKey, Callable[[Any], None]]:
+        """Return the command, its parameters, what it changes and a result callback."""
+        if kind == "approve":
+            if self._awaiting and self._parents:
+                chore_id = self._awaiting.popleft()
+                approver = self._rng.choice(self._parents)
+                return (
+                    "famdo/approve_chore", {"chore_id": chore_id, "approver_id": approver},
+                    ("chores", "id", chore_id, "completed"), _ignore,
+                )
+            kind = "complete"
+        if kind == "complete":
+            if self._claimed:
+                chore_id, member_id = self._claimed.popleft()
+                return (
+                    "famdo/complete_chore", {"chore_id": chore_id, "member_id": member_id},
+                    ("chores", "id", chore_id, "awaiting_approval"),
+                    lambda _result: self._awaiting.append(chore_id),
+                )
+            kind = "claim"
+        if kind == "claim":
+            if self._claimable and self._kids:
+                chore_id = self._claimable.popleft()
+                member_id = self._rng.choice(self._kids)
+                return (
+                    "famdo/claim_chore", {"chore_id": chore_id, "member_id": member_id},
+                    ("chores", "id", chore_id, "claimed"),
+                    lambda _result: self._claimed.append((chore_id, member_id)),
+                )
+            kind = "add_chore"
+        # Unique names let subscribers recognise new records before the reply
+        self._added += 1
+        if kind == "add_chore":
+            name = f"Load test chore {self._added}"
+            return (
+                "famdo/add_chore", {"name": name, "points": 5}, ("chores", "name", name, None),
+                lambda result: self._claimable.append(result["id"]),
+            )
+        title = f"Load test todo {self._added}"
+        return "famdo/add_todo", {"title": title}, ("todos", "title", title, None), _ignore
+
+
+def _ignore(_result: Any) -> None:
+    pass
+
+
+class _StageStats:
+    def __init__(self) -> None:
+        self.latencies: list[float] = []
+        self.errors = 0
+        self.connect: list[float] = []
+
+
+async def _open(
+    session: aiohttp.ClientSession,
+    url: str,
+    token: str,
+    fanout: FanOut,
+    args: argparse.Namespace,
+    stats: _StageStats,
+    gate: asyncio.Semaphore,
+) -> tuple[Connection, dict] | None:
+    async with gate:
+        start = time.perf_counter()
+        try:
+            ws = await session.ws_connect(url, max_msg_size=0)
+            conn = Connection(ws, fanout)
+            await conn.authenticate(token)
+            data = await conn.subscribe(args.delta, args.throttle_ms)
+        except (OSError, aiohttp.ClientError, ConnectionError, CommandFailed):
+            stats.errors += 1
+            return None
+        stats.connect.append(time.perf_counter() - start)
+        return conn, data
+
+
+async def _admin(
+    conn: Connection,
+    workflow: _Workflow,
+    fanout: FanOut,
+    mix: dict[str, float],
+    rate: float,
+    rng: random.Random,
+    stats: _StageStats,
+    stop: asyncio.Event,
+) -> None:
+    kinds, weights = list(mix), list(mix.values())
+    while True:
+        try:
+            await asyncio.wait_for(stop.wait(), rng.expovariate(rate))
+            return
+        except asyncio.TimeoutError:
+            pass
+        msg_type, params, key, on_result = workflow.next(rng.choices(kinds, weights)[0])
+        write = fanout.start(key)
+        try:
+            result = await conn.call(msg_type, **params)
+        except (CommandFailed, ConnectionError):
+            write.failed = True
+            stats.errors += 1
+            if conn.dropped:
+                return
+            continue
+        stats.latencies.append(time.perf_counter() - write.sent)
+        on_result(result)
+
+
+async def _server_rss(session: aiohttp.ClientSession, url: str) -> float | None:
+    """Return the server's resident memory in MB from ``/metrics``, if reported."""
+    metrics_url = url.replace("ws", "http", 1).rsplit("/api/", 1)[0] + "/metrics"
+    try:
+        async with session.get(metrics_url) as resp:
+            body = await resp.text()
+    except (OSError, aiohttp.ClientError):
+        return None
+    for line in body.splitlines():
+        if line.startswith("process_resident_memory_bytes "):
+            return float(line.split()[1]) / 1e6
+    return None
+
+
+async def _stage(
+    session: aiohttp.ClientSession, url: str, clients: int, args: argparse.Namespace,
+    mix: dict[str, float],
+) -> dict[str, Any]:
+    stats = _StageStats()
+    fanout = FanOut()
+    gate = asyncio.Semaphore(CONNECT_CONCURRENCY)
+    opened = await asyncio.gather(*(
+        _open(session, url, args.token, fanout, args, stats, gate) for _ in range(clients)
+    ))
+    connections = [item[0] for item in opened if item is not None]
+    initial = next((item[1] for item in opened if item is not None), {})
+    admins = connections[:max(1, round(len(connections) * args.admins))] if connections else []
+    rng = random.Random(args.seed + clients)
+    workflow = _Workflow(initial, rng)
+
+    for conn in connections:
+        conn.measure()
+    stop = asyncio.Event()
+    tasks = [
+        asyncio.create_task(_admin(
+            conn, workflow, fanout, mix, args.rate, random.Random(rng.random()), stats, stop
+        ))
+        for conn in admins
+    ]
+    start = time.perf_counter()
+    await asyncio.sleep(args.duration)
+    stop.set()
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+    # Let the last pushes land before counting
+    await asyncio.sleep(max(0.5, (args.throttle_ms or 100) / 1000 * 2))
+    stats.errors += sum(conn.dropped for conn in connections)
+    everyone = fanout.everyone(len(connections))
+    pushes = fanout.pushes
+    await asyncio.gather(*(conn.close() for conn in connections), return_exceptions=True)
+
+    latencies = sorted(stats.latencies)
+    samples = sorted(fanout.samples)
+    return {
+        "clients": clients,
+        "connected": len(connections),
+        "admins": len(admins),
+        "commands_per_s": len(latencies) / elapsed,
+        **{f"p{p}_ms": percentile(latencies, p) * 1000 for p in (50, 95, 99)},
+        **{f"fanout_p{p}_ms": percentile(samples, p) * 1000 for p in (50, 95, 99)},
+        "fanout_all_p99_ms": percentile(everyone, 99) * 1000,
+        "pushes_per_s": pushes / elapsed,
+        "errors": stats.errors,
+        "rss_mb": await _server_rss(session, url),
+        "connect_p95_ms": percentile(sorted(stats.connect), 95) * 1000,
+    }
+
+
+def _print_row(row: dict[str, Any]) -> None:
+    rss = f"{row['rss_mb']:>7.0f}" if row["rss_mb"] is not None else f"{'-':>7}"
+    print(
+        f"{row['connected']:>7} {row['admins']:>6} {row['commands_per_s']:>7.1f}"
+        f" {row['p50_ms']:>7.1f} {row['p95_ms']:>7.1f} {row['p99_ms']:>7.1f}"
+        f" {row['fanout_p50_ms']:>8.1f} {row['fanout_p95_ms']:>7.1f}"
+        f" {row['fanout_p99_ms']:>7.1f} {row['fanout_all_p99_ms']:>8.1f}"
+        f" {row['pushes_per_s']:>8.0f} {row['errors']:>6} {rss} {row['connect_p95_ms']:>9.1f}",
+        flush=True,
+    )
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("", 0))
+        return sock.getsockname()[1]
+
+
+def write_store(path: str, records: int, seed: int) -> None:
+    """Write a synthetic store of about *records* records to *path*."""
+    subprocess.run(
+        [sys.executable, "devserver/seed_data.py", "--records", str(records),
+         "--seed", str(seed), "-o", path],
+        cwd=_REPO_ROOT, check=True, stdout=subprocess.DEVNULL,
+    )
+
+
+async def start_server(
+    data_file: str, tmp: str, repo: Path = _REPO_ROOT
+) -> tuple[asyncio.subprocess.Process, str]:
+    """Start *repo*'s dev server on *data_file*; return the process and its URL.
+
+    The server log goes to ``server.log`` in *tmp*.
+    """
+    port = _free_port()
+    log = open(os.path.join(tmp, "server.log"), "wb")
+    proc = await asyncio.create_subprocess_exec(
+        sys.executable, "devserver/server.py", "--port", str(port), "--data-file", data_file,
+        cwd=repo, stdout=log, stderr=log,
+    )
+    log.close()
+    deadline = time.monotonic() + SERVER_START_TIMEOUT
+    async with aiohttp.ClientSession() as session:
+        while time.monotonic() < deadline:
+            if proc.returncode is not None:
+                break
+            try:
+                async with session.get(f"http://localhost:{port}/metrics") as resp:
+                    if resp.status == 200:
+                        return proc, f"ws://localhost:{port}/api/websocket"
+            except (OSError, aiohttp.ClientError):
+                pass
+            await asyncio.sleep(0.2)
+    if proc.returncode is None:
+        proc.kill()
+    await proc.wait()
+    raise RuntimeError(f"Dev server did not start; see {tmp}/server.log")
+
+
+def _parse_mix(text: str) -> dict[str, float]:
+    mix = {}
+    for part in text.split(","):
+        kind, _, weight = part.partition("=")
+        if kind.strip() not in MIX_KINDS:
+            raise argparse.ArgumentTypeError(f"mix kinds are {', '.join(MIX_KINDS)}")
+        mix[kind.strip()] = float(weight or 1)
+    return mix
+
+
+async def _run(args: argparse.Namespace) -> list[dict[str, Any]]:
+    mix = _parse_mix(args.mix)
+    proc = None
+    with tempfile.TemporaryDirectory() as tmp:
+        url = args.url
+        if url is None:
+            data_file = os.path.join(tmp, "data.json")
+            write_store(data_file, args.records, args.seed)
+            proc, url = await start_server(data_file, tmp)
+            print(f"Dev server on {url} with about {args.records:,} records")
+        rows = []
+        print(
+            f"{'clients':>7} {'admins':>6} {'cmd/s':>7} {'p50':>7} {'p95':>7} {'p99':>7}"
+            f" {'fan p50':>8} {'p95':>7} {'p99':>7} {'all p99':>8}"
+            f" {'push/s':>8} {'errors':>6} {'rss MB':>7} {'conn p95':>9}"
+        )
+        try:
+            connector = aiohttp.TCPConnector(limit=0)
+            async with aiohttp.ClientSession(connector=connector) as session:
+                for clients in args.clients:
+                    row = await _stage(session, url, clients, args, mix)
+                    _print_row(row)
+                    rows.append(row)
+        finally:
+            if proc is not None:
+                proc.terminate()
+                await proc.wait()
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, nargs="+", default=[25, 50, 100, 200, 400])
+    parser.add_argument("--duration", type=float, default=20, help="Seconds per stage")
+    parser.add_argument("--admins", type=float, default=0.1, help="Share of admin connections")
+    parser.add_argument("--rate", type=float, default=1.0, help="Commands per second per admin")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Command weights ({DEFAULT_MIX})")
+    parser.add_argument("--delta", action="store_true", help="Subscribe for diffs")
+    parser.add_argument("--throttle-ms", type=int, help="Push throttle per subscriber")
+    parser.add_argument("--url", help="Use a running server instead of starting one")
+    parser.add_argument("--token", default="dev-token")
+    parser.add_argument("--records", type=int, default=2000, help="Size of the started store")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Also write the rows to this file")
+    args = parser.parse_args()
+
+    rows = asyncio.run(_run(args))
+    if args.json:
+        Path(args.json).write_text(json.dumps(rows, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Benchmark how long serializing FamDo data blocks the event loop.
+
+Usage:
+    python benchmarks/bench_loop_blocking.py [--records 10000 100000] [--repeat 3]
+
+Compares two ways of producing a subscription push / store payload while a
+probe task measures the longest gap between its wake-ups:
+
+* ``inline``   — ``codec.dumps(data.to_dict())`` on the loop (previous behaviour)
+* ``version`` — publish a copy-on-write version on the loop (O(1)),
+  ``to_dict()`` + encoding in a thread
+
+``on-loop ms`` is the synchronous time spent on the loop, ``stall ms`` the
+worst delay the probe observed, ``total ms`` the wall time until the payload
+is ready.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_serialization import build_dataset  # noqa: E402
+
+from custom_components.famdo.versions import DataVersions  # noqa: E402
+from devserver.json_codec import get_codec  # noqa: E402
+
+PROBE_INTERVAL = 0.001
+
+
+async def _probe(stop: asyncio.Event) -> float:
+    """Return the longest gap between wake-ups beyond the sleep interval."""
+    worst = 0.0
+    last = time.perf_counter()
+    while not stop.is_set():
+        await asyncio.sleep(PROBE_INTERVAL)
+        now = time.perf_counter()
+        worst = max(worst, now - last - PROBE_INTERVAL)
+        last = now
+    return worst
+
+
+async def _measure(produce) -> tuple[float, float, float]:
+    stop = asyncio.Event()
+    probe = asyncio.create_task(_probe(stop))
+    await asyncio.sleep(0.01)
+    start = time.perf_counter()
+    on_loop = await produce()
+    total = time.perf_counter() - start
+    await asyncio.sleep(0.01)
+    stop.set()
+    return on_loop, await probe, total
+
+
+def bench(records: int, repeat: int) -> list[tuple]:
+    data = build_dataset(records)
+    codec = get_codec()
+    versions = DataVersions(data)
+
+    async def inline() -> float:
+        start = time.perf_counter()
+        codec.dumps({"id": 1, "data": data.to_dict()})
+        return time.perf_counter() - start
+
+    async def version() -> float:
+        start = time.perf_counter()
+        versions.edit_at("chores", 0).points += 1
+        published = versions.commit().data
+        on_loop = time.perf_counter() - start
+        await asyncio.to_thread(lambda: codec.dumps({"id": 1, "data": published.to_dict()}))
+        return on_loop
+
+    rows = []
+    for name, produce in (("inline", inline), ("version", version)):
+        runs = [asyncio.run(_measure(produce)) for _ in range(repeat)]
+        rows.append((records, name, *(min(r[i] for r in runs) for i in range(3))))
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'records':>8} {'mode':<10} {'on-loop ms':>10} {'stall ms':>9} {'total ms':>9}")
+    for records in args.records:
+        for n, name, on_loop, stall, total in bench(records, args.repeat):
+            print(
+                f"{n:>8} {name:<10} {on_loop * 1000:>10.1f} {stall * 1000:>9.1f}"
+                f" {total * 1000:>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+"""Replay a recorded WebSocket capture and report latency and throughput.
+
+Usage:
+    python benchmarks/bench_replay.py CAPTURE [--speed 10] [--json run.json]
+        [--url ws://host:8123/api/websocket | --repo ../famdo-main]
+        [--compare base.json [--fail-over 25]]
+
+Record a capture with ``python devserver/server.py --record capture.jsonl.gz``
+(see ``devserver/recorder.py``). Each recorded connection is opened again
+and sends its commands, under their original ids, at the recorded times
+divided by ``--speed``. ``--speed 0`` sends as fast as the connections allow.
+Commands go out on schedule without waiting for earlier replies, as the
+tablets sent them.
+
+Without ``--url`` a dev server is started on a copy of the data file saved
+with the capture, so every replay starts from the same state. ``--repo``
+takes that server from another checkout, to compare builds. The report has
+throughput, latency percentiles per command type and how far the replayer
+itself fell behind schedule (``max lag``; a large lag means the client, not
+the server, set the pace). ``--compare`` prints the change against an
+earlier ``--json`` report. With ``--fail-over PCT`` the exit status is 1 if
+throughput fell, or any p95 with enough samples rose, by more than PCT%.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import shutil
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any
+
+import aiohttp
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_load import (  # noqa: E402
+    CommandFailed,
+    Connection,
+    FanOut,
+    percentile,
+    start_server,
+)
+
+from devserver.json_codec import get_codec  # noqa: E402
+from devserver.recorder import read_capture  # noqa: E402
+
+# Replies still missing this long after the capture ends count as errors
+REPLY_TIMEOUT = 30
+# Command types with fewer samples are not judged by --fail-over
+MIN_COMPARE_COUNT = 20
+
+_codec = get_codec()
+
+
+class _Results:
+    def __init__(self) -> None:
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+        self.lag = 0.0
+
+
+async def _reply(future: asyncio.Future, msg_type: str, sent: float, results: _Results) -> None:
+    try:
+        await future
+    except (CommandFailed, ConnectionError):
+        results.errors[msg_type] += 1
+        return
+    except asyncio.CancelledError:
+        results.errors[msg_type] += 1
+        raise
+    results.latencies[msg_type].append(time.perf_counter() - sent)
+
+
+async def _play(
+    session: aiohttp.ClientSession,
+    url: str,
+    token: str,
+    queue: asyncio.Queue,
+    fanout: FanOut,
+    results: _Results,
+) -> None:
+    """Open one connection and send what the scheduler queues until ``None``."""
+    try:
+        ws = await session.ws_connect(url, max_msg_size=0)
+        conn = Connection(ws, fanout)
+        await conn.authenticate(token)
+    except (OSError, aiohttp.ClientError, ConnectionError, CommandFailed):
+        conn = None
+    if conn is not None:
+        conn.measure()
+    replies = []
+    while (msg := await queue.get()) is not None:
+        msg_type = msg.get("type", "")
+        if conn is None or conn.dropped:
+            results.errors[msg_type] += 1
+            continue
+        sent = time.perf_counter()
+        try:
+            future = await conn.send(msg)
+        except (OSError, aiohttp.ClientError, ConnectionError):
+            results.errors[msg_type] += 1
+            continue
+        replies.append(asyncio.create_task(_reply(future, msg_type, sent, results)))
+    if replies:
+        _done, late = await asyncio.wait(replies, timeout=REPLY_TIMEOUT)
+        for task in late:
+            task.cancel()
+        await asyncio.gather(*late, return_exceptions=True)
+    if conn is not None:
+        await conn.close()
+
+
+async def replay(capture: str, url: str, speed: float, token: str) -> dict[str, Any]:
+    """Replay *capture* against *url* and return the report."""
+    _header, events = read_capture(capture, _codec)
+    results = _Results()
+    fanout = FanOut()
+    queues: dict[int, asyncio.Queue] = {}
+    players: list[asyncio.Task] = []
+    connector = aiohttp.TCPConnector(limit=0)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        start = time.perf_counter()
+        first: float | None = None
+        for event in events:
+            # The capture may start well before the first tablet connected
+            if first is None:
+                first = event["t"]
+            if speed > 0:
+                delay = start + (event["t"] - first) / speed - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                else:
+                    results.lag = max(results.lag, -delay)
+            conn = event["c"]
+            if event.get("open"):
+                queue = queues[conn] = asyncio.Queue()
+                players.append(asyncio.create_task(
+                    _play(session, url, token, queue, fanout, results)
+                ))
+            elif event.get("close"):
+                queue = queues.pop(conn, None)
+                if queue is not None:
+                    queue.put_nowait(None)
+            elif "msg" in event and conn in queues:
+                queues[conn].put_nowait(event["msg"])
+            if speed <= 0:
+                await asyncio.sleep(0)
+        # Connections still open when recording stopped
+        for queue in queues.values():
+            queue.put_nowait(None)
+        await asyncio.gather(*players)
+        elapsed = time.perf_counter() - start
+
+    everything = sorted(t for values in results.latencies.values() for t in values)
+    by_type = {}
+    for msg_type in sorted(set(results.latencies) | set(results.errors)):
+        values = sorted(results.latencies.get(msg_type, []))
+        by_type[msg_type] = {
+            "count": len(values),
+            "errors": results.errors.get(msg_type, 0),
+            **{f"p{p}_ms": percentile(values, p) * 1000 for p in (50, 95, 99)},
+        }
+    return {
+        "capture": os.path.basename(capture),
+        "speed": speed,
+        "duration_s": elapsed,
+        "commands": len(everything),
+        "commands_per_s": len(everything) / elapsed if elapsed else 0.0,
+        "errors": sum(results.errors.values()),
+        "pushes": fanout.pushes,
+        "max_lag_ms": results.lag * 1000,
+        **{f"p{p}_ms": percentile(everything, p) * 1000 for p in (50, 95, 99)},
+        "by_type": by_type,
+    }
+
+
+def _print_report(report: dict[str, Any]) -> None:
+    print(
+        f"{report['commands']} commands in {report['duration_s']:.1f}s"
+        f" ({report['commands_per_s']:.1f}/s), {report['errors']} errors,"
+        f" {report['pushes']} pushes, max lag {report['max_lag_ms']:.0f} ms"
+    )
+    print(f"{'type':<34} {'count':>7} {'errors':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for msg_type, row in report["by_type"].items():
+        print(
+            f"{msg_type:<34} {row['count']:>7} {row['errors']:>6} {row['p50_ms']:>8.1f}"
+            f" {row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f}"
+        )
+    print(
+        f"{'all':<34} {report['commands']:>7} {report['errors']:>6} {report['p50_ms']:>8.1f}"
+        f" {report['p95_ms']:>8.1f} {report['p99_ms']:>8.1f}"
+    )
+
+
+def _change(old: float, new: float) -> float:
+    if not old or math.isnan(old) or math.isnan(new):
+        return float("nan")
+    return (new - old) / old * 100
+
+
+def compare(base: dict[str, Any], report: dict[str, Any], fail_over: float | None) -> bool:
+    """Print *report* against *base*; return False if it regressed past *fail_over*%."""
+    ok = True
+    throughput = _change(base["commands_per_s"], report["commands_per_s"])
+    print(
+        f"\nthroughput {base['commands_per_s']:.1f}/s -> {report['commands_per_s']:.1f}/s"
+        f" ({throughput:+.1f}%)"
+    )
+    if fail_over is not None and -throughput > fail_over:
+        ok = False
+    print(f"{'type':<34} {'p50 ms':>19} {'p95 ms':>19} {'p95 %':>8}")
+    rows = {**base["by_type"], **report["by_type"]}
+    for msg_type in sorted(rows):
+        old = base["by_type"].get(msg_type)
+        new = report["by_type"].get(msg_type)
+        if old is None or new is None:
+            print(f"{msg_type:<34} only in {'new' if old is None else 'base'} run")
+            continue
+        p95 = _change(old["p95_ms"], new["p95_ms"])
+        judged = min(old["count"], new["count"]) >= MIN_COMPARE_COUNT
+        flag = ""
+        if fail_over is not None and judged and p95 > fail_over:
+            flag = "  regressed"
+            ok = False
+        print(
+            f"{msg_type:<34} {old['p50_ms']:>8.1f} -> {new['p50_ms']:>7.1f}"
+            f" {old['p95_ms']:>8.1f} -> {new['p95_ms']:>7.1f} {p95:>+7.1f}%{flag}"
+        )
+    return ok
+
+
+async def _run(args: argparse.Namespace) -> dict[str, Any]:
+    header, events = read_capture(args.capture, _codec)
+    events.close()
+    if args.url:
+        return await replay(args.capture, args.url, args.speed, args.token)
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = os.path.join(tmp, "data.json")
+        if header.get("snapshot"):
+            directory = os.path.dirname(os.path.abspath(args.capture))
+            shutil.copyfile(os.path.join(directory, header["snapshot"]), data_file)
+        proc, url = await start_server(data_file, tmp, Path(args.repo).resolve())
+        try:
+            return await replay(args.capture, url, args.speed, args.token)
+        finally:
+            proc.terminate()
+            await proc.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("capture", help="Capture written by server.py --record")
+    parser.add_argument(
+        "--speed", type=float, default=1.0, help="Time compression; 0 for no waiting (default: 1)"
+    )
+    parser.add_argument("--url", help="Replay against a running server")
+    parser.add_argument(
+        "--repo", default=str(Path(__file__).resolve().parent.parent),
+        help="Checkout whose dev server is started (default: this one)",
+    )
+    parser.add_argument("--token", default="dev-token")
+    parser.add_argument("--json", help="Write the report here")
+    parser.add_argument("--compare", help="Report from an earlier --json run")
+    parser.add_argument(
+        "--fail-over", type=float, metavar="PCT",
+        help="With --compare, exit 1 on a regression beyond PCT percent",
+    )
+    args = parser.parse_args()
+
+    report = asyncio.run(_run(args))
+    _print_report(report)
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2) + "\n")
+    if args.compare:
+        base = json.loads(Path(args.compare).read_text())
+        if not compare(base, report, args.fail_over):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
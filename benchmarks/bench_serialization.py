@@ -0,0 +1,107 @@
+"""Benchmark dev server JSON encoding: MockStore save/load and push payloads.
+
+Usage:
+    python benchmarks/bench_serialization.py [--records 10000 100000] [--repeat 3]
+
+For each available codec, builds a dataset of roughly N records (chores,
+todos and events cloned from the seed data), then times:
+
+* ``encode`` — encoding an already-built ``to_dict()`` snapshot
+* ``push``  — ``to_dict()`` + encoding one subscription snapshot
+* ``save``  — ``MockStore.async_save`` (compact)
+* ``load``  — ``MockStore.async_load`` from that file
+
+The ``json-indent`` row is the previous behaviour (stdlib, ``indent=2``).
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import dataclasses
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from devserver.json_codec import JsonCodec, available_codecs, get_codec  # noqa: E402
+from devserver.mock_storage import MockStore  # noqa: E402
+from devserver.seed_data import create_seed_data  # noqa: E402
+
+
+def build_dataset(records: int):
+    """Return FamDoData with about *records* chores, todos and events."""
+    data = create_seed_data()
+    pools = [("chores", data.chores), ("todos", data.todos), ("events", data.events)]
+    per_pool = records // len(pools)
+    for attr, seed in pools:
+        items = []
+        for i in range(per_pool):
+            template = seed[i % len(seed)]
+            items.append(dataclasses.replace(template, id=f"{template.id[:4]}{i:08d}"))
+        setattr(data, attr, items)
+    return data
+
+
+def _best_of(repeat: int, func) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _indent_codec() -> JsonCodec:
+    stdlib = get_codec("json")
+    return dataclasses.replace(
+        stdlib, name="json-indent", dumps=lambda obj: json.dumps(obj, indent=2).encode()
+    )
+
+
+def bench(records: int, repeat: int) -> list[tuple]:
+    data = build_dataset(records)
+    codecs = [_indent_codec()] + [get_codec(name) for name in available_codecs()]
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for codec in codecs:
+            path = os.path.join(tmp, f"{codec.name}.json")
+            store = MockStore(data_file=path, codec=codec)
+            store._data = data
+
+            snapshot = {"id": 1, "data": data.to_dict()}
+            encode = _best_of(repeat, lambda: codec.dumps(snapshot))
+            push = _best_of(repeat, lambda: codec.dumps({"id": 1, "data": data.to_dict()}))
+            save = _best_of(repeat, lambda: asyncio.run(store.async_save()))
+
+            def _load() -> None:
+                asyncio.run(MockStore(data_file=path, codec=codec).async_load())
+
+            load = _best_of(repeat, _load)
+            rows.append((records, codec.name, encode, push, save, load, os.path.getsize(path)))
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(
+        f"{'records':>8} {'codec':<12} {'encode ms':>9} {'push ms':>9}"
+        f" {'save ms':>9} {'load ms':>9} {'file KB':>9}"
+    )
+    for records in args.records:
+        for n, name, encode, push, save, load, size in bench(records, args.repeat):
+            print(
+                f"{n:>8} {name:<12} {encode * 1000:>9.1f} {push * 1000:>9.1f} {save * 1000:>9.1f}"
+                f" {load * 1000:>9.1f} {size / 1024:>9.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
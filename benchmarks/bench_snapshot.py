@@ -0,0 +1,72 @@
+"""Benchmark MockStore snapshot formats: save/load time and file size.
+
+Usage:
+    python benchmarks/bench_snapshot.py [--records 10000 100000] [--repeat 3]
+
+Times the encode + compress (save) and decompress + decode (load) of the
+snapshot dict for every supported format/compression pair, excluding
+``to_dict``/``from_dict`` which are identical across formats.
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_serialization import build_dataset  # noqa: E402
+from devserver.json_codec import get_codec  # noqa: E402
+from devserver.snapshot import (  # noqa: E402
+    COMPRESSIONS,
+    SNAPSHOT_FORMATS,
+    check_snapshot_support,
+    decode_snapshot,
+    encode_snapshot,
+)
+
+
+def _best_of(repeat: int, func):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    codec = get_codec()
+    print(f"JSON codec: {codec.name}")
+    print(
+        f"{'records':>8} {'format':<8} {'compress':<8}"
+        f" {'save ms':>9} {'load ms':>9} {'file KB':>9}"
+    )
+    for records in args.records:
+        snapshot = build_dataset(records).to_dict()
+        for fmt in SNAPSHOT_FORMATS:
+            for compression in COMPRESSIONS:
+                try:
+                    check_snapshot_support(fmt, compression)
+                except ValueError as err:
+                    print(f"{records:>8} {fmt:<8} {compression:<8} skipped: {err}")
+                    continue
+                save, blob = _best_of(
+                    args.repeat, lambda: encode_snapshot(snapshot, codec, fmt, compression)
+                )
+                load, _ = _best_of(args.repeat, lambda: decode_snapshot(blob, codec))
+                print(
+                    f"{records:>8} {fmt:<8} {compression:<8} {save * 1000:>9.1f}"
+                    f" {load * 1000:>9.1f} {len(blob) / 1024:>9.0f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Benchmark store startup: eager vs. lazy loading of historical records.
+
+Usage:
+    python benchmarks/bench_startup.py [--records 100000] [--history 0.8] [--repeat 3]
+
+Writes a synthetic store of about N records where a *history* fraction of
+todos and events is cold (completed todos, past one-off events), then times
+``MockStore.async_load`` followed by what the sensors read on startup
+(collection sizes and open todos / upcoming events), with and without
+``lazy``. ``first read ms`` is the later cost of materializing the cold
+records when a collection is iterated for the first time.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_serialization import build_dataset  # noqa: E402
+
+from custom_components.famdo.lazy import hot_items  # noqa: E402
+from devserver.mock_storage import MockStore  # noqa: E402
+
+
+def _write_store(path: str, records: int, history: float) -> None:
+    data = build_dataset(records)
+    past = (date.today() - timedelta(days=30)).isoformat()
+    for todo in data.todos[: int(len(data.todos) * history)]:
+        todo.completed = True
+    for event in data.events[: int(len(data.events) * history)]:
+        event.start_date = past
+        event.end_date = None
+        event.recurrence = "none"
+    store = MockStore(data_file=path)
+    store._data = data
+    asyncio.run(store.async_save())
+
+
+def _startup(path: str, lazy: bool) -> tuple[float, float]:
+    start = time.perf_counter()
+    data = asyncio.run(MockStore(data_file=path, lazy=lazy).async_load())
+    today = date.today().isoformat()
+    len(data.todos), len(data.events), len(data.reward_claims)
+    [t for t in hot_items(data.todos) if not t.completed]
+    [e for e in hot_items(data.events) if e.start_date >= today]
+    startup = time.perf_counter() - start
+
+    start = time.perf_counter()
+    list(data.todos), list(data.events)
+    return startup, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, nargs="+", default=[100_000])
+    parser.add_argument("--history", type=float, default=0.8)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'records':>8} {'mode':<6} {'startup ms':>10} {'first read ms':>13}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for records in args.records:
+            path = os.path.join(tmp, f"{records}.json")
+            _write_store(path, records, args.history)
+            for mode, lazy in (("eager", False), ("lazy", True)):
+                runs = [_startup(path, lazy) for _ in range(args.repeat)]
+                startup = min(r[0] for r in runs)
+                first_read = min(r[1] for r in runs)
+                print(
+                    f"{records:>8} {mode:<6} {startup * 1000:>10.1f}"
+                    f" {first_read * 1000:>13.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+"""Benchmark suite with regression thresholds, run under pytest.
+
+Usage:
+    python -m pytest benchmarks/bench_suite.py [-k "to_dict or save"] [-s]
+    FAMDO_BENCH_SIZES=100,10000 python -m pytest benchmarks/bench_suite.py
+    FAMDO_BENCH_UPDATE=1 python -m pytest benchmarks/bench_suite.py
+
+Times model serialization, ``get_*_by_id`` lookups, the coordinator's
+periodic chore checks, calendar range queries and ``MockStore`` save/load
+over synthetic households of about 100, 10k and 100k records
+(``FAMDO_BENCH_SIZES``; see ``devserver/seed_data.generate_data``). The data
+is generated from a fixed seed relative to today, so runs compare.
+
+Each case reports the best of several repeats, with garbage collection off,
+like ``timeit``. A case fails if it is more than ``FAMDO_BENCH_TOLERANCE``
+(default 1.5) times slower than its entry in ``baseline.json``, ignoring
+slowdowns under 20 microseconds. Cases without an entry only report.
+Timings only compare on one machine, so the baseline is never committed: the
+first run of each case records it (``baseline.json`` is git-ignored), and
+``FAMDO_BENCH_UPDATE=1`` rewrites it from this run.
+``FAMDO_BENCH_OUTPUT=path.json`` also saves this run's timings. Run with
+``-s`` to see the results table.
+"""
+from __future__ import annotations
+
+import asyncio
+import gc
+import importlib.util as _ilu
+import json
+import os
+import sys
+import time
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from devserver.mock_coordinator import MockCoordinator  # noqa: E402
+from devserver.mock_storage import MockStore  # noqa: E402
+from devserver.seed_data import generate_data, params_for_records  # noqa: E402
+from custom_components.famdo.models import FamDoData  # noqa: E402
+
+_famdo_dir = Path(__file__).resolve().parent.parent / "custom_components" / "famdo"
+
+
+def _load_module(name: str, path: Path):
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = _ilu.spec_from_file_location(name, path)
+    mod = _ilu.module_from_spec(spec)
+    sys.modules[name] = mod
+    spec.loader.exec_module(mod)
+    return mod
+
+
+# Not loaded by the dev server modules above; the package __init__ needs HA
+_load_module("custom_components.famdo.calendar_cache", _famdo_dir / "calendar_cache.py")
+famdo_events = _load_module(
+    "custom_components.famdo.merged_events", _famdo_dir / "merged_events.py"
+).famdo_events
+
+BASELINE_FILE = Path(__file__).resolve().parent / "baseline.json"
+SIZES = [
+    int(size) for size in os.environ.get("FAMDO_BENCH_SIZES", "100,10000,100000").split(",")
+]
+TOLERANCE = float(os.environ.get("FAMDO_BENCH_TOLERANCE", "1.5"))
+UPDATE = os.environ.get("FAMDO_BENCH_UPDATE") == "1"
+OUTPUT = os.environ.get("FAMDO_BENCH_OUTPUT")
+
+# Each case is repeated until it has run this long, at least REPEAT times
+MIN_TIME = 0.2
+REPEAT = 3
+# Slowdowns smaller than this are timer noise, whatever the ratio
+NOISE_FLOOR = 20e-6
+
+
+def build_dataset(size: int) -> FamDoData:
+    """Return a synthetic household of about *size* records, the same every run."""
+    return generate_data(**params_for_records(size))
+
+
+def _measure(func: Callable[[], Any]) -> float:
+    """Return the best per-call time of *func*, in seconds."""
+    loops = 1
+    while True:
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            for _ in range(loops):
+                func()
+            elapsed = time.perf_counter() - start
+        finally:
+            gc.enable()
+        if elapsed * REPEAT >= MIN_TIME or loops >= 1_000_000:
+            break
+        loops *= 10
+    best = elapsed / loops
+    for _ in range(REPEAT - 1):
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            for _ in range(loops):
+                func()
+            best = min(best, (time.perf_counter() - start) / loops)
+        finally:
+            gc.enable()
+    return best
+
+
+def _measure_async(func: Callable[[], Awaitable[Any]]) -> float:
+    """Like :func:`_measure` for a coroutine function, timed inside one loop."""
+    loop = asyncio.new_event_loop()
+    try:
+        return _measure(lambda: loop.run_until_complete(func()))
+    finally:
+        loop.close()
+
+
+class _Results:
+    def __init__(self) -> None:
+        self.baseline: dict[str, float] = (
+            json.loads(BASELINE_FILE.read_text()) if BASELINE_FILE.exists() else {}
+        )
+        # Without a baseline for this machine, this run becomes it
+        self.recording = UPDATE or not BASELINE_FILE.exists()
+        self.timings: dict[str, float] = {}
+
+    def check(self, case: str, size: int, seconds: float) -> None:
+        name = f"{case}[{size}]"
+        self.timings[name] = seconds
+        expected = self.baseline.get(name)
+        if self.recording or expected is None or seconds - expected < NOISE_FLOOR:
+            return
+        assert seconds <= expected * TOLERANCE, (
+            f"{name} took {seconds * 1000:.3f} ms; baseline {expected * 1000:.3f} ms"
+            f" (tolerance x{TOLERANCE})"
+        )
+
+    def finish(self) -> None:
+        print(f"\n{'case':<34} {'ms':>12} {'baseline ms':>12}")
+        for name, seconds in self.timings.items():
+            expected = self.baseline.get(name)
+            shown = f"{expected * 1000:>12.3f}" if expected is not None else f"{'-':>12}"
+            print(f"{name:<34} {seconds * 1000:>12.3f} {shown}")
+        # Cases new to this machine's baseline (e.g. another size) join it
+        recorded = {
+            name: float(f"{seconds:.6g}") for name, seconds in self.timings.items()
+            if self.recording or name not in self.baseline
+        }
+        if recorded:
+            merged = {**self.baseline, **recorded}
+            BASELINE_FILE.write_text(json.dumps(dict(sorted(merged.items())), indent=2) + "\n")
+            print(f"Recorded {len(recorded)} baseline timings in {BASELINE_FILE}")
+        if OUTPUT:
+            Path(OUTPUT).write_text(json.dumps(self.timings, indent=2) + "\n")
+
+
+@pytest.fixture(scope="module")
+def results():
+    collected = _Results()
+    yield collected
+    collected.finish()
+
+
+@pytest.fixture(scope="module", params=SIZES, ids=str)
+def bench_env(request, tmp_path_factory):
+    """A loaded coordinator over the dataset for one size, and its store path."""
+    path = str(tmp_path_factory.mktemp(f"bench{request.param}") / "data.json")
+    data = build_dataset(request.param)
+
+    async def _setup() -> MockCoordinator:
+        store = MockStore(data_file=path)
+        store._data = data
+        await store.async_save()
+        coordinator = MockCoordinator(store)
+        await coordinator.async_init()
+        # Settle overdue marks and due instances so timed runs see steady state
+        await coordinator._check_overdue_chores()
+        await coordinator._reset_recurring_chores()
+        return coordinator
+
+    coordinator = asyncio.run(_setup())
+    return request.param, coordinator, path
+
+
+def test_to_dict(bench_env, results):
+    size, coordinator, _ = bench_env
+    data = coordinator.famdo_data
+    results.check("to_dict", size, _measure(data.to_dict))
+
+
+def test_from_dict(bench_env, results):
+    size, coordinator, _ = bench_env
+    raw = coordinator.famdo_data.to_dict()
+    results.check("from_dict", size, _measure(lambda: FamDoData.from_dict(raw)))
+
+
+@pytest.mark.parametrize("collection,getter", [
+    ("members", "get_member_by_id"),
+    ("chores", "get_chore_by_id"),
+    ("rewards", "get_reward_by_id"),
+    ("reward_claims", "get_reward_claim_by_id"),
+])
+def test_get_by_id(bench_env, results, collection, getter):
+    size, coordinator, _ = bench_env
+    data = coordinator.famdo_data
+    items = getattr(data, collection)
+    if not items:
+        pytest.skip(f"no {collection} at size {size}")
+    # Ten ids spread evenly through the list, plus one that is missing
+    ids = [items[i * len(items) // 10].id for i in range(10)] + ["missing"]
+    lookup = getattr(data, getter)
+
+    def _lookups() -> None:
+        for item_id in ids:
+            lookup(item_id)
+
+    results.check(getter, size, _measure(_lookups) / len(ids))
+
+
+def test_check_overdue_chores(bench_env, results):
+    size, coordinator, _ = bench_env
+    results.check(
+        "check_overdue_chores", size, _measure_async(coordinator._check_overdue_chores)
+    )
+
+
+def test_reset_recurring_chores(bench_env, results):
+    size, coordinator, _ = bench_env
+    results.check(
+        "reset_recurring_chores", size, _measure_async(coordinator._reset_recurring_chores)
+    )
+
+
+def test_calendar_week(bench_env, results):
+    size, coordinator, _ = bench_env
+    data = coordinator.famdo_data
+    tz = timezone.utc
+    start = datetime.combine(date.today(), datetime.min.time(), tzinfo=tz)
+    results.check(
+        "calendar_week", size,
+        _measure(lambda: famdo_events(data, start, start + timedelta(days=7), tz)),
+    )
+
+
+def test_query_events_range(bench_env, results):
+    size, coordinator, _ = bench_env
+    today = date.today()
+    window = {
+        "date_from": (today - timedelta(days=30)).isoformat(),
+        "date_to": today.isoformat(),
+    }
+    coordinator.query("events", **window)  # Build the index once
+    results.check(
+        "query_events_month", size, _measure(lambda: coordinator.query("events", **window))
+    )
+
+
+def test_store_save(bench_env, results):
+    size, coordinator, _ = bench_env
+    results.check("store_save", size, _measure_async(coordinator.store.async_save))
+
+
+def test_store_load(bench_env, results):
+    size, _, path = bench_env
+
+    async def _load() -> None:
+        await MockStore(data_file=path).async_load()
+
+    results.check("store_load", size, _measure_async(_load))
@@ -0,0 +1,101 @@
+"""Benchmark bulk import/export of chores through the dev server.
+
+Usage:
+    python benchmarks/bench_transfer.py [--chores 100000] [--chunk 1000] [--baseline 20]
+
+Starts the dev server in-process on a fresh data file, writes a JSON Lines
+file of N chores and times ``devserver/transfer.py`` importing it (one save
+at the end) and exporting everything back. ``baseline`` times that many
+``famdo/add_chore`` calls (one save each) on a store already holding the
+imported chores, for comparison.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import socket
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from aiohttp import web
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from devserver.json_codec import get_codec  # noqa: E402
+from devserver.server import init_app  # noqa: E402
+from devserver.transfer import (  # noqa: E402
+    HEADER_FORMAT,
+    _connect,
+    export_file,
+    import_file,
+)
+from custom_components.famdo.models import Chore  # noqa: E402
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("", 0))
+        return sock.getsockname()[1]
+
+
+def _write_chores(path: str, count: int) -> None:
+    codec = get_codec()
+    with open(path, "wb") as out:
+        out.write(codec.dumps({"format": HEADER_FORMAT}) + b"\n")
+        for i in range(count):
+            chore = Chore(id=f"bench{i:08d}", name=f"Chore {i}", points=i % 50)
+            out.write(codec.dumps({"collection": "chores", "record": chore.to_dict()}) + b"\n")
+
+
+async def _bench(chores: int, chunk: int, baseline: int, tmp: str) -> None:
+    app = await init_app(os.path.join(tmp, "data.json"))
+    runner = web.AppRunner(app)
+    await runner.setup()
+    port = _free_port()
+    await web.TCPSite(runner, "localhost", port).start()
+    url = f"ws://localhost:{port}/api/websocket"
+    source = os.path.join(tmp, "chores.jsonl")
+    _write_chores(source, chores)
+
+    try:
+        start = time.perf_counter()
+        result = await import_file(source, url=url, chunk=chunk)
+        elapsed = time.perf_counter() - start
+        print(f"import    {result['added']:>8} records {elapsed:>7.2f}s"
+              f" {result['added'] / elapsed:>10,.0f} records/s")
+
+        start = time.perf_counter()
+        count = await export_file(os.path.join(tmp, "export.jsonl"), url=url, chunk=chunk)
+        elapsed = time.perf_counter() - start
+        print(f"export    {count:>8} records {elapsed:>7.2f}s {count / elapsed:>10,.0f} records/s")
+
+        if baseline:
+            import aiohttp
+
+            async with aiohttp.ClientSession() as session:
+                client = await _connect(session, url, "dev-token")
+                start = time.perf_counter()
+                for i in range(baseline):
+                    await client.call("famdo/add_chore", name=f"Extra {i}")
+                elapsed = time.perf_counter() - start
+            print(f"add_chore {baseline:>8} records {elapsed:>7.2f}s"
+                  f" {baseline / elapsed:>10,.0f} records/s")
+    finally:
+        await runner.cleanup()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chores", type=int, default=100_000)
+    parser.add_argument("--chunk", type=int, default=1000)
+    parser.add_argument("--baseline", type=int, default=20)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(_bench(args.chores, args.chunk, args.baseline, tmp))
+
+
+if __name__ == "__main__":
+    main()
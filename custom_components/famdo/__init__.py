@@ -8,13 +8,19 @@ from typing import Any
 from homeassistant.components.frontend import async_register_built_in_panel
 from homeassistant.components.http import StaticPathConfig
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.const import EVENT_STATE_CHANGED, Platform
+from homeassistant.core import Event, HomeAssistant, ServiceCall, callback
 import voluptuous as vol
 
+from .calendar_cache import CalendarEventCache, CalendarRegistry
 from .const import (
+    CALENDAR_EVENTS_CACHE_TTL,
     DOMAIN,
     CONF_FAMILY_NAME,
+    CONF_LAZY_LOAD,
+    CONF_METRICS,
+    CONF_STORAGE_BACKEND,
+    STORAGE_BACKEND_JSON,
     SERVICE_ADD_MEMBER,
     SERVICE_REMOVE_MEMBER,
     SERVICE_ADD_CHORE,
@@ -28,6 +34,7 @@ from .const import (
     SERVICE_ADD_EVENT,
 )
 from .coordinator import FamDoCoordinator
+from .metrics import METRICS
 from .storage import FamDoStore
 from .websocket_api import async_register_websocket_api
 
@@ -39,9 +46,14 @@ PLATFORMS: list[Platform] = [Platform.SENSOR, Platform.CALENDAR]
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up FamDo from a config entry."""
     _LOGGER.debug("Setting up FamDo integration")
+    METRICS.enabled = entry.options.get(CONF_METRICS, False)
 
     # Initialize storage
-    store = FamDoStore(hass)
+    store = FamDoStore(
+        hass,
+        entry.options.get(CONF_STORAGE_BACKEND, STORAGE_BACKEND_JSON),
+        lazy=entry.options.get(CONF_LAZY_LOAD, True),
+    )
     await store.async_load()
 
     # Update family name from config if changed
@@ -59,6 +71,31 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     hass.data[DOMAIN]["coordinator"] = coordinator
     hass.data[DOMAIN]["store"] = store
 
+    # HA calendar events for the panel; a calendar's state changes whenever
+    # one of its events starts or ends, so drop its cached windows then.
+    # The same listener keeps the list of calendar entities current.
+    calendar_cache = CalendarEventCache(CALENDAR_EVENTS_CACHE_TTL)
+    calendar_registry = CalendarRegistry()
+    calendar_registry.load(
+        (state.entity_id, state.attributes.get("friendly_name", state.entity_id))
+        for state in hass.states.async_all("calendar")
+    )
+    hass.data[DOMAIN]["calendar_cache"] = calendar_cache
+    hass.data[DOMAIN]["calendar_registry"] = calendar_registry
+
+    @callback
+    def _async_calendar_changed(event: Event) -> None:
+        entity_id = event.data["entity_id"]
+        if entity_id.startswith("calendar."):
+            calendar_cache.invalidate(entity_id)
+            new_state = event.data.get("new_state")
+            calendar_registry.update(
+                entity_id,
+                new_state.attributes.get("friendly_name", entity_id) if new_state else None,
+            )
+
+    entry.async_on_unload(hass.bus.async_listen(EVENT_STATE_CHANGED, _async_calendar_changed))
+
     # Register WebSocket API
     async_register_websocket_api(hass)
 
@@ -71,15 +108,25 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Set up platforms
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    # Options such as the storage backend take effect on reload
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+
     return True
 
 
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the config entry when its options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
     if unload_ok:
-        hass.data.pop(DOMAIN, None)
+        domain_data = hass.data.pop(DOMAIN, None) or {}
+        if "store" in domain_data:
+            await domain_data["store"].async_close()
 
     return unload_ok
 
@@ -17,6 +17,7 @@ from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
 from .coordinator import FamDoCoordinator
+from .lazy import hot_items
 from .models import CalendarEvent, Chore
 
 _LOGGER = logging.getLogger(__name__)
@@ -68,7 +69,8 @@ class FamDoCalendar(CoordinatorEntity[FamDoCoordinator], CalendarEntity):
         now = datetime.now()
 
         upcoming = []
-        for event in self.coordinator.famdo_data.events:
+        # Past one-off events are never upcoming, so cold ones can stay unloaded
+        for event in hot_items(self.coordinator.famdo_data.events):
             try:
                 start = date.fromisoformat(event.start_date)
                 if start >= today:
@@ -184,8 +186,9 @@ class FamDoChoresCalendar(CoordinatorEntity[FamDoCoordinator], CalendarEntity):
         today = date.today()
 
         upcoming = []
-        for chore in self.coordinator.famdo_data.chores:
-            if chore.due_date and chore.status not in ["completed"]:
+        # Settled chores are not upcoming, and they are the only cold ones
+        for chore in hot_items(self.coordinator.famdo_data.chores):
+            if chore.due_date and chore.status not in ["completed", "rejected"]:
                 try:
                     due = date.fromisoformat(chore.due_date)
                     if due >= today:
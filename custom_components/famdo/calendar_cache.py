@@ -0,0 +1,181 @@
+"""Caches of Home Assistant calendar entities and their events (no HA deps)."""
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Iterable
+
+# (start, end, payload) for one event, with timezone-aware bounds
+CachedEvent = tuple[datetime, datetime, Any]
+Fetch = Callable[[datetime, datetime], Awaitable[list[CachedEvent]]]
+
+# Windows kept per calendar; the oldest is dropped first
+MAX_WINDOWS_PER_CALENDAR = 8
+
+
+@dataclass
+class _Window:
+    start: datetime
+    end: datetime
+    expires: float
+    events: list[CachedEvent]
+
+
+def _within(events: list[CachedEvent], start: datetime, end: datetime) -> list[Any]:
+    """Return the payloads of events overlapping ``[start, end)``."""
+    return [
+        payload for ev_start, ev_end, payload in events if ev_start < end and ev_end > start
+    ]
+
+
+class CalendarEventCache:
+    """Events fetched per (calendar, window), reused for any window inside one.
+
+    A week view followed by a day view in that week costs one fetch.
+    Requests for a window already being fetched wait for that fetch instead
+    of starting another. Entries expire after ``ttl`` seconds, or sooner
+    through :meth:`invalidate` when the calendar's state changes.
+    """
+
+    def __init__(self, ttl: float, *, clock: Callable[[], float] = time.monotonic) -> None:
+        """Initialize an empty cache."""
+        self._ttl = ttl
+        self._clock = clock
+        self._windows: dict[str, list[_Window]] = {}
+        # Fetches in progress by (entity_id, start, end)
+        self._pending: dict[tuple[str, datetime, datetime], asyncio.Future] = {}
+        # Bumped on invalidate so fetches started before it are not stored
+        self._generation: dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.collapsed = 0
+
+    def _cached(self, entity_id: str, start: datetime, end: datetime) -> _Window | None:
+        now = self._clock()
+        windows = self._windows.get(entity_id)
+        if not windows:
+            return None
+        windows[:] = [window for window in windows if window.expires > now]
+        for window in windows:
+            if window.start <= start and end <= window.end:
+                return window
+        return None
+
+    def _in_flight(
+        self, entity_id: str, start: datetime, end: datetime
+    ) -> asyncio.Future | None:
+        for (fetch_id, fetch_start, fetch_end), future in self._pending.items():
+            if fetch_id == entity_id and fetch_start <= start and end <= fetch_end:
+                return future
+        return None
+
+    async def async_get(
+        self, entity_id: str, start: datetime, end: datetime, fetch: Fetch
+    ) -> list[Any]:
+        """Return the payloads of *entity_id*'s events overlapping the window.
+
+        *fetch* is awaited with the window on a miss and returns
+        :data:`CachedEvent` tuples.
+        """
+        while True:
+            window = self._cached(entity_id, start, end)
+            if window is not None:
+                self.hits += 1
+                return _within(window.events, start, end)
+            future = self._in_flight(entity_id, start, end)
+            if future is None:
+                break
+            self.collapsed += 1
+            try:
+                events = await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # The request that was fetching went away; try again
+                continue
+            return _within(events, start, end)
+
+        self.misses += 1
+        generation = self._generation.get(entity_id, 0)
+        future = asyncio.get_running_loop().create_future()
+        key = (entity_id, start, end)
+        self._pending[key] = future
+        try:
+            events = await fetch(start, end)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as err:
+            future.set_exception(err)
+            future.exception()  # Waiters re-raise it; nobody else needs to
+            raise
+        finally:
+            del self._pending[key]
+        future.set_result(events)
+
+        if self._generation.get(entity_id, 0) == generation:
+            windows = self._windows.setdefault(entity_id, [])
+            windows.append(_Window(start, end, self._clock() + self._ttl, events))
+            del windows[:-MAX_WINDOWS_PER_CALENDAR]
+        return _within(events, start, end)
+
+    def invalidate(self, entity_id: str | None = None) -> None:
+        """Drop cached windows for one calendar, or for all of them."""
+        if entity_id is not None:
+            keys = {entity_id}
+        else:
+            keys = set(self._windows) | {key[0] for key in self._pending}
+        for key in keys:
+            self._windows.pop(key, None)
+            self._generation[key] = self._generation.get(key, 0) + 1
+
+
+class CalendarRegistry:
+    """The calendar entities HA knows about, kept current from state changes.
+
+    Listing them is O(1): the list is rebuilt only after a change, and
+    ``revision`` goes up with each change so clients holding the latest
+    list can skip it. A renamed entity shows up as a removal followed by an
+    add.
+    """
+
+    def __init__(self) -> None:
+        """Initialize with no calendars."""
+        self._names: dict[str, str] = {}
+        self._listing: list[dict[str, str]] | None = []
+        self.revision = 0
+
+    def load(self, calendars: Iterable[tuple[str, str]]) -> None:
+        """Replace the registry with *calendars* as ``(entity_id, name)`` pairs."""
+        self._names = dict(calendars)
+        self._changed()
+
+    def update(self, entity_id: str, name: str | None) -> bool:
+        """Record a calendar's current name, or ``None`` once it is removed.
+
+        Return whether anything changed; state changes that keep the name
+        (events starting or ending) leave the revision alone.
+        """
+        if name is None:
+            if self._names.pop(entity_id, None) is None:
+                return False
+        elif self._names.get(entity_id) == name:
+            return False
+        else:
+            self._names[entity_id] = name
+        self._changed()
+        return True
+
+    def listing(self) -> list[dict[str, str]]:
+        """Return the calendars as ``famdo/get_ha_calendars`` reports them."""
+        if self._listing is None:
+            self._listing = [
+                {"entity_id": entity_id, "name": name} for entity_id, name in self._names.items()
+            ]
+        return self._listing
+
+    def _changed(self) -> None:
+        self._listing = None
+        self.revision += 1
@@ -0,0 +1,881 @@
+"""Transport-neutral registry of FamDo WebSocket commands.
+
+Each command is declared once with its fields, a handler and whether it
+writes. The Home Assistant WebSocket API turns the field specs into
+voluptuous schemas; the dev server validates with :func:`validate`. Both
+dispatch through :func:`execute`.
+"""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Protocol
+
+from .const import DEFAULT_PUSH_INTERVAL_MS, MAX_PUSH_INTERVAL_MS, ROLE_PARENT
+from .metrics import METRICS
+from .models import FamDoData
+from .query import DEFAULT_QUERY_LIMIT, MAX_QUERY_LIMIT, QueryError
+from .transfer import EXPORT_PAGE_SIZE, MAX_EXPORT_PAGE_SIZE, TransferError
+
+if TYPE_CHECKING:
+    from .versions import DataVersion
+
+_MISSING: Any = object()
+
+
+class CommandError(Exception):
+    """A command failed; carries a WebSocket error code."""
+
+    def __init__(self, code: str, message: str) -> None:
+        """Initialize the error."""
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+@dataclass(frozen=True)
+class Field:
+    """A message field accepted by a command.
+
+    ``types`` lists the accepted Python types; ``None`` allows null.
+    """
+
+    name: str
+    types: tuple[Any, ...]
+    required: bool = False
+    default: Any = _MISSING
+    min: int | None = None
+    max: int | None = None
+
+    @property
+    def has_default(self) -> bool:
+        """Whether a default is filled in when the field is omitted."""
+        return self.default is not _MISSING
+
+
+def required(name: str, *types: Any) -> Field:
+    """Declare a required field."""
+    return Field(name, types, required=True)
+
+
+def optional(name: str, *types: Any, default: Any = _MISSING, **limits: int) -> Field:
+    """Declare an optional field."""
+    return Field(name, types, default=default, **limits)
+
+
+class CommandContext(Protocol):
+    """What a handler needs from the transport it runs under."""
+
+    coordinator: Any
+
+    def resolve_parent(self, raw_id: str, action: str) -> str:
+        """Map an approver id (possibly ``ha_user:<id>``) to a parent member id."""
+
+
+Handler = Callable[[CommandContext, dict[str, Any]], Awaitable[Any]]
+
+
+@dataclass(frozen=True)
+class Command:
+    """A registered command."""
+
+    name: str
+    handler: Handler
+    fields: tuple[Field, ...] = ()
+    write: bool = True
+
+
+COMMANDS: dict[str, Command] = {}
+
+
+def command(
+    name: str, *fields: Field, write: bool = True
+) -> Callable[[Handler], Handler]:
+    """Register the decorated coroutine as the handler for *name*."""
+
+    def decorator(handler: Handler) -> Handler:
+        COMMANDS[name] = Command(name, handler, fields, write=write)
+        return handler
+
+    return decorator
+
+
+def validate(cmd: Command, params: dict[str, Any]) -> dict[str, Any]:
+    """Check *params* against the command's fields and fill in defaults.
+
+    Mirrors the voluptuous schema HA builds from the same fields, including
+    rejecting unknown keys.
+    """
+    return validate_fields(cmd.fields, params)
+
+
+def validate_fields(fields: tuple[Field, ...], params: dict[str, Any]) -> dict[str, Any]:
+    """Like :func:`validate`, for commands a transport handles itself."""
+    known = {f.name for f in fields}
+    extra = [key for key in params if key not in known]
+    if extra:
+        raise CommandError("invalid_format", f"extra keys not allowed: {', '.join(extra)}")
+
+    result = dict(params)
+    for spec in fields:
+        if spec.name not in params:
+            if spec.required:
+                raise CommandError("invalid_format", f"required key not provided: {spec.name}")
+            if spec.has_default:
+                result[spec.name] = spec.default
+            continue
+        value = params[spec.name]
+        if not _type_ok(value, spec.types):
+            raise CommandError("invalid_format", f"invalid value for {spec.name}")
+        if isinstance(value, int) and not isinstance(value, bool):
+            if (spec.min is not None and value < spec.min) or (
+                spec.max is not None and value > spec.max
+            ):
+                raise CommandError("invalid_format", f"value out of range for {spec.name}")
+    return result
+
+
+def _type_ok(value: Any, types: tuple[Any, ...]) -> bool:
+    for expected in types:
+        if expected is None:
+            if value is None:
+                return True
+        elif expected is int:
+            # bool is an int subclass; HA's schema rejects it with a strict int check
+            if isinstance(value, int) and not isinstance(value, bool):
+                return True
+        elif isinstance(value, expected):
+            return True
+    return False
+
+
+async def execute(cmd: Command, ctx: CommandContext, params: dict[str, Any]) -> Any:
+    """Run a command's handler with already-validated params."""
+    if not METRICS.enabled:
+        return await cmd.handler(ctx, params)
+    with METRICS.timer(f"command.{cmd.name}"):
+        return await cmd.handler(ctx, params)
+
+
+def find_parent_for_ha_user(data: FamDoData, ha_user_id: str) -> str | None:
+    """Return the parent linked to an HA user, else any parent."""
+    for member in data.members:
+        if member.ha_user_id == ha_user_id and member.role == ROLE_PARENT:
+            return member.id
+    for member in data.members:
+        if member.role == ROLE_PARENT:
+            return member.id
+    return None
+
+
+async def async_data_dict(version: DataVersion) -> dict[str, Any]:
+    """Serialize a published version in the default executor.
+
+    Versions never change, so ``to_dict`` can run off the event loop.
+    """
+    return await asyncio.get_running_loop().run_in_executor(None, version.data.to_dict)
+
+
+def _updates(params: dict[str, Any], id_field: str) -> dict[str, Any]:
+    """Return the fields to update, without the entity id or version check."""
+    return {
+        k: v for k, v in params.items() if k not in (id_field, "expected_version")
+    }
+
+
+# Clients send back the ``version`` they last saw to detect concurrent edits
+_EXPECTED_VERSION = optional("expected_version", int, min=0)
+
+
+def _check_version(
+    ctx: CommandContext, collection: str, entity_id: str, params: dict[str, Any]
+) -> None:
+    """Fail with ``version_conflict`` if the client's copy of the record is stale.
+
+    Call right before the coordinator: nothing awaits in between, so no other
+    command can change the record after the check. Unknown ids are left to the
+    coordinator to report.
+    """
+    expected = params.get("expected_version")
+    if expected is None:
+        return
+    item = ctx.coordinator.famdo_data.get_record(collection, entity_id)
+    if item is not None and item.version != expected:
+        raise CommandError(
+            "version_conflict",
+            f"Record is at version {item.version}, expected {expected}",
+        )
+
+
+# famdo/subscribe needs the connection, so each transport handles it, but
+# both validate it against these fields
+SUBSCRIBE_FIELDS = (
+    optional(
+        "throttle_ms", int, default=DEFAULT_PUSH_INTERVAL_MS, min=0, max=MAX_PUSH_INTERVAL_MS
+    ),
+    optional("delta", bool, default=False),
+)
+
+
+# ==================== Data Retrieval ====================
+
+
+@command("famdo/get_data", write=False)
+async def get_data(ctx: CommandContext, params: dict[str, Any]) -> Any:
+    """Get all FamDo data."""
+    return await async_data_dict(ctx.coordinator.snapshot())
+
+
+_QUERY_FIELDS = (
+    optional("member_id", str),
+    optional("date_from", str),
+    optional("date_to", str),
+    optional("sort_by", str),
+    optional("descending", bool, default=False),
+    optional("limit", int, default=DEFAULT_QUERY_LIMIT, min=1, max=MAX_QUERY_LIMIT),
+    optional("cursor", str, None),
+)
+_STATUS_FIELD = optional("status", str, list)
+
+
+def _query(ctx: CommandContext, collection: str, params: dict[str, Any]) -> Any:
+    try:
+        return ctx.coordinator.query(collection, **params)
+    except QueryError as err:
+        raise CommandError("invalid_query", str(err)) from err
+
+
+@command(
+    "famdo/query_chores",
+    optional("template_id", str),
+    optional("is_template", bool),
+    _STATUS_FIELD,
+    *_QUERY_FIELDS,
+    write=False,
+)
+async def query_chores(ctx: CommandContext, params: dict[str, Any]) -> Any:
+    """Query chores with filtering, sorting and cursor pagination."""
+    return _query(ctx, "chores", params)
+
+
+@command("famdo/query_todos", _STATUS_FIELD, *_QUERY_FIELDS, write=False)
+async def query_todos(ctx: CommandContext, params: dict[str, Any]) -> Any:
+    """Query todos (status is "active" or "completed")."""
+    return _query(ctx, "todos", params)
+
+
+@command("famdo/query_claims", _STATUS_FIELD, *_QUERY_FIELDS, write=False)
+async def query_claims(ctx: CommandContext, params: dict[str, Any]) -> Any:
+    """Query reward claims."""
+    return _query(ctx, "reward_claims", params)
+
+
+@command("famdo/query_events", *_QUERY_FIELDS, write=False)
+async def query_events(ctx: CommandContext, params: dict[str, Any]) -> Any:
+    """Query calendar events by start date."""
+    return _query(ctx, "events", params)
+
+
+# ==================== Member Management ====================
+
+
+@command(
+    "famdo/add_member",
+    required("name", str),
+    optional("role", str, default="child"),
+    optional("color", str, default="#4ECDC4"),
+    optional("avatar", str, default="mdi:account"),
+)
+async def add_member(ctx: CommandContext, params: dict[str, Any]) -> Any:
+    """Add a family member."""
+    member = await ctx.coordinator.async_add_member(
+        name=params["name"],
+        role=params["role"],
+        color=params["color"],
+        avatar=params["avatar"],
+    )
+    return member.to_dict()
+
+
+@command(
+    "famdo/update_member",
+    required("member_id", str),
+    optional("name", str),
+    optional("role", str),
+    optional("color", str),
+    optional("avatar", str),
+    optional("points", int),
+    optional("ha_user_id", str, None),
+    _EXPECTED_VERSION,
+)
+async def update_member(ctx: CommandContext, params: dict[str, Any]) -> Any:
+    """Update a family member."""
+    _check_version(ctx, "members", params["member_id"], params)
+    member = await ctx.coordinator.async_update_member(
+        params["member_id"], **_updates(params, "member_id")
+    )
+    if member is None:
+        raise CommandError("not_found", "Member not found")
+    return member.to_dict()
+
+
+@command("famdo/remove_member", required("member_id", str))
+async def remove_member(ctx: CommandContext, params: dict[str, Any]) -> Any:
+    """Remove a family member."""
+    success = await ctx.coordinator.async_remove_member(params["member_id"])
+    return {"success": success}
+
+
+# ==================== Chore Management ====================
+
+
+@command(
+    "famdo/add_chore",
+    required("name", str),
+    optional("description", str, default=""),
+    optional("points", int, default=10),
+    optional("assigned_to", str, None),
+    optional("recurrence", str, default="none"),
+    optional("due_date", str, None),
+    optional("due_time", str, None),
+    optional("icon", str, default="mdi:broom"),
+    optional("negative_points", int, default=0),
+    optional("max_instances", int, default=3),
+)
+async def add_chore(ctx: CommandContext, params: dict[str, Any]) -> Any:
+    """Add a chore."""
+    chore = await ctx.coordinator.async_add_chore(
+        name=params["name"],
+        description=params["description"],
+        points=params["points"],
+        assigned_to=params.get("assigned_to"),
+        recurrence=params["recurrence"],
+        due_date=params.get("due_date"),
+        due_time=params.get("due_time"),
+        icon=params["icon"],
+        negative_points=params["negative_points"],
+        max_instances=params["max_instances"],
+    )
+    return chore.to_dict()
+
+
+@command(
+    "famdo/update_chore",
+    required("chore_id", str),
+    optional("name", str),
+    optional("description", str),
+    optional("points", int),
+    optional("assigned_to", str, None),
+    optional("recurrence", str),
+    optional("due_date", str, None),
+    optional("due_time", str, None),
+    optional("icon", str),
+    optional("status", str),
+    optional("negative_points", int),
+    optional("max_instances", int),
+    _EXPECTED_VERSION,
+)
+async def update_chore(ctx: CommandContext, params: dict[str, Any]) -> Any:
+    """Update a chore."""
+    _check_version(ctx, "chores", params["chore_id"], params)
+    chore = await ctx.coordinator.async_update_chore(
+        params["chore_id"], **_updates(params, "chore_id")
+    )
+    if chore is None:
+        raise CommandError("not_found", "Chore not found")
+    return chore.to_dict()
+
+
+@command(
+    "famdo/claim_chore",
+    required("chore_id", str),
+    required("member_id", str),
+    _EXPECTED_VERSION,
+)
+async def claim_chore(ctx: CommandContext, params: dict[str, Any]) -> Any:
+    """Claim a chore."""
+    _check_version(ctx, "chores", params["chore_id"], params)
+    chore = await ctx.coordinator.async_claim_chore(params["chore_id"], params["member_id"])
+    if chore is None:
+        raise CommandError("failed", "Could not claim chore")
+    return chore.to_dict()
+
+
+@command(
+    "famdo/complete_chore",
+    required("chore_id", str),
+    required("member_id", str),
+    _EXPECTED_VERSION,
+)
+async def complete_chore(ctx: CommandContext, params: dict[str, Any]) -> Any:
+    """Complete a chore."""
+    _check_version(ctx, "chores", params["chore_id"], params)
+    chore = await ctx.coordinator.async_complete_chore(params["chore_id"], params["member_id"])
+    if chore is None:
+        raise CommandError("failed", "Could not complete chore")
+    return chore.to_dict()
+
+
+@command(
+    "famdo/approve_chore",
+    required("chore_id", str),
+    required("approver_id", str),
+    _EXPECTED_VERSION,
+)
+async def approve_chore(ctx: CommandContext, params: dict[str, Any]) -> Any:
+    """Approve a chore."""
+    approver_id = ctx.resolve_parent(params["approver_id"], "approve chores")
+    _check_version(ctx, "chores", params["chore_id"], params)
+    chore = await ctx.coordinator.async_approve_chore(params["chore_id"], approver_id)
+    if chore is None:
+        raise CommandError("failed", "Could not approve chore")
+    return chore.to_dict()
+
+
+@command(
+    "famdo/reject_chore",
+    required("chore_id", str),
+    required("approver_id", str),
+    _EXPECTED_VERSION,
+)
+async def reject_chore(ctx: CommandContext, params: dict[str, Any]) -> Any:
+    """Reject a chore."""
+    approver_id = ctx.resolve_parent(params["approver_id"], "reject chores")
+    _check_version(ctx, "chores", params["chore_id"], params)
+    chore = await ctx.coordinator.async_reject_chore(params["chore_id"], approver_id)
+    if chore is None:
+        raise CommandError("failed", "Could not reject chore")
+    return chore.to_dict()
+
+
+@command("famdo/retry_chore", required("chore_id", str), required("member_id", str))
+async def retry_chore(ctx: CommandContext, params: dict[str, Any]) -> Any:
+    """Retry a rejected chore."""
+    chore = await ctx.coordinator.async_retry_chore(params["chore_id"], params["member_id"])
+    if chore is None:
+        raise CommandError("failed", "Could not retry chore")
+    return chore.to_dict()
+
+
+@command(
+    "famdo/reactivate_template", required("template_id", str), required("approver_id", str)
+)
+async def reactivate_template(ctx: CommandContext, params: dict[str, Any]) -> Any:
+    """Reactivate a recurring chore template by creating a new instance."""
+    approver_id = ctx.resolve_parent(params["approver_id"], "reactivate templates")
+    chore = await ctx.coordinator.async_reactivate_template(params["template_id"], approver_id)
+    if chore is None:
+        raise CommandError("failed", "Could not reactivate template")
+    return chore.to_dict()
+
+
+@command("famdo/delete_chore", required("chore_id", str))
+async def delete_chore(ctx: CommandContext, params: dict[str, Any]) -> Any:
+    """Delete a chore."""
+    success = await ctx.coordinator.async_delete_chore(params["chore_id"])
+    return {"success": success}
+
+
+# ==================== Reward Management ====================
+
+
+@command(
+    "famdo/add_reward",
+    required("name", str),
+    optional("description", str, default=""),
+    optional("points_cost", int, default=50),
+    optional("icon", str, default="mdi:gift"),
+    optional("image_url", str, None),
+    optional("quantity", int, default=-1),
+)
+async def add_reward(ctx: CommandContext, params: dict[str, Any]) -> Any:
+    """Add a reward."""
+    reward = await ctx.coordinator.async_add_reward(
+        name=params["name"],
+        description=params["description"],
+        points_cost=params["points_cost"],
+        icon=params["icon"],
+        image_url=params.get("image_url"),
+        quantity=params["quantity"],
+    )
+    return reward.to_dict()
+
+
+@command(
+    "famdo/update_reward",
+    required("reward_id", str),
+    optional("name", str),
+    optional("description", str),
+    optional("points_cost", int),
+    optional("icon", str),
+    optional("image_url", str, None),
+    optional("quantity", int),
+    optional("available", bool),
+    _EXPECTED_VERSION,
+)
+async def update_reward(ctx: CommandContext, params: dict[str, Any]) -> Any:
+    """Update a reward."""
+    _check_version(ctx, "rewards", params["reward_id"], params)
+    reward = await ctx.coordinator.async_update_reward(
+        params["reward_id"], **_updates(params, "reward_id")
+    )
+    if reward is None:
+        raise CommandError("not_found", "Reward not found")
+    return reward.to_dict()
+
+
+@command(
+    "famdo/claim_reward",
+    required("reward_id", str),
+    required("member_id", str),
+    _EXPECTED_VERSION,
+)
+async def claim_reward(ctx: CommandContext, params: dict[str, Any]) -> Any:
+    """Claim a reward."""
+    _check_version(ctx, "rewards", params["reward_id"], params)
+    claim = await ctx.coordinator.async_claim_reward(params["reward_id"], params["member_id"])
+    if claim is None:
+        raise CommandError("failed", "Could not claim reward")
+    return claim.to_dict()
+
+
+@command(
+    "famdo/fulfill_reward_claim",
+    required("claim_id", str),
+    required("fulfiller_id", str),
+    _EXPECTED_VERSION,
+)
+async def fulfill_reward_claim(ctx: CommandContext, params: dict[str, Any]) -> Any:
+    """Fulfill a reward claim (mark as delivered)."""
+    fulfiller_id = ctx.resolve_parent(params["fulfiller_id"], "fulfill rewards")
+    _check_version(ctx, "reward_claims", params["claim_id"], params)
+    claim = await ctx.coordinator.async_fulfill_reward_claim(params["claim_id"], fulfiller_id)
+    if claim is None:
+        raise CommandError("failed", "Could not fulfill reward claim")
+    return claim.to_dict()
+
+
+@command("famdo/delete_reward", required("reward_id", str))
+async def delete_reward(ctx: CommandContext, params: dict[str, Any]) -> Any:
+    """Delete a reward."""
+    success = await ctx.coordinator.async_delete_reward(params["reward_id"])
+    return {"success": success}
+
+
+# ==================== Todo Management ====================
+
+
+@command(
+    "famdo/add_todo",
+    required("title", str),
+    optional("description", str, default=""),
+    optional("assigned_to", str, None),
+    optional("due_date", str, None),
+    optional("priority", str, default="normal"),
+    optional("category", str, default="general"),
+    optional("created_by", str, None),
+)
+async def add_todo(ctx: CommandContext, params: dict[str, Any]) -> Any:
+    """Add a todo item."""
+    todo = await ctx.coordinator.async_add_todo(
+        title=params["title"],
+        description=params["description"],
+        assigned_to=params.get("assigned_to"),
+        due_date=params.get("due_date"),
+        priority=params["priority"],
+        category=params["category"],
+        created_by=params.get("created_by"),
+    )
+    return todo.to_dict()
+
+
+@command(
+    "famdo/update_todo",
+    required("todo_id", str),
+    optional("title", str),
+    optional("description", str),
+    optional("assigned_to", str, None),
+    optional("due_date", str, None),
+    optional("priority", str),
+    optional("category", str),
+    optional("completed", bool),
+    _EXPECTED_VERSION,
+)
+async def update_todo(ctx: CommandContext, params: dict[str, Any]) -> Any:
+    """Update a todo item."""
+    _check_version(ctx, "todos", params["todo_id"], params)
+    todo = await ctx.coordinator.async_update_todo(
+        params["todo_id"], **_updates(params, "todo_id")
+    )
+    if todo is None:
+        raise CommandError("not_found", "Todo not found")
+    return todo.to_dict()
+
+
+@command("famdo/complete_todo", required("todo_id", str), _EXPECTED_VERSION)
+async def complete_todo(ctx: CommandContext, params: dict[str, Any]) -> Any:
+    """Complete a todo item."""
+    _check_version(ctx, "todos", params["todo_id"], params)
+    todo = await ctx.coordinator.async_complete_todo(params["todo_id"])
+    if todo is None:
+        raise CommandError("not_found", "Todo not found")
+    return todo.to_dict()
+
+
+@command("famdo/delete_todo", required("todo_id", str))
+async def delete_todo(ctx: CommandContext, params: dict[str, Any]) -> Any:
+    """Delete a todo item."""
+    success = await ctx.coordinator.async_delete_todo(params["todo_id"])
+    return {"success": success}
+
+
+# ==================== Calendar Event Management ====================
+
+
+@command(
+    "famdo/add_event",
+    required("title", str),
+    required("start_date", str),
+    optional("description", str, default=""),
+    optional("end_date", str, None),
+    optional("start_time", str, None),
+    optional("end_time", str, None),
+    optional("all_day", bool, default=True),
+    optional("member_ids", list, None),
+    optional("color", str, None),
+    optional("recurrence", str, default="none"),
+    optional("location", str, default=""),
+)
+async def add_event(ctx: CommandContext, params: dict[str, Any]) -> Any:
+    """Add a calendar event."""
+    event = await ctx.coordinator.async_add_event(
+        title=params["title"],
+        start_date=params["start_date"],
+        description=params["description"],
+        end_date=params.get("end_date"),
+        start_time=params.get("start_time"),
+        end_time=params.get("end_time"),
+        all_day=params["all_day"],
+        member_ids=params.get("member_ids"),
+        color=params.get("color"),
+        recurrence=params["recurrence"],
+        location=params["location"],
+    )
+    return event.to_dict()
+
+
+@command(
+    "famdo/update_event",
+    required("event_id", str),
+    optional("title", str),
+    optional("description", str),
+    optional("start_date", str),
+    optional("end_date", str, None),
+    optional("start_time", str, None),
+    optional("end_time", str, None),
+    optional("all_day", bool),
+    optional("member_ids", list, None),
+    optional("color", str, None),
+    optional("recurrence", str),
+    optional("location", str),
+    _EXPECTED_VERSION,
+)
+async def update_event(ctx: CommandContext, params: dict[str, Any]) -> Any:
+    """Update a calendar event."""
+    _check_version(ctx, "events", params["event_id"], params)
+    event = await ctx.coordinator.async_update_event(
+        params["event_id"], **_updates(params, "event_id")
+    )
+    if event is None:
+        raise CommandError("not_found", "Event not found")
+    return event.to_dict()
+
+
+@command("famdo/delete_event", required("event_id", str))
+async def delete_event(ctx: CommandContext, params: dict[str, Any]) -> Any:
+    """Delete a calendar event."""
+    success = await ctx.coordinator.async_delete_event(params["event_id"])
+    return {"success": success}
+
+
+# ==================== Settings ====================
+
+
+@command(
+    "famdo/update_settings",
+    optional("family_name", str),
+    optional("selected_calendars", list),
+    optional("calendar_colors", dict),
+    optional("time_format", str),  # "12h" or "24h"
+)
+async def update_settings(ctx: CommandContext, params: dict[str, Any]) -> Any:
+    """Update settings."""
+    settings = dict(params)
+    if "family_name" in settings:
+        await ctx.coordinator.async_update_family_name(settings.pop("family_name"))
+    if settings:
+        await ctx.coordinator.async_update_settings(**settings)
+    return {"success": True}
+
+
+# ==================== Import / Export ====================
+
+
+@command(
+    "famdo/import",
+    required("records", dict),
+    optional("import_id", str, None),
+    optional("final", bool, default=True),
+    optional("replace", bool, default=False),
+    optional("family_name", str),
+    optional("settings", dict),
+)
+async def import_records(ctx: CommandContext, params: dict[str, Any]) -> Any:
+    """Import records in chunks; the final chunk saves them all at once.
+
+    ``records`` maps collection names to serialized records, as exported.
+    Chunks sent with the same ``import_id`` and ``final: false`` are
+    validated and staged, and nothing is written until the final one.
+    """
+    try:
+        return await ctx.coordinator.async_import(
+            params["records"],
+            import_id=params.get("import_id"),
+            final=params["final"],
+            replace=params["replace"],
+            family_name=params.get("family_name"),
+            settings=params.get("settings"),
+        )
+    except TransferError as err:
+        raise CommandError("invalid_import", str(err)) from err
+
+
+@command(
+    "famdo/export",
+    optional("cursor", str, None),
+    optional("limit", int, default=EXPORT_PAGE_SIZE, min=1, max=MAX_EXPORT_PAGE_SIZE),
+    write=False,
+)
+async def export_records(ctx: CommandContext, params: dict[str, Any]) -> Any:
+    """Export all records a page at a time, all from the same version."""
+    try:
+        return ctx.coordinator.export_page(params.get("cursor"), params["limit"])
+    except TransferError as err:
+        raise CommandError("invalid_cursor", str(err)) from err
+
+
+# ==================== Data Management ====================
+
+
+@command(
+    "famdo/update_reward_claim",
+    required("claim_id", str),
+    optional("status", str),
+    optional("points_spent", int),
+    optional("fulfilled_at", str, None),
+    _EXPECTED_VERSION,
+)
+async def update_reward_claim(ctx: CommandContext, params: dict[str, Any]) -> Any:
+    """Update a reward claim."""
+    _check_version(ctx, "reward_claims", params["claim_id"], params)
+    claim = await ctx.coordinator.async_update_reward_claim(
+        params["claim_id"], **_updates(params, "claim_id")
+    )
+    if claim is None:
+        raise CommandError("not_found", "Reward claim not found")
+    return claim.to_dict()
+
+
+@command("famdo/delete_reward_claim", required("claim_id", str))
+async def delete_reward_claim(ctx: CommandContext, params: dict[str, Any]) -> Any:
+    """Delete a reward claim."""
+    success = await ctx.coordinator.async_delete_reward_claim(params["claim_id"])
+    return {"success": success}
+
+
+@command(
+    "famdo/delete_where",
+    required("collection", str),
+    _STATUS_FIELD,
+    optional("member_id", str),
+    optional("template_id", str),
+    optional("is_template", bool),
+    optional("older_than_days", int, min=0),
+    optional("dry_run", bool, default=False),
+)
+async def delete_where(ctx: CommandContext, params: dict[str, Any]) -> Any:
+    """Delete chores, todos, claims or events matching all the given filters.
+
+    With ``dry_run`` nothing is deleted and ``count`` is how many would be.
+    """
+    filters = dict(params)
+    collection = filters.pop("collection")
+    dry_run = filters.pop("dry_run")
+    try:
+        count = await ctx.coordinator.async_delete_where(
+            collection, dry_run=dry_run, **filters
+        )
+    except QueryError as err:
+        raise CommandError("invalid_query", str(err)) from err
+    return {"count": count, "dry_run": dry_run}
+
+
+@command("famdo/delete_all_chores", optional("keep_templates", bool, default=False))
+async def delete_all_chores(ctx: CommandContext, params: dict[str, Any]) -> Any:
+    """Delete all chores."""
+    count = await ctx.coordinator.async_delete_all_chores(keep_templates=params["keep_templates"])
+    return {"success": True, "count": count}
+
+
+@command("famdo/delete_all_rewards")
+async def delete_all_rewards(ctx: CommandContext, params: dict[str, Any]) -> Any:
+    """Delete all rewards."""
+    count = await ctx.coordinator.async_delete_all_rewards()
+    return {"success": True, "count": count}
+
+
+@command("famdo/delete_all_reward_claims")
+async def delete_all_reward_claims(ctx: CommandContext, params: dict[str, Any]) -> Any:
+    """Delete all reward claims."""
+    count = await ctx.coordinator.async_delete_all_reward_claims()
+    return {"success": True, "count": count}
+
+
+@command("famdo/delete_all_todos")
+async def delete_all_todos(ctx: CommandContext, params: dict[str, Any]) -> Any:
+    """Delete all todos."""
+    count = await ctx.coordinator.async_delete_all_todos()
+    return {"success": True, "count": count}
+
+
+@command("famdo/delete_all_events")
+async def delete_all_events(ctx: CommandContext, params: dict[str, Any]) -> Any:
+    """Delete all calendar events."""
+    count = await ctx.coordinator.async_delete_all_events()
+    return {"success": True, "count": count}
+
+
+@command("famdo/delete_all_members")
+async def delete_all_members(ctx: CommandContext, params: dict[str, Any]) -> Any:
+    """Delete all family members."""
+    count = await ctx.coordinator.async_delete_all_members()
+    return {"success": True, "count": count}
+
+
+@command("famdo/clear_all_data", optional("keep_members", bool, default=False))
+async def clear_all_data(ctx: CommandContext, params: dict[str, Any]) -> Any:
+    """Clear all FamDo data - reset the entire installation."""
+    counts = await ctx.coordinator.async_clear_all_data(keep_members=params["keep_members"])
+    return {"success": True, "counts": counts}
+
+
+# ==================== Diagnostics ====================
+
+
+@command("famdo/get_metrics", optional("reset", bool, default=False), write=False)
+async def get_metrics(ctx: CommandContext, params: dict[str, Any]) -> Any:
+    """Get latency percentiles per command and stage, if metrics are enabled."""
+    stages = METRICS.snapshot()
+    if params["reset"]:
+        METRICS.reset()
+    return {"enabled": METRICS.enabled, "stages": stages}
@@ -10,7 +10,15 @@ from homeassistant import config_entries
 from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 
-from .const import DOMAIN, CONF_FAMILY_NAME
+from .const import (
+    DOMAIN,
+    CONF_FAMILY_NAME,
+    CONF_LAZY_LOAD,
+    CONF_METRICS,
+    CONF_STORAGE_BACKEND,
+    STORAGE_BACKEND_JSON,
+    STORAGE_BACKENDS,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -79,6 +87,20 @@ class FamDoOptionsFlow(config_entries.OptionsFlow):
                             CONF_FAMILY_NAME, "My Family"
                         ),
                     ): str,
+                    vol.Required(
+                        CONF_STORAGE_BACKEND,
+                        default=self.config_entry.options.get(
+                            CONF_STORAGE_BACKEND, STORAGE_BACKEND_JSON
+                        ),
+                    ): vol.In(STORAGE_BACKENDS),
+                    vol.Required(
+                        CONF_LAZY_LOAD,
+                        default=self.config_entry.options.get(CONF_LAZY_LOAD, True),
+                    ): bool,
+                    vol.Required(
+                        CONF_METRICS,
+                        default=self.config_entry.options.get(CONF_METRICS, False),
+                    ): bool,
                 }
             ),
         )
@@ -6,10 +6,28 @@ VERSION: Final = "1.5.1"
 
 # Configuration keys
 CONF_FAMILY_NAME: Final = "family_name"
+CONF_STORAGE_BACKEND: Final = "storage_backend"
+CONF_LAZY_LOAD: Final = "lazy_load"
+CONF_METRICS: Final = "metrics"
 
 # Storage
 STORAGE_KEY: Final = "famdo_data"
 STORAGE_VERSION: Final = 1
+STORAGE_BACKEND_JSON: Final = "json"  # HA's .storage JSON document
+STORAGE_BACKEND_SQLITE: Final = "sqlite"
+STORAGE_BACKEND_SNAPSHOT: Final = "snapshot"  # gzip-compressed JSON file
+STORAGE_BACKENDS: Final = [STORAGE_BACKEND_JSON, STORAGE_BACKEND_SQLITE, STORAGE_BACKEND_SNAPSHOT]
+SQLITE_FILENAME: Final = "famdo.db"
+SNAPSHOT_FILENAME: Final = "famdo_data.snapshot"
+
+# Subscriptions
+DEFAULT_PUSH_INTERVAL_MS: Final = 100  # Minimum gap between pushes per subscriber
+MAX_PUSH_INTERVAL_MS: Final = 10000
+
+# Home Assistant calendar events fetched for the panel
+CALENDAR_EVENTS_CACHE_TTL: Final = 300  # Seconds; state changes invalidate sooner
+MERGED_EVENTS_TIMEOUT: Final = 5  # Seconds to wait for each calendar
+MAX_MERGED_EVENTS_TIMEOUT: Final = 30
 
 # Events
 EVENT_CHORE_COMPLETED: Final = "famdo_chore_completed"
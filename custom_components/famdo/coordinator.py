@@ -3,7 +3,7 @@ from __future__ import annotations
 
 import logging
 from datetime import datetime, timedelta
-from typing import Any
+from typing import Any, Callable
 
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
@@ -28,6 +28,8 @@ from .const import (
     DEFAULT_MAX_INSTANCES,
     ROLE_PARENT,
 )
+from .lazy import hot_items
+from .metrics import METRICS
 from .models import (
     FamilyMember,
     Chore,
@@ -36,12 +38,17 @@ from .models import (
     TodoItem,
     CalendarEvent,
     FamDoData,
+    index_template_instances,
 )
+from .query import FamDoQueryIndex, record_filter
 from .storage import FamDoStore
+from .transfer import EXPORT_PAGE_SIZE, FamDoTransfer, TransferError, apply_import
+from .versions import DataVersion, DataVersions
 
 _LOGGER = logging.getLogger(__name__)
 
 
+@METRICS.timed_methods("coordinator")
 class FamDoCoordinator(DataUpdateCoordinator[FamDoData]):
     """Coordinator for FamDo data."""
 
@@ -55,6 +62,8 @@ class FamDoCoordinator(DataUpdateCoordinator[FamDoData]):
         )
         self.store = store
         self._data: FamDoData | None = None
+        self._query_index = FamDoQueryIndex()
+        self._transfer = FamDoTransfer()
 
     async def _async_update_data(self) -> FamDoData:
         """Fetch data and check for overdue chores."""
@@ -77,7 +86,8 @@ class FamDoCoordinator(DataUpdateCoordinator[FamDoData]):
         now = datetime.now()
         changed = False
 
-        for chore in self._data.chores:
+        # Settled chores are never overdue, so the cold ones need not load
+        for index, chore in enumerate(hot_items(self._data.chores)):
             # Skip templates - only check instances
             if chore.is_template:
                 continue
@@ -92,6 +102,7 @@ class FamDoCoordinator(DataUpdateCoordinator[FamDoData]):
                             minute=int(time_parts[1]) if len(time_parts) > 1 else 0,
                         )
                     if now > due:
+                        chore = self._versions.edit_at("chores", index)
                         chore.status = CHORE_STATUS_OVERDUE
                         changed = True
 
@@ -102,6 +113,7 @@ class FamDoCoordinator(DataUpdateCoordinator[FamDoData]):
                             if member_id:
                                 member = self._data.get_member_by_id(member_id)
                                 if member:
+                                    member = self._versions.edit("members", member)
                                     member.points = max(0, member.points - chore.negative_points)
                                     _LOGGER.info(
                                         "Applied -%d points to %s for overdue chore: %s",
@@ -124,21 +136,23 @@ class FamDoCoordinator(DataUpdateCoordinator[FamDoData]):
         changed = False
 
         # Find all recurring templates (time-based only, not always_on)
+        chores = hot_items(self._data.chores)
         templates = [
-            c for c in self._data.chores
+            c for c in chores
             if c.is_template and c.recurrence in [RECURRENCE_DAILY, RECURRENCE_WEEKLY, RECURRENCE_MONTHLY]
         ]
+        # One pass over the chores instead of two per template
+        instances = index_template_instances(chores)
 
         for template in templates:
-            # Count active (non-completed) instances for this template
-            active_instances = self._count_active_instances(template.id)
+            entry = instances.get(template.id)
 
             # Don't create more instances if at max
-            if active_instances >= template.max_instances:
+            if entry is not None and entry.active >= template.max_instances:
                 continue
 
             # Check if we need to create a new instance based on time
-            last_created = self._get_last_instance_created(template.id)
+            last_created = entry.last_created if entry is not None else None
 
             should_create = False
             if last_created is None:
@@ -167,7 +181,7 @@ class FamDoCoordinator(DataUpdateCoordinator[FamDoData]):
         if self._data is None:
             return 0
         return sum(
-            1 for c in self._data.chores
+            1 for c in hot_items(self._data.chores)
             if c.template_id == template_id and c.status not in (CHORE_STATUS_COMPLETED, CHORE_STATUS_REJECTED)
         )
 
@@ -175,8 +189,9 @@ class FamDoCoordinator(DataUpdateCoordinator[FamDoData]):
         """Get the creation time of the most recent instance."""
         if self._data is None:
             return None
+        # A template's newest instance is never cold
         instances = [
-            c for c in self._data.chores
+            c for c in hot_items(self._data.chores)
             if c.template_id == template_id
         ]
         if not instances:
@@ -225,17 +240,59 @@ class FamDoCoordinator(DataUpdateCoordinator[FamDoData]):
             negative_points=template.negative_points,
             max_instances=template.max_instances,
         )
-        self._data.chores.append(instance)
+        self._versions.collection("chores").append(instance)
         _LOGGER.debug("Created new instance of recurring chore: %s", template.name)
         return instance
 
     @property
     def famdo_data(self) -> FamDoData:
-        """Get the FamDo data."""
+        """Get the FamDo data.
+
+        This is the draft that coordinator methods edit. Go through
+        ``self._versions`` before changing a collection or record in it.
+        """
         if self._data is None:
             raise RuntimeError("Data not loaded")
         return self._data
 
+    @property
+    def _versions(self) -> DataVersions:
+        return self.store.versions
+
+    def snapshot(self) -> DataVersion:
+        """Return the last saved version; it never changes (O(1))."""
+        return self.store.versions.current
+
+    @callback
+    def async_set_updated_data(self, data: FamDoData) -> None:
+        """Notify listeners of new data, timing the callbacks."""
+        with METRICS.timer("coordinator.listeners"):
+            super().async_set_updated_data(data)
+
+    def query(self, collection: str, **kwargs: Any) -> dict[str, Any]:
+        """Run a filtered, paged query over a collection of the last saved version.
+
+        See :meth:`FamDoQueryIndex.query` for the supported filters.
+        """
+        return self._query_index.query(self.snapshot().data, collection, **kwargs)
+
+    def _remove_by_id(self, name: str, item_id: str) -> bool:
+        """Remove the record *item_id* from collection *name* with a single scan."""
+        for index, item in enumerate(getattr(self.famdo_data, name)):
+            if item.id == item_id:
+                del self._versions.collection(name)[index]
+                return True
+        return False
+
+    def _remove_where(self, name: str, matches: Callable[[Any], bool]) -> int:
+        """Drop the records of *name* that match, rebuilding the list in one pass."""
+        items = getattr(self.famdo_data, name)
+        kept = [item for item in items if not matches(item)]
+        removed = len(items) - len(kept)
+        if removed:
+            self._versions.replace_collection(name, kept)
+        return removed
+
     # ==================== Member Management ====================
 
     async def async_add_member(
@@ -252,7 +309,7 @@ class FamDoCoordinator(DataUpdateCoordinator[FamDoData]):
             color=color,
             avatar=avatar,
         )
-        self.famdo_data.members.append(member)
+        self._versions.collection("members").append(member)
         await self.store.async_save()
         self.async_set_updated_data(self._data)
         return member
@@ -267,6 +324,7 @@ class FamDoCoordinator(DataUpdateCoordinator[FamDoData]):
         if member is None:
             return None
 
+        member = self._versions.edit("members", member)
         for key, value in kwargs.items():
             if hasattr(member, key):
                 setattr(member, key, value)
@@ -277,11 +335,9 @@ class FamDoCoordinator(DataUpdateCoordinator[FamDoData]):
 
     async def async_remove_member(self, member_id: str) -> bool:
         """Remove a family member."""
-        member = self.famdo_data.get_member_by_id(member_id)
-        if member is None:
+        if not self._remove_by_id("members", member_id):
             return False
 
-        self.famdo_data.members.remove(member)
         await self.store.async_save()
         self.async_set_updated_data(self._data)
         return True
@@ -292,6 +348,7 @@ class FamDoCoordinator(DataUpdateCoordinator[FamDoData]):
         if member is None:
             return None
 
+        member = self._versions.edit("members", member)
         member.points += points
         await self.store.async_save()
 
@@ -340,7 +397,7 @@ class FamDoCoordinator(DataUpdateCoordinator[FamDoData]):
                 negative_points=negative_points,
                 max_instances=max_instances,
             )
-            self.famdo_data.chores.append(template)
+            self._versions.collection("chores").append(template)
 
             # Create the first instance
             instance = await self._create_chore_instance(template, due_date)
@@ -362,7 +419,7 @@ class FamDoCoordinator(DataUpdateCoordinator[FamDoData]):
                 negative_points=negative_points,
                 max_instances=1,
             )
-            self.famdo_data.chores.append(chore)
+            self._versions.collection("chores").append(chore)
             await self.store.async_save()
             self.async_set_updated_data(self._data)
             return chore
@@ -377,6 +434,7 @@ class FamDoCoordinator(DataUpdateCoordinator[FamDoData]):
         if chore is None:
             return None
 
+        chore = self._versions.edit("chores", chore)
         for key, value in kwargs.items():
             if hasattr(chore, key):
                 setattr(chore, key, value)
@@ -394,6 +452,7 @@ class FamDoCoordinator(DataUpdateCoordinator[FamDoData]):
         if chore.status not in [CHORE_STATUS_PENDING, CHORE_STATUS_OVERDUE]:
             return None
 
+        chore = self._versions.edit("chores", chore)
         chore.status = CHORE_STATUS_CLAIMED
         chore.claimed_by = member_id
         await self.store.async_save()
@@ -409,6 +468,7 @@ class FamDoCoordinator(DataUpdateCoordinator[FamDoData]):
         if chore.claimed_by != member_id:
             return None
 
+        chore = self._versions.edit("chores", chore)
         chore.status = CHORE_STATUS_AWAITING_APPROVAL
         chore.completed_at = datetime.now().isoformat()
         await self.store.async_save()
@@ -432,6 +492,7 @@ class FamDoCoordinator(DataUpdateCoordinator[FamDoData]):
         if chore.status != CHORE_STATUS_AWAITING_APPROVAL:
             return None
 
+        chore = self._versions.edit("chores", chore)
         chore.status = CHORE_STATUS_COMPLETED
         chore.approved_by = approver_id
 
@@ -483,6 +544,7 @@ class FamDoCoordinator(DataUpdateCoordinator[FamDoData]):
         if chore.status != CHORE_STATUS_AWAITING_APPROVAL:
             return None
 
+        chore = self._versions.edit("chores", chore)
         chore.status = CHORE_STATUS_REJECTED
 
         # For always_on recurring chores, create a new instance immediately
@@ -517,6 +579,7 @@ class FamDoCoordinator(DataUpdateCoordinator[FamDoData]):
         if chore.status != CHORE_STATUS_REJECTED:
             return None
 
+        chore = self._versions.edit("chores", chore)
         chore.status = CHORE_STATUS_CLAIMED
         chore.completed_at = None  # Clear completed timestamp
         await self.store.async_save()
@@ -550,11 +613,9 @@ class FamDoCoordinator(DataUpdateCoordinator[FamDoData]):
 
     async def async_delete_chore(self, chore_id: str) -> bool:
         """Delete a chore."""
-        chore = self.famdo_data.get_chore_by_id(chore_id)
-        if chore is None:
+        if not self._remove_by_id("chores", chore_id):
             return False
 
-        self.famdo_data.chores.remove(chore)
         await self.store.async_save()
         self.async_set_updated_data(self._data)
         return True
@@ -579,7 +640,7 @@ class FamDoCoordinator(DataUpdateCoordinator[FamDoData]):
             image_url=image_url,
             quantity=quantity,
         )
-        self.famdo_data.rewards.append(reward)
+        self._versions.collection("rewards").append(reward)
         await self.store.async_save()
         self.async_set_updated_data(self._data)
         return reward
@@ -594,6 +655,7 @@ class FamDoCoordinator(DataUpdateCoordinator[FamDoData]):
         if reward is None:
             return None
 
+        reward = self._versions.edit("rewards", reward)
         for key, value in kwargs.items():
             if hasattr(reward, key):
                 setattr(reward, key, value)
@@ -622,10 +684,12 @@ class FamDoCoordinator(DataUpdateCoordinator[FamDoData]):
             return None
 
         # Deduct points
+        member = self._versions.edit("members", member)
         member.points -= reward.points_cost
 
         # Decrement quantity if limited
         if reward.quantity > 0:
+            reward = self._versions.edit("rewards", reward)
             reward.quantity -= 1
             if reward.quantity == 0:
                 reward.available = False
@@ -636,7 +700,7 @@ class FamDoCoordinator(DataUpdateCoordinator[FamDoData]):
             member_id=member_id,
             points_spent=reward.points_cost,
         )
-        self.famdo_data.reward_claims.append(claim)
+        self._versions.collection("reward_claims").append(claim)
 
         self.hass.bus.async_fire(
             EVENT_REWARD_CLAIMED,
@@ -653,11 +717,9 @@ class FamDoCoordinator(DataUpdateCoordinator[FamDoData]):
 
     async def async_delete_reward(self, reward_id: str) -> bool:
         """Delete a reward."""
-        reward = self.famdo_data.get_reward_by_id(reward_id)
-        if reward is None:
+        if not self._remove_by_id("rewards", reward_id):
             return False
 
-        self.famdo_data.rewards.remove(reward)
         await self.store.async_save()
         self.async_set_updated_data(self._data)
         return True
@@ -685,6 +747,7 @@ class FamDoCoordinator(DataUpdateCoordinator[FamDoData]):
         if claim.status != "pending":
             return None
 
+        claim = self._versions.edit("reward_claims", claim)
         claim.status = "fulfilled"
         claim.fulfilled_at = datetime.now().isoformat()
 
@@ -712,6 +775,7 @@ class FamDoCoordinator(DataUpdateCoordinator[FamDoData]):
         if claim is None:
             return None
 
+        claim = self._versions.edit("reward_claims", claim)
         for key, value in kwargs.items():
             if hasattr(claim, key):
                 setattr(claim, key, value)
@@ -722,11 +786,9 @@ class FamDoCoordinator(DataUpdateCoordinator[FamDoData]):
 
     async def async_delete_reward_claim(self, claim_id: str) -> bool:
         """Delete a reward claim."""
-        claim = self.famdo_data.get_reward_claim_by_id(claim_id)
-        if claim is None:
+        if not self._remove_by_id("reward_claims", claim_id):
             return False
 
-        self.famdo_data.reward_claims.remove(claim)
         await self.store.async_save()
         self.async_set_updated_data(self._data)
         return True
@@ -753,7 +815,7 @@ class FamDoCoordinator(DataUpdateCoordinator[FamDoData]):
             category=category,
             created_by=created_by,
         )
-        self.famdo_data.todos.append(todo)
+        self._versions.collection("todos").append(todo)
         await self.store.async_save()
         self.async_set_updated_data(self._data)
         return todo
@@ -764,8 +826,9 @@ class FamDoCoordinator(DataUpdateCoordinator[FamDoData]):
         **kwargs: Any,
     ) -> TodoItem | None:
         """Update a todo item."""
-        for todo in self.famdo_data.todos:
+        for index, todo in enumerate(self.famdo_data.todos):
             if todo.id == todo_id:
+                todo = self._versions.edit_at("todos", index)
                 for key, value in kwargs.items():
                     if hasattr(todo, key):
                         setattr(todo, key, value)
@@ -776,8 +839,9 @@ class FamDoCoordinator(DataUpdateCoordinator[FamDoData]):
 
     async def async_complete_todo(self, todo_id: str) -> TodoItem | None:
         """Mark a todo as completed."""
-        for todo in self.famdo_data.todos:
+        for index, todo in enumerate(self.famdo_data.todos):
             if todo.id == todo_id:
+                todo = self._versions.edit_at("todos", index)
                 todo.completed = True
                 todo.completed_at = datetime.now().isoformat()
                 await self.store.async_save()
@@ -787,13 +851,11 @@ class FamDoCoordinator(DataUpdateCoordinator[FamDoData]):
 
     async def async_delete_todo(self, todo_id: str) -> bool:
         """Delete a todo item."""
-        for todo in self.famdo_data.todos:
-            if todo.id == todo_id:
-                self.famdo_data.todos.remove(todo)
-                await self.store.async_save()
-                self.async_set_updated_data(self._data)
-                return True
-        return False
+        if not self._remove_by_id("todos", todo_id):
+            return False
+        await self.store.async_save()
+        self.async_set_updated_data(self._data)
+        return True
 
     # ==================== Calendar Event Management ====================
 
@@ -825,7 +887,7 @@ class FamDoCoordinator(DataUpdateCoordinator[FamDoData]):
             recurrence=recurrence,
             location=location,
         )
-        self.famdo_data.events.append(event)
+        self._versions.collection("events").append(event)
         await self.store.async_save()
         self.async_set_updated_data(self._data)
         return event
@@ -836,8 +898,9 @@ class FamDoCoordinator(DataUpdateCoordinator[FamDoData]):
         **kwargs: Any,
     ) -> CalendarEvent | None:
         """Update a calendar event."""
-        for event in self.famdo_data.events:
+        for index, event in enumerate(self.famdo_data.events):
             if event.id == event_id:
+                event = self._versions.edit_at("events", index)
                 for key, value in kwargs.items():
                     if hasattr(event, key):
                         setattr(event, key, value)
@@ -848,19 +911,17 @@ class FamDoCoordinator(DataUpdateCoordinator[FamDoData]):
 
     async def async_delete_event(self, event_id: str) -> bool:
         """Delete a calendar event."""
-        for event in self.famdo_data.events:
-            if event.id == event_id:
-                self.famdo_data.events.remove(event)
-                await self.store.async_save()
-                self.async_set_updated_data(self._data)
-                return True
-        return False
+        if not self._remove_by_id("events", event_id):
+            return False
+        await self.store.async_save()
+        self.async_set_updated_data(self._data)
+        return True
 
     # ==================== Settings ====================
 
     async def async_update_settings(self, **kwargs: Any) -> dict:
         """Update settings."""
-        self.famdo_data.settings.update(kwargs)
+        self._versions.settings().update(kwargs)
         await self.store.async_save()
         self.async_set_updated_data(self._data)
         return self.famdo_data.settings
@@ -872,8 +933,76 @@ class FamDoCoordinator(DataUpdateCoordinator[FamDoData]):
         self.async_set_updated_data(self._data)
         return name
 
+    # ==================== Import / Export ====================
+
+    async def async_import(
+        self,
+        records: dict[str, Any],
+        *,
+        import_id: str | None = None,
+        final: bool = True,
+        replace: bool = False,
+        family_name: str | None = None,
+        settings: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        """Validate a chunk of serialized records and stage it under *import_id*.
+
+        The final chunk inserts everything staged as one version with a
+        single save. Raises :class:`TransferError` if a record is invalid.
+        """
+        try:
+            staged = self._transfer.stage(import_id, records)
+        except TransferError:
+            self._transfer.discard(import_id)
+            raise
+        if not final:
+            return {"staged": sum(len(batch) for batch in staged.values())}
+        self._transfer.discard(import_id)
+        result = apply_import(
+            self._versions,
+            staged,
+            replace=replace,
+            family_name=family_name,
+            settings=settings,
+        )
+        await self.store.async_save()
+        self.async_set_updated_data(self._data)
+        _LOGGER.info(
+            "Imported %d new and %d updated records", result["added"], result["updated"]
+        )
+        return result
+
+    def export_page(
+        self, cursor: str | None = None, limit: int = EXPORT_PAGE_SIZE
+    ) -> dict[str, Any]:
+        """Return the next page of an export of the last saved version.
+
+        See :meth:`FamDoTransfer.export_page`.
+        """
+        return self._transfer.export_page(self.snapshot(), cursor, limit)
+
     # ==================== Bulk Delete Operations ====================
 
+    async def async_delete_where(
+        self, collection: str, *, dry_run: bool = False, **filters: Any
+    ) -> int:
+        """Delete the records of *collection* matching every filter, in one pass.
+
+        Takes the filters of :func:`record_filter` (status, member, template,
+        age). With *dry_run* nothing changes and the number of records that
+        would be deleted is returned. Raises :class:`QueryError` for
+        unsupported filters.
+        """
+        matches = record_filter(collection, **filters)
+        if dry_run:
+            return sum(1 for item in getattr(self.famdo_data, collection) if matches(item))
+        count = self._remove_where(collection, matches)
+        if count:
+            await self.store.async_save()
+            self.async_set_updated_data(self._data)
+        _LOGGER.info("Deleted %d %s matching %s", count, collection, filters)
+        return count
+
     async def async_delete_all_chores(self, keep_templates: bool = False) -> int:
         """Delete all chores.
 
@@ -884,13 +1013,10 @@ class FamDoCoordinator(DataUpdateCoordinator[FamDoData]):
             Number of chores deleted
         """
         if keep_templates:
-            to_delete = [c for c in self.famdo_data.chores if not c.is_template]
+            count = self._remove_where("chores", lambda chore: not chore.is_template)
         else:
-            to_delete = list(self.famdo_data.chores)
-
-        count = len(to_delete)
-        for chore in to_delete:
-            self.famdo_data.chores.remove(chore)
+            count = len(self.famdo_data.chores)
+            self._versions.replace_collection("chores", [])
 
         await self.store.async_save()
         self.async_set_updated_data(self._data)
@@ -904,7 +1030,7 @@ class FamDoCoordinator(DataUpdateCoordinator[FamDoData]):
             Number of rewards deleted
         """
         count = len(self.famdo_data.rewards)
-        self.famdo_data.rewards.clear()
+        self._versions.replace_collection("rewards", [])
         await self.store.async_save()
         self.async_set_updated_data(self._data)
         _LOGGER.info("Deleted %d rewards", count)
@@ -917,7 +1043,7 @@ class FamDoCoordinator(DataUpdateCoordinator[FamDoData]):
             Number of reward claims deleted
         """
         count = len(self.famdo_data.reward_claims)
-        self.famdo_data.reward_claims.clear()
+        self._versions.replace_collection("reward_claims", [])
         await self.store.async_save()
         self.async_set_updated_data(self._data)
         _LOGGER.info("Deleted %d reward claims", count)
@@ -930,7 +1056,7 @@ class FamDoCoordinator(DataUpdateCoordinator[FamDoData]):
             Number of todos deleted
         """
         count = len(self.famdo_data.todos)
-        self.famdo_data.todos.clear()
+        self._versions.replace_collection("todos", [])
         await self.store.async_save()
         self.async_set_updated_data(self._data)
         _LOGGER.info("Deleted %d todos", count)
@@ -943,7 +1069,7 @@ class FamDoCoordinator(DataUpdateCoordinator[FamDoData]):
             Number of events deleted
         """
         count = len(self.famdo_data.events)
-        self.famdo_data.events.clear()
+        self._versions.replace_collection("events", [])
         await self.store.async_save()
         self.async_set_updated_data(self._data)
         _LOGGER.info("Deleted %d events", count)
@@ -956,7 +1082,7 @@ class FamDoCoordinator(DataUpdateCoordinator[FamDoData]):
             Number of members deleted
         """
         count = len(self.famdo_data.members)
-        self.famdo_data.members.clear()
+        self._versions.replace_collection("members", [])
         await self.store.async_save()
         self.async_set_updated_data(self._data)
         _LOGGER.info("Deleted %d members", count)
@@ -981,18 +1107,18 @@ class FamDoCoordinator(DataUpdateCoordinator[FamDoData]):
         }
 
         # Clear all data lists
-        self.famdo_data.chores.clear()
-        self.famdo_data.rewards.clear()
-        self.famdo_data.reward_claims.clear()
-        self.famdo_data.todos.clear()
-        self.famdo_data.events.clear()
+        self._versions.replace_collection("chores", [])
+        self._versions.replace_collection("rewards", [])
+        self._versions.replace_collection("reward_claims", [])
+        self._versions.replace_collection("todos", [])
+        self._versions.replace_collection("events", [])
 
         if keep_members:
             # Reset points for all members
-            for member in self.famdo_data.members:
-                member.points = 0
+            for index in range(len(self.famdo_data.members)):
+                self._versions.edit_at("members", index).points = 0
         else:
-            self.famdo_data.members.clear()
+            self._versions.replace_collection("members", [])
 
         # Reset settings to defaults (keep family name if keeping members)
         if not keep_members:
@@ -0,0 +1,102 @@
+"""Pluggable JSON codec for snapshots and the dev server (no HA deps).
+
+Uses the fastest library available (orjson, then msgspec, then the stdlib).
+Every backend emits compact UTF-8 bytes without ASCII-escaping, so payloads
+can go straight onto the wire or into a file opened in binary mode.
+
+Set ``FAMDO_JSON_CODEC`` (``orjson``, ``msgspec`` or ``json``) to force one.
+"""
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass
+from typing import Any, Callable
+
+
+@dataclass(frozen=True)
+class JsonCodec:
+    """A JSON backend. ``loads`` raises ``ValueError`` on malformed input."""
+
+    name: str
+    dumps: Callable[[Any], bytes]
+    dumps_pretty: Callable[[Any], bytes]
+    loads: Callable[[bytes | str], Any]
+
+
+def _stdlib_codec() -> JsonCodec:
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+    def _dumps_pretty(obj: Any) -> bytes:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+    return JsonCodec("json", _dumps, _dumps_pretty, json.loads)
+
+
+def _orjson_codec() -> JsonCodec:
+    import orjson
+
+    def _dumps_pretty(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+    # orjson.JSONDecodeError subclasses ValueError already
+    return JsonCodec("orjson", orjson.dumps, _dumps_pretty, orjson.loads)
+
+
+def _msgspec_codec() -> JsonCodec:
+    import msgspec
+
+    encoder = msgspec.json.Encoder()
+    decoder = msgspec.json.Decoder()
+
+    def _dumps_pretty(obj: Any) -> bytes:
+        return msgspec.json.format(encoder.encode(obj), indent=2)
+
+    def _loads(data: bytes | str) -> Any:
+        try:
+            return decoder.decode(data)
+        except msgspec.DecodeError as err:
+            raise ValueError(str(err)) from err
+
+    return JsonCodec("msgspec", encoder.encode, _dumps_pretty, _loads)
+
+
+_BACKENDS: dict[str, Callable[[], JsonCodec]] = {
+    "orjson": _orjson_codec,
+    "msgspec": _msgspec_codec,
+    "json": _stdlib_codec,
+}
+
+
+def available_codecs() -> list[str]:
+    """Return the names of the backends importable here, fastest first."""
+    names = []
+    for name, factory in _BACKENDS.items():
+        try:
+            factory()
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def get_codec(name: str | None = None) -> JsonCodec:
+    """Return the named codec, or the preferred available one.
+
+    Raises ``ValueError`` if the named backend is unknown or not installed.
+    """
+    name = name or os.environ.get("FAMDO_JSON_CODEC")
+    if name:
+        if name not in _BACKENDS:
+            raise ValueError(f"Unknown JSON codec: {name}")
+        try:
+            return _BACKENDS[name]()
+        except ImportError as err:
+            raise ValueError(f"JSON codec {name} is not installed") from err
+    for factory in (_orjson_codec, _msgspec_codec):
+        try:
+            return factory()
+        except ImportError:
+            continue
+    return _stdlib_codec()
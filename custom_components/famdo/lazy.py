@@ -0,0 +1,212 @@
+"""List type whose cold items are loaded on first use."""
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, Iterable, Mapping, NamedTuple, Sequence
+
+_END: Any = object()
+
+
+def _merge(hot: list, cold: list, positions: Sequence[int] | None) -> list:
+    """Put *cold* items back at their original *positions* among *hot*."""
+    if positions is None:
+        return cold + hot
+    merged: list = []
+    rest = iter(hot)
+    for position, item in zip(positions, cold):
+        while len(merged) < position:
+            nxt = next(rest, _END)
+            if nxt is _END:
+                break
+            merged.append(nxt)
+        merged.append(item)
+    merged.extend(rest)
+    return merged
+
+
+class _Cold(NamedTuple):
+    """What a list knows about its cold items; swapped as one value."""
+
+    loader: Callable[[], list]
+    dumper: Callable[[], list] | None
+    count: int | None
+    positions: Sequence[int] | None
+    tally: Mapping[Any, int] | None
+
+
+class LazyList(list):
+    """A list holding its hot items, with the rest fetched by *loader* on demand.
+
+    It behaves like a plain list: the first operation that observes the
+    contents (iteration, ``len``, indexing, ``remove`` …) calls the loader once
+    and merges the loaded items in. Appending does not trigger a load, so new
+    items can be added without touching cold storage.
+
+    *positions* gives each cold item's index in the original list, in loader
+    order, so loading (and :meth:`dump`) puts cold items back where they were
+    and the stored order survives a load and save. Without it they go in
+    front. Until the load, the hot items are the original ones in order plus
+    any appended: everything else loads first.
+
+    If *cold_count* is given, ``len`` answers without loading. If *dumper* is
+    given it returns the cold items already serialized, so :meth:`dump` can
+    serialize the whole list without materializing them. *tally* counts the
+    cold items by a key the builder chose, for totals that would otherwise
+    need a load (see :func:`split_tally`).
+
+    A published list can be read from executor threads while the event loop
+    loads it, so the load happens under a per-list lock and readers that
+    look at the hot items and the cold state together (:meth:`dump`,
+    :meth:`snapshot`, :meth:`lazy_copy`) take the same lock.
+    """
+
+    __slots__ = ("_cold", "_lock")
+
+    def __init__(
+        self,
+        hot: Iterable[Any] = (),
+        loader: Callable[[], list] | None = None,
+        *,
+        dumper: Callable[[], list] | None = None,
+        cold_count: int | None = None,
+        positions: Sequence[int] | None = None,
+        tally: Mapping[Any, int] | None = None,
+    ) -> None:
+        """Initialize with the hot items and a loader for the cold ones."""
+        super().__init__(hot)
+        if loader is None:
+            self._cold: _Cold | None = None
+            self._lock: threading.Lock | None = None
+        else:
+            self._cold = _Cold(loader, dumper, cold_count, positions, tally)
+            self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the cold items are in the list."""
+        return self._cold is None
+
+    def _read(self) -> tuple[list, _Cold | None]:
+        """Return a copy of the items in memory and the cold state, together."""
+        if self._lock is None:
+            return list.copy(self), None
+        with self._lock:
+            return list.copy(self), self._cold
+
+    def loaded_items(self) -> list:
+        """Return the items currently in memory without triggering a load."""
+        return self._read()[0]
+
+    def snapshot(self) -> tuple[list, bool]:
+        """Return the items in memory and whether that is all of them."""
+        items, cold = self._read()
+        return items, cold is None
+
+    def load(self) -> None:
+        """Fetch the cold items now if they have not been yet."""
+        if self._cold is None:
+            return
+        with self._lock:
+            cold = self._cold
+            if cold is None:
+                # Another thread loaded it while we waited
+                return
+            merged = _merge(list.copy(self), cold.loader(), cold.positions)
+            list.__setitem__(self, slice(None), merged)
+            self._cold = None
+
+    def derive(self, hot: Iterable[Any]) -> LazyList:
+        """Return a list of *hot* sharing this list's cold items, still unloaded.
+
+        *hot* must be this list's hot items, possibly with more appended. The
+        loader may then run once per list, so it must build fresh items each
+        time it is called.
+        """
+        return self._derive(hot, self._cold)
+
+    def lazy_copy(self) -> list:
+        """Return a copy to modify, sharing the cold items if not loaded yet."""
+        hot, cold = self._read()
+        return hot if cold is None else self._derive(hot, cold)
+
+    @staticmethod
+    def _derive(hot: Iterable[Any], cold: _Cold | None) -> LazyList:
+        if cold is None:
+            return LazyList(hot)
+        return LazyList(
+            hot,
+            cold.loader,
+            dumper=cold.dumper,
+            cold_count=cold.count,
+            positions=cold.positions,
+            tally=cold.tally,
+        )
+
+    def dump(self, dump_item: Callable[[Any], Any]) -> list:
+        """Serialize every item, reusing the dumper for cold ones if possible."""
+        hot, cold = self._read()
+        if cold is not None and cold.dumper is not None:
+            return _merge([dump_item(item) for item in hot], cold.dumper(), cold.positions)
+        return [dump_item(item) for item in self]
+
+    def __len__(self) -> int:
+        cold = self._cold
+        if cold is not None and cold.count is not None:
+            return list.__len__(self) + cold.count
+        self.load()
+        return list.__len__(self)
+
+    def __repr__(self) -> str:
+        # Reprs show up in logs and debuggers; they must not trigger a load
+        hot, cold = self._read()
+        if cold is None:
+            return list.__repr__(hot)
+        count = "?" if cold.count is None else cold.count
+        return f"LazyList({list.__repr__(hot)}, {count} not loaded)"
+
+    def __reduce_ex__(self, protocol: Any) -> Any:
+        self.load()
+        return (list, (list(list.__iter__(self)),))
+
+
+def _loading(name: str) -> Callable:
+    method = getattr(list, name)
+
+    def wrapper(self: LazyList, *args: Any, **kwargs: Any) -> Any:
+        self.load()
+        return method(self, *args, **kwargs)
+
+    wrapper.__name__ = name
+    wrapper.__doc__ = method.__doc__
+    return wrapper
+
+
+for _name in (
+    "__iter__", "__getitem__", "__setitem__", "__delitem__",
+    "__contains__", "__reversed__", "__eq__", "__ne__", "__lt__", "__le__",
+    "__gt__", "__ge__", "__add__", "__iadd__", "__mul__", "__imul__",
+    "copy", "count", "index", "insert", "pop", "remove", "reverse", "sort",
+    "clear", "extend",
+):
+    setattr(LazyList, _name, _loading(_name))
+
+
+def hot_items(items: list) -> list:
+    """Return the items in memory, without loading cold ones.
+
+    Only for callers whose filter never matches a cold item (e.g. open todos).
+    """
+    return items.loaded_items() if isinstance(items, LazyList) else items
+
+
+def split_tally(items: list) -> tuple[list, Mapping[Any, int] | None]:
+    """Return the items to count over and the tally of the rest, read together.
+
+    With a tally, totals are the tally plus the returned (hot) items; without,
+    the returned items are *items* itself and counting over them loads it.
+    """
+    if isinstance(items, LazyList):
+        hot, cold = items._read()
+        if cold is not None and cold.tally is not None:
+            return hot, cold.tally
+    return items, None
@@ -0,0 +1,145 @@
+"""Merge FamDo events, chore due dates and HA calendars into one list (no HA deps).
+
+Every source is turned into :data:`CachedEvent` tuples sorted by start, and
+:func:`merge_events` walks them with a k-way merge (``heapq.merge``). The
+merged list is never sorted as a whole, and a ``limit`` stops the walk early.
+"""
+from __future__ import annotations
+
+import heapq
+from datetime import date, datetime, time, timedelta, tzinfo
+from typing import Any, Iterable
+
+from .calendar_cache import CachedEvent
+
+SOURCE_EVENTS = "famdo"
+SOURCE_CHORES = "famdo_chores"
+
+
+def _parse_time(value: str | None, default: str) -> time:
+    parts = (value or default).split(":")
+    return time(int(parts[0]), int(parts[1]) if len(parts) > 1 else 0)
+
+
+def _at(day: date, moment: time, tz: tzinfo) -> datetime:
+    return datetime.combine(day, moment, tzinfo=tz)
+
+
+def _as_datetime(value: str, tz: tzinfo) -> datetime:
+    """Parse an ISO date or datetime; naive values are taken as local to *tz*."""
+    if "T" not in value and len(value) == 10:
+        return _at(date.fromisoformat(value), time(), tz)
+    parsed = datetime.fromisoformat(value)
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=tz)
+
+
+def famdo_events(data: Any, start: datetime, end: datetime, tz: tzinfo) -> list[CachedEvent]:
+    """Return FamDo calendar events overlapping ``[start, end)``, sorted by start.
+
+    Payloads have the shape of ``famdo/get_ha_calendar_events`` results, as
+    the FamDo calendar entity would report them.
+    """
+    events = []
+    for event in data.events:
+        try:
+            first = date.fromisoformat(event.start_date)
+            last = date.fromisoformat(event.end_date) if event.end_date else first
+            if event.all_day:
+                ev_start = _at(first, time(), tz)
+                ev_end = _at(last + timedelta(days=1), time(), tz)
+                bounds = (first.isoformat(), (last + timedelta(days=1)).isoformat())
+            else:
+                ev_start = _at(first, _parse_time(event.start_time, "00:00"), tz)
+                ev_end = _at(last, _parse_time(event.end_time, "23:59"), tz)
+                bounds = (ev_start.isoformat(), ev_end.isoformat())
+        except (ValueError, TypeError):
+            continue
+        if ev_start < end and ev_end > start:
+            events.append((ev_start, ev_end, {
+                "summary": event.title,
+                "start": bounds[0],
+                "end": bounds[1],
+                "description": event.description,
+                "location": event.location,
+                "uid": event.id,
+                "source": SOURCE_EVENTS,
+            }))
+    events.sort(key=lambda item: item[:2])
+    return events
+
+
+def chore_events(data: Any, start: datetime, end: datetime, tz: tzinfo) -> list[CachedEvent]:
+    """Return chores due within ``[start, end)``, sorted by due time.
+
+    Templates are skipped: only their instances are ever due.
+    """
+    events = []
+    for chore in data.chores:
+        if not chore.due_date or chore.is_template:
+            continue
+        try:
+            due = date.fromisoformat(chore.due_date)
+            if chore.due_time:
+                ev_start = _at(due, _parse_time(chore.due_time, "00:00"), tz)
+                ev_end = ev_start + timedelta(hours=1)
+                bounds = (ev_start.isoformat(), ev_end.isoformat())
+            else:
+                ev_start = _at(due, time(), tz)
+                ev_end = _at(due + timedelta(days=1), time(), tz)
+                bounds = (due.isoformat(), (due + timedelta(days=1)).isoformat())
+        except (ValueError, TypeError):
+            continue
+        if not (ev_start < end and ev_end > start):
+            continue
+        member = data.get_member_by_id(chore.assigned_to) if chore.assigned_to else None
+        member_name = f" ({member.name})" if member else ""
+        events.append((ev_start, ev_end, {
+            "summary": f"{chore.name}{member_name} - {chore.points} pts",
+            "start": bounds[0],
+            "end": bounds[1],
+            "description": chore.description,
+            "location": None,
+            "uid": f"chore_{chore.id}",
+            "status": chore.status,
+            "source": SOURCE_CHORES,
+        }))
+    events.sort(key=lambda item: item[:2])
+    return events
+
+
+def calendar_events(payloads: list[dict], source: str, tz: tzinfo) -> list[CachedEvent]:
+    """Tag HA calendar payloads with *source* and sort them by start."""
+    events = []
+    for payload in payloads:
+        try:
+            ev_start = _as_datetime(payload["start"], tz)
+            ev_end = _as_datetime(payload["end"], tz) if payload.get("end") else ev_start
+        except (KeyError, TypeError, ValueError):
+            continue
+        events.append((ev_start, ev_end, {**payload, "source": source}))
+    events.sort(key=lambda item: item[:2])
+    return events
+
+
+def merge_events(
+    sources: Iterable[list[CachedEvent]], limit: int | None = None
+) -> list[dict[str, Any]]:
+    """K-way merge already-sorted *sources* into one list, dropping duplicates.
+
+    Two events are the same if they share a uid and start (recurring
+    instances share a uid), or, without a uid, a summary, start and end. The
+    copy from the earlier source wins, so list FamDo's own sources first to
+    keep their richer payloads over the FamDo calendar entities' copies.
+    """
+    merged = []
+    seen: set[tuple] = set()
+    for ev_start, ev_end, payload in heapq.merge(*sources, key=lambda item: item[:2]):
+        uid = payload.get("uid")
+        key = (uid, ev_start) if uid else (None, payload.get("summary"), ev_start, ev_end)
+        if key in seen:
+            continue
+        seen.add(key)
+        merged.append(payload)
+        if limit is not None and len(merged) >= limit:
+            break
+    return merged
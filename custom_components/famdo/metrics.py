@@ -0,0 +1,196 @@
+"""Latency histograms for hot paths (no HA deps).
+
+:data:`METRICS` is shared by everything in the process. It is off by default;
+while off, :meth:`Metrics.timer` hands back a shared no-op and the
+:meth:`Metrics.timed` wrappers cost one attribute check per call. Samples go
+into fixed log-scale buckets, so recording is O(1) and percentiles are
+accurate to within one bucket (about 19%).
+"""
+from __future__ import annotations
+
+import asyncio
+import functools
+import math
+import threading
+import time
+from contextlib import nullcontext
+from typing import Any, Callable, TypeVar
+
+_F = TypeVar("_F", bound=Callable[..., Any])
+
+# Bucket i covers [MIN_SECONDS * 2**(i/4), MIN_SECONDS * 2**((i+1)/4))
+MIN_SECONDS = 1e-6
+BUCKETS_PER_DOUBLING = 4
+BUCKET_COUNT = 27 * BUCKETS_PER_DOUBLING  # Up to about 134 s
+PERCENTILES = (50, 95, 99)
+
+_NULL_TIMER = nullcontext()
+
+
+def bucket_bound(index: int) -> float:
+    """Return the upper bound, in seconds, of bucket *index*."""
+    return MIN_SECONDS * 2 ** ((index + 1) / BUCKETS_PER_DOUBLING)
+
+
+class Histogram:
+    """Counts of samples per log-scale bucket, plus count, sum and max."""
+
+    __slots__ = ("buckets", "count", "total", "max")
+
+    def __init__(self) -> None:
+        """Start empty."""
+        self.buckets = [0] * BUCKET_COUNT
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """Record one sample."""
+        if seconds <= MIN_SECONDS:
+            index = 0
+        else:
+            index = min(
+                int(math.log2(seconds / MIN_SECONDS) * BUCKETS_PER_DOUBLING), BUCKET_COUNT - 1
+            )
+        self.buckets[index] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def copy(self) -> Histogram:
+        """Return an independent copy."""
+        other = Histogram()
+        other.buckets = list(self.buckets)
+        other.count, other.total, other.max = self.count, self.total, self.max
+        return other
+
+    def percentile(self, pct: float) -> float:
+        """Return the upper bound of the bucket holding the *pct*-th percentile."""
+        if not self.count:
+            return 0.0
+        rank = math.ceil(self.count * pct / 100)
+        seen = 0
+        for index, bucket in enumerate(self.buckets):
+            seen += bucket
+            if seen >= rank:
+                return min(bucket_bound(index), self.max)
+        return self.max
+
+    def summary(self) -> dict[str, Any]:
+        """Return count, mean, percentiles and max, in milliseconds."""
+        result: dict[str, Any] = {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count * 1000, 3) if self.count else 0.0,
+        }
+        for pct in PERCENTILES:
+            result[f"p{pct}_ms"] = round(self.percentile(pct) * 1000, 3)
+        result["max_ms"] = round(self.max * 1000, 3)
+        return result
+
+
+class _Timer:
+    __slots__ = ("_metrics", "_name", "_start")
+
+    def __init__(self, metrics: Metrics, name: str) -> None:
+        self._metrics = metrics
+        self._name = name
+
+    def __enter__(self) -> None:
+        self._start = time.perf_counter()
+
+    def __exit__(self, *exc: object) -> None:
+        self._metrics.observe(self._name, time.perf_counter() - self._start)
+
+
+class Metrics:
+    """Named histograms, e.g. ``command.famdo/add_chore`` or ``store.save``."""
+
+    def __init__(self) -> None:
+        """Start disabled with no histograms."""
+        self.enabled = False
+        self._histograms: dict[str, Histogram] = {}
+        # Serialization runs in executor threads, so samples can arrive from several
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, seconds: float) -> None:
+        """Record a duration for *name* if enabled."""
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram()
+            histogram.observe(seconds)
+
+    def timer(self, name: str) -> Any:
+        """Return a context manager that records the time spent in its block."""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name)
+
+    def timed(self, name: str) -> Callable[[_F], _F]:
+        """Decorate a function or coroutine function to record its duration."""
+
+        def decorate(func: _F) -> _F:
+            if asyncio.iscoroutinefunction(func):
+
+                @functools.wraps(func)
+                async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                    if not self.enabled:
+                        return await func(*args, **kwargs)
+                    start = time.perf_counter()
+                    try:
+                        return await func(*args, **kwargs)
+                    finally:
+                        self.observe(name, time.perf_counter() - start)
+
+                return async_wrapper  # type: ignore[return-value]
+
+            @functools.wraps(func)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.observe(name, time.perf_counter() - start)
+
+            return wrapper  # type: ignore[return-value]
+
+        return decorate
+
+    def timed_methods(self, prefix: str) -> Callable[[type], type]:
+        """Class decorator timing each ``async_*`` coroutine method as ``prefix.name``."""
+
+        def decorate(cls: type) -> type:
+            for attr, value in list(vars(cls).items()):
+                if attr.startswith("async_") and asyncio.iscoroutinefunction(value):
+                    setattr(cls, attr, self.timed(f"{prefix}.{attr[6:]}")(value))
+            return cls
+
+        return decorate
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """Return a summary of every histogram, by name."""
+        with self._lock:
+            return {
+                name: histogram.summary()
+                for name, histogram in sorted(self._histograms.items())
+            }
+
+    def histograms(self) -> list[tuple[str, Histogram]]:
+        """Return a copy of every histogram with its name, sorted by name."""
+        with self._lock:
+            return [
+                (name, histogram.copy()) for name, histogram in sorted(self._histograms.items())
+            ]
+
+    def reset(self) -> None:
+        """Drop all recorded samples."""
+        with self._lock:
+            self._histograms.clear()
+
+
+METRICS = Metrics()
@@ -1,16 +1,21 @@
 """Data models for FamDo integration."""
 from __future__ import annotations
 
-from dataclasses import dataclass, field, asdict
+from collections import Counter
+from dataclasses import dataclass, field, fields, asdict
 from datetime import datetime, date
-from typing import Any, Optional
+from typing import Any, Callable, Iterable, Optional
 from uuid import uuid4
 
 from .const import (
     ROLE_CHILD,
+    CHORE_STATUS_COMPLETED,
     CHORE_STATUS_PENDING,
+    CHORE_STATUS_REJECTED,
     RECURRENCE_NONE,
 )
+from .lazy import LazyList, hot_items, split_tally
+from .metrics import METRICS
 
 
 def generate_id() -> str:
@@ -30,6 +35,7 @@ class FamilyMember:
     points: int = 0
     created_at: str = field(default_factory=lambda: datetime.now().isoformat())
     ha_user_id: Optional[str] = None  # Link to Home Assistant user ID for auth
+    version: int = 0  # Bumped each time a change to this record is saved
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary."""
@@ -80,6 +86,7 @@ class Chore:
     negative_points: int = 0  # Points deducted if overdue (only for time-based)
     max_instances: int = 1  # Max instances that can exist at once
     overdue_applied: bool = False  # Track if negative points already applied
+    version: int = 0  # Bumped each time a change to this record is saved
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary."""
@@ -110,6 +117,7 @@ class Reward:
     available: bool = True
     quantity: int = -1  # -1 for unlimited
     created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    version: int = 0  # Bumped each time a change to this record is saved
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary."""
@@ -132,6 +140,7 @@ class RewardClaim:
     status: str = "pending"  # pending, approved, fulfilled
     claimed_at: str = field(default_factory=lambda: datetime.now().isoformat())
     fulfilled_at: Optional[str] = None
+    version: int = 0  # Bumped each time a change to this record is saved
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary."""
@@ -158,6 +167,7 @@ class TodoItem:
     created_by: Optional[str] = None
     created_at: str = field(default_factory=lambda: datetime.now().isoformat())
     completed_at: Optional[str] = None
+    version: int = 0  # Bumped each time a change to this record is saved
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary."""
@@ -186,6 +196,7 @@ class CalendarEvent:
     recurrence: str = RECURRENCE_NONE
     location: str = ""
     created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    version: int = 0  # Bumped each time a change to this record is saved
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary."""
@@ -197,6 +208,121 @@ class CalendarEvent:
         return cls(**data)
 
 
+def _event_is_cold(record: dict[str, Any]) -> bool:
+    if record.get("recurrence", RECURRENCE_NONE) != RECURRENCE_NONE:
+        return False
+    last_day = (record.get("end_date") or record.get("start_date") or "")[:10]
+    return bool(last_day) and last_day < date.today().isoformat()
+
+
+def _chore_is_settled(record: dict[str, Any]) -> bool:
+    return not record.get("is_template") and record.get("status") in (
+        CHORE_STATUS_COMPLETED,
+        CHORE_STATUS_REJECTED,
+    )
+
+
+# Historical records, by collection: settled chores, fulfilled claims,
+# completed todos and one-off events that have ended. The latest instance of
+# each recurring template stays hot even when settled, since the refresh
+# schedules the next one from it (see ``latest_instance_ids``).
+COLD_RECORDS: dict[str, Callable[[dict[str, Any]], bool]] = {
+    "chores": _chore_is_settled,
+    "reward_claims": lambda record: record.get("status") == "fulfilled",
+    "todos": lambda record: bool(record.get("completed")),
+    "events": _event_is_cold,
+}
+
+
+def latest_instance_ids(records: Iterable[dict[str, Any]]) -> set[str]:
+    """Return the id of the newest instance of each recurring template."""
+    latest: dict[str, dict[str, Any]] = {}
+    for record in records:
+        template_id = record.get("template_id")
+        if not template_id:
+            continue
+        newest = latest.get(template_id)
+        if newest is None or record.get("created_at", "") > newest.get("created_at", ""):
+            latest[template_id] = record
+    return {record.get("id") for record in latest.values()}
+
+
+@dataclass
+class TemplateInstances:
+    """The instances of one recurring template, as the refresh sees them."""
+
+    active: int = 0  # Neither completed nor rejected
+    last_created: Optional[str] = None
+
+
+def index_template_instances(chores: Iterable[Chore]) -> dict[str, TemplateInstances]:
+    """Summarize instances per template in one pass.
+
+    The hot chores are enough: active instances and each template's newest
+    one are never cold.
+    """
+    index: dict[str, TemplateInstances] = {}
+    for chore in chores:
+        if not chore.template_id:
+            continue
+        entry = index.get(chore.template_id)
+        if entry is None:
+            entry = index[chore.template_id] = TemplateInstances()
+        if chore.status not in (CHORE_STATUS_COMPLETED, CHORE_STATUS_REJECTED):
+            entry.active += 1
+        if entry.last_created is None or chore.created_at > entry.last_created:
+            entry.last_created = chore.created_at
+    return index
+
+
+def _chore_tally_key(record: dict[str, Any]) -> tuple[Any, Any]:
+    return record.get("status"), record.get("claimed_by")
+
+
+def _lazy_collection(
+    model: type,
+    records: list[dict[str, Any]],
+    is_cold: Callable,
+    keep_hot: set[str] | frozenset[str] = frozenset(),
+    tally_key: Callable | None = None,
+) -> list:
+    """Build hot records now; keep cold ones as dicts until first read.
+
+    Records in *keep_hot* stay hot whatever *is_cold* says. With *tally_key*,
+    cold records are counted by it (see ``cold_tally``).
+    """
+    hot = []
+    cold = []
+    positions = []
+    field_count = len(fields(model))
+    for position, record in enumerate(records):
+        if is_cold(record) and record.get("id") not in keep_hot:
+            if len(record) != field_count:
+                # Written by an older version: fill in defaults now so cold
+                # records serialize like loaded ones
+                record = model.from_dict(record).to_dict()
+            cold.append(record)
+            positions.append(position)
+        else:
+            hot.append(model.from_dict(record))
+    if not cold:
+        return LazyList(hot)
+    return LazyList(
+        hot,
+        lambda: [model.from_dict(record) for record in cold],
+        dumper=lambda: list(cold),
+        cold_count=len(cold),
+        positions=positions,
+        tally=Counter(map(tally_key, cold)) if tally_key else None,
+    )
+
+
+def _dump(items: list) -> list[dict[str, Any]]:
+    if isinstance(items, LazyList):
+        return items.dump(lambda item: item.to_dict())
+    return [item.to_dict() for item in items]
+
+
 @dataclass
 class FamDoData:
     """Main data container for FamDo."""
@@ -210,22 +336,51 @@ class FamDoData:
     events: list[CalendarEvent] = field(default_factory=list)
     settings: dict[str, Any] = field(default_factory=dict)
 
+    @METRICS.timed("data.to_dict")
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary for storage."""
         return {
             "family_name": self.family_name,
             "members": [m.to_dict() for m in self.members],
-            "chores": [c.to_dict() for c in self.chores],
+            # Cold records of lazily loaded collections are not materialized
+            "chores": _dump(self.chores),
             "rewards": [r.to_dict() for r in self.rewards],
-            "reward_claims": [rc.to_dict() for rc in self.reward_claims],
-            "todos": [t.to_dict() for t in self.todos],
-            "events": [e.to_dict() for e in self.events],
+            "reward_claims": _dump(self.reward_claims),
+            "todos": _dump(self.todos),
+            "events": _dump(self.events),
             "settings": self.settings,
         }
 
     @classmethod
-    def from_dict(cls, data: dict[str, Any]) -> FamDoData:
-        """Create from dictionary."""
+    @METRICS.timed("data.from_dict")
+    def from_dict(cls, data: dict[str, Any], lazy: bool = False) -> FamDoData:
+        """Create from dictionary.
+
+        With *lazy*, historical records (see ``COLD_RECORDS``) are only turned
+        into objects the first time their collection is read.
+        """
+        if lazy:
+            chores = data.get("chores", [])
+            return cls(
+                family_name=data.get("family_name", "My Family"),
+                members=[FamilyMember.from_dict(m) for m in data.get("members", [])],
+                chores=_lazy_collection(
+                    Chore,
+                    chores,
+                    COLD_RECORDS["chores"],
+                    keep_hot=latest_instance_ids(chores),
+                    tally_key=_chore_tally_key,
+                ),
+                rewards=[Reward.from_dict(r) for r in data.get("rewards", [])],
+                reward_claims=_lazy_collection(
+                    RewardClaim, data.get("reward_claims", []), COLD_RECORDS["reward_claims"]
+                ),
+                todos=_lazy_collection(TodoItem, data.get("todos", []), COLD_RECORDS["todos"]),
+                events=_lazy_collection(
+                    CalendarEvent, data.get("events", []), COLD_RECORDS["events"]
+                ),
+                settings=data.get("settings", {}),
+            )
         return cls(
             family_name=data.get("family_name", "My Family"),
             members=[FamilyMember.from_dict(m) for m in data.get("members", [])],
@@ -246,11 +401,36 @@ class FamDoData:
 
     def get_chore_by_id(self, chore_id: str) -> Optional[Chore]:
         """Get a chore by ID."""
-        for chore in self.chores:
-            if chore.id == chore_id:
-                return chore
+        return self.get_record("chores", chore_id)
+
+    def get_record(self, collection: str, record_id: str) -> Any:
+        """Get a record of *collection* by ID, or None.
+
+        Most lookups are for open records: the ones in memory are tried before
+        loading cold ones.
+        """
+        items = getattr(self, collection)
+        for item in hot_items(items):
+            if item.id == record_id:
+                return item
+        if isinstance(items, LazyList):
+            # Not a hot one: load the cold ones and look again
+            for item in items:
+                if item.id == record_id:
+                    return item
         return None
 
+    def count_completed_chores(self, member_id: str) -> int:
+        """Count the chores *member_id* completed, without loading settled ones."""
+        chores, tally = split_tally(self.chores)
+        count = sum(
+            1 for c in chores
+            if c.claimed_by == member_id and c.status == CHORE_STATUS_COMPLETED
+        )
+        if tally is not None:
+            count += tally.get((CHORE_STATUS_COMPLETED, member_id), 0)
+        return count
+
     def get_reward_by_id(self, reward_id: str) -> Optional[Reward]:
         """Get a reward by ID."""
         for reward in self.rewards:
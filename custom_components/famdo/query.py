@@ -0,0 +1,447 @@
+"""Indexed, paged queries over FamDo collections."""
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from bisect import bisect_left, bisect_right, insort
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from operator import itemgetter
+from typing import Any, Callable, Iterable, Iterator
+
+from .lazy import LazyList
+from .models import FamDoData
+
+DEFAULT_QUERY_LIMIT = 50
+MAX_QUERY_LIMIT = 500
+
+
+class QueryError(ValueError):
+    """Raised when query parameters are invalid."""
+
+
+@dataclass(frozen=True)
+class CollectionSpec:
+    """Describes how a collection can be filtered and sorted."""
+
+    attr: str
+    date_field: str
+    member_fields: tuple[str, ...]
+    sort_fields: tuple[str, ...]
+    default_sort: str
+    status_of: Callable[[Any], str] | None = None
+    has_templates: bool = False
+    created_field: str = "created_at"  # What "age" is measured from
+    # Statuses that cold records (see models.COLD_RECORDS) can have
+    cold_statuses: frozenset[str] = frozenset()
+    # Whether cold records all have a date before today
+    cold_before_today: bool = False
+
+
+QUERY_COLLECTIONS: dict[str, CollectionSpec] = {
+    "chores": CollectionSpec(
+        attr="chores",
+        date_field="due_date",
+        member_fields=("assigned_to", "claimed_by"),
+        sort_fields=("created_at", "due_date", "completed_at", "name", "points", "status"),
+        default_sort="created_at",
+        status_of=lambda chore: chore.status,
+        has_templates=True,
+        cold_statuses=frozenset({"completed", "rejected"}),
+    ),
+    "todos": CollectionSpec(
+        attr="todos",
+        date_field="due_date",
+        member_fields=("assigned_to", "created_by"),
+        sort_fields=("created_at", "due_date", "completed_at", "title", "priority"),
+        default_sort="created_at",
+        status_of=lambda todo: "completed" if todo.completed else "active",
+        cold_statuses=frozenset({"completed"}),
+    ),
+    "reward_claims": CollectionSpec(
+        attr="reward_claims",
+        date_field="claimed_at",
+        member_fields=("member_id",),
+        sort_fields=("claimed_at", "fulfilled_at", "points_spent", "status"),
+        default_sort="claimed_at",
+        status_of=lambda claim: claim.status,
+        created_field="claimed_at",
+        cold_statuses=frozenset({"fulfilled"}),
+    ),
+    "events": CollectionSpec(
+        attr="events",
+        date_field="start_date",
+        member_fields=("member_ids",),
+        sort_fields=("start_date", "end_date", "created_at", "title"),
+        default_sort="start_date",
+        cold_before_today=True,
+    ),
+}
+
+
+def _sort_key(value: Any, item_id: str) -> tuple:
+    """Build a total-order sort key; missing values sort last."""
+    if value is None:
+        return (1, "", item_id)
+    return (0, value, item_id)
+
+
+def _date_of(value: str | None) -> str | None:
+    """Reduce an ISO date or datetime string to its date part."""
+    return value[:10] if value else None
+
+
+def _parse_day(name: str, value: str) -> str:
+    """Validate an ISO date (or datetime) filter and return its date part."""
+    try:
+        return date.fromisoformat(value).isoformat()
+    except (TypeError, ValueError):
+        pass
+    try:
+        return datetime.fromisoformat(value).date().isoformat()
+    except (TypeError, ValueError) as err:
+        raise QueryError(f"{name} must be an ISO date (YYYY-MM-DD)") from err
+
+
+def _may_match_cold(
+    spec: CollectionSpec,
+    statuses: list[str] | None,
+    is_template: bool | None,
+    date_from: str | None,
+) -> bool:
+    """Whether a query with these filters could match a cold record."""
+    if statuses is not None and spec.cold_statuses and spec.cold_statuses.isdisjoint(statuses):
+        return False
+    if is_template and spec.has_templates:
+        # Templates are never settled
+        return False
+    if spec.cold_before_today and date_from is not None:
+        return date_from < date.today().isoformat()
+    return True
+
+
+def _members_of(spec: CollectionSpec, item: Any) -> Iterator[str]:
+    """Yield the member ids a record refers to."""
+    for field_name in spec.member_fields:
+        value = getattr(item, field_name)
+        for member_id in value if isinstance(value, list) else (value,):
+            if member_id:
+                yield member_id
+
+
+def _spec_for(
+    collection: str,
+    status: Any = None,
+    template_id: str | None = None,
+    is_template: bool | None = None,
+) -> CollectionSpec:
+    """Look up a collection and check that it supports the given filters."""
+    spec = QUERY_COLLECTIONS.get(collection)
+    if spec is None:
+        raise QueryError(f"Unknown collection: {collection}")
+    if status is not None and spec.status_of is None:
+        raise QueryError(f"{collection} cannot be filtered by status")
+    if (template_id is not None or is_template is not None) and not spec.has_templates:
+        raise QueryError(f"{collection} cannot be filtered by template")
+    return spec
+
+
+def record_filter(
+    collection: str,
+    *,
+    status: str | list[str] | None = None,
+    member_id: str | None = None,
+    template_id: str | None = None,
+    is_template: bool | None = None,
+    older_than_days: int | None = None,
+    now: datetime | None = None,
+) -> Callable[[Any], bool]:
+    """Build a predicate for records of *collection* that pass every filter.
+
+    Filters mean the same as in :meth:`FamDoQueryIndex.query`.
+    ``older_than_days`` matches records created (claimed, for reward claims)
+    more than that many days before *now*. At least one filter is required.
+    """
+    spec = _spec_for(collection, status, template_id, is_template)
+    checks: list[Callable[[Any], bool]] = []
+    if status is not None:
+        statuses = {status} if isinstance(status, str) else set(status)
+        checks.append(lambda item: spec.status_of(item) in statuses)
+    if member_id is not None:
+        checks.append(lambda item: member_id in _members_of(spec, item))
+    if template_id is not None:
+        checks.append(lambda item: item.template_id == template_id)
+    if is_template is not None:
+        checks.append(lambda item: item.is_template == is_template)
+    if older_than_days is not None:
+        cutoff = ((now or datetime.now()) - timedelta(days=older_than_days)).isoformat()
+        checks.append(lambda item: (getattr(item, spec.created_field) or cutoff) < cutoff)
+    if not checks:
+        raise QueryError("At least one filter is required")
+    if len(checks) == 1:
+        return checks[0]
+    return lambda item: all(check(item) for check in checks)
+
+
+def _encode_cursor(sort_by: str, descending: bool, key: tuple) -> str:
+    raw = json.dumps([sort_by, descending, *key], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str, sort_by: str, descending: bool) -> tuple:
+    try:
+        decoded = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        cursor_sort, cursor_desc, flag, value, item_id = decoded
+    except (binascii.Error, ValueError, TypeError) as err:
+        raise QueryError("Invalid cursor") from err
+    if cursor_sort != sort_by or cursor_desc != descending:
+        raise QueryError("Cursor does not match the query sort order")
+    return (flag, value, item_id)
+
+
+class _SortedIndex:
+    """``(value, id)`` pairs kept sorted, so a value range is two bisects."""
+
+    def __init__(self) -> None:
+        self.pairs: list[tuple[str, str]] = []
+
+    def add(self, value: str, item_id: str) -> None:
+        insort(self.pairs, (value, item_id))
+
+    def discard(self, value: str, item_id: str) -> None:
+        pos = bisect_left(self.pairs, (value, item_id))
+        if pos < len(self.pairs) and self.pairs[pos] == (value, item_id):
+            del self.pairs[pos]
+
+    def between(self, low: str | None, high: str | None) -> Iterator[str]:
+        """Yield the ids whose value is in ``[low, high]`` (open if None)."""
+        value = itemgetter(0)
+        start = 0 if low is None else bisect_left(self.pairs, low, key=value)
+        end = len(self.pairs) if high is None else bisect_right(self.pairs, high, key=value)
+        for pos in range(start, end):
+            yield self.pairs[pos][1]
+
+
+class _CollectionIndex:
+    """Secondary indexes over one collection, kept up to date record by record.
+
+    Records are indexed by id. :meth:`sync` compares a new list with the one
+    last indexed by identity, so only records that were added, replaced or
+    removed are re-indexed. Only the records in memory are indexed: cold ones
+    are added once the list is loaded.
+    """
+
+    def __init__(self, spec: CollectionSpec) -> None:
+        self.spec = spec
+        self.items: list | None = None
+        self.loaded = False
+        self.records: dict[str, Any] = {}
+        self.by_status = _SortedIndex()
+        self.by_date = _SortedIndex()
+        self.by_member: dict[str, set[str]] = {}
+        self.by_template: dict[str, set[str]] = {}
+        self.templates: set[str] = set()
+        # Sort keys per field, built on first use
+        self._sorted: dict[str, list[tuple]] = {}
+
+    def sync(self, items: list) -> None:
+        """Bring the indexes in line with *items* (a published list)."""
+        if isinstance(items, LazyList):
+            in_memory, loaded = items.snapshot()
+        else:
+            in_memory, loaded = items, True
+        if items is self.items and loaded == self.loaded:
+            return
+        seen = set()
+        for item in in_memory:
+            seen.add(item.id)
+            if self.records.get(item.id) is not item:
+                self._add(item)
+        for item_id in [item_id for item_id in self.records if item_id not in seen]:
+            self._discard(item_id)
+        self.items = items
+        self.loaded = loaded
+
+    def _add(self, item: Any) -> None:
+        spec = self.spec
+        if item.id in self.records:
+            self._discard(item.id)
+        self.records[item.id] = item
+        if spec.status_of is not None:
+            self.by_status.add(spec.status_of(item), item.id)
+        day = _date_of(getattr(item, spec.date_field))
+        if day is not None:
+            self.by_date.add(day, item.id)
+        for member_id in _members_of(spec, item):
+            self.by_member.setdefault(member_id, set()).add(item.id)
+        if spec.has_templates:
+            if item.is_template:
+                self.templates.add(item.id)
+            if item.template_id:
+                self.by_template.setdefault(item.template_id, set()).add(item.id)
+        for field_name, keys in self._sorted.items():
+            insort(keys, _sort_key(getattr(item, field_name), item.id))
+
+    def _discard(self, item_id: str) -> None:
+        # Published records never change, so the old one still has its keys
+        spec = self.spec
+        item = self.records.pop(item_id)
+        if spec.status_of is not None:
+            self.by_status.discard(spec.status_of(item), item_id)
+        day = _date_of(getattr(item, spec.date_field))
+        if day is not None:
+            self.by_date.discard(day, item_id)
+        for member_id in _members_of(spec, item):
+            _discard_from(self.by_member, member_id, item_id)
+        if spec.has_templates:
+            self.templates.discard(item_id)
+            if item.template_id:
+                _discard_from(self.by_template, item.template_id, item_id)
+        for field_name, keys in self._sorted.items():
+            key = _sort_key(getattr(item, field_name), item_id)
+            pos = bisect_left(keys, key)
+            if pos < len(keys) and keys[pos] == key:
+                del keys[pos]
+
+    def sorted_by(self, field_name: str) -> list[tuple]:
+        """Return the sort keys of every indexed record, ordered by *field_name*."""
+        if field_name not in self._sorted:
+            self._sorted[field_name] = sorted(
+                _sort_key(getattr(item, field_name), item_id)
+                for item_id, item in self.records.items()
+            )
+        return self._sorted[field_name]
+
+
+def _discard_from(buckets: dict[str, set[str]], key: str, item_id: str) -> None:
+    bucket = buckets.get(key)
+    if bucket is not None:
+        bucket.discard(item_id)
+        if not bucket:
+            del buckets[key]
+
+
+class FamDoQueryIndex:
+    """Indexes used to answer paged collection queries.
+
+    Queries run against published versions (see versions.py), whose lists and
+    records never change, so each collection's index is brought up to date
+    incrementally by comparing the new list with the last one it saw. Cold
+    records are only loaded for a query whose filters could match them.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self._indexes: dict[str, _CollectionIndex] = {}
+
+    def _index_for(self, data: FamDoData, spec: CollectionSpec, cold: bool) -> _CollectionIndex:
+        items = getattr(data, spec.attr)
+        if cold and isinstance(items, LazyList):
+            items.load()
+        index = self._indexes.get(spec.attr)
+        if index is None:
+            index = self._indexes[spec.attr] = _CollectionIndex(spec)
+        index.sync(items)
+        return index
+
+    def query(
+        self,
+        data: FamDoData,
+        collection: str,
+        *,
+        status: str | list[str] | None = None,
+        member_id: str | None = None,
+        template_id: str | None = None,
+        is_template: bool | None = None,
+        date_from: str | None = None,
+        date_to: str | None = None,
+        sort_by: str | None = None,
+        descending: bool = False,
+        limit: int = DEFAULT_QUERY_LIMIT,
+        cursor: str | None = None,
+    ) -> dict[str, Any]:
+        """Filter, sort and page a collection of a published version.
+
+        ``date_from`` and ``date_to`` are ISO dates, both inclusive. Returns a
+        dict with ``items`` (serialized records), ``total`` (number of matches
+        across all pages) and ``next_cursor`` (``None`` on the last page).
+        """
+        spec = _spec_for(collection, status, template_id, is_template)
+        sort_by = sort_by or spec.default_sort
+        if sort_by not in spec.sort_fields:
+            raise QueryError(f"Cannot sort {collection} by {sort_by}")
+        if not 1 <= limit <= MAX_QUERY_LIMIT:
+            raise QueryError(f"limit must be between 1 and {MAX_QUERY_LIMIT}")
+        if date_from is not None:
+            date_from = _parse_day("date_from", date_from)
+        if date_to is not None:
+            date_to = _parse_day("date_to", date_to)
+        cursor_key = _decode_cursor(cursor, sort_by, descending) if cursor else None
+        statuses = None
+        if status is not None:
+            statuses = [status] if isinstance(status, str) else list(status)
+
+        index = self._index_for(
+            data, spec, _may_match_cold(spec, statuses, is_template, date_from)
+        )
+
+        # Intersect the filters, smallest set first
+        filters: list[set[str]] = []
+        if statuses is not None:
+            filters.append({
+                item_id for s in statuses for item_id in index.by_status.between(s, s)
+            })
+        if member_id is not None:
+            filters.append(index.by_member.get(member_id, set()))
+        if template_id is not None:
+            filters.append(index.by_template.get(template_id, set()))
+        if is_template is True:
+            filters.append(index.templates)
+        if date_from is not None or date_to is not None:
+            filters.append(set(index.by_date.between(date_from, date_to)))
+        excluded = index.templates if is_template is False else set()
+
+        keys = index.sorted_by(sort_by)
+        candidates: set[str] | None = None
+        if filters:
+            filters.sort(key=len)
+            candidates = set(filters[0]).intersection(*filters[1:]) - excluded
+            total = len(candidates)
+            # Few matches are cheaper to sort than to pick out of the whole order
+            if total * 8 < len(keys):
+                keys = sorted(
+                    _sort_key(getattr(index.records[item_id], sort_by), item_id)
+                    for item_id in candidates
+                )
+                candidates = None
+        else:
+            total = len(index.records) - len(excluded)
+
+        if descending:
+            end = len(keys) if cursor_key is None else bisect_left(keys, cursor_key)
+            order: Iterable[int] = range(end - 1, -1, -1)
+        else:
+            start = 0 if cursor_key is None else bisect_right(keys, cursor_key)
+            order = range(start, len(keys))
+        page: list[tuple] = []
+        has_more = False
+        for pos in order:
+            key = keys[pos]
+            item_id = key[-1]
+            if item_id in excluded or (candidates is not None and item_id not in candidates):
+                continue
+            if len(page) == limit:
+                has_more = True
+                break
+            page.append(key)
+
+        next_cursor = None
+        if page and has_more:
+            next_cursor = _encode_cursor(sort_by, descending, page[-1])
+
+        return {
+            "items": [index.records[key[-1]].to_dict() for key in page],
+            "total": total,
+            "next_cursor": next_cursor,
+        }
@@ -9,6 +9,7 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory, UnitOfTime
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
@@ -16,6 +17,8 @@ from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN, CHORE_STATUS_PENDING, CHORE_STATUS_AWAITING_APPROVAL
 from .coordinator import FamDoCoordinator
+from .lazy import hot_items
+from .metrics import METRICS
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -37,6 +40,9 @@ async def async_setup_entry(
         FamDoUpcomingEventsSensor(coordinator),
     ]
 
+    if METRICS.enabled:
+        entities.append(FamDoMetricsSensor(coordinator))
+
     # Add per-member point sensors
     for member in coordinator.famdo_data.members:
         entities.append(FamDoMemberPointsSensor(coordinator, member.id))
@@ -139,7 +145,7 @@ class FamDoPendingChoresSensor(FamDoBaseSensor):
         return len(
             [
                 c
-                for c in self.coordinator.famdo_data.chores
+                for c in hot_items(self.coordinator.famdo_data.chores)
                 if c.status == CHORE_STATUS_PENDING
             ]
         )
@@ -149,7 +155,7 @@ class FamDoPendingChoresSensor(FamDoBaseSensor):
         """Return pending chores details."""
         pending = [
             c
-            for c in self.coordinator.famdo_data.chores
+            for c in hot_items(self.coordinator.famdo_data.chores)
             if c.status == CHORE_STATUS_PENDING
         ]
         return {
@@ -184,7 +190,7 @@ class FamDoAwaitingApprovalSensor(FamDoBaseSensor):
         return len(
             [
                 c
-                for c in self.coordinator.famdo_data.chores
+                for c in hot_items(self.coordinator.famdo_data.chores)
                 if c.status == CHORE_STATUS_AWAITING_APPROVAL
             ]
         )
@@ -194,7 +200,7 @@ class FamDoAwaitingApprovalSensor(FamDoBaseSensor):
         """Return chores awaiting approval details."""
         awaiting = [
             c
-            for c in self.coordinator.famdo_data.chores
+            for c in hot_items(self.coordinator.famdo_data.chores)
             if c.status == CHORE_STATUS_AWAITING_APPROVAL
         ]
         return {
@@ -263,13 +269,7 @@ class FamDoMemberPointsSensor(FamDoBaseSensor):
             return {}
 
         # Count completed chores
-        completed = len(
-            [
-                c
-                for c in self.coordinator.famdo_data.chores
-                if c.claimed_by == self._member_id and c.status == "completed"
-            ]
-        )
+        completed = self.coordinator.famdo_data.count_completed_chores(self._member_id)
 
         return {
             "member_id": member.id,
@@ -301,14 +301,15 @@ class FamDoActiveTodosSensor(FamDoBaseSensor):
     @property
     def native_value(self) -> int:
         """Return count of active todos."""
-        return len(
-            [t for t in self.coordinator.famdo_data.todos if not t.completed]
-        )
+        # Cold todos are completed ones, so they can stay unloaded
+        todos = hot_items(self.coordinator.famdo_data.todos)
+        return len([t for t in todos if not t.completed])
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return active todos details."""
-        active = [t for t in self.coordinator.famdo_data.todos if not t.completed]
+        todos = hot_items(self.coordinator.famdo_data.todos)
+        active = [t for t in todos if not t.completed]
         return {
             "todos": [
                 {
@@ -341,9 +342,8 @@ class FamDoUpcomingEventsSensor(FamDoBaseSensor):
         from datetime import date
 
         today = date.today().isoformat()
-        return len(
-            [e for e in self.coordinator.famdo_data.events if e.start_date >= today]
-        )
+        events = hot_items(self.coordinator.famdo_data.events)
+        return len([e for e in events if e.start_date >= today])
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
@@ -352,7 +352,8 @@ class FamDoUpcomingEventsSensor(FamDoBaseSensor):
 
         today = date.today().isoformat()
         upcoming = [
-            e for e in self.coordinator.famdo_data.events if e.start_date >= today
+            e for e in hot_items(self.coordinator.famdo_data.events)
+            if e.start_date >= today
         ]
         upcoming.sort(key=lambda x: x.start_date)
         return {
@@ -367,3 +368,35 @@ class FamDoUpcomingEventsSensor(FamDoBaseSensor):
                 for e in upcoming[:10]  # Limit to 10 upcoming events
             ]
         }
+
+
+class FamDoMetricsSensor(FamDoBaseSensor):
+    """Diagnostic sensor with latency percentiles, when metrics are enabled.
+
+    Updates with the coordinator, so the numbers are as of the last change
+    or overdue check.
+    """
+
+    _attr_name = "Metrics"
+    _attr_icon = "mdi:timer-outline"
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    # Per-stage numbers change constantly; keep them out of the recorder
+    _unrecorded_attributes = frozenset({"stages"})
+
+    def __init__(self, coordinator: FamDoCoordinator) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self._attr_unique_id = f"{DOMAIN}_metrics"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the p95 save latency."""
+        save = METRICS.snapshot().get("store.save")
+        return save["p95_ms"] if save else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return p50/p95/p99 for every recorded command and stage."""
+        return {"stages": METRICS.snapshot()}
@@ -0,0 +1,123 @@
+"""Snapshot file formats: JSON or MessagePack, optionally compressed (no HA deps).
+
+Used by FamDoStore's snapshot backend and the dev server's MockStore. The
+format is recognised from the bytes themselves on load (gzip and zstd magic
+numbers, then JSON vs. MessagePack), so a data file written in any format can
+be read back without configuration.
+"""
+from __future__ import annotations
+
+import gzip
+from typing import Any, Callable
+
+from .json_codec import JsonCodec
+
+FORMAT_JSON = "json"
+FORMAT_MSGPACK = "msgpack"
+SNAPSHOT_FORMATS = (FORMAT_JSON, FORMAT_MSGPACK)
+
+COMPRESSION_NONE = "none"
+COMPRESSION_GZIP = "gzip"
+COMPRESSION_ZSTD = "zstd"
+COMPRESSIONS = (COMPRESSION_NONE, COMPRESSION_GZIP, COMPRESSION_ZSTD)
+
+# Saves happen on every mutation, so favour speed over ratio
+GZIP_LEVEL = 1
+ZSTD_LEVEL = 3
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+def _msgpack() -> tuple[Callable[[Any], bytes], Callable[[bytes], Any]]:
+    """Return (packb, unpackb) from msgspec or msgpack."""
+    try:
+        import msgspec
+    except ImportError:
+        pass
+    else:
+        return msgspec.msgpack.encode, msgspec.msgpack.decode
+    try:
+        import msgpack
+    except ImportError as err:
+        raise ValueError("MessagePack snapshots need msgspec or msgpack installed") from err
+    return msgpack.packb, msgpack.unpackb
+
+
+def _zstd() -> tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]:
+    """Return (compress, decompress) from the stdlib (3.14+) or zstandard."""
+    try:
+        from compression import zstd
+    except ImportError:
+        pass
+    else:
+        return (lambda data: zstd.compress(data, level=ZSTD_LEVEL)), zstd.decompress
+    try:
+        import zstandard
+    except ImportError as err:
+        raise ValueError("zstd snapshots need Python 3.14+ or zstandard installed") from err
+    compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+    return compressor.compress, zstandard.ZstdDecompressor().decompress
+
+
+def check_snapshot_support(fmt: str, compression: str) -> None:
+    """Raise ``ValueError`` if the format or compression is unknown or unavailable."""
+    if fmt not in SNAPSHOT_FORMATS:
+        raise ValueError(f"snapshot format must be one of {', '.join(SNAPSHOT_FORMATS)}")
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"compression must be one of {', '.join(COMPRESSIONS)}")
+    if fmt == FORMAT_MSGPACK:
+        _msgpack()
+    if compression == COMPRESSION_ZSTD:
+        _zstd()
+
+
+def encode_snapshot(
+    obj: Any,
+    codec: JsonCodec,
+    fmt: str = FORMAT_JSON,
+    compression: str = COMPRESSION_NONE,
+    pretty: bool = False,
+) -> bytes:
+    """Serialize *obj*; *pretty* only applies to uncompressed JSON."""
+    if fmt == FORMAT_MSGPACK:
+        payload = _msgpack()[0](obj)
+    elif pretty and compression == COMPRESSION_NONE:
+        payload = codec.dumps_pretty(obj)
+    else:
+        payload = codec.dumps(obj)
+
+    if compression == COMPRESSION_GZIP:
+        # mtime=0 keeps identical data byte-identical
+        return gzip.compress(payload, compresslevel=GZIP_LEVEL, mtime=0)
+    if compression == COMPRESSION_ZSTD:
+        return _zstd()[0](payload)
+    return payload
+
+
+def decode_snapshot(data: bytes, codec: JsonCodec) -> Any:
+    """Deserialize a snapshot written in any supported format.
+
+    Raises ``ValueError`` if the data is corrupt.
+    """
+    try:
+        if data.startswith(_GZIP_MAGIC):
+            data = gzip.decompress(data)
+        elif data.startswith(_ZSTD_MAGIC):
+            data = _zstd()[1](data)
+    except (OSError, EOFError) as err:
+        raise ValueError(f"Corrupt compressed snapshot: {err}") from err
+    except ValueError:
+        raise
+    except Exception as err:  # zstd libraries raise their own error types
+        raise ValueError(f"Corrupt compressed snapshot: {err}") from err
+
+    stripped = data.lstrip()
+    if not stripped or stripped[:1] in (b"{", b"["):
+        return codec.loads(data)
+    try:
+        return _msgpack()[1](data)
+    except ValueError:
+        raise
+    except Exception as err:  # msgspec.DecodeError, msgpack's own exceptions
+        raise ValueError(f"Corrupt MessagePack snapshot: {err}") from err
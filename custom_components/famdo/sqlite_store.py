@@ -0,0 +1,395 @@
+"""SQLite storage backend for FamDo (no HA deps).
+
+Each model gets its own table with the serialized record plus a few indexed
+columns. Saves are row-level: only records whose serialized form changed are
+upserted, and only removed ids are deleted, instead of rewriting the whole
+document. Published versions share every list and record nobody edited, so
+a save skips collections and records it has already written by identity and
+only serializes the ones that are new objects. Archived rows (settled chores
+other than each template's newest instance, fulfilled claims, completed
+todos, past one-off events) are read as text by the initial load but only
+parsed the first time their collection is read, so that read never touches
+the database from the event loop.
+
+The backend is synchronous; callers run it in an executor and pass a
+published version (see versions.py), never data that is still being edited.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from .lazy import LazyList
+from .models import (
+    COLD_RECORDS,
+    CalendarEvent,
+    Chore,
+    FamDoData,
+    FamilyMember,
+    Reward,
+    RewardClaim,
+    TodoItem,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 2
+
+
+@dataclass(frozen=True)
+class _Table:
+    """How one FamDoData collection maps onto a table."""
+
+    name: str
+    model: type
+    columns: tuple[str, ...] = ()
+    archived: Callable[[dict[str, Any]], bool] | None = None
+    # Which rows the initial load leaves out
+    cold: str = "archived = 1"
+    # Columns the cold rows are counted by (see LazyList's tally)
+    tally: tuple[str, ...] = ()
+
+
+_TABLES: tuple[_Table, ...] = (
+    _Table("members", FamilyMember),
+    _Table(
+        "chores",
+        Chore,
+        ("status", "template_id", "due_date", "created_at", "claimed_by"),
+        archived=COLD_RECORDS["chores"],
+        # The refresh schedules from each template's newest instance
+        cold=(
+            "archived = 1 AND id NOT IN (SELECT id FROM (SELECT id, MAX(created_at) "
+            "FROM chores WHERE template_id <> '' GROUP BY template_id))"
+        ),
+        tally=("status", "claimed_by"),
+    ),
+    _Table("rewards", Reward),
+    _Table("reward_claims", RewardClaim, ("status",), archived=COLD_RECORDS["reward_claims"]),
+    _Table("todos", TodoItem, ("due_date",), archived=COLD_RECORDS["todos"]),
+    _Table("events", CalendarEvent, ("start_date",), archived=COLD_RECORDS["events"]),
+)
+
+
+@dataclass
+class SaveBatch:
+    """Row changes computed by :meth:`SQLiteBackend.prepare`."""
+
+    meta: dict[str, str] = field(default_factory=dict)
+    upserts: dict[str, list[tuple]] = field(default_factory=dict)
+    deletes: dict[str, list[str]] = field(default_factory=dict)
+    # Lists and records now known to match the database, even if unchanged
+    lists: dict[str, list] = field(default_factory=dict)
+    records: dict[str, list[Any]] = field(default_factory=dict)
+
+    def __bool__(self) -> bool:
+        return bool(self.meta or any(self.upserts.values()) or any(self.deletes.values()))
+
+
+class SQLiteBackend:
+    """Row-per-record FamDo storage in a single SQLite file (WAL mode)."""
+
+    def __init__(self, path: str) -> None:
+        """Initialize the backend; the database is opened on first use."""
+        self.path = path
+        self._conn: sqlite3.Connection | None = None
+        # Guards the connection
+        self._lock = threading.Lock()
+        # Guards the bookkeeping below, which archived-row loaders update from
+        # whichever thread reads the list first; never held across SQL
+        self._state_lock = threading.Lock()
+        # Last written serialization per table and id
+        self._rows: dict[str, dict[str, str | None]] = {t.name: {} for t in _TABLES}
+        # The list and the record objects last written, to skip them by identity
+        self._lists: dict[str, list] = {}
+        self._records: dict[str, dict[str, Any]] = {t.name: {} for t in _TABLES}
+        # Ids of the rows the last load left out
+        self._cold: dict[str, set[str]] = {t.name: set() for t in _TABLES}
+        self._meta: dict[str, str] = {}
+
+    # ── Connection ─────────────────────────────────────────────────
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            for table in _TABLES:
+                extra = "".join(f", {col} TEXT" for col in table.columns)
+                conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS {table.name} "
+                    f"(id TEXT PRIMARY KEY, data TEXT NOT NULL, archived INTEGER NOT NULL DEFAULT 0{extra})"
+                )
+            self._migrate(conn)
+            for table in _TABLES:
+                for col in (*table.columns, "archived"):
+                    conn.execute(
+                        f"CREATE INDEX IF NOT EXISTS idx_{table.name}_{col} ON {table.name} ({col})"
+                    )
+            self._conn = conn
+        return self._conn
+
+    def _migrate(self, conn: sqlite3.Connection) -> None:
+        """Bring a database written by an older version up to this schema."""
+        row = conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+        if row is None:
+            conn.execute(
+                "INSERT INTO meta (key, value) VALUES ('schema_version', ?)",
+                (str(SCHEMA_VERSION),),
+            )
+            return
+        if int(row[0]) >= SCHEMA_VERSION:
+            return
+        _LOGGER.info("Upgrading %s to schema version %d", self.path, SCHEMA_VERSION)
+        conn.execute("BEGIN")
+        try:
+            for table in _TABLES:
+                existing = {info[1] for info in conn.execute(f"PRAGMA table_info({table.name})")}
+                for col in table.columns:
+                    if col not in existing:
+                        conn.execute(f"ALTER TABLE {table.name} ADD COLUMN {col} TEXT")
+                # Fill new columns and re-apply the archiving rules to every row
+                updates = []
+                for row_id, payload in conn.execute(f"SELECT id, data FROM {table.name}"):
+                    record = json.loads(payload)
+                    archived = int(table.archived(record)) if table.archived else 0
+                    updates.append((archived, *(record.get(col) for col in table.columns), row_id))
+                assignments = ", ".join(f"{col} = ?" for col in ("archived", *table.columns))
+                conn.executemany(
+                    f"UPDATE {table.name} SET {assignments} WHERE id = ?", updates
+                )
+            conn.execute(
+                "UPDATE meta SET value = ? WHERE key = 'schema_version'", (str(SCHEMA_VERSION),)
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # ── Load ───────────────────────────────────────────────────────
+
+    def is_empty(self) -> bool:
+        """Whether nothing has been saved yet."""
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT 1 FROM meta WHERE key = 'data'"
+            ).fetchone()
+        return row is None
+
+    def load(self) -> FamDoData:
+        """Load the hot rows; archived rows are parsed on first access."""
+        with self._lock:
+            conn = self._connect()
+            meta_rows = dict(conn.execute("SELECT key, value FROM meta").fetchall())
+            fetched = {
+                table.name: conn.execute(
+                    f"SELECT id, data, {table.cold}"
+                    f"{''.join(f', {col}' for col in table.tally)} "
+                    f"FROM {table.name} ORDER BY rowid"
+                ).fetchall()
+                for table in _TABLES
+            }
+
+        collections: dict[str, list] = {}
+        with self._state_lock:
+            self._meta = meta_rows
+            for table in _TABLES:
+                rows = self._rows[table.name] = {}
+                records = self._records[table.name] = {}
+                cold = self._cold[table.name] = set()
+                hot = []
+                archived = []
+                # Where cold rows sit among all rows, to load them back in place
+                positions = []
+                tally: Counter = Counter()
+                for position, (row_id, payload, is_cold, *key) in enumerate(
+                    fetched[table.name]
+                ):
+                    rows[row_id] = payload
+                    if is_cold:
+                        cold.add(row_id)
+                        archived.append((row_id, payload))
+                        positions.append(position)
+                        tally[tuple(key)] += 1
+                        continue
+                    item = records[row_id] = table.model.from_dict(json.loads(payload))
+                    hot.append(item)
+                if table.archived is None:
+                    collections[table.name] = hot
+                    continue
+                if not positions:
+                    collections[table.name] = LazyList(hot)
+                    continue
+                collections[table.name] = LazyList(
+                    hot,
+                    lambda t=table, a=archived: self._load_archived(t, a),
+                    cold_count=len(positions),
+                    positions=positions,
+                    tally=tally if table.tally else None,
+                )
+            self._lists = dict(collections)
+
+        meta = json.loads(meta_rows.get("data", "{}"))
+        return FamDoData(
+            family_name=meta.get("family_name", "My Family"),
+            settings=meta.get("settings", {}),
+            **collections,
+        )
+
+    def _load_archived(self, table: _Table, archived: list[tuple[str, str]]) -> list:
+        _LOGGER.debug("Loading archived %s", table.name)
+        items = [
+            (row_id, table.model.from_dict(json.loads(payload)))
+            for row_id, payload in archived
+        ]
+        with self._state_lock:
+            self._records[table.name].update(items)
+        return [item for _, item in items]
+
+    # ── Save ───────────────────────────────────────────────────────
+
+    def prepare(self, data: FamDoData) -> SaveBatch:
+        """Diff *data* against what was last written and return the changes.
+
+        *data* must be a published version: records are compared by identity
+        first, so one edited in place would be missed.
+        """
+        batch = SaveBatch()
+        meta = json.dumps(
+            {"family_name": data.family_name, "settings": data.settings}, sort_keys=True
+        )
+        with self._state_lock:
+            if self._meta.get("data") != meta:
+                batch.meta["data"] = meta
+            lists = dict(self._lists)
+
+        for table in _TABLES:
+            items = getattr(data, table.name)
+            if items is lists.get(table.name):
+                continue
+            batch.lists[table.name] = items
+            with self._state_lock:
+                known = dict(self._rows[table.name])
+                written = dict(self._records[table.name])
+                cold = self._cold[table.name]
+            unloaded = False
+            if isinstance(items, LazyList):
+                # Archived rows nobody has read cannot have changed
+                items, loaded = items.snapshot()
+                unloaded = not loaded
+            seen = set()
+            upserts = []
+            checked = []
+            for item in items:
+                seen.add(item.id)
+                if written.get(item.id) is item:
+                    continue
+                checked.append(item)
+                record = item.to_dict()
+                payload = json.dumps(record, sort_keys=True)
+                if known.get(item.id) != payload:
+                    archived = int(table.archived(record)) if table.archived else 0
+                    columns = tuple(getattr(item, col) for col in table.columns)
+                    upserts.append((item.id, payload, archived, *columns))
+            if checked:
+                batch.records[table.name] = checked
+            deletes = [
+                row_id for row_id in known
+                if row_id not in seen and not (unloaded and row_id in cold)
+            ]
+            if upserts:
+                batch.upserts[table.name] = upserts
+            if deletes:
+                batch.deletes[table.name] = deletes
+        return batch
+
+    def apply(self, batch: SaveBatch) -> None:
+        """Write a prepared batch in one transaction."""
+        if batch:
+            self._write(batch)
+        with self._state_lock:
+            self._lists.update(batch.lists)
+            for table_name, items in batch.records.items():
+                written = self._records[table_name]
+                for item in items:
+                    written[item.id] = item
+
+    def _write(self, batch: SaveBatch) -> None:
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN")
+            try:
+                for key, value in batch.meta.items():
+                    conn.execute(
+                        "INSERT INTO meta (key, value) VALUES (?, ?) "
+                        "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                        (key, value),
+                    )
+                for table in _TABLES:
+                    cols = ("id", "data", "archived", *table.columns)
+                    upserts = batch.upserts.get(table.name)
+                    if upserts:
+                        updates = ", ".join(f"{c} = excluded.{c}" for c in cols[1:])
+                        conn.executemany(
+                            f"INSERT INTO {table.name} ({', '.join(cols)}) "
+                            f"VALUES ({', '.join('?' * len(cols))}) "
+                            f"ON CONFLICT(id) DO UPDATE SET {updates}",
+                            upserts,
+                        )
+                    deletes = batch.deletes.get(table.name)
+                    if deletes:
+                        conn.executemany(
+                            f"DELETE FROM {table.name} WHERE id = ?",
+                            [(row_id,) for row_id in deletes],
+                        )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+        with self._state_lock:
+            self._meta.update(batch.meta)
+            for table_name, upserts in batch.upserts.items():
+                rows = self._rows[table_name]
+                for row in upserts:
+                    rows[row[0]] = row[1]
+            for table_name, deletes in batch.deletes.items():
+                rows = self._rows[table_name]
+                written = self._records[table_name]
+                for row_id in deletes:
+                    rows.pop(row_id, None)
+                    written.pop(row_id, None)
+
+    def save(self, data: FamDoData) -> None:
+        """Prepare and apply in one go (same thread)."""
+        self.apply(self.prepare(data))
+
+    def delete(self) -> None:
+        """Close and remove the database files."""
+        self.close()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(self.path + suffix):
+                os.remove(self.path + suffix)
+        with self._state_lock:
+            self._rows = {t.name: {} for t in _TABLES}
+            self._lists = {}
+            self._records = {t.name: {} for t in _TABLES}
+            self._cold = {t.name: set() for t in _TABLES}
+            self._meta = {}
@@ -1,57 +1,245 @@
 """Storage handling for FamDo integration."""
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import TYPE_CHECKING
+import os
+from typing import TYPE_CHECKING, Any
 
-from homeassistant.helpers.storage import Store
+from homeassistant.helpers.storage import STORAGE_DIR, Store
 
-from .const import DOMAIN, STORAGE_KEY, STORAGE_VERSION
+from .const import (
+    SNAPSHOT_FILENAME,
+    SQLITE_FILENAME,
+    STORAGE_BACKEND_JSON,
+    STORAGE_BACKEND_SNAPSHOT,
+    STORAGE_BACKEND_SQLITE,
+    STORAGE_KEY,
+    STORAGE_VERSION,
+)
+from .json_codec import get_codec
+from .metrics import METRICS
 from .models import FamDoData
+from .snapshot import (
+    COMPRESSION_GZIP,
+    FORMAT_JSON,
+    decode_snapshot,
+    encode_snapshot,
+)
+from .sqlite_store import SQLiteBackend
+from .versions import DataVersion, DataVersions
 
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
 
 _LOGGER = logging.getLogger(__name__)
 
+# The snapshot backend writes what the stdlib can always read back. Snapshots
+# in the other formats (MessagePack, zstd) load too where the library is
+# installed, e.g. a data file copied over from the dev server.
+SNAPSHOT_FORMAT = FORMAT_JSON
+SNAPSHOT_COMPRESSION = COMPRESSION_GZIP
 
+
+@METRICS.timed_methods("store")
 class FamDoStore:
     """Handle storage for FamDo data."""
 
-    def __init__(self, hass: HomeAssistant) -> None:
-        """Initialize the store."""
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        backend: str = STORAGE_BACKEND_JSON,
+        lazy: bool = True,
+    ) -> None:
+        """Initialize the store.
+
+        With *lazy*, historical records are materialized on first access (the
+        SQLite backend always works this way).
+        """
         self.hass = hass
+        self._lazy = lazy
         self._store: Store = Store(
             hass,
             STORAGE_VERSION,
             STORAGE_KEY,
             private=True,
         )
+        self._sqlite_path = hass.config.path(STORAGE_DIR, SQLITE_FILENAME)
+        self._sqlite: SQLiteBackend | None = None
+        if backend == STORAGE_BACKEND_SQLITE:
+            self._sqlite = SQLiteBackend(self._sqlite_path)
+        self._snapshot = backend == STORAGE_BACKEND_SNAPSHOT
+        self._snapshot_path = hass.config.path(STORAGE_DIR, SNAPSHOT_FILENAME)
+        self._codec = get_codec()
+        # Saves run one at a time, so an older version never lands after a
+        # newer one (and SQLite saves diff against the last write)
+        self._save_lock = asyncio.Lock()
         self._data: FamDoData | None = None
+        self._versions: DataVersions | None = None
+        self._saved: DataVersion | None = None
 
     async def async_load(self) -> FamDoData:
         """Load data from storage."""
         if self._data is not None:
             return self._data
 
-        stored_data = await self._store.async_load()
+        if self._sqlite is not None:
+            return await self._async_load_sqlite()
+        if self._snapshot:
+            return await self._async_load_snapshot()
+
+        stored_data = await self._async_migrate_to_json()
+        if stored_data is None:
+            stored_data = await self._store.async_load()
 
         if stored_data is None:
             _LOGGER.debug("No existing FamDo data found, creating new")
             self._data = FamDoData()
         else:
             _LOGGER.debug("Loading existing FamDo data")
-            self._data = FamDoData.from_dict(stored_data)
+            self._data = await self.hass.async_add_executor_job(
+                FamDoData.from_dict, stored_data, self._lazy
+            )
+
+        return self._data
+
+    async def _async_load_sqlite(self) -> FamDoData:
+        """Load from SQLite, migrating the JSON document on first use."""
+        if await self.hass.async_add_executor_job(self._sqlite.is_empty):
+            stored_data = await self._async_migrate_to_json()
+            if stored_data is None:
+                stored_data = await self._store.async_load()
+            if stored_data is not None:
+                _LOGGER.info("Migrating FamDo data from JSON storage to SQLite")
+                self._data = await self.hass.async_add_executor_job(
+                    FamDoData.from_dict, stored_data
+                )
+                await self.async_save()
+                return self._data
+
+        _LOGGER.debug("Loading FamDo data from SQLite")
+        self._data = await self.hass.async_add_executor_job(self._sqlite.load)
+        return self._data
+
+    async def _async_load_snapshot(self) -> FamDoData:
+        """Load the snapshot file, migrating the JSON document on first use."""
+        stored_data = await self._async_migrate_to_json()
+        if stored_data is None:
+            stored_data = await self.hass.async_add_executor_job(self._read_snapshot)
+            if stored_data is not None:
+                _LOGGER.debug("Loading FamDo data from the snapshot file")
+                self._data = await self.hass.async_add_executor_job(
+                    FamDoData.from_dict, stored_data, self._lazy
+                )
+                return self._data
+            stored_data = await self._store.async_load()
+
+        if stored_data is None:
+            _LOGGER.debug("No existing FamDo data found, creating new")
+            self._data = FamDoData()
+            return self._data
 
+        _LOGGER.info("Migrating FamDo data from JSON storage to the snapshot file")
+        self._data = await self.hass.async_add_executor_job(
+            FamDoData.from_dict, stored_data, self._lazy
+        )
+        await self.async_save()
         return self._data
 
+    async def _async_migrate_to_json(self) -> dict[str, Any] | None:
+        """Move data left by the other backends into JSON storage.
+
+        Only the backend in use writes, so its files hold newer data than the
+        JSON document. Each is removed once moved, so at most one is left.
+        """
+        stored_data = None
+        if self._sqlite is None:
+            stored_data = await self._async_migrate_from_sqlite()
+        if not self._snapshot:
+            stored_data = await self._async_migrate_from_snapshot() or stored_data
+        return stored_data
+
+    async def _async_migrate_from_snapshot(self) -> dict[str, Any] | None:
+        """Move data left by the snapshot backend back into JSON storage."""
+        stored_data = await self.hass.async_add_executor_job(self._read_snapshot)
+        if stored_data is None:
+            return None
+        _LOGGER.info("Migrating FamDo data from the snapshot file back to JSON storage")
+        await self._store.async_save(stored_data)
+        await self.hass.async_add_executor_job(self._remove_snapshot)
+        return stored_data
+
+    async def _async_migrate_from_sqlite(self) -> dict[str, Any] | None:
+        """Move data left by the SQLite backend back into JSON storage.
+
+        The JSON document is not written while SQLite is in use, so after
+        switching back it is stale. The database is removed once its contents
+        are saved, so switching to SQLite again migrates the current data.
+        """
+        if not await self.hass.async_add_executor_job(os.path.exists, self._sqlite_path):
+            return None
+        backend = SQLiteBackend(self._sqlite_path)
+        stored_data = None
+        try:
+            if not await self.hass.async_add_executor_job(backend.is_empty):
+                _LOGGER.info("Migrating FamDo data from SQLite back to JSON storage")
+                stored_data = await self.hass.async_add_executor_job(
+                    lambda: backend.load().to_dict()
+                )
+                await self._store.async_save(stored_data)
+        finally:
+            await self.hass.async_add_executor_job(backend.close)
+        await self.hass.async_add_executor_job(backend.delete)
+        return stored_data
+
     async def async_save(self) -> None:
         """Save data to storage."""
         if self._data is None:
             return
 
         _LOGGER.debug("Saving FamDo data")
-        await self._store.async_save(self._data.to_dict())
+        # Publish the draft; the version never changes, so the executor can read it
+        self.versions.commit()
+        async with self._save_lock:
+            # Saves queued behind a slow one all write the newest version, once
+            version = self.versions.current
+            if version is self._saved:
+                return
+            if self._sqlite is not None:
+                await self.hass.async_add_executor_job(self._sqlite.save, version.data)
+            elif self._snapshot:
+                await self.hass.async_add_executor_job(self._write_snapshot, version.data)
+            else:
+                await self._store.async_save(
+                    await self.hass.async_add_executor_job(version.data.to_dict)
+                )
+            self._saved = version
+
+    def _read_snapshot(self) -> dict[str, Any] | None:
+        """Read the snapshot file, if there is one (runs in the executor)."""
+        try:
+            with open(self._snapshot_path, "rb") as fh:
+                payload = fh.read()
+        except FileNotFoundError:
+            return None
+        return decode_snapshot(payload, self._codec)
+
+    def _write_snapshot(self, data: FamDoData) -> None:
+        """Replace the snapshot file atomically (runs in the executor)."""
+        payload = encode_snapshot(
+            data.to_dict(), self._codec, SNAPSHOT_FORMAT, SNAPSHOT_COMPRESSION
+        )
+        tmp_path = f"{self._snapshot_path}.tmp"
+        with open(tmp_path, "wb") as fh:
+            fh.write(payload)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp_path, self._snapshot_path)
+
+    def _remove_snapshot(self) -> None:
+        for path in (self._snapshot_path, f"{self._snapshot_path}.tmp"):
+            if os.path.exists(path):
+                os.remove(path)
 
     @property
     def data(self) -> FamDoData:
@@ -60,7 +248,24 @@ class FamDoStore:
             raise RuntimeError("Data not loaded. Call async_load first.")
         return self._data
 
+    @property
+    def versions(self) -> DataVersions:
+        """Copy-on-write versions of the loaded data."""
+        data = self.data
+        if self._versions is None or self._versions.draft is not data:
+            self._versions = DataVersions(data)
+        return self._versions
+
+    async def async_close(self) -> None:
+        """Release the database connection, if any."""
+        if self._sqlite is not None:
+            await self.hass.async_add_executor_job(self._sqlite.close)
+
     async def async_delete(self) -> None:
         """Delete all stored data."""
         await self._store.async_remove()
+        if self._sqlite is not None:
+            await self.hass.async_add_executor_job(self._sqlite.delete)
+        if self._snapshot:
+            await self.hass.async_add_executor_job(self._remove_snapshot)
         self._data = None
@@ -0,0 +1,57 @@
+"""Rate limiting for subscription pushes."""
+from __future__ import annotations
+
+import asyncio
+import math
+from typing import Callable
+
+
+class PushThrottler:
+    """Coalesce bursts of update notifications into rate-limited sends.
+
+    The first notification after a quiet period is sent immediately. Any
+    notifications arriving within ``interval`` seconds of the last send are
+    collapsed into a single trailing send, so subscribers receive at most one
+    update per interval and the final state of a burst is never lost. The
+    ``send`` callback should read the current state when called rather than
+    capture it at notification time.
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        interval: float,
+        send: Callable[[], None],
+    ) -> None:
+        """Initialize the throttler."""
+        self._loop = loop
+        self._interval = interval
+        self._send = send
+        self._last_sent = -math.inf
+        self._timer: asyncio.TimerHandle | None = None
+        self._cancelled = False
+
+    def trigger(self) -> None:
+        """Notify that the state changed."""
+        if self._cancelled or self._timer is not None:
+            # A trailing send is already scheduled and will carry this change.
+            return
+        wait = self._last_sent + self._interval - self._loop.time()
+        if wait <= 0:
+            self._fire()
+        else:
+            self._timer = self._loop.call_later(wait, self._fire)
+
+    def _fire(self) -> None:
+        self._timer = None
+        if self._cancelled:
+            return
+        self._last_sent = self._loop.time()
+        self._send()
+
+    def cancel(self) -> None:
+        """Stop sending; drops any pending trailing update."""
+        self._cancelled = True
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
@@ -0,0 +1,199 @@
+"""Bulk import and chunked export of FamDo records (no HA deps).
+
+Imports arrive in chunks that are validated and staged under an
+``import_id``. The final chunk applies everything to one draft, so the whole
+import is a single version and a single save. Exports page through a pinned
+:class:`DataVersion`, so a long export sees one consistent state even while
+other commands keep writing. Each page serializes only its own records.
+"""
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+import uuid
+from collections import OrderedDict
+from typing import Any
+
+from .models import (
+    CalendarEvent,
+    Chore,
+    FamilyMember,
+    Reward,
+    RewardClaim,
+    TodoItem,
+)
+from .versions import COLLECTIONS, DataVersion, DataVersions
+
+EXPORT_PAGE_SIZE = 1000
+MAX_EXPORT_PAGE_SIZE = 10000
+
+# Abandoned imports and exports are dropped oldest-first past this many
+MAX_TRANSFER_SESSIONS = 8
+
+MODELS: dict[str, type] = {
+    "members": FamilyMember,
+    "chores": Chore,
+    "rewards": Reward,
+    "reward_claims": RewardClaim,
+    "todos": TodoItem,
+    "events": CalendarEvent,
+}
+
+
+class TransferError(ValueError):
+    """Raised when import records or an export cursor are invalid."""
+
+
+def parse_records(records: dict[str, Any]) -> dict[str, list]:
+    """Validate serialized records by collection and build model instances.
+
+    Nothing is applied here, so one bad record rejects the whole chunk.
+    """
+    parsed: dict[str, list] = {}
+    for name, items in records.items():
+        model = MODELS.get(name)
+        if model is None:
+            raise TransferError(f"Unknown collection: {name}")
+        if not isinstance(items, list):
+            raise TransferError(f"{name} must be a list of records")
+        batch = []
+        for index, record in enumerate(items):
+            if not isinstance(record, dict):
+                raise TransferError(f"{name}[{index}] is not a record")
+            try:
+                # from_dict fills in legacy defaults in place; keep the input intact
+                batch.append(model.from_dict(dict(record)))
+            except TypeError as err:
+                raise TransferError(f"{name}[{index}]: {err}") from err
+        parsed[name] = batch
+    return parsed
+
+
+def apply_import(
+    versions: DataVersions,
+    records: dict[str, list],
+    *,
+    replace: bool = False,
+    family_name: str | None = None,
+    settings: dict[str, Any] | None = None,
+) -> dict[str, int]:
+    """Insert parsed *records* into the draft, one pass per collection.
+
+    Records whose id already exists replace the stored one and get its next
+    version. With *replace*, each imported collection is swapped out instead
+    of merged.
+    """
+    added = updated = 0
+    for name, batch in records.items():
+        if replace:
+            by_id: dict[str, int] = {}
+            items = versions.replace_collection(name, [])
+        else:
+            items = versions.collection(name)
+            by_id = {item.id: index for index, item in enumerate(items)}
+        for record in batch:
+            index = by_id.get(record.id)
+            if index is None:
+                by_id[record.id] = len(items)
+                items.append(record)
+                added += 1
+            else:
+                record.version = items[index].version + 1
+                items[index] = record
+                updated += 1
+    if family_name is not None:
+        versions.draft.family_name = family_name
+    if settings is not None:
+        versions.settings().update(settings)
+    return {"added": added, "updated": updated}
+
+
+def _encode_cursor(token: str, collection: int, offset: int) -> str:
+    raw = json.dumps([token, collection, offset]).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[str, int, int]:
+    try:
+        token, collection, offset = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, ValueError, TypeError) as err:
+        raise TransferError("Invalid cursor") from err
+    return token, collection, offset
+
+
+class FamDoTransfer:
+    """Staged import chunks and pinned export versions for one coordinator."""
+
+    def __init__(self) -> None:
+        """Start with no sessions."""
+        self._imports: OrderedDict[str, dict[str, list]] = OrderedDict()
+        self._exports: OrderedDict[str, DataVersion] = OrderedDict()
+
+    @staticmethod
+    def _remember(sessions: OrderedDict, key: str, value: Any) -> None:
+        sessions[key] = value
+        sessions.move_to_end(key)
+        while len(sessions) > MAX_TRANSFER_SESSIONS:
+            sessions.popitem(last=False)
+
+    def stage(self, import_id: str | None, records: dict[str, Any]) -> dict[str, list]:
+        """Validate a chunk and add it to the import; return everything staged."""
+        parsed = parse_records(records)
+        if import_id is None:
+            return parsed
+        staged = self._imports.pop(import_id, {})
+        for name, batch in parsed.items():
+            staged.setdefault(name, []).extend(batch)
+        self._remember(self._imports, import_id, staged)
+        return staged
+
+    def discard(self, import_id: str | None) -> None:
+        """Forget a staged import."""
+        if import_id is not None:
+            self._imports.pop(import_id, None)
+
+    def export_page(
+        self, version: DataVersion, cursor: str | None = None, limit: int = EXPORT_PAGE_SIZE
+    ) -> dict[str, Any]:
+        """Serialize the next *limit* records of an export.
+
+        Without a cursor a new export of *version* starts, and the first page
+        also carries ``family_name`` and ``settings``. Later pages come from
+        the same version whatever *version* is passed. ``next_cursor`` is
+        ``None`` on the last page.
+        """
+        if not 1 <= limit <= MAX_EXPORT_PAGE_SIZE:
+            raise TransferError(f"limit must be between 1 and {MAX_EXPORT_PAGE_SIZE}")
+        page: dict[str, Any] = {}
+        if cursor is None:
+            token, position, offset = uuid.uuid4().hex, 0, 0
+            page["family_name"] = version.data.family_name
+            page["settings"] = version.data.settings
+        else:
+            token, position, offset = _decode_cursor(cursor)
+            version = self._exports.get(token)
+            if version is None:
+                raise TransferError("Export expired; start again without a cursor")
+
+        records: dict[str, list] = {}
+        remaining = limit
+        while position < len(COLLECTIONS) and remaining:
+            name = COLLECTIONS[position]
+            items = getattr(version.data, name)
+            chunk = items[offset:offset + remaining]
+            if chunk:
+                records[name] = [item.to_dict() for item in chunk]
+                remaining -= len(chunk)
+                offset += len(chunk)
+            if offset >= len(items):
+                position, offset = position + 1, 0
+
+        if position < len(COLLECTIONS):
+            self._remember(self._exports, token, version)
+            next_cursor = _encode_cursor(token, position, offset)
+        else:
+            self._exports.pop(token, None)
+            next_cursor = None
+        page.update(version=version.number, records=records, next_cursor=next_cursor)
+        return page
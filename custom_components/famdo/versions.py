@@ -0,0 +1,195 @@
+"""Copy-on-write versions of FamDo data (no HA deps).
+
+Writers keep editing one *draft* :class:`FamDoData` in place, but ask
+:class:`DataVersions` for the collection or record first. Anything still
+shared with the last published version is copied before it is handed out:
+a collection is copied as a list of references, a record field-by-field.
+:meth:`DataVersions.commit` then publishes the draft as a new version in
+O(1). The version's root is new, but it shares every collection and record
+nobody edited. Every record copied for a draft gets its ``version`` bumped,
+which clients use for optimistic concurrency checks.
+
+Published versions are never modified, so readers can hold one across awaits
+or serialize it in another thread. Diffing two versions only follows
+pointers: untouched collections are the same list, and edited records are
+new objects.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field, fields, replace
+from typing import Any
+
+from .lazy import LazyList, hot_items
+from .models import FamDoData
+
+COLLECTIONS = ("members", "chores", "rewards", "reward_claims", "todos", "events")
+
+
+def _detached(item: Any) -> Any:
+    """Copy a model instance field-by-field (much cheaper than copy.copy)."""
+    clone = object.__new__(type(item))
+    clone.__dict__ = item.__dict__.copy()
+    return clone
+
+
+@dataclass(frozen=True)
+class DataVersion:
+    """A published, read-only version of the data."""
+
+    number: int
+    data: FamDoData
+
+
+@dataclass
+class VersionDiff:
+    """Records added, changed or removed between two versions."""
+
+    base: int
+    version: int
+    upserted: dict[str, list[Any]] = field(default_factory=dict)
+    removed: dict[str, list[str]] = field(default_factory=dict)
+    family_name: str | None = None
+    settings: dict[str, Any] | None = None
+
+    def __bool__(self) -> bool:
+        return bool(
+            self.upserted or self.removed
+            or self.family_name is not None or self.settings is not None
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize for a delta push."""
+        changes: dict[str, Any] = {
+            name: {
+                "upserted": [item.to_dict() for item in self.upserted.get(name, ())],
+                "removed": self.removed.get(name, []),
+            }
+            for name in COLLECTIONS
+            if name in self.upserted or name in self.removed
+        }
+        if self.family_name is not None:
+            changes["family_name"] = self.family_name
+        if self.settings is not None:
+            changes["settings"] = self.settings
+        return {"base_version": self.base, "version": self.version, "changes": changes}
+
+
+def diff_versions(old: DataVersion, new: DataVersion) -> VersionDiff:
+    """Compare two versions by identity; unchanged collections are skipped in O(1).
+
+    Cold records loaded after *old* was published are new objects and show up
+    as upserted.
+    """
+    result = VersionDiff(base=old.number, version=new.number)
+    for name in COLLECTIONS:
+        before = getattr(old.data, name)
+        after = getattr(new.data, name)
+        if before is after:
+            continue
+        # One copy of each, so a load on another thread cannot land in between
+        before = hot_items(before)
+        after = hot_items(after)
+        before_ids = {id(item) for item in before}
+        upserted = [item for item in after if id(item) not in before_ids]
+        after_ids = {id(item) for item in after}
+        kept = {item.id for item in upserted}
+        removed = [
+            item.id for item in before
+            if id(item) not in after_ids and item.id not in kept
+        ]
+        if upserted:
+            result.upserted[name] = upserted
+        if removed:
+            result.removed[name] = removed
+    if old.data.family_name != new.data.family_name:
+        result.family_name = new.data.family_name
+    if old.data.settings is not new.data.settings:
+        result.settings = new.data.settings
+    return result
+
+
+class DataVersions:
+    """The draft writers edit plus the last published version."""
+
+    def __init__(self, draft: FamDoData) -> None:
+        """Start at version 0 with everything shared."""
+        self.draft = draft
+        self._current = DataVersion(0, replace(draft))
+        self._owned_lists: set[str] = set()
+        # Records copied for this draft, by id() (the values keep them alive)
+        self._owned: dict[int, Any] = {}
+        self._owned_settings = False
+
+    @property
+    def current(self) -> DataVersion:
+        """The last published version, in O(1)."""
+        return self._current
+
+    def collection(self, name: str) -> list:
+        """Return the draft's list *name*, safe to append to or remove from."""
+        items = getattr(self.draft, name)
+        if name in self._owned_lists:
+            return items
+        if isinstance(items, LazyList):
+            copy = items.lazy_copy()
+        else:
+            copy = list(items)
+        setattr(self.draft, name, copy)
+        self._owned_lists.add(name)
+        return copy
+
+    def replace_collection(self, name: str, items: list) -> list:
+        """Swap the draft's list *name* for *items* (e.g. rebuilt in one pass)."""
+        setattr(self.draft, name, items)
+        self._owned_lists.add(name)
+        return items
+
+    def edit(self, name: str, item: Any) -> Any:
+        """Return a private copy of *item* (a record of *name*) to modify."""
+        if self._owned.get(id(item)) is item:
+            return item
+        items = self.collection(name)
+        # *item* came from memory, so cold records that were never read can
+        # be skipped
+        for index, candidate in enumerate(list.__iter__(items)):
+            if candidate is item:
+                return self.edit_at(name, index)
+        raise ValueError(f"{item!r} is not in {name}")
+
+    def edit_at(self, name: str, index: int) -> Any:
+        """Like :meth:`edit`, for the record at *index* (no search).
+
+        For a lazy list not loaded yet, *index* counts the items in memory
+        (see ``hot_items``).
+        """
+        items = self.collection(name)
+        item = list.__getitem__(items, index)
+        if self._owned.get(id(item)) is item:
+            return item
+        copy = _detached(item)
+        # A record is copied once per draft, so each saved change bumps it once
+        copy.version = item.version + 1
+        list.__setitem__(items, index, copy)
+        self._owned[id(copy)] = copy
+        return copy
+
+    def settings(self) -> dict[str, Any]:
+        """Return the draft's settings dict, safe to update."""
+        if not self._owned_settings:
+            self.draft.settings = dict(self.draft.settings)
+            self._owned_settings = True
+        return self.draft.settings
+
+    def commit(self) -> DataVersion:
+        """Publish the draft; later edits copy again."""
+        published = self._current.data
+        if all(
+            getattr(self.draft, f.name) is getattr(published, f.name)
+            for f in fields(FamDoData)
+        ):
+            return self._current
+        self._current = DataVersion(self._current.number + 1, replace(self.draft))
+        self._owned_lists.clear()
+        self._owned.clear()
+        self._owned_settings = False
+        return self._current
@@ -1,15 +1,34 @@
 """WebSocket API for FamDo integration."""
 from __future__ import annotations
 
+import asyncio
 import logging
+from datetime import datetime
 from typing import TYPE_CHECKING, Any
 
 import voluptuous as vol
 
 from homeassistant.components import websocket_api
 from homeassistant.core import HomeAssistant, callback
-
-from .const import DOMAIN
+from homeassistant.helpers.json import json_bytes
+from homeassistant.util import dt as dt_util
+
+from .calendar_cache import CachedEvent, CalendarEventCache, CalendarRegistry
+from .commands import (
+    COMMANDS,
+    SUBSCRIBE_FIELDS,
+    Command,
+    CommandError,
+    Field,
+    async_data_dict,
+    execute,
+    find_parent_for_ha_user,
+)
+from .const import DOMAIN, MAX_MERGED_EVENTS_TIMEOUT, MERGED_EVENTS_TIMEOUT
+from .merged_events import calendar_events, chore_events, famdo_events, merge_events
+from .metrics import METRICS
+from .throttle import PushThrottler
+from .versions import DataVersion, diff_versions
 
 if TYPE_CHECKING:
     from .coordinator import FamDoCoordinator
@@ -19,45 +38,13 @@ _LOGGER = logging.getLogger(__name__)
 
 def async_register_websocket_api(hass: HomeAssistant) -> None:
     """Register WebSocket API handlers."""
-    websocket_api.async_register_command(hass, websocket_get_data)
-    websocket_api.async_register_command(hass, websocket_add_member)
-    websocket_api.async_register_command(hass, websocket_update_member)
-    websocket_api.async_register_command(hass, websocket_remove_member)
-    websocket_api.async_register_command(hass, websocket_add_chore)
-    websocket_api.async_register_command(hass, websocket_update_chore)
-    websocket_api.async_register_command(hass, websocket_claim_chore)
-    websocket_api.async_register_command(hass, websocket_complete_chore)
-    websocket_api.async_register_command(hass, websocket_approve_chore)
-    websocket_api.async_register_command(hass, websocket_reject_chore)
-    websocket_api.async_register_command(hass, websocket_retry_chore)
-    websocket_api.async_register_command(hass, websocket_reactivate_template)
-    websocket_api.async_register_command(hass, websocket_delete_chore)
-    websocket_api.async_register_command(hass, websocket_add_reward)
-    websocket_api.async_register_command(hass, websocket_update_reward)
-    websocket_api.async_register_command(hass, websocket_claim_reward)
-    websocket_api.async_register_command(hass, websocket_fulfill_reward_claim)
-    websocket_api.async_register_command(hass, websocket_delete_reward)
-    websocket_api.async_register_command(hass, websocket_add_todo)
-    websocket_api.async_register_command(hass, websocket_update_todo)
-    websocket_api.async_register_command(hass, websocket_complete_todo)
-    websocket_api.async_register_command(hass, websocket_delete_todo)
-    websocket_api.async_register_command(hass, websocket_add_event)
-    websocket_api.async_register_command(hass, websocket_update_event)
-    websocket_api.async_register_command(hass, websocket_delete_event)
-    websocket_api.async_register_command(hass, websocket_update_settings)
+    # Coordinator commands come from the shared registry (see commands.py)
+    for command in COMMANDS.values():
+        websocket_api.async_register_command(hass, _build_command_handler(command))
     websocket_api.async_register_command(hass, websocket_subscribe)
     websocket_api.async_register_command(hass, websocket_get_ha_calendars)
     websocket_api.async_register_command(hass, websocket_get_ha_calendar_events)
-    # Data management commands
-    websocket_api.async_register_command(hass, websocket_update_reward_claim)
-    websocket_api.async_register_command(hass, websocket_delete_reward_claim)
-    websocket_api.async_register_command(hass, websocket_delete_all_chores)
-    websocket_api.async_register_command(hass, websocket_delete_all_rewards)
-    websocket_api.async_register_command(hass, websocket_delete_all_reward_claims)
-    websocket_api.async_register_command(hass, websocket_delete_all_todos)
-    websocket_api.async_register_command(hass, websocket_delete_all_events)
-    websocket_api.async_register_command(hass, websocket_delete_all_members)
-    websocket_api.async_register_command(hass, websocket_clear_all_data)
+    websocket_api.async_register_command(hass, websocket_get_merged_events)
 
 
 def _get_coordinator(hass: HomeAssistant) -> FamDoCoordinator:
@@ -65,864 +52,243 @@ def _get_coordinator(hass: HomeAssistant) -> FamDoCoordinator:
     return hass.data[DOMAIN]["coordinator"]
 
 
-# ==================== Data Retrieval ====================
-
-
-@websocket_api.websocket_command({vol.Required("type"): "famdo/get_data"})
-@websocket_api.async_response
-async def websocket_get_data(
-    hass: HomeAssistant,
-    connection: websocket_api.ActiveConnection,
-    msg: dict[str, Any],
-) -> None:
-    """Get all FamDo data."""
-    coordinator = _get_coordinator(hass)
-    data = coordinator.famdo_data
-
-    connection.send_result(msg["id"], data.to_dict())
-
-
-# ==================== Subscription ====================
-
-
-@websocket_api.websocket_command({vol.Required("type"): "famdo/subscribe"})
-@websocket_api.async_response
-async def websocket_subscribe(
-    hass: HomeAssistant,
-    connection: websocket_api.ActiveConnection,
-    msg: dict[str, Any],
-) -> None:
-    """Subscribe to FamDo data updates."""
-    coordinator = _get_coordinator(hass)
-
-    @callback
-    def async_update() -> None:
-        """Send update to subscriber."""
-        connection.send_message(
-            websocket_api.event_message(
-                msg["id"],
-                {"data": coordinator.famdo_data.to_dict()},
+# ==================== Registry Commands ====================
+
+
+class _ConnectionContext:
+    """Command context bound to one HA WebSocket connection."""
+
+    def __init__(
+        self, hass: HomeAssistant, connection: websocket_api.ActiveConnection
+    ) -> None:
+        """Initialize the context."""
+        self.coordinator = _get_coordinator(hass)
+        self._connection = connection
+
+    def resolve_parent(self, raw_id: str, action: str) -> str:
+        """Resolve an ``ha_user:`` approver to a parent member, checking admin rights."""
+        if not raw_id.startswith("ha_user:"):
+            return raw_id
+        ha_user_id = raw_id[8:]  # Strip "ha_user:" prefix
+        user = self._connection.user
+        if not (user and user.id == ha_user_id):
+            raise CommandError("unauthorized", "User mismatch")
+        if not user.is_admin:
+            raise CommandError("unauthorized", f"Only admin users can {action}")
+        parent_id = find_parent_for_ha_user(self.coordinator.famdo_data, ha_user_id)
+        if parent_id is None:
+            raise CommandError(
+                "failed", "No parent member found. Please create a parent member first."
             )
-        )
-
-    # Send initial data
-    connection.send_result(msg["id"], coordinator.famdo_data.to_dict())
-
-    # Subscribe to updates
-    unsub = coordinator.async_add_listener(async_update)
-    connection.subscriptions[msg["id"]] = unsub
-
-
-# ==================== Member Management ====================
-
-
-@websocket_api.websocket_command(
-    {
-        vol.Required("type"): "famdo/add_member",
-        vol.Required("name"): str,
-        vol.Optional("role", default="child"): str,
-        vol.Optional("color", default="#4ECDC4"): str,
-        vol.Optional("avatar", default="mdi:account"): str,
-    }
-)
-@websocket_api.async_response
-async def websocket_add_member(
-    hass: HomeAssistant,
-    connection: websocket_api.ActiveConnection,
-    msg: dict[str, Any],
-) -> None:
-    """Add a family member."""
-    coordinator = _get_coordinator(hass)
-    member = await coordinator.async_add_member(
-        name=msg["name"],
-        role=msg["role"],
-        color=msg["color"],
-        avatar=msg["avatar"],
-    )
-    connection.send_result(msg["id"], member.to_dict())
-
-
-@websocket_api.websocket_command(
-    {
-        vol.Required("type"): "famdo/update_member",
-        vol.Required("member_id"): str,
-        vol.Optional("name"): str,
-        vol.Optional("role"): str,
-        vol.Optional("color"): str,
-        vol.Optional("avatar"): str,
-        vol.Optional("points"): int,
-        vol.Optional("ha_user_id"): vol.Any(str, None),
-    }
-)
-@websocket_api.async_response
-async def websocket_update_member(
-    hass: HomeAssistant,
-    connection: websocket_api.ActiveConnection,
-    msg: dict[str, Any],
-) -> None:
-    """Update a family member."""
-    coordinator = _get_coordinator(hass)
-    msg_id = msg["id"]
-    member_id = msg["member_id"]
+        return parent_id
 
-    # Extract only the update fields
-    update_data = {}
-    for key in ["name", "role", "color", "avatar", "points", "ha_user_id"]:
-        if key in msg:
-            update_data[key] = msg[key]
 
-    member = await coordinator.async_update_member(member_id, **update_data)
-    if member:
-        connection.send_result(msg_id, member.to_dict())
-    else:
-        connection.send_error(msg_id, "not_found", "Member not found")
+def _strict_int(value: Any) -> int:
+    """Accept an int but not a bool, which voluptuous' ``int`` lets through."""
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise vol.Invalid("expected int")
+    return value
 
 
-@websocket_api.websocket_command(
-    {
-        vol.Required("type"): "famdo/remove_member",
-        vol.Required("member_id"): str,
-    }
-)
-@websocket_api.async_response
-async def websocket_remove_member(
-    hass: HomeAssistant,
-    connection: websocket_api.ActiveConnection,
-    msg: dict[str, Any],
-) -> None:
-    """Remove a family member."""
-    coordinator = _get_coordinator(hass)
-    success = await coordinator.async_remove_member(msg["member_id"])
-    connection.send_result(msg["id"], {"success": success})
-
-
-# ==================== Chore Management ====================
+def _field_validator(types: tuple[Any, ...]) -> Any:
+    """Build the voluptuous validator for a field's accepted types."""
+    validators = [_strict_int if expected is int else expected for expected in types]
+    if len(validators) == 1:
+        return validators[0]
+    return vol.Any(*validators)
 
 
-@websocket_api.websocket_command(
-    {
-        vol.Required("type"): "famdo/add_chore",
-        vol.Required("name"): str,
-        vol.Optional("description", default=""): str,
-        vol.Optional("points", default=10): int,
-        vol.Optional("assigned_to"): vol.Any(str, None),
-        vol.Optional("recurrence", default="none"): str,
-        vol.Optional("due_date"): vol.Any(str, None),
-        vol.Optional("due_time"): vol.Any(str, None),
-        vol.Optional("icon", default="mdi:broom"): str,
-        vol.Optional("negative_points", default=0): int,
-        vol.Optional("max_instances", default=3): int,
-    }
-)
-@websocket_api.async_response
-async def websocket_add_chore(
-    hass: HomeAssistant,
-    connection: websocket_api.ActiveConnection,
-    msg: dict[str, Any],
-) -> None:
-    """Add a chore."""
-    coordinator = _get_coordinator(hass)
-    chore = await coordinator.async_add_chore(
-        name=msg["name"],
-        description=msg.get("description", ""),
-        points=msg.get("points", 10),
-        assigned_to=msg.get("assigned_to"),
-        recurrence=msg.get("recurrence", "none"),
-        due_date=msg.get("due_date"),
-        due_time=msg.get("due_time"),
-        icon=msg.get("icon", "mdi:broom"),
-        negative_points=msg.get("negative_points", 0),
-        max_instances=msg.get("max_instances", 3),
-    )
-    connection.send_result(msg["id"], chore.to_dict())
-
-
-@websocket_api.websocket_command(
-    {
-        vol.Required("type"): "famdo/update_chore",
-        vol.Required("chore_id"): str,
-        vol.Optional("name"): str,
-        vol.Optional("description"): str,
-        vol.Optional("points"): int,
-        vol.Optional("assigned_to"): vol.Any(str, None),
-        vol.Optional("recurrence"): str,
-        vol.Optional("due_date"): vol.Any(str, None),
-        vol.Optional("due_time"): vol.Any(str, None),
-        vol.Optional("icon"): str,
-        vol.Optional("status"): str,
-        vol.Optional("negative_points"): int,
-        vol.Optional("max_instances"): int,
-    }
-)
-@websocket_api.async_response
-async def websocket_update_chore(
-    hass: HomeAssistant,
-    connection: websocket_api.ActiveConnection,
-    msg: dict[str, Any],
-) -> None:
-    """Update a chore."""
-    coordinator = _get_coordinator(hass)
-    chore_id = msg.pop("chore_id")
-    msg.pop("type")
-    msg_id = msg.pop("id")
-
-    chore = await coordinator.async_update_chore(chore_id, **msg)
-    if chore:
-        connection.send_result(msg_id, chore.to_dict())
-    else:
-        connection.send_error(msg_id, "not_found", "Chore not found")
-
-
-@websocket_api.websocket_command(
-    {
-        vol.Required("type"): "famdo/claim_chore",
-        vol.Required("chore_id"): str,
-        vol.Required("member_id"): str,
-    }
-)
-@websocket_api.async_response
-async def websocket_claim_chore(
-    hass: HomeAssistant,
-    connection: websocket_api.ActiveConnection,
-    msg: dict[str, Any],
-) -> None:
-    """Claim a chore."""
-    coordinator = _get_coordinator(hass)
-    chore = await coordinator.async_claim_chore(msg["chore_id"], msg["member_id"])
-    if chore:
-        connection.send_result(msg["id"], chore.to_dict())
-    else:
-        connection.send_error(msg["id"], "failed", "Could not claim chore")
-
-
-@websocket_api.websocket_command(
-    {
-        vol.Required("type"): "famdo/complete_chore",
-        vol.Required("chore_id"): str,
-        vol.Required("member_id"): str,
-    }
-)
-@websocket_api.async_response
-async def websocket_complete_chore(
-    hass: HomeAssistant,
-    connection: websocket_api.ActiveConnection,
-    msg: dict[str, Any],
-) -> None:
-    """Complete a chore."""
-    coordinator = _get_coordinator(hass)
-    chore = await coordinator.async_complete_chore(msg["chore_id"], msg["member_id"])
-    if chore:
-        connection.send_result(msg["id"], chore.to_dict())
-    else:
-        connection.send_error(msg["id"], "failed", "Could not complete chore")
-
+def _command_schema(command: Command) -> dict:
+    """Translate a registry command's fields into a voluptuous schema."""
+    return _fields_schema(command.name, command.fields)
 
-@websocket_api.websocket_command(
-    {
-        vol.Required("type"): "famdo/approve_chore",
-        vol.Required("chore_id"): str,
-        vol.Required("approver_id"): str,
-    }
-)
-@websocket_api.async_response
-async def websocket_approve_chore(
-    hass: HomeAssistant,
-    connection: websocket_api.ActiveConnection,
-    msg: dict[str, Any],
-) -> None:
-    """Approve a chore."""
-    coordinator = _get_coordinator(hass)
-    approver_id = msg["approver_id"]
 
-    # Handle ha_user: prefix - verify HA user is admin
-    if approver_id.startswith("ha_user:"):
-        ha_user_id = approver_id[8:]  # Strip "ha_user:" prefix
-        # Check if the connection user matches and is admin
-        if connection.user and connection.user.id == ha_user_id:
-            if not connection.user.is_admin:
-                connection.send_error(msg["id"], "unauthorized", "Only admin users can approve chores")
-                return
-            # Try to find a parent member linked to this HA user
-            for member in coordinator.famdo_data.members:
-                if member.ha_user_id == ha_user_id and member.role == "parent":
-                    approver_id = member.id
-                    break
-            else:
-                # No linked member, find any parent for approval
-                for member in coordinator.famdo_data.members:
-                    if member.role == "parent":
-                        approver_id = member.id
-                        break
-                else:
-                    connection.send_error(msg["id"], "failed", "No parent member found. Please create a parent member first.")
-                    return
+def _fields_schema(name: str, fields: tuple[Field, ...]) -> dict:
+    """Build the voluptuous schema for command *name* taking *fields*."""
+    schema: dict = {vol.Required("type"): name}
+    for field in fields:
+        if field.required:
+            key = vol.Required(field.name)
+        elif field.has_default:
+            key = vol.Optional(field.name, default=field.default)
         else:
-            connection.send_error(msg["id"], "unauthorized", "User mismatch")
+            key = vol.Optional(field.name)
+        validator = _field_validator(field.types)
+        if field.min is not None or field.max is not None:
+            validator = vol.All(validator, vol.Range(min=field.min, max=field.max))
+        schema[key] = validator
+    return schema
+
+
+def _build_command_handler(command: Command):
+    """Wrap a registry command as an HA WebSocket command handler."""
+
+    @websocket_api.websocket_command(_command_schema(command))
+    @websocket_api.async_response
+    async def _handler(
+        hass: HomeAssistant,
+        connection: websocket_api.ActiveConnection,
+        msg: dict[str, Any],
+    ) -> None:
+        params = {k: v for k, v in msg.items() if k not in ("id", "type")}
+        try:
+            result = await execute(command, _ConnectionContext(hass, connection), params)
+        except CommandError as err:
+            connection.send_error(msg["id"], err.code, err.message)
             return
+        connection.send_result(msg["id"], result)
 
-    chore = await coordinator.async_approve_chore(msg["chore_id"], approver_id)
-    if chore:
-        connection.send_result(msg["id"], chore.to_dict())
-    else:
-        connection.send_error(msg["id"], "failed", "Could not approve chore")
+    _handler.__doc__ = command.handler.__doc__
+    return _handler
 
 
-@websocket_api.websocket_command(
-    {
-        vol.Required("type"): "famdo/reject_chore",
-        vol.Required("chore_id"): str,
-        vol.Required("approver_id"): str,
-    }
-)
-@websocket_api.async_response
-async def websocket_reject_chore(
-    hass: HomeAssistant,
-    connection: websocket_api.ActiveConnection,
-    msg: dict[str, Any],
-) -> None:
-    """Reject a chore."""
-    coordinator = _get_coordinator(hass)
-    approver_id = msg["approver_id"]
-
-    # Handle ha_user: prefix - verify HA user is admin
-    if approver_id.startswith("ha_user:"):
-        ha_user_id = approver_id[8:]  # Strip "ha_user:" prefix
-        if connection.user and connection.user.id == ha_user_id:
-            if not connection.user.is_admin:
-                connection.send_error(msg["id"], "unauthorized", "Only admin users can reject chores")
-                return
-            # Try to find a parent member linked to this HA user
-            for member in coordinator.famdo_data.members:
-                if member.ha_user_id == ha_user_id and member.role == "parent":
-                    approver_id = member.id
-                    break
-            else:
-                # No linked member, find any parent
-                for member in coordinator.famdo_data.members:
-                    if member.role == "parent":
-                        approver_id = member.id
-                        break
-                else:
-                    connection.send_error(msg["id"], "failed", "No parent member found. Please create a parent member first.")
-                    return
-        else:
-            connection.send_error(msg["id"], "unauthorized", "User mismatch")
-            return
-
-    chore = await coordinator.async_reject_chore(msg["chore_id"], approver_id)
-    if chore:
-        connection.send_result(msg["id"], chore.to_dict())
-    else:
-        connection.send_error(msg["id"], "failed", "Could not reject chore")
+# ==================== Subscription ====================
 
 
-@websocket_api.websocket_command(
-    {
-        vol.Required("type"): "famdo/retry_chore",
-        vol.Required("chore_id"): str,
-        vol.Required("member_id"): str,
-    }
-)
+@websocket_api.websocket_command(_fields_schema("famdo/subscribe", SUBSCRIBE_FIELDS))
 @websocket_api.async_response
-async def websocket_retry_chore(
+async def websocket_subscribe(
     hass: HomeAssistant,
     connection: websocket_api.ActiveConnection,
     msg: dict[str, Any],
 ) -> None:
-    """Retry a rejected chore."""
-    coordinator = _get_coordinator(hass)
-    chore = await coordinator.async_retry_chore(msg["chore_id"], msg["member_id"])
-    if chore:
-        connection.send_result(msg["id"], chore.to_dict())
-    else:
-        connection.send_error(msg["id"], "failed", "Could not retry chore")
-
+    """Subscribe to FamDo data updates.
 
-@websocket_api.websocket_command(
-    {
-        vol.Required("type"): "famdo/reactivate_template",
-        vol.Required("template_id"): str,
-        vol.Required("approver_id"): str,
-    }
-)
-@websocket_api.async_response
-async def websocket_reactivate_template(
-    hass: HomeAssistant,
-    connection: websocket_api.ActiveConnection,
-    msg: dict[str, Any],
-) -> None:
-    """Reactivate a recurring chore template by creating a new instance."""
+    Bursts of mutations are coalesced so each subscriber gets at most one
+    push per ``throttle_ms``, always carrying the latest data. With ``delta``
+    the result is ``{"version", "data"}`` and pushes only carry the records
+    changed since the previous one.
+    """
     coordinator = _get_coordinator(hass)
-    approver_id = msg["approver_id"]
+    # Versions never change, so to_dict() and JSON encoding run in the
+    # executor. A sequence number drops pushes overtaken by a newer one.
+    state = {"seq": 0, "sent": 0, "closed": False}
+    initial_sent = asyncio.Event()
+    last_version = coordinator.snapshot()
 
-    # Handle ha_user: prefix - verify HA user is admin
-    if approver_id.startswith("ha_user:"):
-        ha_user_id = approver_id[8:]  # Strip "ha_user:" prefix
-        if connection.user and connection.user.id == ha_user_id:
-            if not connection.user.is_admin:
-                connection.send_error(msg["id"], "unauthorized", "Only admin users can reactivate templates")
-                return
-            # Try to find a parent member linked to this HA user
-            for member in coordinator.famdo_data.members:
-                if member.ha_user_id == ha_user_id and member.role == "parent":
-                    approver_id = member.id
-                    break
-            else:
-                # No linked member, find any parent
-                for member in coordinator.famdo_data.members:
-                    if member.role == "parent":
-                        approver_id = member.id
-                        break
-                else:
-                    connection.send_error(msg["id"], "failed", "No parent member found. Please create a parent member first.")
-                    return
-        else:
-            connection.send_error(msg["id"], "unauthorized", "User mismatch")
+    async def _async_push(seq: int, version: DataVersion) -> None:
+        payload = await hass.async_add_executor_job(
+            lambda: json_bytes(
+                websocket_api.event_message(
+                    msg["id"], {"data": version.data.to_dict(), "version": version.number}
+                )
+            )
+        )
+        await initial_sent.wait()
+        if state["closed"] or seq <= state["sent"]:
             return
+        state["sent"] = seq
+        connection.send_message(payload)
 
-    chore = await coordinator.async_reactivate_template(msg["template_id"], approver_id)
-    if chore:
-        connection.send_result(msg["id"], chore.to_dict())
-    else:
-        connection.send_error(msg["id"], "failed", "Could not reactivate template")
-
-
-@websocket_api.websocket_command(
-    {
-        vol.Required("type"): "famdo/delete_chore",
-        vol.Required("chore_id"): str,
-    }
-)
-@websocket_api.async_response
-async def websocket_delete_chore(
-    hass: HomeAssistant,
-    connection: websocket_api.ActiveConnection,
-    msg: dict[str, Any],
-) -> None:
-    """Delete a chore."""
-    coordinator = _get_coordinator(hass)
-    success = await coordinator.async_delete_chore(msg["chore_id"])
-    connection.send_result(msg["id"], {"success": success})
-
-
-# ==================== Reward Management ====================
-
-
-@websocket_api.websocket_command(
-    {
-        vol.Required("type"): "famdo/add_reward",
-        vol.Required("name"): str,
-        vol.Optional("description", default=""): str,
-        vol.Optional("points_cost", default=50): int,
-        vol.Optional("icon", default="mdi:gift"): str,
-        vol.Optional("image_url"): vol.Any(str, None),
-        vol.Optional("quantity", default=-1): int,
-    }
-)
-@websocket_api.async_response
-async def websocket_add_reward(
-    hass: HomeAssistant,
-    connection: websocket_api.ActiveConnection,
-    msg: dict[str, Any],
-) -> None:
-    """Add a reward."""
-    coordinator = _get_coordinator(hass)
-    reward = await coordinator.async_add_reward(
-        name=msg["name"],
-        description=msg.get("description", ""),
-        points_cost=msg.get("points_cost", 50),
-        icon=msg.get("icon", "mdi:gift"),
-        image_url=msg.get("image_url"),
-        quantity=msg.get("quantity", -1),
-    )
-    connection.send_result(msg["id"], reward.to_dict())
-
-
-@websocket_api.websocket_command(
-    {
-        vol.Required("type"): "famdo/update_reward",
-        vol.Required("reward_id"): str,
-        vol.Optional("name"): str,
-        vol.Optional("description"): str,
-        vol.Optional("points_cost"): int,
-        vol.Optional("icon"): str,
-        vol.Optional("image_url"): vol.Any(str, None),
-        vol.Optional("quantity"): int,
-        vol.Optional("available"): bool,
-    }
-)
-@websocket_api.async_response
-async def websocket_update_reward(
-    hass: HomeAssistant,
-    connection: websocket_api.ActiveConnection,
-    msg: dict[str, Any],
-) -> None:
-    """Update a reward."""
-    coordinator = _get_coordinator(hass)
-    reward_id = msg.pop("reward_id")
-    msg.pop("type")
-    msg_id = msg.pop("id")
-
-    reward = await coordinator.async_update_reward(reward_id, **msg)
-    if reward:
-        connection.send_result(msg_id, reward.to_dict())
-    else:
-        connection.send_error(msg_id, "not_found", "Reward not found")
-
-
-@websocket_api.websocket_command(
-    {
-        vol.Required("type"): "famdo/claim_reward",
-        vol.Required("reward_id"): str,
-        vol.Required("member_id"): str,
-    }
-)
-@websocket_api.async_response
-async def websocket_claim_reward(
-    hass: HomeAssistant,
-    connection: websocket_api.ActiveConnection,
-    msg: dict[str, Any],
-) -> None:
-    """Claim a reward."""
-    coordinator = _get_coordinator(hass)
-    claim = await coordinator.async_claim_reward(msg["reward_id"], msg["member_id"])
-    if claim:
-        connection.send_result(msg["id"], claim.to_dict())
-    else:
-        connection.send_error(msg["id"], "failed", "Could not claim reward")
-
-
-@websocket_api.websocket_command(
-    {
-        vol.Required("type"): "famdo/fulfill_reward_claim",
-        vol.Required("claim_id"): str,
-        vol.Required("fulfiller_id"): str,
-    }
-)
-@websocket_api.async_response
-async def websocket_fulfill_reward_claim(
-    hass: HomeAssistant,
-    connection: websocket_api.ActiveConnection,
-    msg: dict[str, Any],
-) -> None:
-    """Fulfill a reward claim (mark as delivered)."""
-    coordinator = _get_coordinator(hass)
-    fulfiller_id = msg["fulfiller_id"]
-
-    # Handle ha_user: prefix - verify HA user is admin
-    if fulfiller_id.startswith("ha_user:"):
-        ha_user_id = fulfiller_id[8:]  # Strip "ha_user:" prefix
-        if connection.user and connection.user.id == ha_user_id:
-            if not connection.user.is_admin:
-                connection.send_error(msg["id"], "unauthorized", "Only admin users can fulfill rewards")
-                return
-            # Try to find a parent member linked to this HA user
-            for member in coordinator.famdo_data.members:
-                if member.ha_user_id == ha_user_id and member.role == "parent":
-                    fulfiller_id = member.id
-                    break
-            else:
-                # No linked member, find any parent
-                for member in coordinator.famdo_data.members:
-                    if member.role == "parent":
-                        fulfiller_id = member.id
-                        break
-                else:
-                    connection.send_error(msg["id"], "failed", "No parent member found. Please create a parent member first.")
-                    return
-        else:
-            connection.send_error(msg["id"], "unauthorized", "User mismatch")
+    async def _async_push_delta() -> None:
+        nonlocal last_version
+        await initial_sent.wait()
+        if state["closed"]:
             return
+        # Diffing follows pointers and only changed records are serialized,
+        # so this stays on the loop (and in order)
+        version = coordinator.snapshot()
+        changes = diff_versions(last_version, version)
+        last_version = version
+        if changes:
+            connection.send_message(
+                websocket_api.event_message(msg["id"], {"delta": changes.to_dict()})
+            )
 
-    claim = await coordinator.async_fulfill_reward_claim(msg["claim_id"], fulfiller_id)
-    if claim:
-        connection.send_result(msg["id"], claim.to_dict())
-    else:
-        connection.send_error(msg["id"], "failed", "Could not fulfill reward claim")
+    @callback
+    def async_update() -> None:
+        """Send update to subscriber."""
+        if msg["delta"]:
+            hass.async_create_task(_async_push_delta())
+            return
+        state["seq"] += 1
+        hass.async_create_task(_async_push(state["seq"], coordinator.snapshot()))
 
+    # Subscribe to updates
+    throttler = PushThrottler(hass.loop, msg["throttle_ms"] / 1000, async_update)
+    unsub = coordinator.async_add_listener(throttler.trigger)
 
-@websocket_api.websocket_command(
-    {
-        vol.Required("type"): "famdo/delete_reward",
-        vol.Required("reward_id"): str,
-    }
-)
-@websocket_api.async_response
-async def websocket_delete_reward(
-    hass: HomeAssistant,
-    connection: websocket_api.ActiveConnection,
-    msg: dict[str, Any],
-) -> None:
-    """Delete a reward."""
-    coordinator = _get_coordinator(hass)
-    success = await coordinator.async_delete_reward(msg["reward_id"])
-    connection.send_result(msg["id"], {"success": success})
+    @callback
+    def async_unsub() -> None:
+        """Stop pending pushes and remove the listener."""
+        state["closed"] = True
+        throttler.cancel()
+        unsub()
 
+    connection.subscriptions[msg["id"]] = async_unsub
 
-# ==================== Todo Management ====================
+    # Send initial data. Queued pushes wait for it, so release them even on
+    # failure; they see the subscription closed and drop out.
+    try:
+        data = await async_data_dict(last_version)
+        if msg["delta"]:
+            data = {"version": last_version.number, "data": data}
+        connection.send_result(msg["id"], data)
+    except Exception:
+        _LOGGER.exception("Error sending initial data for subscription %s", msg["id"])
+        connection.subscriptions.pop(msg["id"], None)
+        async_unsub()
+        connection.send_error(msg["id"], "failed", "Could not send the initial data")
+    finally:
+        initial_sent.set()
 
 
-@websocket_api.websocket_command(
-    {
-        vol.Required("type"): "famdo/add_todo",
-        vol.Required("title"): str,
-        vol.Optional("description", default=""): str,
-        vol.Optional("assigned_to"): vol.Any(str, None),
-        vol.Optional("due_date"): vol.Any(str, None),
-        vol.Optional("priority", default="normal"): str,
-        vol.Optional("category", default="general"): str,
-        vol.Optional("created_by"): vol.Any(str, None),
-    }
-)
-@websocket_api.async_response
-async def websocket_add_todo(
-    hass: HomeAssistant,
-    connection: websocket_api.ActiveConnection,
-    msg: dict[str, Any],
-) -> None:
-    """Add a todo item."""
-    coordinator = _get_coordinator(hass)
-    todo = await coordinator.async_add_todo(
-        title=msg["title"],
-        description=msg.get("description", ""),
-        assigned_to=msg.get("assigned_to"),
-        due_date=msg.get("due_date"),
-        priority=msg.get("priority", "normal"),
-        category=msg.get("category", "general"),
-        created_by=msg.get("created_by"),
-    )
-    connection.send_result(msg["id"], todo.to_dict())
-
+# ==================== Home Assistant Calendar Integration ====================
 
-@websocket_api.websocket_command(
-    {
-        vol.Required("type"): "famdo/update_todo",
-        vol.Required("todo_id"): str,
-        vol.Optional("title"): str,
-        vol.Optional("description"): str,
-        vol.Optional("assigned_to"): vol.Any(str, None),
-        vol.Optional("due_date"): vol.Any(str, None),
-        vol.Optional("priority"): str,
-        vol.Optional("category"): str,
-        vol.Optional("completed"): bool,
-    }
-)
-@websocket_api.async_response
-async def websocket_update_todo(
-    hass: HomeAssistant,
-    connection: websocket_api.ActiveConnection,
-    msg: dict[str, Any],
-) -> None:
-    """Update a todo item."""
-    coordinator = _get_coordinator(hass)
-    todo_id = msg.pop("todo_id")
-    msg.pop("type")
-    msg_id = msg.pop("id")
 
-    todo = await coordinator.async_update_todo(todo_id, **msg)
-    if todo:
-        connection.send_result(msg_id, todo.to_dict())
-    else:
-        connection.send_error(msg_id, "not_found", "Todo not found")
+def _calendar_fetcher(hass: HomeAssistant, entity_id: str):
+    """Return a cache fetch for one calendar entity's events."""
 
+    async def _async_fetch(start: datetime, end: datetime) -> list[CachedEvent]:
+        calendar_component = hass.data.get("calendar")
+        entity = calendar_component.get_entity(entity_id) if calendar_component else None
+        if entity is None or not hasattr(entity, "async_get_events"):
+            return []
+        events = await entity.async_get_events(hass, start, end)
+        return [
+            (
+                event.start_datetime_local,
+                event.end_datetime_local,
+                {
+                    "summary": event.summary,
+                    "start": event.start.isoformat() if event.start else None,
+                    "end": event.end.isoformat() if event.end else None,
+                    "description": event.description,
+                    "location": event.location,
+                    "uid": getattr(event, "uid", None),
+                },
+            )
+            for event in events
+        ]
 
-@websocket_api.websocket_command(
-    {
-        vol.Required("type"): "famdo/complete_todo",
-        vol.Required("todo_id"): str,
-    }
-)
-@websocket_api.async_response
-async def websocket_complete_todo(
-    hass: HomeAssistant,
-    connection: websocket_api.ActiveConnection,
-    msg: dict[str, Any],
-) -> None:
-    """Complete a todo item."""
-    coordinator = _get_coordinator(hass)
-    todo = await coordinator.async_complete_todo(msg["todo_id"])
-    if todo:
-        connection.send_result(msg["id"], todo.to_dict())
-    else:
-        connection.send_error(msg["id"], "not_found", "Todo not found")
+    return _async_fetch
 
 
 @websocket_api.websocket_command(
     {
-        vol.Required("type"): "famdo/delete_todo",
-        vol.Required("todo_id"): str,
+        vol.Required("type"): "famdo/get_ha_calendars",
+        vol.Optional("revision"): int,
     }
 )
-@websocket_api.async_response
-async def websocket_delete_todo(
+@callback
+def websocket_get_ha_calendars(
     hass: HomeAssistant,
     connection: websocket_api.ActiveConnection,
     msg: dict[str, Any],
 ) -> None:
-    """Delete a todo item."""
-    coordinator = _get_coordinator(hass)
-    success = await coordinator.async_delete_todo(msg["todo_id"])
-    connection.send_result(msg["id"], {"success": success})
-
-
-# ==================== Calendar Event Management ====================
+    """Get list of Home Assistant calendar entities.
 
-
-@websocket_api.websocket_command(
-    {
-        vol.Required("type"): "famdo/add_event",
-        vol.Required("title"): str,
-        vol.Required("start_date"): str,
-        vol.Optional("description", default=""): str,
-        vol.Optional("end_date"): vol.Any(str, None),
-        vol.Optional("start_time"): vol.Any(str, None),
-        vol.Optional("end_time"): vol.Any(str, None),
-        vol.Optional("all_day", default=True): bool,
-        vol.Optional("member_ids"): vol.Any(list, None),
-        vol.Optional("color"): vol.Any(str, None),
-        vol.Optional("recurrence", default="none"): str,
-        vol.Optional("location", default=""): str,
-    }
-)
-@websocket_api.async_response
-async def websocket_add_event(
-    hass: HomeAssistant,
-    connection: websocket_api.ActiveConnection,
-    msg: dict[str, Any],
-) -> None:
-    """Add a calendar event."""
-    coordinator = _get_coordinator(hass)
-    event = await coordinator.async_add_event(
-        title=msg["title"],
-        start_date=msg["start_date"],
-        description=msg.get("description", ""),
-        end_date=msg.get("end_date"),
-        start_time=msg.get("start_time"),
-        end_time=msg.get("end_time"),
-        all_day=msg.get("all_day", True),
-        member_ids=msg.get("member_ids"),
-        color=msg.get("color"),
-        recurrence=msg.get("recurrence", "none"),
-        location=msg.get("location", ""),
+    Served from the calendar registry. A client that passes the ``revision``
+    it already has gets ``{"revision": n, "unchanged": true}`` back instead
+    of the list.
+    """
+    registry: CalendarRegistry = hass.data[DOMAIN]["calendar_registry"]
+    if msg.get("revision") == registry.revision:
+        connection.send_result(msg["id"], {"revision": registry.revision, "unchanged": True})
+        return
+    connection.send_result(
+        msg["id"], {"calendars": registry.listing(), "revision": registry.revision}
     )
-    connection.send_result(msg["id"], event.to_dict())
-
-
-@websocket_api.websocket_command(
-    {
-        vol.Required("type"): "famdo/update_event",
-        vol.Required("event_id"): str,
-        vol.Optional("title"): str,
-        vol.Optional("description"): str,
-        vol.Optional("start_date"): str,
-        vol.Optional("end_date"): vol.Any(str, None),
-        vol.Optional("start_time"): vol.Any(str, None),
-        vol.Optional("end_time"): vol.Any(str, None),
-        vol.Optional("all_day"): bool,
-        vol.Optional("member_ids"): vol.Any(list, None),
-        vol.Optional("color"): vol.Any(str, None),
-        vol.Optional("recurrence"): str,
-        vol.Optional("location"): str,
-    }
-)
-@websocket_api.async_response
-async def websocket_update_event(
-    hass: HomeAssistant,
-    connection: websocket_api.ActiveConnection,
-    msg: dict[str, Any],
-) -> None:
-    """Update a calendar event."""
-    coordinator = _get_coordinator(hass)
-    event_id = msg.pop("event_id")
-    msg.pop("type")
-    msg_id = msg.pop("id")
-
-    event = await coordinator.async_update_event(event_id, **msg)
-    if event:
-        connection.send_result(msg_id, event.to_dict())
-    else:
-        connection.send_error(msg_id, "not_found", "Event not found")
-
-
-@websocket_api.websocket_command(
-    {
-        vol.Required("type"): "famdo/delete_event",
-        vol.Required("event_id"): str,
-    }
-)
-@websocket_api.async_response
-async def websocket_delete_event(
-    hass: HomeAssistant,
-    connection: websocket_api.ActiveConnection,
-    msg: dict[str, Any],
-) -> None:
-    """Delete a calendar event."""
-    coordinator = _get_coordinator(hass)
-    success = await coordinator.async_delete_event(msg["event_id"])
-    connection.send_result(msg["id"], {"success": success})
-
-
-# ==================== Settings ====================
-
-
-@websocket_api.websocket_command(
-    {
-        vol.Required("type"): "famdo/update_settings",
-        vol.Optional("family_name"): str,
-        vol.Optional("selected_calendars"): list,
-        vol.Optional("calendar_colors"): dict,
-        vol.Optional("time_format"): str,  # "12h" or "24h"
-    }
-)
-@websocket_api.async_response
-async def websocket_update_settings(
-    hass: HomeAssistant,
-    connection: websocket_api.ActiveConnection,
-    msg: dict[str, Any],
-) -> None:
-    """Update settings."""
-    coordinator = _get_coordinator(hass)
-    msg.pop("type")
-    msg_id = msg.pop("id")
-
-    if "family_name" in msg:
-        await coordinator.async_update_family_name(msg.pop("family_name"))
-
-    if "selected_calendars" in msg:
-        await coordinator.async_update_settings(selected_calendars=msg.pop("selected_calendars"))
-
-    if "calendar_colors" in msg:
-        await coordinator.async_update_settings(calendar_colors=msg.pop("calendar_colors"))
-
-    if "time_format" in msg:
-        await coordinator.async_update_settings(time_format=msg.pop("time_format"))
-
-    if msg:
-        await coordinator.async_update_settings(**msg)
-
-    connection.send_result(msg_id, {"success": True})
-
-
-# ==================== Home Assistant Calendar Integration ====================
-
-
-@websocket_api.websocket_command({vol.Required("type"): "famdo/get_ha_calendars"})
-@websocket_api.async_response
-async def websocket_get_ha_calendars(
-    hass: HomeAssistant,
-    connection: websocket_api.ActiveConnection,
-    msg: dict[str, Any],
-) -> None:
-    """Get list of Home Assistant calendar entities."""
-    calendars = []
-    for entity_id in hass.states.async_entity_ids("calendar"):
-        state = hass.states.get(entity_id)
-        if state:
-            calendars.append({
-                "entity_id": entity_id,
-                "name": state.attributes.get("friendly_name", entity_id),
-            })
-    connection.send_result(msg["id"], {"calendars": calendars})
 
 
 @websocket_api.websocket_command(
@@ -934,214 +300,96 @@ async def websocket_get_ha_calendars(
     }
 )
 @websocket_api.async_response
+@METRICS.timed("command.famdo/get_ha_calendar_events")
 async def websocket_get_ha_calendar_events(
     hass: HomeAssistant,
     connection: websocket_api.ActiveConnection,
     msg: dict[str, Any],
 ) -> None:
-    """Get events from a Home Assistant calendar entity."""
-    from datetime import datetime
+    """Get events from a Home Assistant calendar entity.
 
+    Results are cached per window (see :class:`CalendarEventCache`), so
+    panels and kiosks refreshing the same range share one fetch.
+    """
     entity_id = msg["entity_id"]
-    start = datetime.fromisoformat(msg["start"])
-    end = datetime.fromisoformat(msg["end"])
+    start = dt_util.as_local(datetime.fromisoformat(msg["start"]))
+    end = dt_util.as_local(datetime.fromisoformat(msg["end"]))
 
     try:
-        # Use the calendar component to get events
-        calendar_component = hass.data.get("calendar")
-        if calendar_component:
-            entity = calendar_component.get_entity(entity_id)
-            if entity and hasattr(entity, "async_get_events"):
-                events = await entity.async_get_events(hass, start, end)
-                event_list = []
-                for event in events:
-                    event_list.append({
-                        "summary": event.summary,
-                        "start": event.start.isoformat() if event.start else None,
-                        "end": event.end.isoformat() if event.end else None,
-                        "description": event.description,
-                        "location": event.location,
-                        "uid": getattr(event, "uid", None),
-                    })
-                connection.send_result(msg["id"], {"events": event_list})
-                return
-
-        # Fallback: try using service call
-        connection.send_result(msg["id"], {"events": []})
+        cache: CalendarEventCache = hass.data[DOMAIN]["calendar_cache"]
+        event_list = await cache.async_get(
+            entity_id, start, end, _calendar_fetcher(hass, entity_id)
+        )
     except Exception as e:
         _LOGGER.error("Error fetching calendar events: %s", e)
-        connection.send_result(msg["id"], {"events": []})
-
-
-# ==================== Data Management ====================
+        event_list = []
+    connection.send_result(msg["id"], {"events": event_list})
 
 
 @websocket_api.websocket_command(
     {
-        vol.Required("type"): "famdo/update_reward_claim",
-        vol.Required("claim_id"): str,
-        vol.Optional("status"): str,
-        vol.Optional("points_spent"): int,
-        vol.Optional("fulfilled_at"): vol.Any(str, None),
+        vol.Required("type"): "famdo/get_merged_events",
+        vol.Required("start"): str,
+        vol.Required("end"): str,
+        vol.Optional("entity_ids", default=[]): [str],
+        vol.Optional("include_events", default=True): bool,
+        vol.Optional("include_chores", default=True): bool,
+        vol.Optional("timeout", default=MERGED_EVENTS_TIMEOUT): vol.All(
+            vol.Coerce(float), vol.Range(min=0.1, max=MAX_MERGED_EVENTS_TIMEOUT)
+        ),
+        vol.Optional("limit"): vol.All(_strict_int, vol.Range(min=1)),
     }
 )
 @websocket_api.async_response
-async def websocket_update_reward_claim(
+@METRICS.timed("command.famdo/get_merged_events")
+async def websocket_get_merged_events(
     hass: HomeAssistant,
     connection: websocket_api.ActiveConnection,
     msg: dict[str, Any],
 ) -> None:
-    """Update a reward claim."""
-    coordinator = _get_coordinator(hass)
-    claim_id = msg.pop("claim_id")
-    msg.pop("type")
-    msg_id = msg.pop("id")
-
-    claim = await coordinator.async_update_reward_claim(claim_id, **msg)
-    if claim:
-        connection.send_result(msg_id, claim.to_dict())
-    else:
-        connection.send_error(msg_id, "not_found", "Reward claim not found")
-
-
-@websocket_api.websocket_command(
-    {
-        vol.Required("type"): "famdo/delete_reward_claim",
-        vol.Required("claim_id"): str,
-    }
-)
-@websocket_api.async_response
-async def websocket_delete_reward_claim(
-    hass: HomeAssistant,
-    connection: websocket_api.ActiveConnection,
-    msg: dict[str, Any],
-) -> None:
-    """Delete a reward claim."""
-    coordinator = _get_coordinator(hass)
-    success = await coordinator.async_delete_reward_claim(msg["claim_id"])
-    connection.send_result(msg["id"], {"success": success})
+    """Get FamDo events, chore due dates and several HA calendars as one list.
 
+    Calendars are fetched concurrently (through the event cache), each given
+    at most ``timeout`` seconds. Ones that fail or time out are listed under
+    ``failed`` and left out rather than failing the whole request.
+    """
+    try:
+        start = dt_util.as_local(datetime.fromisoformat(msg["start"]))
+        end = dt_util.as_local(datetime.fromisoformat(msg["end"]))
+    except ValueError as err:
+        connection.send_error(
+            msg["id"], "invalid_format", f"start and end must be ISO datetimes: {err}"
+        )
+        return
+    tz = start.tzinfo
+    entity_ids = list(dict.fromkeys(msg["entity_ids"]))
+    cache: CalendarEventCache = hass.data[DOMAIN]["calendar_cache"]
+
+    async def _async_get(entity_id: str) -> list[dict]:
+        return await asyncio.wait_for(
+            cache.async_get(entity_id, start, end, _calendar_fetcher(hass, entity_id)),
+            msg["timeout"],
+        )
 
-@websocket_api.websocket_command(
-    {
-        vol.Required("type"): "famdo/delete_all_chores",
-        vol.Optional("keep_templates", default=False): bool,
-    }
-)
-@websocket_api.async_response
-async def websocket_delete_all_chores(
-    hass: HomeAssistant,
-    connection: websocket_api.ActiveConnection,
-    msg: dict[str, Any],
-) -> None:
-    """Delete all chores."""
-    coordinator = _get_coordinator(hass)
-    count = await coordinator.async_delete_all_chores(
-        keep_templates=msg.get("keep_templates", False)
+    results = await asyncio.gather(
+        *(_async_get(entity_id) for entity_id in entity_ids), return_exceptions=True
     )
-    connection.send_result(msg["id"], {"success": True, "count": count})
-
-
-@websocket_api.websocket_command(
-    {
-        vol.Required("type"): "famdo/delete_all_rewards",
-    }
-)
-@websocket_api.async_response
-async def websocket_delete_all_rewards(
-    hass: HomeAssistant,
-    connection: websocket_api.ActiveConnection,
-    msg: dict[str, Any],
-) -> None:
-    """Delete all rewards."""
-    coordinator = _get_coordinator(hass)
-    count = await coordinator.async_delete_all_rewards()
-    connection.send_result(msg["id"], {"success": True, "count": count})
-
-
-@websocket_api.websocket_command(
-    {
-        vol.Required("type"): "famdo/delete_all_reward_claims",
-    }
-)
-@websocket_api.async_response
-async def websocket_delete_all_reward_claims(
-    hass: HomeAssistant,
-    connection: websocket_api.ActiveConnection,
-    msg: dict[str, Any],
-) -> None:
-    """Delete all reward claims."""
-    coordinator = _get_coordinator(hass)
-    count = await coordinator.async_delete_all_reward_claims()
-    connection.send_result(msg["id"], {"success": True, "count": count})
-
-
-@websocket_api.websocket_command(
-    {
-        vol.Required("type"): "famdo/delete_all_todos",
-    }
-)
-@websocket_api.async_response
-async def websocket_delete_all_todos(
-    hass: HomeAssistant,
-    connection: websocket_api.ActiveConnection,
-    msg: dict[str, Any],
-) -> None:
-    """Delete all todos."""
-    coordinator = _get_coordinator(hass)
-    count = await coordinator.async_delete_all_todos()
-    connection.send_result(msg["id"], {"success": True, "count": count})
-
-
-@websocket_api.websocket_command(
-    {
-        vol.Required("type"): "famdo/delete_all_events",
-    }
-)
-@websocket_api.async_response
-async def websocket_delete_all_events(
-    hass: HomeAssistant,
-    connection: websocket_api.ActiveConnection,
-    msg: dict[str, Any],
-) -> None:
-    """Delete all calendar events."""
-    coordinator = _get_coordinator(hass)
-    count = await coordinator.async_delete_all_events()
-    connection.send_result(msg["id"], {"success": True, "count": count})
-
-
-@websocket_api.websocket_command(
-    {
-        vol.Required("type"): "famdo/delete_all_members",
-    }
-)
-@websocket_api.async_response
-async def websocket_delete_all_members(
-    hass: HomeAssistant,
-    connection: websocket_api.ActiveConnection,
-    msg: dict[str, Any],
-) -> None:
-    """Delete all family members."""
-    coordinator = _get_coordinator(hass)
-    count = await coordinator.async_delete_all_members()
-    connection.send_result(msg["id"], {"success": True, "count": count})
 
+    # FamDo's own sources go first so their copies win over the FamDo entities'
+    data = _get_coordinator(hass).snapshot().data
+    sources = []
+    if msg["include_events"]:
+        sources.append(famdo_events(data, start, end, tz))
+    if msg["include_chores"]:
+        sources.append(chore_events(data, start, end, tz))
+    failed = []
+    for entity_id, result in zip(entity_ids, results):
+        if isinstance(result, BaseException):
+            _LOGGER.warning("Error fetching calendar events for %s: %r", entity_id, result)
+            failed.append(entity_id)
+        else:
+            sources.append(calendar_events(result, entity_id, tz))
 
-@websocket_api.websocket_command(
-    {
-        vol.Required("type"): "famdo/clear_all_data",
-        vol.Optional("keep_members", default=False): bool,
-    }
-)
-@websocket_api.async_response
-async def websocket_clear_all_data(
-    hass: HomeAssistant,
-    connection: websocket_api.ActiveConnection,
-    msg: dict[str, Any],
-) -> None:
-    """Clear all FamDo data - reset the entire installation."""
-    coordinator = _get_coordinator(hass)
-    counts = await coordinator.async_clear_all_data(
-        keep_members=msg.get("keep_members", False)
+    connection.send_result(
+        msg["id"], {"events": merge_events(sources, msg.get("limit")), "failed": failed}
     )
-    connection.send_result(msg["id"], {"success": True, "counts": counts})
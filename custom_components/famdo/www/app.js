@@ -13,6 +13,7 @@ class FamDoAdminApp {
         this.subscriptionId = null;
         this.messageId = 1;
         this.haCalendars = [];
+        this.haCalendarsRevision = null;
         this.selectedChores = new Set();
         this.selectedClaims = new Set();
 
@@ -232,11 +233,16 @@ class FamDoAdminApp {
 
     async loadHACalendars() {
         try {
-            const result = await this.sendCommand('famdo/get_ha_calendars');
-            this.haCalendars = result.calendars || [];
+            const params = this.haCalendarsRevision === null ? {} : { revision: this.haCalendarsRevision };
+            const result = await this.sendCommand('famdo/get_ha_calendars', params);
+            this.haCalendarsRevision = result.revision ?? null;
+            if (!result.unchanged) {
+                this.haCalendars = result.calendars || [];
+            }
         } catch (error) {
             console.error('Failed to load HA calendars:', error);
             this.haCalendars = [];
+            this.haCalendarsRevision = null;
         }
     }
 
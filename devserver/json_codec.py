@@ -0,0 +1,29 @@
+"""Pluggable JSON codec for the dev server and MockStore.
+
+The codec is shared with FamDoStore's snapshot backend; this loads
+custom_components/famdo/json_codec.py by path so the package __init__ (which
+imports homeassistant) never runs.
+"""
+from __future__ import annotations
+
+import importlib.util as _ilu
+import os
+import sys
+
+_NAME = "custom_components.famdo.json_codec"
+
+if _NAME not in sys.modules:
+    _path = os.path.join(
+        os.path.abspath(os.path.join(os.path.dirname(__file__), "..")),
+        "custom_components", "famdo", "json_codec.py",
+    )
+    _spec = _ilu.spec_from_file_location(_NAME, _path)
+    _module = _ilu.module_from_spec(_spec)
+    sys.modules[_NAME] = _module
+    _spec.loader.exec_module(_module)
+
+from custom_components.famdo.json_codec import (  # noqa: E402, F401
+    JsonCodec,
+    available_codecs,
+    get_codec,
+)
@@ -29,7 +29,12 @@ def _load_module(name: str, path: str):
 
 
 _load_module("custom_components.famdo.const", os.path.join(_famdo_dir, "const.py"))
+_load_module("custom_components.famdo.lazy", os.path.join(_famdo_dir, "lazy.py"))
+_load_module("custom_components.famdo.metrics", os.path.join(_famdo_dir, "metrics.py"))
 _models = _load_module("custom_components.famdo.models", os.path.join(_famdo_dir, "models.py"))
+_load_module("custom_components.famdo.query", os.path.join(_famdo_dir, "query.py"))
+_load_module("custom_components.famdo.versions", os.path.join(_famdo_dir, "versions.py"))
+_load_module("custom_components.famdo.transfer", os.path.join(_famdo_dir, "transfer.py"))
 
 from custom_components.famdo.const import (  # noqa: E402
     CHORE_STATUS_PENDING,
@@ -50,6 +55,8 @@ from custom_components.famdo.const import (  # noqa: E402
     EVENT_REWARD_CLAIMED,
     EVENT_REWARD_FULFILLED,
 )
+from custom_components.famdo.lazy import hot_items  # noqa: E402
+from custom_components.famdo.metrics import METRICS  # noqa: E402
 from custom_components.famdo.models import (  # noqa: E402
     FamilyMember,
     Chore,
@@ -58,14 +65,24 @@ from custom_components.famdo.models import (  # noqa: E402
     TodoItem,
     CalendarEvent,
     FamDoData,
+    index_template_instances,
     generate_id,
 )
+from custom_components.famdo.query import FamDoQueryIndex, record_filter  # noqa: E402
+from custom_components.famdo.transfer import (  # noqa: E402
+    EXPORT_PAGE_SIZE,
+    FamDoTransfer,
+    TransferError,
+    apply_import,
+)
+from custom_components.famdo.versions import DataVersion, DataVersions  # noqa: E402
 
 from .mock_storage import MockStore  # noqa: E402
 
 _LOGGER = logging.getLogger(__name__)
 
 
+@METRICS.timed_methods("coordinator")
 class MockCoordinator:
     """Coordinator that mirrors FamDoCoordinator without any Home Assistant dependency."""
 
@@ -73,6 +90,8 @@ class MockCoordinator:
         """Initialize the coordinator."""
         self.store = store
         self._data: FamDoData | None = None
+        self._query_index = FamDoQueryIndex()
+        self._transfer = FamDoTransfer()
         self._listeners: list[Callable[[], None]] = []
         self._event_log: list[dict[str, Any]] = []
 
@@ -91,11 +110,12 @@ class MockCoordinator:
 
     def async_set_updated_data(self, data: FamDoData | None) -> None:
         """Notify all listeners that data changed (replaces HA helper)."""
-        for cb in list(self._listeners):
-            try:
-                cb()
-            except Exception:  # noqa: BLE001
-                _LOGGER.exception("Error in listener callback")
+        with METRICS.timer("coordinator.listeners"):
+            for cb in list(self._listeners):
+                try:
+                    cb()
+                except Exception:  # noqa: BLE001
+                    _LOGGER.exception("Error in listener callback")
 
     def _fire_event(self, event_type: str, data: dict[str, Any]) -> None:
         """Log an event (replaces hass.bus.async_fire)."""
@@ -113,11 +133,40 @@ class MockCoordinator:
 
     @property
     def famdo_data(self) -> FamDoData:
-        """Get the FamDo data."""
+        """Get the FamDo data (the draft; edit it through ``self._versions``)."""
         if self._data is None:
             raise RuntimeError("Data not loaded")
         return self._data
 
+    @property
+    def _versions(self) -> DataVersions:
+        return self.store.versions
+
+    def snapshot(self) -> DataVersion:
+        """Return the last saved version; it never changes (O(1))."""
+        return self.store.versions.current
+
+    def query(self, collection: str, **kwargs: Any) -> dict[str, Any]:
+        """Run a filtered, paged query over a collection of the last saved version."""
+        return self._query_index.query(self.snapshot().data, collection, **kwargs)
+
+    def _remove_by_id(self, name: str, item_id: str) -> bool:
+        """Remove the record *item_id* from collection *name* with a single scan."""
+        for index, item in enumerate(getattr(self.famdo_data, name)):
+            if item.id == item_id:
+                del self._versions.collection(name)[index]
+                return True
+        return False
+
+    def _remove_where(self, name: str, matches: Callable[[Any], bool]) -> int:
+        """Drop the records of *name* that match, rebuilding the list in one pass."""
+        items = getattr(self.famdo_data, name)
+        kept = [item for item in items if not matches(item)]
+        removed = len(items) - len(kept)
+        if removed:
+            self._versions.replace_collection(name, kept)
+        return removed
+
     # ------------------------------------------------------------------
     # Periodic maintenance (replaces _async_update_data polling)
     # ------------------------------------------------------------------
@@ -142,7 +191,8 @@ class MockCoordinator:
         now = datetime.now()
         changed = False
 
-        for chore in self._data.chores:
+        # Settled chores are never overdue, so the cold ones need not load
+        for index, chore in enumerate(hot_items(self._data.chores)):
             # Skip templates - only check instances
             if chore.is_template:
                 continue
@@ -157,6 +207,7 @@ class MockCoordinator:
                             minute=int(time_parts[1]) if len(time_parts) > 1 else 0,
                         )
                     if now > due:
+                        chore = self._versions.edit_at("chores", index)
                         chore.status = CHORE_STATUS_OVERDUE
                         changed = True
 
@@ -167,6 +218,7 @@ class MockCoordinator:
                             if member_id:
                                 member = self._data.get_member_by_id(member_id)
                                 if member:
+                                    member = self._versions.edit("members", member)
                                     member.points = max(0, member.points - chore.negative_points)
                                     _LOGGER.info(
                                         "Applied -%d points to %s for overdue chore: %s",
@@ -189,21 +241,23 @@ class MockCoordinator:
         changed = False
 
         # Find all recurring templates (time-based only, not always_on)
+        chores = hot_items(self._data.chores)
         templates = [
-            c for c in self._data.chores
+            c for c in chores
             if c.is_template and c.recurrence in [RECURRENCE_DAILY, RECURRENCE_WEEKLY, RECURRENCE_MONTHLY]
         ]
+        # One pass over the chores instead of two per template
+        instances = index_template_instances(chores)
 
         for template in templates:
-            # Count active (non-completed) instances for this template
-            active_instances = self._count_active_instances(template.id)
+            entry = instances.get(template.id)
 
             # Don't create more instances if at max
-            if active_instances >= template.max_instances:
+            if entry is not None and entry.active >= template.max_instances:
                 continue
 
             # Check if we need to create a new instance based on time
-            last_created = self._get_last_instance_created(template.id)
+            last_created = entry.last_created if entry is not None else None
 
             should_create = False
             if last_created is None:
@@ -232,7 +286,7 @@ class MockCoordinator:
         if self._data is None:
             return 0
         return sum(
-            1 for c in self._data.chores
+            1 for c in hot_items(self._data.chores)
             if c.template_id == template_id and c.status not in (CHORE_STATUS_COMPLETED, CHORE_STATUS_REJECTED)
         )
 
@@ -240,8 +294,9 @@ class MockCoordinator:
         """Get the creation time of the most recent instance."""
         if self._data is None:
             return None
+        # A template's newest instance is never cold
         instances = [
-            c for c in self._data.chores
+            c for c in hot_items(self._data.chores)
             if c.template_id == template_id
         ]
         if not instances:
@@ -280,7 +335,7 @@ class MockCoordinator:
             negative_points=template.negative_points,
             max_instances=template.max_instances,
         )
-        self._data.chores.append(instance)
+        self._versions.collection("chores").append(instance)
         _LOGGER.debug("Created new instance of recurring chore: %s", template.name)
         return instance
 
@@ -300,7 +355,7 @@ class MockCoordinator:
             color=color,
             avatar=avatar,
         )
-        self.famdo_data.members.append(member)
+        self._versions.collection("members").append(member)
         await self.store.async_save()
         self.async_set_updated_data(self._data)
         return member
@@ -315,6 +370,7 @@ class MockCoordinator:
         if member is None:
             return None
 
+        member = self._versions.edit("members", member)
         for key, value in kwargs.items():
             if hasattr(member, key):
                 setattr(member, key, value)
@@ -325,11 +381,9 @@ class MockCoordinator:
 
     async def async_remove_member(self, member_id: str) -> bool:
         """Remove a family member."""
-        member = self.famdo_data.get_member_by_id(member_id)
-        if member is None:
+        if not self._remove_by_id("members", member_id):
             return False
 
-        self.famdo_data.members.remove(member)
         await self.store.async_save()
         self.async_set_updated_data(self._data)
         return True
@@ -340,6 +394,7 @@ class MockCoordinator:
         if member is None:
             return None
 
+        member = self._versions.edit("members", member)
         member.points += points
         await self.store.async_save()
 
@@ -388,7 +443,7 @@ class MockCoordinator:
                 negative_points=negative_points,
                 max_instances=max_instances,
             )
-            self.famdo_data.chores.append(template)
+            self._versions.collection("chores").append(template)
 
             # Create the first instance
             instance = await self._create_chore_instance(template, due_date)
@@ -410,7 +465,7 @@ class MockCoordinator:
                 negative_points=negative_points,
                 max_instances=1,
             )
-            self.famdo_data.chores.append(chore)
+            self._versions.collection("chores").append(chore)
             await self.store.async_save()
             self.async_set_updated_data(self._data)
             return chore
@@ -425,6 +480,7 @@ class MockCoordinator:
         if chore is None:
             return None
 
+        chore = self._versions.edit("chores", chore)
         for key, value in kwargs.items():
             if hasattr(chore, key):
                 setattr(chore, key, value)
@@ -442,6 +498,7 @@ class MockCoordinator:
         if chore.status not in [CHORE_STATUS_PENDING, CHORE_STATUS_OVERDUE]:
             return None
 
+        chore = self._versions.edit("chores", chore)
         chore.status = CHORE_STATUS_CLAIMED
         chore.claimed_by = member_id
         await self.store.async_save()
@@ -457,6 +514,7 @@ class MockCoordinator:
         if chore.claimed_by != member_id:
             return None
 
+        chore = self._versions.edit("chores", chore)
         chore.status = CHORE_STATUS_AWAITING_APPROVAL
         chore.completed_at = datetime.now().isoformat()
         await self.store.async_save()
@@ -480,6 +538,7 @@ class MockCoordinator:
         if chore.status != CHORE_STATUS_AWAITING_APPROVAL:
             return None
 
+        chore = self._versions.edit("chores", chore)
         chore.status = CHORE_STATUS_COMPLETED
         chore.approved_by = approver_id
 
@@ -529,6 +588,7 @@ class MockCoordinator:
         if chore.status != CHORE_STATUS_AWAITING_APPROVAL:
             return None
 
+        chore = self._versions.edit("chores", chore)
         chore.status = CHORE_STATUS_REJECTED
 
         # For always_on recurring chores, create a new instance immediately
@@ -562,6 +622,7 @@ class MockCoordinator:
         if chore.status != CHORE_STATUS_REJECTED:
             return None
 
+        chore = self._versions.edit("chores", chore)
         chore.status = CHORE_STATUS_CLAIMED
         chore.completed_at = None
         await self.store.async_save()
@@ -595,11 +656,9 @@ class MockCoordinator:
 
     async def async_delete_chore(self, chore_id: str) -> bool:
         """Delete a chore."""
-        chore = self.famdo_data.get_chore_by_id(chore_id)
-        if chore is None:
+        if not self._remove_by_id("chores", chore_id):
             return False
 
-        self.famdo_data.chores.remove(chore)
         await self.store.async_save()
         self.async_set_updated_data(self._data)
         return True
@@ -624,7 +683,7 @@ class MockCoordinator:
             image_url=image_url,
             quantity=quantity,
         )
-        self.famdo_data.rewards.append(reward)
+        self._versions.collection("rewards").append(reward)
         await self.store.async_save()
         self.async_set_updated_data(self._data)
         return reward
@@ -639,6 +698,7 @@ class MockCoordinator:
         if reward is None:
             return None
 
+        reward = self._versions.edit("rewards", reward)
         for key, value in kwargs.items():
             if hasattr(reward, key):
                 setattr(reward, key, value)
@@ -667,10 +727,12 @@ class MockCoordinator:
             return None
 
         # Deduct points
+        member = self._versions.edit("members", member)
         member.points -= reward.points_cost
 
         # Decrement quantity if limited
         if reward.quantity > 0:
+            reward = self._versions.edit("rewards", reward)
             reward.quantity -= 1
             if reward.quantity == 0:
                 reward.available = False
@@ -681,7 +743,7 @@ class MockCoordinator:
             member_id=member_id,
             points_spent=reward.points_cost,
         )
-        self.famdo_data.reward_claims.append(claim)
+        self._versions.collection("reward_claims").append(claim)
 
         self._fire_event(
             EVENT_REWARD_CLAIMED,
@@ -698,11 +760,9 @@ class MockCoordinator:
 
     async def async_delete_reward(self, reward_id: str) -> bool:
         """Delete a reward."""
-        reward = self.famdo_data.get_reward_by_id(reward_id)
-        if reward is None:
+        if not self._remove_by_id("rewards", reward_id):
             return False
 
-        self.famdo_data.rewards.remove(reward)
         await self.store.async_save()
         self.async_set_updated_data(self._data)
         return True
@@ -725,6 +785,7 @@ class MockCoordinator:
         if claim.status != "pending":
             return None
 
+        claim = self._versions.edit("reward_claims", claim)
         claim.status = "fulfilled"
         claim.fulfilled_at = datetime.now().isoformat()
 
@@ -752,6 +813,7 @@ class MockCoordinator:
         if claim is None:
             return None
 
+        claim = self._versions.edit("reward_claims", claim)
         for key, value in kwargs.items():
             if hasattr(claim, key):
                 setattr(claim, key, value)
@@ -762,11 +824,9 @@ class MockCoordinator:
 
     async def async_delete_reward_claim(self, claim_id: str) -> bool:
         """Delete a reward claim."""
-        claim = self.famdo_data.get_reward_claim_by_id(claim_id)
-        if claim is None:
+        if not self._remove_by_id("reward_claims", claim_id):
             return False
 
-        self.famdo_data.reward_claims.remove(claim)
         await self.store.async_save()
         self.async_set_updated_data(self._data)
         return True
@@ -774,7 +834,7 @@ class MockCoordinator:
     async def async_delete_all_reward_claims(self) -> int:
         """Delete all reward claims."""
         count = len(self.famdo_data.reward_claims)
-        self.famdo_data.reward_claims.clear()
+        self._versions.replace_collection("reward_claims", [])
         await self.store.async_save()
         self.async_set_updated_data(self._data)
         _LOGGER.info("Deleted %d reward claims", count)
@@ -802,7 +862,7 @@ class MockCoordinator:
             category=category,
             created_by=created_by,
         )
-        self.famdo_data.todos.append(todo)
+        self._versions.collection("todos").append(todo)
         await self.store.async_save()
         self.async_set_updated_data(self._data)
         return todo
@@ -813,8 +873,9 @@ class MockCoordinator:
         **kwargs: Any,
     ) -> TodoItem | None:
         """Update a todo item."""
-        for todo in self.famdo_data.todos:
+        for index, todo in enumerate(self.famdo_data.todos):
             if todo.id == todo_id:
+                todo = self._versions.edit_at("todos", index)
                 for key, value in kwargs.items():
                     if hasattr(todo, key):
                         setattr(todo, key, value)
@@ -825,8 +886,9 @@ class MockCoordinator:
 
     async def async_complete_todo(self, todo_id: str) -> TodoItem | None:
         """Mark a todo as completed."""
-        for todo in self.famdo_data.todos:
+        for index, todo in enumerate(self.famdo_data.todos):
             if todo.id == todo_id:
+                todo = self._versions.edit_at("todos", index)
                 todo.completed = True
                 todo.completed_at = datetime.now().isoformat()
                 await self.store.async_save()
@@ -836,18 +898,16 @@ class MockCoordinator:
 
     async def async_delete_todo(self, todo_id: str) -> bool:
         """Delete a todo item."""
-        for todo in self.famdo_data.todos:
-            if todo.id == todo_id:
-                self.famdo_data.todos.remove(todo)
-                await self.store.async_save()
-                self.async_set_updated_data(self._data)
-                return True
-        return False
+        if not self._remove_by_id("todos", todo_id):
+            return False
+        await self.store.async_save()
+        self.async_set_updated_data(self._data)
+        return True
 
     async def async_delete_all_todos(self) -> int:
         """Delete all todo items."""
         count = len(self.famdo_data.todos)
-        self.famdo_data.todos.clear()
+        self._versions.replace_collection("todos", [])
         await self.store.async_save()
         self.async_set_updated_data(self._data)
         _LOGGER.info("Deleted %d todos", count)
@@ -883,7 +943,7 @@ class MockCoordinator:
             recurrence=recurrence,
             location=location,
         )
-        self.famdo_data.events.append(event)
+        self._versions.collection("events").append(event)
         await self.store.async_save()
         self.async_set_updated_data(self._data)
         return event
@@ -894,8 +954,9 @@ class MockCoordinator:
         **kwargs: Any,
     ) -> CalendarEvent | None:
         """Update a calendar event."""
-        for event in self.famdo_data.events:
+        for index, event in enumerate(self.famdo_data.events):
             if event.id == event_id:
+                event = self._versions.edit_at("events", index)
                 for key, value in kwargs.items():
                     if hasattr(event, key):
                         setattr(event, key, value)
@@ -906,18 +967,16 @@ class MockCoordinator:
 
     async def async_delete_event(self, event_id: str) -> bool:
         """Delete a calendar event."""
-        for event in self.famdo_data.events:
-            if event.id == event_id:
-                self.famdo_data.events.remove(event)
-                await self.store.async_save()
-                self.async_set_updated_data(self._data)
-                return True
-        return False
+        if not self._remove_by_id("events", event_id):
+            return False
+        await self.store.async_save()
+        self.async_set_updated_data(self._data)
+        return True
 
     async def async_delete_all_events(self) -> int:
         """Delete all calendar events."""
         count = len(self.famdo_data.events)
-        self.famdo_data.events.clear()
+        self._versions.replace_collection("events", [])
         await self.store.async_save()
         self.async_set_updated_data(self._data)
         _LOGGER.info("Deleted %d events", count)
@@ -927,7 +986,7 @@ class MockCoordinator:
 
     async def async_update_settings(self, **kwargs: Any) -> dict:
         """Update settings."""
-        self.famdo_data.settings.update(kwargs)
+        self._versions.settings().update(kwargs)
         await self.store.async_save()
         self.async_set_updated_data(self._data)
         return self.famdo_data.settings
@@ -939,18 +998,83 @@ class MockCoordinator:
         self.async_set_updated_data(self._data)
         return name
 
+    # ==================== Import / Export ====================
+
+    async def async_import(
+        self,
+        records: dict[str, Any],
+        *,
+        import_id: str | None = None,
+        final: bool = True,
+        replace: bool = False,
+        family_name: str | None = None,
+        settings: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        """Validate a chunk of serialized records and stage it under *import_id*.
+
+        The final chunk inserts everything staged as one version with a
+        single save. Raises :class:`TransferError` if a record is invalid.
+        """
+        try:
+            staged = self._transfer.stage(import_id, records)
+        except TransferError:
+            self._transfer.discard(import_id)
+            raise
+        if not final:
+            return {"staged": sum(len(batch) for batch in staged.values())}
+        self._transfer.discard(import_id)
+        result = apply_import(
+            self._versions,
+            staged,
+            replace=replace,
+            family_name=family_name,
+            settings=settings,
+        )
+        await self.store.async_save()
+        self.async_set_updated_data(self._data)
+        _LOGGER.info(
+            "Imported %d new and %d updated records", result["added"], result["updated"]
+        )
+        return result
+
+    def export_page(
+        self, cursor: str | None = None, limit: int = EXPORT_PAGE_SIZE
+    ) -> dict[str, Any]:
+        """Return the next page of an export of the last saved version.
+
+        See :meth:`FamDoTransfer.export_page`.
+        """
+        return self._transfer.export_page(self.snapshot(), cursor, limit)
+
     # ==================== Bulk Delete Operations ====================
 
+    async def async_delete_where(
+        self, collection: str, *, dry_run: bool = False, **filters: Any
+    ) -> int:
+        """Delete the records of *collection* matching every filter, in one pass.
+
+        Takes the filters of :func:`record_filter` (status, member, template,
+        age). With *dry_run* nothing changes and the number of records that
+        would be deleted is returned. Raises :class:`QueryError` for
+        unsupported filters.
+        """
+        matches = record_filter(collection, **filters)
+        if dry_run:
+            return sum(1 for item in getattr(self.famdo_data, collection) if matches(item))
+        count = self._remove_where(collection, matches)
+        if count:
+            await self.store.async_save()
+            self.async_set_updated_data(self._data)
+        _LOGGER.info("Deleted %d %s matching %s", count, collection, filters)
+        return count
+
     async def async_delete_all_chores(self, keep_templates: bool = False) -> int:
         """Delete all chores."""
         if keep_templates:
-            to_delete = [c for c in self.famdo_data.chores if not c.is_template]
+            count = self._remove_where("chores", lambda chore: not chore.is_template)
         else:
-            to_delete = list(self.famdo_data.chores)
-
-        count = len(to_delete)
-        for chore in to_delete:
-            self.famdo_data.chores.remove(chore)
+            count = len(self.famdo_data.chores)
+            self._versions.replace_collection("chores", [])
 
         await self.store.async_save()
         self.async_set_updated_data(self._data)
@@ -960,7 +1084,7 @@ class MockCoordinator:
     async def async_delete_all_rewards(self) -> int:
         """Delete all rewards."""
         count = len(self.famdo_data.rewards)
-        self.famdo_data.rewards.clear()
+        self._versions.replace_collection("rewards", [])
         await self.store.async_save()
         self.async_set_updated_data(self._data)
         _LOGGER.info("Deleted %d rewards", count)
@@ -969,7 +1093,7 @@ class MockCoordinator:
     async def async_delete_all_members(self) -> int:
         """Delete all family members."""
         count = len(self.famdo_data.members)
-        self.famdo_data.members.clear()
+        self._versions.replace_collection("members", [])
         await self.store.async_save()
         self.async_set_updated_data(self._data)
         _LOGGER.info("Deleted %d members", count)
@@ -986,17 +1110,17 @@ class MockCoordinator:
             "members": 0 if keep_members else len(self.famdo_data.members),
         }
 
-        self.famdo_data.chores.clear()
-        self.famdo_data.rewards.clear()
-        self.famdo_data.reward_claims.clear()
-        self.famdo_data.todos.clear()
-        self.famdo_data.events.clear()
+        self._versions.replace_collection("chores", [])
+        self._versions.replace_collection("rewards", [])
+        self._versions.replace_collection("reward_claims", [])
+        self._versions.replace_collection("todos", [])
+        self._versions.replace_collection("events", [])
 
         if keep_members:
-            for member in self.famdo_data.members:
-                member.points = 0
+            for index in range(len(self.famdo_data.members)):
+                self._versions.edit_at("members", index).points = 0
         else:
-            self.famdo_data.members.clear()
+            self._versions.replace_collection("members", [])
 
         if not keep_members:
             self.famdo_data.family_name = "Our Family"
@@ -2,10 +2,11 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
 import os
+import shutil
 import sys
+import time
 
 # Import models directly to avoid pulling in homeassistant via the package __init__
 import importlib.util as _ilu
@@ -26,20 +27,104 @@ def _load_module(name: str, path: str):
 
 # Load const first (models depends on it via relative import)
 _load_module("custom_components.famdo.const", os.path.join(_famdo_dir, "const.py"))
+# Keep an already imported lazy module so isinstance checks agree across modules
+if "custom_components.famdo.lazy" not in sys.modules:
+    _load_module("custom_components.famdo.lazy", os.path.join(_famdo_dir, "lazy.py"))
+# Likewise keep one metrics registry for the whole process
+if "custom_components.famdo.metrics" not in sys.modules:
+    _load_module("custom_components.famdo.metrics", os.path.join(_famdo_dir, "metrics.py"))
 _models = _load_module("custom_components.famdo.models", os.path.join(_famdo_dir, "models.py"))
+if "custom_components.famdo.versions" not in sys.modules:
+    _load_module("custom_components.famdo.versions", os.path.join(_famdo_dir, "versions.py"))
 
 FamDoData = _models.FamDoData
+METRICS = sys.modules["custom_components.famdo.metrics"].METRICS
+DataVersions = sys.modules["custom_components.famdo.versions"].DataVersions
+
+from .json_codec import JsonCodec, get_codec  # noqa: E402
+from .snapshot import (  # noqa: E402
+    COMPRESSION_NONE,
+    FORMAT_JSON,
+    check_snapshot_support,
+    decode_snapshot,
+    encode_snapshot,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+# fsync policies: every save, at most once per FSYNC_BATCH_INTERVAL, or leave it to the OS
+FSYNC_ALWAYS = "always"
+FSYNC_BATCHED = "batched"
+FSYNC_NEVER = "never"
+FSYNC_POLICIES = (FSYNC_ALWAYS, FSYNC_BATCHED, FSYNC_NEVER)
+FSYNC_BATCH_INTERVAL = 1.0
+
+# Minimum age of the newest backup before another one is rotated in
+BACKUP_INTERVAL = 300.0
+
+
+def _fsync_path(path: str) -> None:
+    """fsync a file or directory by path."""
+    flags = os.O_RDONLY
+    if os.path.isdir(path):
+        flags |= getattr(os, "O_DIRECTORY", 0)
+    try:
+        fd = os.open(path, flags)
+    except OSError:
+        return  # e.g. directories cannot be opened on Windows
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
 
+
+@METRICS.timed_methods("store")
 class MockStore:
     """File-backed mock of FamDoStore for local development."""
 
-    def __init__(self, data_file: str = "devserver/data.json") -> None:
-        """Initialize the store."""
+    def __init__(
+        self,
+        data_file: str = "devserver/data.json",
+        codec: JsonCodec | None = None,
+        pretty: bool = False,
+        snapshot_format: str = FORMAT_JSON,
+        compression: str = COMPRESSION_NONE,
+        fsync: str = FSYNC_BATCHED,
+        backups: int = 0,
+        backup_interval: float = BACKUP_INTERVAL,
+        lazy: bool = False,
+    ) -> None:
+        """Initialize the store.
+
+        The file is written as compact JSON unless *pretty* is set, or as
+        MessagePack and/or gzip/zstd-compressed per *snapshot_format* and
+        *compression*; any of these is recognised on load. Saves go
+        to a temp file that is renamed over the data file, so a crash leaves
+        either the old or the new contents. *fsync* controls durability (see
+        ``FSYNC_POLICIES``); with *backups* > 0 the previous file is kept as
+        ``<data_file>.1`` … ``.N``, rotated at most every *backup_interval*
+        seconds. With *lazy*, historical records are materialized on first
+        access (see ``FamDoData.from_dict``).
+        """
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {', '.join(FSYNC_POLICIES)}")
         self._data_file = data_file
         self._data: FamDoData | None = None
+        self._versions: DataVersions | None = None
+        self._codec = codec or get_codec()
+        self._pretty = pretty
+        check_snapshot_support(snapshot_format, compression)
+        self._snapshot_format = snapshot_format
+        self._compression = compression
+        self._fsync = fsync
+        self._backups = backups
+        self._backup_interval = backup_interval
+        self._last_backup = 0.0
+        self._lazy = lazy
+        # Commands may run concurrently; never let two writes hit the file at once.
+        self._save_lock = asyncio.Lock()
+        self._fsync_handle: asyncio.TimerHandle | None = None
+        self._unsynced = False
 
     async def async_load(self) -> FamDoData:
         """Load data from the JSON file."""
@@ -47,31 +132,115 @@ class MockStore:
             return self._data
 
         def _read() -> FamDoData:
-            if not os.path.exists(self._data_file):
-                _LOGGER.debug("No data file found at %s, creating new", self._data_file)
-                return FamDoData()
-            with open(self._data_file, "r", encoding="utf-8") as fh:
-                raw = json.load(fh)
-            _LOGGER.debug("Loaded FamDo data from %s", self._data_file)
-            return FamDoData.from_dict(raw)
+            error: ValueError | None = None
+            for path in self._candidate_files():
+                if not os.path.exists(path):
+                    continue
+                try:
+                    with open(path, "rb") as fh:
+                        raw = decode_snapshot(fh.read(), self._codec)
+                except ValueError as err:
+                    _LOGGER.warning("Could not parse %s; trying the next backup", path)
+                    error = error or err
+                    continue
+                _LOGGER.debug("Loaded FamDo data from %s", path)
+                return FamDoData.from_dict(raw, lazy=self._lazy)
+            if error is not None:
+                # Never start from empty data on top of a file we could not read
+                raise error
+            _LOGGER.debug("No data file found at %s, creating new", self._data_file)
+            return FamDoData()
 
         self._data = await asyncio.to_thread(_read)
         return self._data
 
     async def async_save(self) -> None:
-        """Save data to the JSON file with pretty-printing."""
+        """Save data to the JSON file."""
         if self._data is None:
             return
 
+        # Publish the draft; the version never changes, so the thread can read it
+        snapshot = self.versions.commit().data
+
         def _write() -> None:
             directory = os.path.dirname(self._data_file)
             if directory and not os.path.isdir(directory):
                 os.makedirs(directory, exist_ok=True)
-            with open(self._data_file, "w", encoding="utf-8") as fh:
-                json.dump(self._data.to_dict(), fh, indent=2)
+            payload = encode_snapshot(
+                snapshot.to_dict(),
+                self._codec,
+                self._snapshot_format,
+                self._compression,
+                self._pretty,
+            )
+            tmp_path = f"{self._data_file}.tmp"
+            with open(tmp_path, "wb") as fh:
+                fh.write(payload)
+                if self._fsync == FSYNC_ALWAYS:
+                    fh.flush()
+                    os.fsync(fh.fileno())
+            self._rotate_backups()
+            os.replace(tmp_path, self._data_file)
+            if self._fsync == FSYNC_ALWAYS:
+                # Make the rename itself durable
+                _fsync_path(directory or ".")
 
         _LOGGER.debug("Saving FamDo data to %s", self._data_file)
-        await asyncio.to_thread(_write)
+        async with self._save_lock:
+            await asyncio.to_thread(_write)
+        if self._fsync == FSYNC_BATCHED:
+            self._schedule_fsync()
+
+    async def async_flush(self) -> None:
+        """fsync any saves still waiting on the batched fsync timer."""
+        if self._fsync_handle is not None:
+            self._fsync_handle.cancel()
+            self._fsync_handle = None
+        if not self._unsynced:
+            return
+        self._unsynced = False
+        async with self._save_lock:
+            await asyncio.to_thread(self._sync_data_file)
+
+    def _schedule_fsync(self) -> None:
+        self._unsynced = True
+        if self._fsync_handle is None:
+            loop = asyncio.get_running_loop()
+            self._fsync_handle = loop.call_later(FSYNC_BATCH_INTERVAL, self._fire_fsync)
+
+    def _fire_fsync(self) -> None:
+        self._fsync_handle = None
+        asyncio.ensure_future(self.async_flush())
+
+    def _sync_data_file(self) -> None:
+        _fsync_path(self._data_file)
+        _fsync_path(os.path.dirname(self._data_file) or ".")
+
+    def _candidate_files(self) -> list[str]:
+        """The data file followed by its backups, newest first."""
+        return [self._data_file] + [
+            f"{self._data_file}.{n}" for n in range(1, self._backups + 1)
+        ]
+
+    def _rotate_backups(self) -> None:
+        """Shift ``.1``..``.N-1`` up one slot and hard-link the current file to ``.1``."""
+        if self._backups <= 0 or not os.path.exists(self._data_file):
+            return
+        now = time.monotonic()
+        if self._last_backup and now - self._last_backup < self._backup_interval:
+            return
+        self._last_backup = now
+        for n in range(self._backups - 1, 0, -1):
+            older = f"{self._data_file}.{n}"
+            if os.path.exists(older):
+                os.replace(older, f"{self._data_file}.{n + 1}")
+        newest = f"{self._data_file}.1"
+        try:
+            # A link keeps the old contents once the data file is replaced,
+            # without copying and without a moment where the data file is missing.
+            os.link(self._data_file, newest)
+        except OSError:
+            shutil.copy2(self._data_file, newest)
 
     @property
     def data(self) -> FamDoData:
@@ -80,12 +249,26 @@ class MockStore:
             raise RuntimeError("Data not loaded. Call async_load first.")
         return self._data
 
+    @property
+    def versions(self) -> DataVersions:
+        """Copy-on-write versions of the loaded data."""
+        data = self.data
+        if self._versions is None or self._versions.draft is not data:
+            # First use, or the data was replaced wholesale (e.g. seeding)
+            self._versions = DataVersions(data)
+        return self._versions
+
     async def async_delete(self) -> None:
         """Delete the JSON file and reset data."""
 
         def _remove() -> None:
-            if os.path.exists(self._data_file):
-                os.remove(self._data_file)
+            for path in (self._data_file, f"{self._data_file}.tmp"):
+                if os.path.exists(path):
+                    os.remove(path)
 
+        if self._fsync_handle is not None:
+            self._fsync_handle.cancel()
+            self._fsync_handle = None
+        self._unsynced = False
         await asyncio.to_thread(_remove)
         self._data = None
@@ -0,0 +1,154 @@
+"""Profile the running dev server without code changes.
+
+Two modes:
+
+``cprofile``
+    Deterministic profile of the event loop thread: dispatch, coordinator
+    methods and everything else that runs on the loop. Writes a ``.pstats``
+    file (``python -m pstats``, snakeviz) and a ``.txt`` summary sorted by
+    cumulative time.
+``sample``
+    Samples the stacks of every thread every few milliseconds, so work
+    pushed to threads (``to_dict``, JSON encoding, ``MockStore`` writes) is
+    included. Writes a ``.collapsed`` file of ``frame;frame;frame count``
+    lines for flamegraph.pl or speedscope.
+
+Only one capture runs at a time.
+"""
+from __future__ import annotations
+
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+
+PROFILE_CPROFILE = "cprofile"
+PROFILE_SAMPLE = "sample"
+PROFILE_MODES = (PROFILE_CPROFILE, PROFILE_SAMPLE)
+
+SAMPLE_INTERVAL = 0.005
+MAX_PROFILE_SECONDS = 300
+SUMMARY_LINES = 40
+
+_active: ProfileCapture | None = None
+
+
+class ProfilerBusy(Exception):
+    """Another capture is already running."""
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    label = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+    # ';' separates frames in the collapsed format
+    return label.replace(";", ":")
+
+
+class _Sampler:
+    """Background thread collecting collapsed stacks of all other threads."""
+
+    def __init__(self, interval: float) -> None:
+        self._interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="famdo-profiler", daemon=True)
+        self.stacks: Counter[str] = Counter()
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> Counter[str]:
+        self._stop.set()
+        self._thread.join()
+        return self.stacks
+
+    def _run(self) -> None:
+        me = threading.get_ident()
+        while not self._stop.wait(self._interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                stack.append(names.get(ident, f"thread-{ident}").replace(";", ":"))
+                self.stacks[";".join(reversed(stack))] += 1
+
+
+class ProfileCapture:
+    """One profile, from :meth:`start` to :meth:`stop`."""
+
+    def __init__(self, mode: str = PROFILE_CPROFILE, interval: float = SAMPLE_INTERVAL) -> None:
+        """Prepare a capture in *mode* (see :data:`PROFILE_MODES`)."""
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"mode must be one of {', '.join(PROFILE_MODES)}")
+        self.mode = mode
+        self._interval = interval
+        self._profile: cProfile.Profile | None = None
+        self._sampler: _Sampler | None = None
+        self._stacks: Counter[str] | None = None
+        self._started = 0.0
+        self._thread = 0
+
+    def start(self) -> None:
+        """Start capturing; cProfile covers the calling thread only."""
+        global _active
+        if _active is not None:
+            raise ProfilerBusy(f"A {_active.mode} profile is already running")
+        _active = self
+        self._started = time.time()
+        self._thread = threading.get_ident()
+        if self.mode == PROFILE_CPROFILE:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        else:
+            self._sampler = _Sampler(self._interval)
+            self._sampler.start()
+
+    def stop(self) -> None:
+        """Stop capturing, on the thread that called :meth:`start`.
+
+        cProfile hooks only the thread that enabled it, and only that thread
+        can unhook it again. Disabling it anywhere else leaves it attached.
+        """
+        global _active
+        if self._profile is not None and threading.get_ident() != self._thread:
+            raise RuntimeError("A cProfile capture must be stopped on the thread that started it")
+        try:
+            if self._profile is not None:
+                self._profile.disable()
+            if self._sampler is not None:
+                self._stacks = self._sampler.stop()
+        finally:
+            _active = None
+
+    def write(self, out_dir: str) -> list[str]:
+        """Write a stopped capture's results to *out_dir*; return the paths.
+
+        Safe to run in a worker thread.
+        """
+        os.makedirs(out_dir, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(self._started))
+        base = os.path.join(out_dir, f"famdo-{self.mode}-{stamp}")
+        if self._stacks is not None:
+            path = f"{base}.collapsed"
+            with open(path, "w", encoding="utf-8") as out:
+                for stack, count in self._stacks.most_common():
+                    out.write(f"{stack} {count}\n")
+            return [path]
+
+        stats_path = f"{base}.pstats"
+        self._profile.dump_stats(stats_path)
+        summary = io.StringIO()
+        pstats.Stats(self._profile, stream=summary).sort_stats("cumulative").print_stats(
+            SUMMARY_LINES
+        )
+        summary_path = f"{base}.txt"
+        with open(summary_path, "w", encoding="utf-8") as out:
+            out.write(summary.getvalue())
+        return [stats_path, summary_path]
@@ -0,0 +1,161 @@
+"""Prometheus text exposition of dev server metrics, served at ``/metrics``.
+
+Connection, message, dispatch, push and data-size numbers are always
+collected. Per-stage timings such as ``store.save`` come from the shared
+latency registry and only appear when the server runs with ``--metrics``.
+"""
+from __future__ import annotations
+
+import os
+from collections import Counter
+from typing import Any, Iterable
+
+# Loaded by path (see mock_storage) before this module is imported
+from custom_components.famdo.metrics import (
+    BUCKET_COUNT,
+    BUCKETS_PER_DOUBLING,
+    Histogram,
+    Metrics,
+    bucket_bound,
+)
+from custom_components.famdo.versions import COLLECTIONS
+
+from .send_queue import SendQueueMetrics
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Message types outside the known commands are counted under this label
+OTHER_TYPE = "other"
+
+
+class ServerStats:
+    """Inbound counters and dispatch latency, aggregated over every connection."""
+
+    def __init__(self, known_types: Iterable[str]) -> None:
+        """Start with no connections; *known_types* become label values."""
+        self._known = frozenset(known_types)
+        self.connections = 0
+        self.messages: Counter[str] = Counter()
+        self.dispatch: dict[str, Histogram] = {}
+
+    def label(self, msg_type: str) -> str:
+        """Return the label for *msg_type*, keeping label cardinality bounded."""
+        return msg_type if msg_type in self._known else OTHER_TYPE
+
+    def received(self, msg_type: str) -> None:
+        """Count one inbound message."""
+        self.messages[self.label(msg_type)] += 1
+
+    def dispatched(self, msg_type: str, seconds: float) -> None:
+        """Record the time from receiving a message to queueing its reply."""
+        label = self.label(msg_type)
+        histogram = self.dispatch.get(label)
+        if histogram is None:
+            histogram = self.dispatch[label] = Histogram()
+        histogram.observe(seconds)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _rss_bytes() -> int | None:
+    """Return this process's resident set size, where ``/proc`` has it."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def _metric(lines: list[str], name: str, kind: str, help_text: str) -> None:
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} {kind}")
+
+
+def _histogram(lines: list[str], name: str, labels: dict[str, str], histogram: Histogram) -> None:
+    """Append one histogram series, with a bucket per doubling of latency."""
+    cumulative = 0
+    for index, count in enumerate(histogram.buckets):
+        cumulative += count
+        if (index + 1) % BUCKETS_PER_DOUBLING == 0 and index < BUCKET_COUNT - 1:
+            bound = f"{bucket_bound(index):.6g}"
+            lines.append(f"{name}_bucket{_labels({**labels, 'le': bound})} {cumulative}")
+    lines.append(f"{name}_bucket{_labels({**labels, 'le': '+Inf'})} {histogram.count}")
+    lines.append(f"{name}_sum{_labels(labels)} {histogram.total:.9g}")
+    lines.append(f"{name}_count{_labels(labels)} {histogram.count}")
+
+
+def render(
+    stats: ServerStats,
+    send_metrics: SendQueueMetrics,
+    coordinator: Any,
+    data_file: str,
+    metrics: Metrics,
+) -> str:
+    """Return every metric in the Prometheus text format."""
+    lines: list[str] = []
+
+    _metric(lines, "famdo_ws_connections", "gauge", "Open WebSocket connections.")
+    lines.append(f"famdo_ws_connections {stats.connections}")
+
+    _metric(lines, "famdo_ws_messages_received_total", "counter", "Inbound messages by type.")
+    for msg_type, count in sorted(stats.messages.items()):
+        lines.append(f"famdo_ws_messages_received_total{_labels({'type': msg_type})} {count}")
+
+    _metric(
+        lines, "famdo_ws_dispatch_seconds", "histogram",
+        "Time from receiving a message to queueing its reply, by type.",
+    )
+    for msg_type, histogram in sorted(stats.dispatch.items()):
+        _histogram(lines, "famdo_ws_dispatch_seconds", {"type": msg_type}, histogram)
+
+    sent = send_metrics.as_dict()
+    for key, kind, help_text in (
+        ("messages_sent", "counter", "Outbound messages, pushes included."),
+        ("bytes_sent", "counter", "Outbound bytes, pushes included."),
+        ("snapshots_sent", "counter", "Subscription pushes sent."),
+        ("snapshot_bytes_sent", "counter", "Bytes of subscription pushes sent."),
+        ("snapshots_dropped", "counter", "Subscription pushes superseded before sending."),
+        ("overflow_disconnects", "counter", "Clients dropped for falling behind."),
+        ("queue_depth", "gauge", "Outbound messages waiting, over all connections."),
+        ("max_queue_depth", "gauge", "Deepest outbound queue seen."),
+    ):
+        name = f"famdo_ws_{key}_total" if kind == "counter" else f"famdo_ws_{key}"
+        _metric(lines, name, kind, help_text)
+        lines.append(f"{name} {sent[key]}")
+
+    version = coordinator.snapshot()
+    _metric(lines, "famdo_data_version", "gauge", "Number of the last saved data version.")
+    lines.append(f"famdo_data_version {version.number}")
+    _metric(lines, "famdo_collection_records", "gauge", "Records per collection.")
+    for name in COLLECTIONS:
+        count = len(getattr(version.data, name))
+        lines.append(f"famdo_collection_records{_labels({'collection': name})} {count}")
+    _metric(lines, "famdo_data_file_bytes", "gauge", "Size of the data file on disk.")
+    try:
+        size = os.path.getsize(data_file)
+    except OSError:
+        size = 0
+    lines.append(f"famdo_data_file_bytes {size}")
+
+    rss = _rss_bytes()
+    if rss is not None:
+        _metric(lines, "process_resident_memory_bytes", "gauge", "Resident memory size.")
+        lines.append(f"process_resident_memory_bytes {rss}")
+
+    _metric(
+        lines, "famdo_stage_seconds", "histogram",
+        "Command, coordinator, store and serialization timings (needs --metrics).",
+    )
+    for stage, histogram in metrics.histograms():
+        _histogram(lines, "famdo_stage_seconds", {"stage": stage}, histogram)
+
+    lines.append("")
+    return "\n".join(lines)
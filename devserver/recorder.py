@@ -0,0 +1,121 @@
+"""Record inbound WebSocket traffic for replay (``--record``).
+
+A capture is JSON Lines, gzipped when the path ends in ``.gz``. The first
+line is a header; every other line is one event, timed in seconds since
+recording started, on a numbered connection::
+
+    {"format": "famdo-capture", "version": 1, "started": "...", "snapshot": "..."}
+    {"t": 0.512, "c": 1, "open": true}
+    {"t": 0.530, "c": 1, "msg": {"id": 1, "type": "famdo/subscribe"}}
+    {"t": 9.004, "c": 1, "close": true}
+
+Only commands are recorded. Auth messages are left out, so captures never
+hold tokens. The data file as it was when recording started is copied next
+to the capture (``<capture>.data``), so a replay can start from the same
+state. ``benchmarks/bench_replay.py`` plays captures back.
+"""
+from __future__ import annotations
+
+import gzip
+import logging
+import os
+import shutil
+import time
+from datetime import datetime
+from typing import IO, Any, Iterator
+
+from .json_codec import JsonCodec
+
+_LOGGER = logging.getLogger("famdo.devserver")
+
+CAPTURE_FORMAT = "famdo-capture"
+CAPTURE_VERSION = 1
+
+
+def _open(path: str, mode: str) -> IO[bytes]:
+    if path.endswith(".gz"):
+        return gzip.open(path, mode)  # type: ignore[return-value]
+    return open(path, mode)
+
+
+class TrafficRecorder:
+    """Append each connection's inbound commands to a capture file."""
+
+    def __init__(self, path: str, codec: JsonCodec, data_file: str | None = None) -> None:
+        """Start a capture at *path*, copying *data_file* next to it if it exists."""
+        self.path = path
+        self._codec = codec
+        self._start = time.monotonic()
+        self._connections = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        snapshot = None
+        if data_file and os.path.exists(data_file):
+            snapshot = f"{path}.data"
+            shutil.copyfile(data_file, snapshot)
+        self._out: IO[bytes] | None = _open(path, "wb")
+        self._write({
+            "format": CAPTURE_FORMAT,
+            "version": CAPTURE_VERSION,
+            "started": datetime.now().isoformat(),
+            "snapshot": os.path.basename(snapshot) if snapshot else None,
+        })
+        self._out.flush()
+        _LOGGER.info("Recording WebSocket traffic to %s", path)
+
+    def _write(self, entry: dict[str, Any]) -> None:
+        if self._out is not None:
+            self._out.write(self._codec.dumps(entry) + b"\n")
+
+    def _now(self) -> float:
+        return round(time.monotonic() - self._start, 4)
+
+    def opened(self) -> int:
+        """Record a new connection and return its number."""
+        self._connections += 1
+        self._write({"t": self._now(), "c": self._connections, "open": True})
+        return self._connections
+
+    def received(self, conn: int, msg: dict[str, Any]) -> None:
+        """Record one inbound command on connection *conn*."""
+        self._write({"t": self._now(), "c": conn, "msg": msg})
+
+    def closed(self, conn: int) -> None:
+        """Record the end of connection *conn* and flush what is buffered."""
+        self._write({"t": self._now(), "c": conn, "close": True})
+        if self._out is not None:
+            self._out.flush()
+
+    def close(self) -> None:
+        """Finish the capture file."""
+        if self._out is not None:
+            self._out.close()
+            self._out = None
+
+
+def read_capture(
+    path: str, codec: JsonCodec
+) -> tuple[dict[str, Any], Iterator[dict[str, Any]]]:
+    """Return the header of the capture at *path* and an iterator over its events.
+
+    A line cut short by a crash ends the capture instead of failing it.
+    """
+    with _open(path, "rb") as source:
+        try:
+            header = codec.loads(source.readline())
+        except ValueError as err:
+            raise ValueError(f"{path} is not a FamDo capture") from err
+    if not isinstance(header, dict) or header.get("format") != CAPTURE_FORMAT:
+        raise ValueError(f"{path} is not a FamDo capture")
+
+    def _events() -> Iterator[dict[str, Any]]:
+        with _open(path, "rb") as source:
+            source.readline()
+            try:
+                for line in source:
+                    yield codec.loads(line)
+            except (ValueError, EOFError):
+                _LOGGER.warning("Capture %s ends with a partial line", path)
+
+    return header, _events()
@@ -0,0 +1,65 @@
+"""Per-connection command scheduler for the dev server.
+
+Writes from one connection apply one at a time, in the order the client sent
+them: commands on different entities still interact (approving a chore and
+claiming a reward both move the same member's points), so there is no safe
+finer-grained order. Reads wait only for the writes sent before them, so a
+client always reads its own writes, and otherwise run concurrently with each
+other and with later writes.
+"""
+from __future__ import annotations
+
+import asyncio
+from typing import Awaitable, Callable
+
+
+class CommandScheduler:
+    """Schedule one connection's commands with read/write classification."""
+
+    def __init__(self, read_commands: frozenset[str]) -> None:
+        """Initialize the scheduler.
+
+        Reads are classified by the caller, normally from the command
+        registry's ``write`` flags; everything else is a write.
+        """
+        self._read_commands = read_commands
+        self._last_write: asyncio.Task | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    @property
+    def pending(self) -> int:
+        """Number of commands not yet finished."""
+        return len(self._tasks)
+
+    def submit(
+        self, msg_type: str, msg: dict, run: Callable[[], Awaitable[None]]
+    ) -> asyncio.Task:
+        """Schedule *run* for a command and return its task."""
+        previous = self._last_write
+        if previous is None:
+            task = asyncio.ensure_future(run())
+        else:
+            task = asyncio.ensure_future(self._run_after(previous, run))
+        if msg_type not in self._read_commands:
+            self._last_write = task
+            task.add_done_callback(self._release)
+
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def drain(self) -> None:
+        """Wait for every submitted command to finish."""
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    @staticmethod
+    async def _run_after(
+        previous: asyncio.Task, run: Callable[[], Awaitable[None]]
+    ) -> None:
+        await asyncio.wait((previous,))
+        await run()
+
+    def _release(self, task: asyncio.Task) -> None:
+        if self._last_write is task:
+            self._last_write = None
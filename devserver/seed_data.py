@@ -1,11 +1,21 @@
-"""Sample data generator for the FamDo dev server."""
+"""Sample data generator for the FamDo dev server.
+
+:func:`create_seed_data` is the small household the server starts with.
+:func:`generate_data` builds a synthetic one of any size, from 1k to 1M
+records, for benchmarks and load tests; see ``python devserver/seed_data.py
+--help``.
+"""
 
 from __future__ import annotations
 
+import argparse
+import asyncio
 import importlib.util as _ilu
 import os
+import random
 import sys
-from datetime import datetime, timedelta
+from collections import Counter
+from datetime import date, datetime, time, timedelta
 
 # Import models directly to avoid pulling in homeassistant via the package __init__
 _famdo_dir = os.path.join(
@@ -23,12 +33,19 @@ def _load_module(name: str, path: str):
 
 
 _const = _load_module("custom_components.famdo.const", os.path.join(_famdo_dir, "const.py"))
+# Keep an already imported lazy module so isinstance checks agree across modules
+if "custom_components.famdo.lazy" not in sys.modules:
+    _load_module("custom_components.famdo.lazy", os.path.join(_famdo_dir, "lazy.py"))
+# Likewise keep one metrics registry for the whole process
+if "custom_components.famdo.metrics" not in sys.modules:
+    _load_module("custom_components.famdo.metrics", os.path.join(_famdo_dir, "metrics.py"))
 _models = _load_module("custom_components.famdo.models", os.path.join(_famdo_dir, "models.py"))
 
 FamDoData = _models.FamDoData
 FamilyMember = _models.FamilyMember
 Chore = _models.Chore
 Reward = _models.Reward
+RewardClaim = _models.RewardClaim
 TodoItem = _models.TodoItem
 CalendarEvent = _models.CalendarEvent
 
@@ -36,9 +53,14 @@ ROLE_PARENT = _const.ROLE_PARENT
 ROLE_CHILD = _const.ROLE_CHILD
 CHORE_STATUS_PENDING = _const.CHORE_STATUS_PENDING
 CHORE_STATUS_CLAIMED = _const.CHORE_STATUS_CLAIMED
+CHORE_STATUS_AWAITING_APPROVAL = _const.CHORE_STATUS_AWAITING_APPROVAL
+CHORE_STATUS_COMPLETED = _const.CHORE_STATUS_COMPLETED
+CHORE_STATUS_REJECTED = _const.CHORE_STATUS_REJECTED
+CHORE_STATUS_OVERDUE = _const.CHORE_STATUS_OVERDUE
 RECURRENCE_NONE = _const.RECURRENCE_NONE
 RECURRENCE_DAILY = _const.RECURRENCE_DAILY
 RECURRENCE_WEEKLY = _const.RECURRENCE_WEEKLY
+RECURRENCE_MONTHLY = _const.RECURRENCE_MONTHLY
 RECURRENCE_ALWAYS_ON = _const.RECURRENCE_ALWAYS_ON
 
 
@@ -196,11 +218,391 @@ def create_seed_data() -> FamDoData:
     )
 
 
+# ── Synthetic data ──────────────────────────────────────────────────
+
+_NAMES = (
+    "Sarah", "Tom", "Emma", "Jake", "Lily", "Noah", "Mia", "Leo", "Ava", "Sam",
+    "Zoe", "Max",
+)
+_COLORS = (
+    "#FF6B6B", "#45B7D1", "#4ECDC4", "#96CEB4", "#FFEAA7", "#DDA0DD", "#F4A261",
+    "#8E9AAF",
+)
+_CHORES = (
+    ("Make Bed", "mdi:bed", 5),
+    ("Feed the Cat", "mdi:cat", 5),
+    ("Clean Room", "mdi:broom", 20),
+    ("Walk the Dog", "mdi:dog-side", 10),
+    ("Take Out Trash", "mdi:delete", 10),
+    ("Water Plants", "mdi:flower", 5),
+    ("Empty Dishwasher", "mdi:dishwasher", 10),
+    ("Vacuum Living Room", "mdi:vacuum", 15),
+    ("Fold Laundry", "mdi:tshirt-crew", 15),
+    ("Practice Piano", "mdi:piano", 10),
+    ("Set the Table", "mdi:silverware-fork-knife", 5),
+    ("Wash the Car", "mdi:car-wash", 25),
+)
+_REWARDS = (
+    ("Extra Screen Time (30 min)", "mdi:television", 30),
+    ("Choose Dinner", "mdi:food", 50),
+    ("Movie Night Pick", "mdi:movie", 75),
+    ("Stay Up Late", "mdi:weather-night", 60),
+    ("Ice Cream Trip", "mdi:ice-cream", 80),
+    ("Skip a Chore", "mdi:hand-back-right", 40),
+    ("New Book", "mdi:book", 120),
+    ("Day Out", "mdi:map-marker", 250),
+)
+_EVENTS = (
+    "Soccer Practice", "Dentist", "Swim Lesson", "Family Game Night", "Piano Lesson",
+    "Parent-Teacher Meeting", "Birthday Party", "Grocery Run", "Book Club", "Doctor",
+)
+_TODOS = (
+    "Buy groceries", "Schedule dentist appointment", "Renew library books", "Call plumber",
+    "Pay school fees", "Order birthday present", "Return parcel", "Book haircut",
+)
+_TODO_CATEGORIES = ("general", "shopping", "school", "home", "errands")
+_LOCATIONS = ("", "", "School", "Park", "Community Center", "Home")
+
+# A template's instances per chain step; always_on is redone every couple of days
+_PERIOD_DAYS = {
+    RECURRENCE_DAILY: 1,
+    RECURRENCE_WEEKLY: 7,
+    RECURRENCE_MONTHLY: 30,
+    RECURRENCE_ALWAYS_ON: 2,
+}
+_TEMPLATE_RECURRENCES = (
+    RECURRENCE_DAILY, RECURRENCE_WEEKLY, RECURRENCE_DAILY, RECURRENCE_ALWAYS_ON,
+    RECURRENCE_WEEKLY, RECURRENCE_MONTHLY,
+)
+# How long past one-off chores, todos and claims stay open before settling
+_OPEN_DAYS = 14
+
+
+def generate_data(
+    members: int = 4,
+    templates: int = 12,
+    years: float = 1.0,
+    events_per_week: float = 6.0,
+    claims: int | None = None,
+    todos: int | None = None,
+    seed: int = 0,
+    today: date | None = None,
+) -> FamDoData:
+    """Return a synthetic household with *years* of history up to *today*.
+
+    Each recurring template has a chain of instances, one per period, as the
+    coordinator would have created them: old instances are mostly completed
+    and approved, some late (with negative points applied) or rejected, and
+    the newest is pending, claimed or awaiting approval, so the periodic
+    checks find the data in steady state. One-off chores, events, todos and
+    reward claims are spread over the same span and settle with age; member
+    points are what they earned minus what they spent. *claims* defaults to
+    one per child per week and *todos* to ten per week. The same arguments
+    always give the same data.
+    """
+    if members < 1:
+        raise ValueError("members must be at least 1")
+    rng = random.Random(seed)
+    today = today or date.today()
+    days = max(1, round(years * 365))
+    start = today - timedelta(days=days)
+    weeks = days / 7
+
+    def stamp(day: date, first_hour: int = 7, last_hour: int = 21) -> str:
+        moment = time(rng.randint(first_hour, last_hour), rng.randrange(60))
+        return datetime.combine(day, moment).isoformat()
+
+    def later(day: date, most: int) -> date:
+        return min(today, day + timedelta(days=rng.randint(0, most)))
+
+    # ── Members and rewards ──
+    parent_count = 1 if members < 3 else 2
+    member_list = []
+    for i in range(members):
+        name = _NAMES[i % len(_NAMES)]
+        if i >= len(_NAMES):
+            name = f"{name} {i // len(_NAMES) + 1}"
+        parent = i < parent_count
+        member_list.append(FamilyMember(
+            id=f"member-{i:03d}", name=name, role=ROLE_PARENT if parent else ROLE_CHILD,
+            color=_COLORS[i % len(_COLORS)],
+            avatar="mdi:account" if parent else "mdi:account-child", created_at=stamp(start),
+        ))
+    parents = [m.id for m in member_list if m.role == ROLE_PARENT]
+    kids = [m.id for m in member_list if m.role == ROLE_CHILD] or parents
+    rewards = [
+        Reward(
+            id=f"reward-{i:02d}", name=name, icon=icon, points_cost=cost,
+            created_at=stamp(start),
+        )
+        for i, (name, icon, cost) in enumerate(_REWARDS)
+    ]
+
+    # ── Chores ──
+    earned: Counter[str] = Counter()
+    template_list: list[Chore] = []
+    instances: list[Chore] = []
+
+    def settle(chore: Chore, day: date, missed: bool) -> None:
+        """Finish a past chore: mostly approved, sometimes late, rejected or missed."""
+        roll = rng.random()
+        if missed and roll < 0.1:
+            chore.status = CHORE_STATUS_OVERDUE
+            return
+        chore.claimed_by = chore.assigned_to or rng.choice(kids)
+        late = roll > 0.85
+        done = later(day, 2) if late else day
+        chore.completed_at = stamp(done, 15, 21)
+        if roll > 0.95:
+            chore.status = CHORE_STATUS_REJECTED
+            return
+        chore.status = CHORE_STATUS_COMPLETED
+        chore.approved_by = rng.choice(parents)
+        earned[chore.claimed_by] += chore.points
+        if late and chore.negative_points:
+            chore.overdue_applied = True
+            earned[chore.claimed_by] -= chore.negative_points
+
+    def open_up(chore: Chore) -> None:
+        """Leave a current chore pending, claimed or awaiting approval."""
+        roll = rng.random()
+        if roll < 0.55:
+            return
+        chore.claimed_by = chore.assigned_to or rng.choice(kids)
+        chore.status = CHORE_STATUS_CLAIMED
+        if roll > 0.8:
+            chore.status = CHORE_STATUS_AWAITING_APPROVAL
+            chore.completed_at = stamp(today, 0, 6)
+
+    for t in range(templates):
+        name, icon, points = _CHORES[t % len(_CHORES)]
+        recurrence = _TEMPLATE_RECURRENCES[t % len(_TEMPLATE_RECURRENCES)]
+        timed = recurrence != RECURRENCE_ALWAYS_ON
+        template = Chore(
+            id=f"template-{t:05d}", name=name, points=points, icon=icon,
+            assigned_to=None if rng.random() < 0.2 else rng.choice(kids),
+            recurrence=recurrence, is_template=True, created_at=stamp(start),
+            due_time=rng.choice((None, "08:00", "19:00")) if timed else None,
+            negative_points=points // 2 if timed and rng.random() < 0.3 else 0,
+        )
+        template_list.append(template)
+        period = _PERIOD_DAYS[recurrence]
+        # As _calculate_next_due_date: daily chores are due the day they appear
+        due_after = 0 if recurrence == RECURRENCE_DAILY else period
+        day = start + timedelta(days=rng.randrange(period))
+        while day <= today:
+            following = day + timedelta(days=period)
+            chore = Chore(
+                id=f"chore-{len(instances):07d}", name=name, points=points, icon=icon,
+                assigned_to=template.assigned_to, recurrence=recurrence,
+                due_date=(day + timedelta(days=due_after)).isoformat() if timed else None,
+                due_time=template.due_time, negative_points=template.negative_points,
+                created_at=stamp(day, 0, 6), template_id=template.id,
+            )
+            if following > today:
+                open_up(chore)
+            else:
+                settle(chore, day, missed=False)
+            instances.append(chore)
+            day = following
+
+    # Two one-off chores a week, some still ahead
+    for _ in range(round(weeks * 2)):
+        name, icon, points = _CHORES[rng.randrange(len(_CHORES))]
+        created = start + timedelta(days=rng.randrange(days + 1))
+        due = created + timedelta(days=rng.randint(1, _OPEN_DAYS))
+        chore = Chore(
+            id=f"chore-{len(instances):07d}", name=name, points=points, icon=icon,
+            assigned_to=rng.choice(kids) if rng.random() < 0.5 else None,
+            due_date=due.isoformat(), created_at=stamp(created),
+        )
+        if due < today:
+            settle(chore, due, missed=True)
+        else:
+            open_up(chore)
+        instances.append(chore)
+    instances.sort(key=lambda chore: chore.created_at)
+
+    # ── Events ──
+    events = [
+        CalendarEvent(
+            id=f"event-weekly-{i:02d}", title=_EVENTS[i % len(_EVENTS)],
+            start_date=(start + timedelta(days=rng.randrange(7))).isoformat(),
+            all_day=False, start_time="16:00", end_time="17:00", member_ids=[kid],
+            recurrence=RECURRENCE_WEEKLY, created_at=stamp(start),
+        )
+        for i, kid in enumerate(kids[:10])
+    ]
+    member_ids = [m.id for m in member_list]
+    ahead = 28
+    for i in range(round(events_per_week * (days + ahead) / 7)):
+        day = start + timedelta(days=rng.randrange(days + ahead))
+        timed = rng.random() < 0.65
+        hour = rng.randint(8, 19)
+        attendees = rng.sample(member_ids, min(len(member_ids), rng.randint(0, 2)))
+        events.append(CalendarEvent(
+            id=f"event-{i:07d}", title=rng.choice(_EVENTS),
+            start_date=day.isoformat(),
+            end_date=(day + timedelta(days=rng.randint(1, 3))).isoformat()
+            if not timed and rng.random() < 0.05 else None,
+            all_day=not timed,
+            start_time=f"{hour:02d}:{rng.choice((0, 15, 30)):02d}" if timed else None,
+            end_time=f"{hour + rng.randint(1, 2):02d}:00" if timed else None,
+            member_ids=attendees, location=rng.choice(_LOCATIONS),
+            color=_COLORS[rng.randrange(len(_COLORS))] if attendees else None,
+            created_at=stamp(max(start, min(today, day - timedelta(days=rng.randint(0, 14))))),
+        ))
+    events.sort(key=lambda event: event.created_at)
+
+    # ── Todos ──
+    todo_list = []
+    for i in range(round(weeks * 10) if todos is None else todos):
+        created = start + timedelta(days=rng.randrange(days + 1))
+        old = (today - created).days > _OPEN_DAYS
+        completed = rng.random() < (0.9 if old else 0.3)
+        todo_list.append(TodoItem(
+            id=f"todo-{i:07d}", title=rng.choice(_TODOS), completed=completed,
+            priority=rng.choices(("low", "normal", "high"), (2, 6, 2))[0],
+            category=rng.choice(_TODO_CATEGORIES), created_by=rng.choice(parents),
+            assigned_to=rng.choice(member_list).id if rng.random() < 0.5 else None,
+            due_date=(created + timedelta(days=rng.randint(1, _OPEN_DAYS))).isoformat()
+            if rng.random() < 0.4 else None,
+            created_at=stamp(created),
+            completed_at=stamp(later(created, 7)) if completed else None,
+        ))
+    todo_list.sort(key=lambda todo: todo.created_at)
+
+    # ── Reward claims ──
+    spent: Counter[str] = Counter()
+    claim_list = []
+    for i in range(round(weeks * len(kids)) if claims is None else claims):
+        reward = rng.choice(rewards)
+        claimed = start + timedelta(days=rng.randrange(days + 1))
+        fulfilled = (today - claimed).days > 3 or rng.random() < 0.3
+        claim = RewardClaim(
+            id=f"claim-{i:07d}", reward_id=reward.id, member_id=rng.choice(kids),
+            points_spent=reward.points_cost, claimed_at=stamp(claimed),
+            status="fulfilled" if fulfilled else "pending",
+            fulfilled_at=stamp(later(claimed, 3)) if fulfilled else None,
+        )
+        spent[claim.member_id] += claim.points_spent
+        claim_list.append(claim)
+    claim_list.sort(key=lambda claim: claim.claimed_at)
+
+    for member in member_list:
+        member.points = max(0, earned[member.id] - spent[member.id])
+
+    return FamDoData(
+        family_name="The Synthetic Family",
+        members=member_list,
+        chores=template_list + instances,
+        rewards=rewards,
+        reward_claims=claim_list,
+        todos=todo_list,
+        events=events,
+    )
+
+
+def params_for_records(records: int, years: float = 1.0) -> dict[str, float | int]:
+    """Return :func:`generate_data` arguments for about *records* records.
+
+    Roughly 70% chores, 12% events, 12% todos and 6% reward claims. More
+    records mean more templates (and members) rather than a longer history;
+    stores too small for a year of one daily chore get a shorter history.
+    """
+    years = min(years, records * 0.7 / (365 + 52 * 2))
+    # Recurring instances fill what the two one-off chores a week leave over
+    budget = records * 0.7 - years * 52 * 2
+    templates = 0
+    while True:
+        recurrence = _TEMPLATE_RECURRENCES[templates % len(_TEMPLATE_RECURRENCES)]
+        chain = 1 + years * 365 / _PERIOD_DAYS[recurrence]
+        if templates and budget < chain / 2:
+            break
+        budget -= chain
+        templates += 1
+    return {
+        "members": max(4, min(50, 2 + templates // 6)),
+        "templates": templates,
+        "years": years,
+        # Events also run four weeks past today
+        "events_per_week": records * 0.12 / (years * 52 + 4),
+        "todos": round(records * 0.12),
+        "claims": round(records * 0.06),
+    }
+
+
+def record_count(data: FamDoData) -> int:
+    """Return the number of records in every collection of *data*."""
+    return sum(
+        len(records) for records in (
+            data.members, data.chores, data.rewards, data.reward_claims, data.todos,
+            data.events,
+        )
+    )
+
+
+def _summary(data: FamDoData) -> str:
+    statuses = Counter(c.status for c in data.chores if not c.is_template)
+    return "\n".join((
+        f"Family: {data.family_name} ({record_count(data):,} records)",
+        f"  {len(data.members)} members",
+        f"  {len(data.chores):,} chores: "
+        + ", ".join(f"{count:,} {status}" for status, count in statuses.most_common()),
+        f"  {len(data.rewards)} rewards, {len(data.reward_claims):,} claims",
+        f"  {len(data.todos):,} todos",
+        f"  {len(data.events):,} events",
+    ))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Print the sample household, or write a synthetic one of any size",
+    )
+    parser.add_argument(
+        "--records", type=int,
+        help="Pick the other sizes for about this many records (1k to 1M)",
+    )
+    parser.add_argument("--members", type=int, help="Family members (default: 4)")
+    parser.add_argument("--templates", type=int, help="Recurring chore templates (default: 12)")
+    parser.add_argument("--years", type=float, default=1.0, help="Years of history (default: 1)")
+    parser.add_argument("--events-per-week", type=float, help="Calendar events per week")
+    parser.add_argument("--claims", type=int, help="Reward claims")
+    parser.add_argument("--todos", type=int, help="Todo items")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    parser.add_argument(
+        "--today", type=date.fromisoformat,
+        help="Date the history ends (default: today); fix it for identical files",
+    )
+    parser.add_argument("-o", "--output", help="Write the data file here instead of a summary")
+    args = parser.parse_args()
+
+    sizes = {
+        key: getattr(args, key)
+        for key in ("members", "templates", "events_per_week", "claims", "todos")
+        if getattr(args, key) is not None
+    }
+    if args.records is None and not sizes and args.output is None:
+        print(_summary(create_seed_data()))
+        return
+
+    if args.records:
+        # params_for_records shortens the history of small stores; keep that
+        params = params_for_records(args.records, args.years)
+    else:
+        params = {"years": args.years}
+    params.update(sizes)
+    data = generate_data(**params, seed=args.seed, today=args.today)
+    print(_summary(data))
+    if args.output:
+        sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        from devserver.mock_storage import MockStore
+
+        store = MockStore(data_file=args.output)
+        store._data = data
+        asyncio.run(store.async_save())
+        print(f"Wrote {args.output} ({os.path.getsize(args.output):,} bytes)")
+
+
 if __name__ == "__main__":
-    data = create_seed_data()
-    print(f"Family: {data.family_name}")
-    print(f"  {len(data.members)} members: {[m.name for m in data.members]}")
-    print(f"  {len(data.chores)} chores: {[c.name for c in data.chores]}")
-    print(f"  {len(data.rewards)} rewards: {[r.name for r in data.rewards]}")
-    print(f"  {len(data.todos)} todos: {[t.title for t in data.todos]}")
-    print(f"  {len(data.events)} events: {[e.title for e in data.events]}")
+    main()
@@ -0,0 +1,189 @@
+"""Bounded per-connection outbound queue for the dev server WebSocket."""
+from __future__ import annotations
+
+import asyncio
+import inspect
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import Awaitable, Callable, NamedTuple, Union
+
+from aiohttp import web
+
+_LOGGER = logging.getLogger(__name__)
+
+# Same idea as HA's MAX_PENDING_MSG: a client that lets this many replies pile
+# up is not keeping up and gets disconnected.
+MAX_PENDING_MESSAGES = 512
+
+
+@dataclass
+class SendQueueMetrics:
+    """Outbound counters aggregated over every connection."""
+
+    messages_sent: int = 0
+    bytes_sent: int = 0
+    snapshots_sent: int = 0
+    snapshot_bytes_sent: int = 0
+    snapshots_dropped: int = 0
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    overflow_disconnects: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        """Return the counters as a plain dict."""
+        return dict(self.__dict__)
+
+
+# Builds a payload when the writer reaches it; may be a coroutine function so
+# serialization can run off the event loop.
+PayloadBuilder = Callable[[], Union[bytes, Awaitable[bytes]]]
+
+
+class _SnapshotSlot(NamedTuple):
+    """Queue placeholder for the latest snapshot of one subscription."""
+
+    key: int
+
+
+class ConnectionSendQueue:
+    """Serialize all sends for one WebSocket through a single writer task.
+
+    Plain messages (results, errors) are delivered in order. Subscription
+    snapshots are coalesced: while a snapshot for a subscription is still
+    queued, newer ones replace it instead of queueing behind it, and the
+    payload is only built when the writer gets to it. A slow client therefore
+    holds at most one pending snapshot per subscription.
+    """
+
+    def __init__(
+        self,
+        ws: web.WebSocketResponse,
+        metrics: SendQueueMetrics,
+        max_pending: int = MAX_PENDING_MESSAGES,
+    ) -> None:
+        """Initialize the queue; call :meth:`start` to begin sending."""
+        self._ws = ws
+        self._metrics = metrics
+        self._max_pending = max_pending
+        self._queue: deque[bytes | PayloadBuilder | _SnapshotSlot] = deque()
+        self._snapshots: dict[int, PayloadBuilder] = {}
+        self._wakeup = asyncio.Event()
+        self._writer: asyncio.Task | None = None
+        self._closed = False
+
+    @property
+    def depth(self) -> int:
+        """Number of queued messages."""
+        return len(self._queue)
+
+    @property
+    def closed(self) -> bool:
+        """Whether new messages are dropped (closed, overflowed or connection lost)."""
+        return self._closed
+
+    def start(self) -> None:
+        """Start the writer task."""
+        self._writer = asyncio.ensure_future(self._run())
+
+    def send(self, payload: bytes | PayloadBuilder) -> None:
+        """Queue a message for in-order delivery.
+
+        *payload* is encoded UTF-8 JSON, or a builder called (and awaited if
+        needed) when the writer reaches it.
+        """
+        if self._closed:
+            return
+        if len(self._queue) >= self._max_pending:
+            self._overflow()
+            return
+        self._enqueue(payload)
+
+    def send_snapshot(self, key: int, build: PayloadBuilder) -> None:
+        """Queue the latest snapshot for subscription *key*.
+
+        *build* is called when the message is actually written, so it should
+        serialize the current state at that moment.
+        """
+        if self._closed:
+            return
+        if key in self._snapshots:
+            self._snapshots[key] = build
+            self._metrics.snapshots_dropped += 1
+            return
+        if len(self._queue) >= self._max_pending:
+            self._overflow()
+            return
+        self._snapshots[key] = build
+        self._enqueue(_SnapshotSlot(key))
+
+    async def close(self) -> None:
+        """Stop the writer and discard anything still queued."""
+        self._closed = True
+        if self._writer is not None:
+            self._writer.cancel()
+            try:
+                await self._writer
+            except asyncio.CancelledError:
+                pass
+        self._discard()
+
+    def _discard(self) -> None:
+        self._metrics.queue_depth -= len(self._queue)
+        self._queue.clear()
+        self._snapshots.clear()
+
+    def _enqueue(self, entry: bytes | PayloadBuilder | _SnapshotSlot) -> None:
+        self._queue.append(entry)
+        self._metrics.queue_depth += 1
+        self._metrics.max_queue_depth = max(self._metrics.max_queue_depth, len(self._queue))
+        self._wakeup.set()
+
+    def _overflow(self) -> None:
+        _LOGGER.warning(
+            "Client unable to keep up with %d pending messages; disconnecting",
+            len(self._queue),
+        )
+        self._metrics.overflow_disconnects += 1
+        self._closed = True
+        asyncio.ensure_future(self._ws.close())
+
+    async def _run(self) -> None:
+        while True:
+            while not self._queue:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+            entry = self._queue.popleft()
+            self._metrics.queue_depth -= 1
+            snapshot = isinstance(entry, _SnapshotSlot)
+            if isinstance(entry, bytes):
+                payload = entry
+            else:
+                if isinstance(entry, _SnapshotSlot):
+                    entry = self._snapshots.pop(entry.key)
+                    self._metrics.snapshots_sent += 1
+                try:
+                    payload = entry()
+                    if inspect.isawaitable(payload):
+                        payload = await payload
+                except Exception:  # noqa: BLE001 - one bad message must not stop the writer
+                    _LOGGER.exception("Error building message")
+                    continue
+            if self._ws.closed:
+                continue
+            try:
+                # Already-encoded UTF-8 goes out as a text frame without a
+                # decode/encode round trip. The send waits for the transport to
+                # drain, so a slow client stalls only this task while newer
+                # snapshots coalesce above.
+                await self._ws.send_frame(payload, web.WSMsgType.TEXT)
+            except ConnectionError:
+                _LOGGER.debug("Connection lost while sending; stopping writer")
+                # Nothing queued from now on could be delivered
+                self._closed = True
+                self._discard()
+                return
+            self._metrics.messages_sent += 1
+            self._metrics.bytes_sent += len(payload)
+            if snapshot:
+                self._metrics.snapshot_bytes_sent += len(payload)
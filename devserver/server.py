@@ -3,10 +3,11 @@ from __future__ import annotations
 
 import argparse
 import asyncio
-import json
 import logging
 import os
 import sys
+import time
+from datetime import datetime
 from pathlib import Path
 from typing import Any
 
@@ -27,9 +28,70 @@ if not hasattr(_devserver_pkg, "__path__"):
     # Already a namespace package via sys.path — just ensure sub-modules load.
     pass
 
-from devserver.mock_storage import MockStore  # noqa: E402
+from devserver.mock_storage import FSYNC_BATCHED, FSYNC_POLICIES, MockStore  # noqa: E402
 from devserver.mock_coordinator import MockCoordinator  # noqa: E402
 from devserver.seed_data import create_seed_data  # noqa: E402
+from devserver.scheduler import CommandScheduler  # noqa: E402
+from devserver.send_queue import ConnectionSendQueue, SendQueueMetrics  # noqa: E402
+from devserver.json_codec import get_codec  # noqa: E402
+from devserver.snapshot import (  # noqa: E402
+    COMPRESSION_NONE,
+    COMPRESSIONS,
+    FORMAT_JSON,
+    SNAPSHOT_FORMATS,
+)
+
+# Shared integration modules are loaded by path so the package __init__
+# (which imports homeassistant) never runs.
+import importlib.util as _ilu  # noqa: E402
+
+_famdo_dir = _REPO_ROOT / "custom_components" / "famdo"
+
+
+def _load_module(name: str, path: Path):
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = _ilu.spec_from_file_location(name, path)
+    mod = _ilu.module_from_spec(spec)
+    sys.modules[name] = mod
+    spec.loader.exec_module(mod)
+    return mod
+
+
+_load_module("custom_components.famdo.throttle", _famdo_dir / "throttle.py")
+from custom_components.famdo.throttle import PushThrottler  # noqa: E402
+
+_load_module("custom_components.famdo.commands", _famdo_dir / "commands.py")
+from custom_components.famdo.commands import (  # noqa: E402
+    COMMANDS,
+    SUBSCRIBE_FIELDS,
+    CommandError,
+    execute,
+    find_parent_for_ha_user,
+    validate,
+    validate_fields,
+)
+
+_load_module("custom_components.famdo.versions", _famdo_dir / "versions.py")
+from custom_components.famdo.versions import DataVersion, diff_versions  # noqa: E402
+from custom_components.famdo.metrics import METRICS  # noqa: E402
+from devserver.prometheus import CONTENT_TYPE, ServerStats, render  # noqa: E402
+from devserver.recorder import TrafficRecorder  # noqa: E402
+from devserver.profiler import (  # noqa: E402
+    MAX_PROFILE_SECONDS,
+    PROFILE_CPROFILE,
+    PROFILE_MODES,
+    ProfileCapture,
+    ProfilerBusy,
+)
+
+_load_module("custom_components.famdo.calendar_cache", _famdo_dir / "calendar_cache.py")
+_load_module("custom_components.famdo.merged_events", _famdo_dir / "merged_events.py")
+from custom_components.famdo.merged_events import (  # noqa: E402
+    chore_events,
+    famdo_events,
+    merge_events,
+)
 
 logging.basicConfig(
     level=logging.INFO,
@@ -37,26 +99,32 @@ logging.basicConfig(
 )
 _LOGGER = logging.getLogger("famdo.devserver")
 
+# Messages are encoded once to compact UTF-8 and written as-is
+_codec = get_codec()
+
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
-def _resolve_ha_user_to_parent(coordinator: MockCoordinator, raw_id: str) -> str:
-    """If *raw_id* starts with ``ha_user:``, resolve to first parent member."""
-    if not raw_id.startswith("ha_user:"):
-        return raw_id
-    for member in coordinator.famdo_data.members:
-        if member.role == "parent":
-            return member.id
-    return raw_id
+class _DevContext:
+    """Command context for the dev server; the dev user is always an admin."""
+
+    def __init__(self, coordinator: MockCoordinator) -> None:
+        self.coordinator = coordinator
+
+    def resolve_parent(self, raw_id: str, action: str) -> str:
+        """If *raw_id* starts with ``ha_user:``, resolve it to a parent member."""
+        if not raw_id.startswith("ha_user:"):
+            return raw_id
+        return find_parent_for_ha_user(self.coordinator.famdo_data, raw_id[8:]) or raw_id
 
 
-def _success(msg_id: int, result: Any) -> str:
-    return json.dumps({"id": msg_id, "type": "result", "success": True, "result": result})
+def _success(msg_id: int, result: Any) -> bytes:
+    return _codec.dumps({"id": msg_id, "type": "result", "success": True, "result": result})
 
 
-def _error(msg_id: int, code: str, message: str) -> str:
-    return json.dumps({
+def _error(msg_id: int, code: str, message: str) -> bytes:
+    return _codec.dumps({
         "id": msg_id,
         "type": "result",
         "success": False,
@@ -64,8 +132,8 @@ def _error(msg_id: int, code: str, message: str) -> str:
     })
 
 
-def _event_msg(msg_id: int, data: dict) -> str:
-    return json.dumps({"id": msg_id, "type": "event", "event": {"data": data}})
+def _event_msg(msg_id: int, event: dict) -> bytes:
+    return _codec.dumps({"id": msg_id, "type": "event", "event": event})
 
 
 # ---------------------------------------------------------------------------
@@ -74,351 +142,267 @@ def _event_msg(msg_id: int, data: dict) -> str:
 
 async def websocket_handler(request: web.Request) -> web.WebSocketResponse:
     coordinator: MockCoordinator = request.app["coordinator"]
+    stats: ServerStats = request.app["server_stats"]
+    recorder: TrafficRecorder | None = request.app["recorder"]
     ws = web.WebSocketResponse()
     await ws.prepare(request)
+    stats.connections += 1
+    conn = recorder.opened() if recorder is not None else 0
+
+    # All outbound traffic goes through one bounded queue + writer task
+    sender = ConnectionSendQueue(ws, request.app["send_metrics"])
+    sender.start()
 
     # Track subscriptions for this connection
     subscriptions: dict[int, Any] = {}
 
+    # Writes apply in order; reads wait only for earlier writes
+    scheduler = CommandScheduler(READ_COMMANDS)
+    ctx = _DevContext(coordinator)
+
+    async def _handle(msg_type: str, msg: dict, msg_id: int, received: float) -> None:
+        try:
+            result = await _dispatch(ctx, msg_type, msg, sender, subscriptions, msg_id)
+            if result is not None:
+                sender.send(_success(msg_id, result))
+        except CommandError as err:
+            sender.send(_error(msg_id, err.code, err.message))
+        except Exception as exc:
+            _LOGGER.exception("Error handling %s", msg_type)
+            sender.send(_error(msg_id, "error", str(exc)))
+        stats.dispatched(msg_type, time.perf_counter() - received)
+
     # 1. Auth required
-    await ws.send_str(json.dumps({"type": "auth_required", "ha_version": "2024.1.0", "famdo_dev": True}))
+    sender.send(_codec.dumps({"type": "auth_required", "ha_version": "2024.1.0", "famdo_dev": True}))
 
     try:
         async for raw in ws:
-            if raw.type != web.WSMsgType.TEXT:
+            # Accept JSON in binary frames too; the codec decodes bytes directly
+            if raw.type not in (web.WSMsgType.TEXT, web.WSMsgType.BINARY):
                 continue
             try:
-                msg = json.loads(raw.data)
-            except json.JSONDecodeError:
+                msg = _codec.loads(raw.data)
+            except ValueError:
                 continue
 
             msg_type = msg.get("type", "")
+            stats.received(msg_type)
 
             # ── Auth ──────────────────────────────────────────────
             if msg_type == "auth":
-                await ws.send_str(json.dumps({"type": "auth_ok", "ha_version": "2024.1.0"}))
+                sender.send(_codec.dumps({"type": "auth_ok", "ha_version": "2024.1.0"}))
                 continue
 
             msg_id = msg.get("id")
             if msg_id is None:
                 continue
-
-            try:
-                result = await _dispatch(coordinator, msg_type, msg, ws, subscriptions, msg_id)
-                if result is not None:
-                    await ws.send_str(_success(msg_id, result))
-            except Exception as exc:
-                _LOGGER.exception("Error handling %s", msg_type)
-                await ws.send_str(_error(msg_id, "error", str(exc)))
+            if recorder is not None:
+                recorder.received(conn, msg)
+
+            received = time.perf_counter()
+            scheduler.submit(
+                msg_type,
+                msg,
+                lambda t=msg_type, m=msg, i=msg_id, r=received: _handle(t, m, i, r),
+            )
     finally:
+        # Let in-flight commands finish so writes are not cut off mid-save
+        await scheduler.drain()
         # Clean up subscriptions
         for unsub in subscriptions.values():
             if callable(unsub):
                 unsub()
+        await sender.close()
+        stats.connections -= 1
+        if recorder is not None:
+            recorder.closed(conn)
         _LOGGER.info("WebSocket client disconnected")
+        _LOGGER.debug("Send queue metrics: %s", request.app["send_metrics"].as_dict())
 
     return ws
 
 
+async def _subscribe(
+    ctx: _DevContext, msg: dict, sender: ConnectionSendQueue, subscriptions: dict, msg_id: int
+) -> None:
+    coordinator = ctx.coordinator
+    params = validate_fields(SUBSCRIBE_FIELDS, _params(msg))
+    delta = params["delta"]
+    # Last version this client got; with delta, pushes are diffs against it
+    sent: dict[str, DataVersion] = {}
+
+    # Payloads are built when the writer reaches them: grab the current
+    # version on the loop (O(1)), then serialize it in a thread.
+    async def _initial() -> bytes:
+        version = sent["version"] = coordinator.snapshot()
+        try:
+            if not delta:
+                return await asyncio.to_thread(lambda: _success(msg_id, version.data.to_dict()))
+            return await asyncio.to_thread(lambda: _success(
+                msg_id, {"version": version.number, "data": version.data.to_dict()}
+            ))
+        except Exception:  # noqa: BLE001 - answer the client instead of dropping the result
+            _LOGGER.exception("Error building initial data for subscription %s", msg_id)
+            unsub_failed = subscriptions.pop(msg_id, None)
+            if unsub_failed is not None:
+                unsub_failed()
+            return _error(msg_id, "failed", "Could not send the initial data")
+
+    async def _push() -> bytes:
+        version = coordinator.snapshot()
+        if delta:
+            changes = diff_versions(sent["version"], version)
+            sent["version"] = version
+            return await asyncio.to_thread(
+                lambda: _event_msg(msg_id, {"delta": changes.to_dict()})
+            )
+        return await asyncio.to_thread(
+            lambda: _event_msg(
+                msg_id, {"data": version.data.to_dict(), "version": version.number}
+            )
+        )
+
+    # Send initial data as result
+    sender.send(_initial)
+
+    # Register listener for push updates, coalescing bursts of mutations.
+    # A client that is behind skips straight to the latest state.
+    def _push_update() -> None:
+        sender.send_snapshot(msg_id, _push)
+
+    throttler = PushThrottler(
+        asyncio.get_running_loop(), params["throttle_ms"] / 1000, _push_update
+    )
+    unsub = coordinator.async_add_listener(throttler.trigger)
+
+    def _unsub() -> None:
+        throttler.cancel()
+        unsub()
+
+    subscriptions[msg_id] = _unsub
+    return None  # already sent
+
+
+async def _current_user(*_args: Any) -> dict:
+    return {"id": "dev-user-1", "name": "Developer", "is_owner": True, "is_admin": True}
+
+
+# ── HA calendar stubs ─────────────────────────────────────────────
+async def _get_ha_calendars(ctx: _DevContext, msg: dict, *_args: Any) -> dict:
+    if msg.get("revision") == 0:
+        return {"revision": 0, "unchanged": True}
+    return {"calendars": [], "revision": 0}
+
+
+async def _get_ha_calendar_events(*_args: Any) -> dict:
+    return {"events": []}
+
+
+async def _get_merged_events(ctx: _DevContext, msg: dict, *_args: Any) -> dict:
+    """FamDo events and chore due dates; there are no HA calendars to add here."""
+    try:
+        start = datetime.fromisoformat(msg["start"])
+        end = datetime.fromisoformat(msg["end"])
+    except (KeyError, TypeError, ValueError) as err:
+        raise CommandError(
+            "invalid_format", f"start and end must be ISO datetimes: {err}"
+        ) from err
+    limit = msg.get("limit")
+    if limit is not None and (isinstance(limit, bool) or not isinstance(limit, int) or limit < 1):
+        raise CommandError("invalid_format", "limit must be a positive integer")
+    tz = start.tzinfo or datetime.now().astimezone().tzinfo
+    start, end = start.replace(tzinfo=start.tzinfo or tz), end.replace(tzinfo=end.tzinfo or tz)
+    data = ctx.coordinator.snapshot().data
+    sources = []
+    if msg.get("include_events", True):
+        sources.append(famdo_events(data, start, end, tz))
+    if msg.get("include_chores", True):
+        sources.append(chore_events(data, start, end, tz))
+    return {"events": merge_events(sources, limit), "failed": []}
+
+
+# Commands that only make sense on this transport; everything else comes from
+# the shared registry. All of these are reads.
+_LOCAL_COMMANDS = {
+    "auth/current_user": _current_user,
+    "famdo/subscribe": _subscribe,
+    "famdo/get_ha_calendars": _get_ha_calendars,
+    "famdo/get_ha_calendar_events": _get_ha_calendar_events,
+    "famdo/get_merged_events": _get_merged_events,
+}
+
+READ_COMMANDS = frozenset(_LOCAL_COMMANDS) | frozenset(
+    name for name, command in COMMANDS.items() if not command.write
+)
+
+
 async def _dispatch(
-    coordinator: MockCoordinator,
+    ctx: _DevContext,
     msg_type: str,
     msg: dict,
-    ws: web.WebSocketResponse,
+    sender: ConnectionSendQueue,
     subscriptions: dict,
     msg_id: int,
 ) -> Any:
-    """Route a command to the coordinator and return the result payload.
+    """Route a command to its handler and return the result payload.
 
     Returns ``None`` when the handler already sent its own response (e.g. subscribe).
     """
+    local = _LOCAL_COMMANDS.get(msg_type)
+    if local is not None:
+        with METRICS.timer(f"command.{msg_type}"):
+            return await local(ctx, msg, sender, subscriptions, msg_id)
 
-    # ── Data retrieval ────────────────────────────────────────────
-    if msg_type == "famdo/get_data":
-        return coordinator.famdo_data.to_dict()
-
-    if msg_type == "famdo/subscribe":
-        # Send initial data as result
-        await ws.send_str(_success(msg_id, coordinator.famdo_data.to_dict()))
-
-        # Register listener for push updates
-        def _push_update() -> None:
-            if not ws.closed:
-                asyncio.ensure_future(
-                    ws.send_str(_event_msg(msg_id, coordinator.famdo_data.to_dict()))
-                )
-
-        unsub = coordinator.async_add_listener(_push_update)
-        subscriptions[msg_id] = unsub
-        return None  # already sent
-
-    if msg_type == "auth/current_user":
-        return {"id": "dev-user-1", "name": "Developer", "is_owner": True, "is_admin": True}
-
-    # ── Member management ─────────────────────────────────────────
-    if msg_type == "famdo/add_member":
-        member = await coordinator.async_add_member(
-            name=msg["name"],
-            role=msg.get("role", "child"),
-            color=msg.get("color", "#4ECDC4"),
-            avatar=msg.get("avatar", "mdi:account"),
-        )
-        return member.to_dict()
-
-    if msg_type == "famdo/update_member":
-        member_id = msg["member_id"]
-        fields = {k: msg[k] for k in ("name", "role", "color", "avatar", "points", "ha_user_id") if k in msg}
-        member = await coordinator.async_update_member(member_id, **fields)
-        if member:
-            return member.to_dict()
-        raise ValueError("Member not found")
-
-    if msg_type == "famdo/remove_member":
-        success = await coordinator.async_remove_member(msg["member_id"])
-        return {"success": success}
-
-    # ── Chore management ──────────────────────────────────────────
-    if msg_type == "famdo/add_chore":
-        chore = await coordinator.async_add_chore(
-            name=msg["name"],
-            description=msg.get("description", ""),
-            points=msg.get("points", 10),
-            assigned_to=msg.get("assigned_to"),
-            recurrence=msg.get("recurrence", "none"),
-            due_date=msg.get("due_date"),
-            due_time=msg.get("due_time"),
-            icon=msg.get("icon", "mdi:broom"),
-            negative_points=msg.get("negative_points", 0),
-            max_instances=msg.get("max_instances", 3),
-        )
-        return chore.to_dict()
-
-    if msg_type == "famdo/update_chore":
-        chore_id = msg["chore_id"]
-        skip = {"type", "id", "chore_id"}
-        fields = {k: v for k, v in msg.items() if k not in skip}
-        chore = await coordinator.async_update_chore(chore_id, **fields)
-        if chore:
-            return chore.to_dict()
-        raise ValueError("Chore not found")
-
-    if msg_type == "famdo/claim_chore":
-        chore = await coordinator.async_claim_chore(msg["chore_id"], msg["member_id"])
-        if chore:
-            return chore.to_dict()
-        raise ValueError("Could not claim chore")
-
-    if msg_type == "famdo/complete_chore":
-        chore = await coordinator.async_complete_chore(msg["chore_id"], msg["member_id"])
-        if chore:
-            return chore.to_dict()
-        raise ValueError("Could not complete chore")
-
-    if msg_type == "famdo/approve_chore":
-        approver_id = _resolve_ha_user_to_parent(coordinator, msg["approver_id"])
-        chore = await coordinator.async_approve_chore(msg["chore_id"], approver_id)
-        if chore:
-            return chore.to_dict()
-        raise ValueError("Could not approve chore")
-
-    if msg_type == "famdo/reject_chore":
-        approver_id = _resolve_ha_user_to_parent(coordinator, msg["approver_id"])
-        chore = await coordinator.async_reject_chore(msg["chore_id"], approver_id)
-        if chore:
-            return chore.to_dict()
-        raise ValueError("Could not reject chore")
-
-    if msg_type == "famdo/retry_chore":
-        chore = await coordinator.async_retry_chore(msg["chore_id"], msg["member_id"])
-        if chore:
-            return chore.to_dict()
-        raise ValueError("Could not retry chore")
-
-    if msg_type == "famdo/reactivate_template":
-        approver_id = _resolve_ha_user_to_parent(coordinator, msg["approver_id"])
-        chore = await coordinator.async_reactivate_template(msg["template_id"], approver_id)
-        if chore:
-            return chore.to_dict()
-        raise ValueError("Could not reactivate template")
-
-    if msg_type == "famdo/delete_chore":
-        success = await coordinator.async_delete_chore(msg["chore_id"])
-        return {"success": success}
-
-    # ── Reward management ─────────────────────────────────────────
-    if msg_type == "famdo/add_reward":
-        reward = await coordinator.async_add_reward(
-            name=msg["name"],
-            description=msg.get("description", ""),
-            points_cost=msg.get("points_cost", 50),
-            icon=msg.get("icon", "mdi:gift"),
-            image_url=msg.get("image_url"),
-            quantity=msg.get("quantity", -1),
-        )
-        return reward.to_dict()
-
-    if msg_type == "famdo/update_reward":
-        reward_id = msg["reward_id"]
-        skip = {"type", "id", "reward_id"}
-        fields = {k: v for k, v in msg.items() if k not in skip}
-        reward = await coordinator.async_update_reward(reward_id, **fields)
-        if reward:
-            return reward.to_dict()
-        raise ValueError("Reward not found")
-
-    if msg_type == "famdo/claim_reward":
-        claim = await coordinator.async_claim_reward(msg["reward_id"], msg["member_id"])
-        if claim:
-            return claim.to_dict()
-        raise ValueError("Could not claim reward")
-
-    if msg_type == "famdo/fulfill_reward_claim":
-        fulfiller_id = _resolve_ha_user_to_parent(coordinator, msg["fulfiller_id"])
-        claim = await coordinator.async_fulfill_reward_claim(msg["claim_id"], fulfiller_id)
-        if claim:
-            return claim.to_dict()
-        raise ValueError("Could not fulfill reward claim")
-
-    if msg_type == "famdo/delete_reward":
-        success = await coordinator.async_delete_reward(msg["reward_id"])
-        return {"success": success}
-
-    # ── Todo management ───────────────────────────────────────────
-    if msg_type == "famdo/add_todo":
-        todo = await coordinator.async_add_todo(
-            title=msg["title"],
-            description=msg.get("description", ""),
-            assigned_to=msg.get("assigned_to"),
-            due_date=msg.get("due_date"),
-            priority=msg.get("priority", "normal"),
-            category=msg.get("category", "general"),
-            created_by=msg.get("created_by"),
-        )
-        return todo.to_dict()
-
-    if msg_type == "famdo/update_todo":
-        todo_id = msg["todo_id"]
-        skip = {"type", "id", "todo_id"}
-        fields = {k: v for k, v in msg.items() if k not in skip}
-        todo = await coordinator.async_update_todo(todo_id, **fields)
-        if todo:
-            return todo.to_dict()
-        raise ValueError("Todo not found")
-
-    if msg_type == "famdo/complete_todo":
-        todo = await coordinator.async_complete_todo(msg["todo_id"])
-        if todo:
-            return todo.to_dict()
-        raise ValueError("Todo not found")
-
-    if msg_type == "famdo/delete_todo":
-        success = await coordinator.async_delete_todo(msg["todo_id"])
-        return {"success": success}
-
-    # ── Event management ──────────────────────────────────────────
-    if msg_type == "famdo/add_event":
-        event = await coordinator.async_add_event(
-            title=msg["title"],
-            start_date=msg["start_date"],
-            description=msg.get("description", ""),
-            end_date=msg.get("end_date"),
-            start_time=msg.get("start_time"),
-            end_time=msg.get("end_time"),
-            all_day=msg.get("all_day", True),
-            member_ids=msg.get("member_ids"),
-            color=msg.get("color"),
-            recurrence=msg.get("recurrence", "none"),
-            location=msg.get("location", ""),
-        )
-        return event.to_dict()
-
-    if msg_type == "famdo/update_event":
-        event_id = msg["event_id"]
-        skip = {"type", "id", "event_id"}
-        fields = {k: v for k, v in msg.items() if k not in skip}
-        event = await coordinator.async_update_event(event_id, **fields)
-        if event:
-            return event.to_dict()
-        raise ValueError("Event not found")
-
-    if msg_type == "famdo/delete_event":
-        success = await coordinator.async_delete_event(msg["event_id"])
-        return {"success": success}
-
-    # ── Settings ──────────────────────────────────────────────────
-    if msg_type == "famdo/update_settings":
-        settings = dict(msg)
-        for key in ("type", "id"):
-            settings.pop(key, None)
-        if "family_name" in settings:
-            await coordinator.async_update_family_name(settings.pop("family_name"))
-        if settings:
-            await coordinator.async_update_settings(**settings)
-        return {"success": True}
-
-    # ── HA calendar stubs ─────────────────────────────────────────
-    if msg_type == "famdo/get_ha_calendars":
-        return {"calendars": []}
-
-    if msg_type == "famdo/get_ha_calendar_events":
-        return {"events": []}
-
-    # ── Data management (bulk) ────────────────────────────────────
-    if msg_type == "famdo/update_reward_claim":
-        claim_id = msg["claim_id"]
-        skip = {"type", "id", "claim_id"}
-        fields = {k: v for k, v in msg.items() if k not in skip}
-        claim = await coordinator.async_update_reward_claim(claim_id, **fields)
-        if claim:
-            return claim.to_dict()
-        raise ValueError("Reward claim not found")
-
-    if msg_type == "famdo/delete_reward_claim":
-        success = await coordinator.async_delete_reward_claim(msg["claim_id"])
-        return {"success": success}
-
-    if msg_type == "famdo/delete_all_chores":
-        count = await coordinator.async_delete_all_chores(
-            keep_templates=msg.get("keep_templates", False),
-        )
-        return {"success": True, "count": count}
+    command = COMMANDS.get(msg_type)
+    if command is None:
+        raise CommandError("unknown_command", f"Unknown command: {msg_type}")
+    return await execute(command, ctx, validate(command, _params(msg)))
 
-    if msg_type == "famdo/delete_all_rewards":
-        count = await coordinator.async_delete_all_rewards()
-        return {"success": True, "count": count}
 
-    if msg_type == "famdo/delete_all_reward_claims":
-        count = await coordinator.async_delete_all_reward_claims()
-        return {"success": True, "count": count}
-
-    if msg_type == "famdo/delete_all_todos":
-        count = await coordinator.async_delete_all_todos()
-        return {"success": True, "count": count}
-
-    if msg_type == "famdo/delete_all_events":
-        count = await coordinator.async_delete_all_events()
-        return {"success": True, "count": count}
-
-    if msg_type == "famdo/delete_all_members":
-        count = await coordinator.async_delete_all_members()
-        return {"success": True, "count": count}
-
-    if msg_type == "famdo/clear_all_data":
-        counts = await coordinator.async_clear_all_data(
-            keep_members=msg.get("keep_members", False),
-        )
-        return {"success": True, "counts": counts}
-
-    raise ValueError(f"Unknown command: {msg_type}")
+def _params(msg: dict) -> dict:
+    """The command's own fields, without the envelope."""
+    return {k: v for k, v in msg.items() if k not in ("id", "type")}
 
 
 # ---------------------------------------------------------------------------
 # Application factory
 # ---------------------------------------------------------------------------
 
-async def init_app(data_file: str) -> web.Application:
-    """Create and return the aiohttp application."""
-    store = MockStore(data_file=data_file)
+async def init_app(
+    data_file: str,
+    *,
+    json_codec: str | None = None,
+    pretty_data: bool = False,
+    snapshot_format: str = FORMAT_JSON,
+    compression: str = COMPRESSION_NONE,
+    fsync: str = FSYNC_BATCHED,
+    backups: int = 0,
+    lazy_load: bool = False,
+    metrics: bool = False,
+    profile_dir: str | None = None,
+    record: str | None = None,
+) -> web.Application:
+    """Create and return the aiohttp application.
+
+    Profiles from ``/debug/profile`` go to *profile_dir*, by default a
+    ``profiles`` directory next to the data file. With *record*, inbound
+    commands are captured to that path for ``benchmarks/bench_replay.py``.
+    """
+    global _codec
+    METRICS.enabled = metrics
+    if json_codec:
+        _codec = get_codec(json_codec)
+    _LOGGER.info("Using %s for JSON encoding", _codec.name)
+    store = MockStore(
+        data_file=data_file,
+        codec=_codec,
+        pretty=pretty_data,
+        snapshot_format=snapshot_format,
+        compression=compression,
+        fsync=fsync,
+        backups=backups,
+        lazy=lazy_load,
+    )
     coordinator = MockCoordinator(store)
 
     # Load existing data or seed
@@ -432,6 +416,10 @@ async def init_app(data_file: str) -> web.Application:
 
     app = web.Application()
     app["coordinator"] = coordinator
+    app["store"] = store
+    app["send_metrics"] = SendQueueMetrics()
+    app["server_stats"] = ServerStats(["auth", *_LOCAL_COMMANDS, *COMMANDS])
+    app["recorder"] = TrafficRecorder(record, _codec, data_file) if record else None
 
     # Static files — serve custom_components/famdo/www/ at /famdo/
     www_dir = _REPO_ROOT / "custom_components" / "famdo" / "www"
@@ -450,9 +438,61 @@ async def init_app(data_file: str) -> web.Application:
     # WebSocket
     app.router.add_get("/api/websocket", websocket_handler)
 
+    # Prometheus scrape target
+    async def _metrics(_req: web.Request) -> web.Response:
+        body = render(
+            app["server_stats"], app["send_metrics"], coordinator, data_file, METRICS
+        )
+        return web.Response(body=body.encode(), headers={"Content-Type": CONTENT_TYPE})
+
+    app.router.add_get("/metrics", _metrics)
+
+    # Profile live traffic: /debug/profile?seconds=N&mode=cprofile|sample
+    app["profile_dir"] = profile_dir or default_profile_dir(data_file)
+
+    async def _debug_profile(req: web.Request) -> web.Response:
+        mode = req.query.get("mode", PROFILE_CPROFILE)
+        try:
+            seconds = float(req.query.get("seconds", "10"))
+            if not 0 < seconds <= MAX_PROFILE_SECONDS:
+                raise ValueError(f"seconds must be in (0, {MAX_PROFILE_SECONDS}]")
+            capture = ProfileCapture(mode)
+        except ValueError as err:
+            return web.json_response({"error": str(err)}, status=400)
+        try:
+            capture.start()
+        except ProfilerBusy as err:
+            return web.json_response({"error": str(err)}, status=409)
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            # cProfile must be unhooked on the loop thread; only the writing moves off it
+            capture.stop()
+        files = await asyncio.to_thread(capture.write, app["profile_dir"])
+        _LOGGER.info("Wrote %s profile: %s", mode, ", ".join(files))
+        return web.json_response({"mode": mode, "seconds": seconds, "files": files})
+
+    app.router.add_get("/debug/profile", _debug_profile)
+
+    async def _flush_store(app: web.Application) -> None:
+        await app["store"].async_flush()
+
+    app.on_cleanup.append(_flush_store)
+
+    async def _close_recorder(app: web.Application) -> None:
+        if app["recorder"] is not None:
+            app["recorder"].close()
+
+    app.on_cleanup.append(_close_recorder)
+
     return app
 
 
+def default_profile_dir(data_file: str) -> str:
+    """Return the ``profiles`` directory next to *data_file*."""
+    return os.path.join(os.path.dirname(os.path.abspath(data_file)), "profiles")
+
+
 # ---------------------------------------------------------------------------
 # CLI entry point
 # ---------------------------------------------------------------------------
@@ -466,10 +506,82 @@ def main() -> None:
         default="devserver/data.json",
         help="Path to JSON data file (default: devserver/data.json)",
     )
+    parser.add_argument(
+        "--json-codec",
+        choices=("orjson", "msgspec", "json"),
+        help="JSON backend (default: fastest installed, or $FAMDO_JSON_CODEC)",
+    )
+    parser.add_argument(
+        "--pretty-data",
+        action="store_true",
+        help="Indent the data file for reading instead of writing compact JSON",
+    )
+    parser.add_argument(
+        "--snapshot-format",
+        choices=SNAPSHOT_FORMATS,
+        default=FORMAT_JSON,
+        help="Data file encoding; msgpack needs msgspec or msgpack (any format is read back)",
+    )
+    parser.add_argument(
+        "--compress",
+        choices=COMPRESSIONS,
+        default=COMPRESSION_NONE,
+        help="Compress the data file; zstd needs Python 3.14+ or zstandard",
+    )
+    parser.add_argument(
+        "--fsync",
+        choices=FSYNC_POLICIES,
+        default=FSYNC_BATCHED,
+        help="When saves are fsynced: every save, batched (at most once a second) or never",
+    )
+    parser.add_argument(
+        "--backups",
+        type=int,
+        default=0,
+        help="Keep this many rolling backups of the data file (default: 0)",
+    )
+    parser.add_argument(
+        "--lazy-load",
+        action="store_true",
+        help="Load completed todos, fulfilled claims and past events on first access",
+    )
+    parser.add_argument(
+        "--metrics",
+        action="store_true",
+        help="Record latency histograms (see famdo/get_metrics)",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const=PROFILE_CPROFILE,
+        choices=PROFILE_MODES,
+        help="Profile from startup until Ctrl+C (default mode: cprofile)",
+    )
+    parser.add_argument(
+        "--profile-dir",
+        help="Where profiles are written (default: profiles/ next to the data file)",
+    )
+    parser.add_argument(
+        "--record",
+        metavar="PATH",
+        help="Capture inbound commands for benchmarks/bench_replay.py (.gz to compress)",
+    )
     args = parser.parse_args()
 
     async def _run() -> None:
-        app = await init_app(args.data_file)
+        app = await init_app(
+            args.data_file,
+            json_codec=args.json_codec,
+            pretty_data=args.pretty_data,
+            snapshot_format=args.snapshot_format,
+            compression=args.compress,
+            fsync=args.fsync,
+            backups=args.backups,
+            lazy_load=args.lazy_load,
+            metrics=args.metrics,
+            profile_dir=args.profile_dir,
+            record=args.record,
+        )
         runner = web.AppRunner(app)
         await runner.setup()
         site = web.TCPSite(runner, "0.0.0.0", args.port)
@@ -481,14 +593,27 @@ def main() -> None:
         print(f"  Admin:     http://localhost:{args.port}/famdo/")
         print(f"  Kiosk:     http://localhost:{args.port}/famdo/kiosk/")
         print(f"  WebSocket: ws://localhost:{args.port}/api/websocket")
+        if args.profile:
+            print(f"  Profiling ({args.profile}); written on Ctrl+C")
+        if args.record:
+            print(f"  Recording: {args.record}")
         print("  Press Ctrl+C to stop")
         print("=" * 50)
         print()
 
+        capture = None
+        if args.profile:
+            capture = ProfileCapture(args.profile)
+            capture.start()
+
         # Run forever until interrupted
         try:
             await asyncio.Event().wait()
         finally:
+            if capture is not None:
+                capture.stop()
+                for path in capture.write(app["profile_dir"]):
+                    print(f"  Profile written to {path}")
             await runner.cleanup()
 
     try:
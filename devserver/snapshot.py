@@ -0,0 +1,41 @@
+"""Snapshot file formats for MockStore.
+
+The formats are shared with FamDoStore's snapshot backend; this loads
+custom_components/famdo/snapshot.py by path so the package __init__ (which
+imports homeassistant) never runs.
+"""
+from __future__ import annotations
+
+import importlib.util as _ilu
+import os
+import sys
+
+# snapshot.py imports the codec relatively; have it in place first
+from . import json_codec  # noqa: F401
+
+_NAME = "custom_components.famdo.snapshot"
+
+if _NAME not in sys.modules:
+    _path = os.path.join(
+        os.path.abspath(os.path.join(os.path.dirname(__file__), "..")),
+        "custom_components", "famdo", "snapshot.py",
+    )
+    _spec = _ilu.spec_from_file_location(_NAME, _path)
+    _module = _ilu.module_from_spec(_spec)
+    sys.modules[_NAME] = _module
+    _spec.loader.exec_module(_module)
+
+from custom_components.famdo.snapshot import (  # noqa: E402, F401
+    COMPRESSION_GZIP,
+    COMPRESSION_NONE,
+    COMPRESSION_ZSTD,
+    COMPRESSIONS,
+    FORMAT_JSON,
+    FORMAT_MSGPACK,
+    GZIP_LEVEL,
+    SNAPSHOT_FORMATS,
+    ZSTD_LEVEL,
+    check_snapshot_support,
+    decode_snapshot,
+    encode_snapshot,
+)
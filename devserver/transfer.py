@@ -0,0 +1,199 @@
+"""Stream FamDo records to or from a running server as JSON Lines.
+
+Usage:
+    python devserver/transfer.py export backup.jsonl [--url URL] [--chunk 1000]
+    python devserver/transfer.py import backup.jsonl [--url URL] [--chunk 1000] [--replace]
+
+The first line of a file is a header with the family name and settings; each
+following line is one record, ``{"collection": ..., "record": {...}}``.
+Export writes each ``famdo/export`` page as it arrives. Import reads the
+file a chunk at a time and sends it with ``famdo/import``. The server stages
+the chunks and saves them all at once when the last one arrives. Neither
+side holds the whole file as one document.
+
+Works against the dev server and Home Assistant alike (pass ``--token`` for
+HA).
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Any
+
+import aiohttp
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from devserver.json_codec import get_codec  # noqa: E402
+
+DEFAULT_URL = "ws://localhost:8123/api/websocket"
+DEFAULT_CHUNK = 1000
+HEADER_FORMAT = "famdo-export"
+
+_codec = get_codec()
+
+
+class TransferFailed(Exception):
+    """The server rejected an import or export command."""
+
+
+class _Client:
+    """Minimal request/response client for the HA WebSocket protocol."""
+
+    def __init__(self, ws: aiohttp.ClientWebSocketResponse) -> None:
+        self._ws = ws
+        self._next_id = 0
+
+    async def authenticate(self, token: str) -> None:
+        await self._receive()  # auth_required
+        await self._ws.send_bytes(_codec.dumps({"type": "auth", "access_token": token}))
+        msg = await self._receive()
+        if msg.get("type") != "auth_ok":
+            raise TransferFailed(f"Authentication failed: {msg}")
+
+    async def call(self, msg_type: str, **params: Any) -> Any:
+        self._next_id += 1
+        msg_id = self._next_id
+        await self._ws.send_bytes(_codec.dumps({"id": msg_id, "type": msg_type, **params}))
+        while True:
+            msg = await self._receive()
+            if msg.get("id") != msg_id or msg.get("type") != "result":
+                continue
+            if not msg.get("success"):
+                error = msg.get("error", {})
+                raise TransferFailed(f"{error.get('code')}: {error.get('message')}")
+            return msg["result"]
+
+    async def _receive(self) -> dict:
+        raw = await self._ws.receive()
+        if raw.type not in (aiohttp.WSMsgType.TEXT, aiohttp.WSMsgType.BINARY):
+            raise TransferFailed(f"Connection closed ({raw.type.name})")
+        return _codec.loads(raw.data)
+
+
+async def _connect(session: aiohttp.ClientSession, url: str, token: str) -> _Client:
+    # Pages and chunks can be a few MB; aiohttp defaults to 4 MB
+    ws = await session.ws_connect(url, max_msg_size=0)
+    client = _Client(ws)
+    await client.authenticate(token)
+    return client
+
+
+async def export_file(
+    path: str, *, url: str = DEFAULT_URL, token: str = "dev-token", chunk: int = DEFAULT_CHUNK
+) -> int:
+    """Write every record to *path*; return the number of records."""
+    count = 0
+    async with aiohttp.ClientSession() as session:
+        client = await _connect(session, url, token)
+        with open(path, "wb") as out:
+            page = await client.call("famdo/export", limit=chunk)
+            out.write(_codec.dumps({
+                "format": HEADER_FORMAT,
+                "version": page["version"],
+                "family_name": page["family_name"],
+                "settings": page["settings"],
+            }) + b"\n")
+            while True:
+                for collection, records in page["records"].items():
+                    for record in records:
+                        out.write(
+                            _codec.dumps({"collection": collection, "record": record}) + b"\n"
+                        )
+                    count += len(records)
+                if page["next_cursor"] is None:
+                    return count
+                page = await client.call(
+                    "famdo/export", cursor=page["next_cursor"], limit=chunk
+                )
+
+
+async def import_file(
+    path: str,
+    *,
+    url: str = DEFAULT_URL,
+    token: str = "dev-token",
+    chunk: int = DEFAULT_CHUNK,
+    replace: bool = False,
+) -> dict[str, Any]:
+    """Send the records in *path*; return the server's ``added``/``updated`` counts."""
+    import_id = uuid.uuid4().hex
+    header: dict[str, Any] = {}
+    batch: dict[str, list] = {}
+    pending = 0
+    async with aiohttp.ClientSession() as session:
+        client = await _connect(session, url, token)
+        with open(path, "rb") as lines:
+            for number, line in enumerate(lines, 1):
+                if not line.strip():
+                    continue
+                entry = _codec.loads(line)
+                if entry.get("format") == HEADER_FORMAT:
+                    header = entry
+                    continue
+                if "collection" not in entry or "record" not in entry:
+                    raise TransferFailed(f"{path}:{number}: not a FamDo record")
+                batch.setdefault(entry["collection"], []).append(entry["record"])
+                pending += 1
+                if pending >= chunk:
+                    await client.call(
+                        "famdo/import", records=batch, import_id=import_id, final=False
+                    )
+                    batch, pending = {}, 0
+        final: dict[str, Any] = {"records": batch, "import_id": import_id, "replace": replace}
+        if "family_name" in header:
+            final["family_name"] = header["family_name"]
+        if "settings" in header:
+            final["settings"] = header["settings"]
+        return await client.call("famdo/import", **final)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("action", choices=("export", "import"))
+    parser.add_argument("file", help="JSON Lines file to write or read")
+    parser.add_argument(
+        "--url", default=DEFAULT_URL, help=f"WebSocket URL (default: {DEFAULT_URL})"
+    )
+    parser.add_argument(
+        "--token", default="dev-token", help="Access token (any value for the dev server)"
+    )
+    parser.add_argument(
+        "--chunk",
+        type=int,
+        default=DEFAULT_CHUNK,
+        help=f"Records per message (default: {DEFAULT_CHUNK})",
+    )
+    parser.add_argument(
+        "--replace",
+        action="store_true",
+        help="On import, replace each collection in the file instead of merging by id",
+    )
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    try:
+        if args.action == "export":
+            count = asyncio.run(
+                export_file(args.file, url=args.url, token=args.token, chunk=args.chunk)
+            )
+            summary = f"Exported {count} records"
+        else:
+            result = asyncio.run(import_file(
+                args.file, url=args.url, token=args.token, chunk=args.chunk, replace=args.replace
+            ))
+            count = result["added"] + result["updated"]
+            summary = f"Imported {result['added']} new and {result['updated']} updated records"
+    except (TransferFailed, aiohttp.ClientError, OSError) as err:
+        print(f"{args.action} failed: {err}", file=sys.stderr)
+        sys.exit(1)
+    elapsed = time.perf_counter() - start
+    print(f"{summary} in {elapsed:.2f}s ({count / elapsed:,.0f} records/s)")
+
+
+if __name__ == "__main__":
+    main()
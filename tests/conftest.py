@@ -22,8 +22,10 @@ _HA_MOCKS = [
     "homeassistant.helpers",
     "homeassistant.helpers.entity",
     "homeassistant.helpers.entity_platform",
+    "homeassistant.helpers.json",
     "homeassistant.helpers.storage",
     "homeassistant.helpers.update_coordinator",
+    "homeassistant.util",
     "voluptuous",
 ]
 for _mod in _HA_MOCKS:
@@ -0,0 +1,142 @@
+"""Tests for the HA calendar event cache and calendar registry."""
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from custom_components.famdo.calendar_cache import CalendarEventCache, CalendarRegistry
+
+DAY = timedelta(days=1)
+MONDAY = datetime(2024, 6, 3, tzinfo=timezone.utc)
+
+
+class _Calendar:
+    """Fake calendar with one event per day, counting fetches."""
+
+    def __init__(self) -> None:
+        self.fetches: list[tuple[datetime, datetime]] = []
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def fetch(self, start: datetime, end: datetime) -> list:
+        self.fetches.append((start, end))
+        await self.release.wait()
+        events = []
+        day = start
+        while day < end:
+            events.append((day, day + timedelta(hours=1), day.date().isoformat()))
+            day += DAY
+        return events
+
+
+@pytest.mark.asyncio
+class TestCalendarEventCache:
+    async def test_sub_window_served_from_superset(self):
+        cache = CalendarEventCache(300)
+        calendar = _Calendar()
+
+        week = await cache.async_get("calendar.family", MONDAY, MONDAY + 7 * DAY, calendar.fetch)
+        day = await cache.async_get(
+            "calendar.family", MONDAY + 2 * DAY, MONDAY + 3 * DAY, calendar.fetch
+        )
+
+        assert len(week) == 7
+        assert day == ["2024-06-05"]
+        assert len(calendar.fetches) == 1
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    async def test_concurrent_requests_share_one_fetch(self):
+        cache = CalendarEventCache(300)
+        calendar = _Calendar()
+        calendar.release.clear()
+
+        tasks = [
+            asyncio.create_task(
+                cache.async_get("calendar.family", MONDAY, MONDAY + 7 * DAY, calendar.fetch)
+            )
+            for _ in range(5)
+        ]
+        await asyncio.sleep(0)
+        calendar.release.set()
+        results = await asyncio.gather(*tasks)
+
+        assert len(calendar.fetches) == 1
+        assert cache.collapsed == 4
+        assert all(result == results[0] for result in results)
+
+    async def test_expiry_and_invalidation(self):
+        now = [0.0]
+        cache = CalendarEventCache(60, clock=lambda: now[0])
+        calendar = _Calendar()
+        window = (MONDAY, MONDAY + DAY)
+
+        await cache.async_get("calendar.family", *window, calendar.fetch)
+        now[0] = 61
+        await cache.async_get("calendar.family", *window, calendar.fetch)
+        cache.invalidate("calendar.family")
+        await cache.async_get("calendar.family", *window, calendar.fetch)
+        await cache.async_get("calendar.other", *window, calendar.fetch)
+        assert len(calendar.fetches) == 4
+
+    async def test_fetch_started_before_invalidate_is_not_cached(self):
+        cache = CalendarEventCache(300)
+        calendar = _Calendar()
+        calendar.release.clear()
+        window = (MONDAY, MONDAY + DAY)
+
+        task = asyncio.create_task(cache.async_get("calendar.family", *window, calendar.fetch))
+        await asyncio.sleep(0)
+        cache.invalidate()
+        calendar.release.set()
+        await task
+        await cache.async_get("calendar.family", *window, calendar.fetch)
+        assert len(calendar.fetches) == 2
+
+    async def test_errors_reach_waiters_and_are_not_cached(self):
+        cache = CalendarEventCache(300)
+        gate = asyncio.Event()
+        calls = 0
+
+        async def failing(start, end):
+            nonlocal calls
+            calls += 1
+            await gate.wait()
+            raise RuntimeError("calendar offline")
+
+        window = (MONDAY, MONDAY + DAY)
+        tasks = [
+            asyncio.create_task(cache.async_get("calendar.family", *window, failing))
+            for _ in range(2)
+        ]
+        await asyncio.sleep(0)
+        gate.set()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert calls == 1
+
+        with pytest.raises(RuntimeError):
+            await cache.async_get("calendar.family", *window, failing)
+        assert calls == 2
+
+
+class TestCalendarRegistry:
+    def test_revision_tracks_add_rename_remove(self):
+        registry = CalendarRegistry()
+        registry.load([("calendar.family", "Family"), ("calendar.school", "School")])
+        listing = registry.listing()
+        revision = registry.revision
+
+        assert [c["entity_id"] for c in listing] == ["calendar.family", "calendar.school"]
+        # An event starting changes the state but not the name
+        assert not registry.update("calendar.family", "Family")
+        assert registry.listing() is listing and registry.revision == revision
+
+        assert registry.update("calendar.family", "Household")
+        assert registry.update("calendar.work", "Work")
+        assert registry.update("calendar.school", None)
+        assert not registry.update("calendar.school", None)
+        assert registry.revision == revision + 3
+        assert registry.listing() == [
+            {"entity_id": "calendar.family", "name": "Household"},
+            {"entity_id": "calendar.work", "name": "Work"},
+        ]
@@ -0,0 +1,206 @@
+"""Tests for the shared WebSocket command registry."""
+import pytest
+import pytest_asyncio
+
+from devserver.mock_coordinator import MockCoordinator
+from devserver.mock_storage import MockStore
+from custom_components.famdo.commands import COMMANDS, CommandError, execute, validate
+
+
+class _Ctx:
+    def __init__(self, coordinator):
+        self.coordinator = coordinator
+
+    def resolve_parent(self, raw_id: str, action: str) -> str:
+        return raw_id
+
+
+@pytest_asyncio.fixture
+async def ctx(tmp_path):
+    store = MockStore(data_file=str(tmp_path / "data.json"))
+    coord = MockCoordinator(store)
+    await coord.async_init()
+    return _Ctx(coord)
+
+
+async def _run(ctx, command_name: str, /, **params):
+    command = COMMANDS[command_name]
+    return await execute(command, ctx, validate(command, params))
+
+
+class TestValidate:
+    def test_fills_defaults(self):
+        params = validate(COMMANDS["famdo/add_member"], {"name": "Emma"})
+        assert params == {
+            "name": "Emma", "role": "child", "color": "#4ECDC4", "avatar": "mdi:account",
+        }
+
+    def test_rejects_missing_extra_and_mistyped(self):
+        add_member = COMMANDS["famdo/add_member"]
+        for bad in ({}, {"name": "Emma", "bogus": 1}, {"name": 3}):
+            with pytest.raises(CommandError) as err:
+                validate(add_member, bad)
+            assert err.value.code == "invalid_format"
+
+    def test_int_range_and_bool_is_not_int(self):
+        query = COMMANDS["famdo/query_chores"]
+        with pytest.raises(CommandError):
+            validate(query, {"limit": 0})
+        with pytest.raises(CommandError):
+            validate(query, {"limit": True})
+        assert validate(query, {"cursor": None})["cursor"] is None
+
+    def test_flags(self):
+        assert not COMMANDS["famdo/get_data"].write
+        assert not COMMANDS["famdo/query_events"].write
+        assert COMMANDS["famdo/claim_chore"].write
+        assert COMMANDS["famdo/clear_all_data"].write
+
+
+class TestExecute:
+    @pytest.mark.asyncio
+    async def test_add_and_update_member(self, ctx):
+        member = await _run(ctx, "famdo/add_member", name="Emma")
+        updated = await _run(ctx, "famdo/update_member", member_id=member["id"], points=5)
+        assert updated["points"] == 5
+
+    @pytest.mark.asyncio
+    async def test_not_found_raises_with_code(self, ctx):
+        with pytest.raises(CommandError) as err:
+            await _run(ctx, "famdo/update_chore", chore_id="missing", name="x")
+        assert err.value.code == "not_found"
+
+    @pytest.mark.asyncio
+    async def test_expected_version_conflict(self, ctx):
+        member = await _run(ctx, "famdo/add_member", name="Emma")
+        chore = await _run(ctx, "famdo/add_chore", name="Dishes")
+        assert chore["version"] == 0
+
+        claimed = await _run(
+            ctx, "famdo/claim_chore", chore_id=chore["id"], member_id=member["id"],
+            expected_version=0,
+        )
+        assert claimed["version"] == 1
+        # A second kiosk still holding version 0 is rejected before anything changes
+        with pytest.raises(CommandError) as err:
+            await _run(
+                ctx, "famdo/update_chore", chore_id=chore["id"], name="x",
+                expected_version=0,
+            )
+        assert err.value.code == "version_conflict"
+        assert ctx.coordinator.famdo_data.get_chore_by_id(chore["id"]).name == "Dishes"
+
+        updated = await _run(
+            ctx, "famdo/update_chore", chore_id=chore["id"], name="x", expected_version=1
+        )
+        assert (updated["name"], updated["version"]) == ("x", 2)
+
+    @pytest.mark.asyncio
+    async def test_delete_where_dry_run(self, ctx):
+        await _run(ctx, "famdo/add_todo", title="Done")
+        await _run(ctx, "famdo/add_todo", title="Open")
+        todo_id = ctx.coordinator.famdo_data.todos[0].id
+        await _run(ctx, "famdo/complete_todo", todo_id=todo_id)
+
+        preview = await _run(ctx, "famdo/delete_where", collection="todos", status="completed",
+                             dry_run=True)
+        assert preview == {"count": 1, "dry_run": True}
+        result = await _run(ctx, "famdo/delete_where", collection="todos", status="completed")
+        assert result == {"count": 1, "dry_run": False}
+        assert [t.title for t in ctx.coordinator.famdo_data.todos] == ["Open"]
+
+        with pytest.raises(CommandError) as err:
+            await _run(ctx, "famdo/delete_where", collection="members", member_id="x")
+        assert err.value.code == "invalid_query"
+
+    @pytest.mark.asyncio
+    async def test_get_metrics(self, ctx):
+        from custom_components.famdo.metrics import METRICS
+
+        METRICS.enabled = True
+        try:
+            await _run(ctx, "famdo/add_todo", title="Timed")
+            result = await _run(ctx, "famdo/get_metrics", reset=True)
+            assert result["enabled"] is True
+            stages = result["stages"]
+            for name in ("command.famdo/add_todo", "coordinator.add_todo", "store.save",
+                         "coordinator.listeners", "data.to_dict"):
+                assert stages[name]["count"] >= 1
+            assert {"p50_ms", "p95_ms", "p99_ms"} <= set(stages["store.save"])
+            # Only the resetting call itself was timed after the reset
+            after = await _run(ctx, "famdo/get_metrics")
+            assert set(after["stages"]) == {"command.famdo/get_metrics"}
+        finally:
+            METRICS.enabled = False
+            METRICS.reset()
+
+    @pytest.mark.asyncio
+    async def test_invalid_query_code(self, ctx):
+        with pytest.raises(CommandError) as err:
+            await _run(ctx, "famdo/query_events", sort_by="nope")
+        assert err.value.code == "invalid_query"
+
+
+class TestTransfer:
+    @pytest.mark.asyncio
+    async def test_chunked_import_saves_once(self, ctx):
+        before = ctx.coordinator.snapshot().number
+        chores = [{"id": f"c{i}", "name": f"Chore {i}"} for i in range(5)]
+
+        staged = await _run(
+            ctx, "famdo/import", records={"chores": chores[:3]}, import_id="x", final=False
+        )
+        assert staged == {"staged": 3}
+        assert ctx.coordinator.famdo_data.chores == []
+
+        result = await _run(
+            ctx, "famdo/import", records={"chores": chores[3:]}, import_id="x",
+            family_name="Smith",
+        )
+        assert result == {"added": 5, "updated": 0}
+        assert [c.id for c in ctx.coordinator.famdo_data.chores] == [f"c{i}" for i in range(5)]
+        assert ctx.coordinator.famdo_data.family_name == "Smith"
+        assert ctx.coordinator.snapshot().number == before + 1
+
+        # Existing ids are replaced and move to their next version
+        result = await _run(
+            ctx, "famdo/import", records={"chores": [{"id": "c0", "name": "Renamed"}]}
+        )
+        assert result == {"added": 0, "updated": 1}
+        chore = ctx.coordinator.famdo_data.get_chore_by_id("c0")
+        assert (chore.name, chore.version) == ("Renamed", 1)
+
+    @pytest.mark.asyncio
+    async def test_invalid_record_rejects_whole_import(self, ctx):
+        await _run(ctx, "famdo/import", records={"chores": [{"id": "a"}]}, import_id="y",
+                   final=False)
+        with pytest.raises(CommandError) as err:
+            await _run(
+                ctx, "famdo/import", records={"chores": [{"id": "b", "bogus": 1}]},
+                import_id="y",
+            )
+        assert err.value.code == "invalid_import"
+        assert ctx.coordinator.famdo_data.chores == []
+
+    @pytest.mark.asyncio
+    async def test_export_pages_from_one_version(self, ctx):
+        await _run(ctx, "famdo/add_member", name="Emma")
+        for i in range(3):
+            await _run(ctx, "famdo/add_chore", name=f"Chore {i}")
+
+        page = await _run(ctx, "famdo/export", limit=2)
+        assert page["family_name"] == ctx.coordinator.famdo_data.family_name
+        records = page["records"]
+        # Writes during the export do not show up in later pages
+        await _run(ctx, "famdo/add_chore", name="Late")
+        while page["next_cursor"]:
+            page = await _run(ctx, "famdo/export", cursor=page["next_cursor"], limit=2)
+            for name, items in page["records"].items():
+                records.setdefault(name, []).extend(items)
+        assert len(records["members"]) == 1
+        assert [c["name"] for c in records["chores"]] == ["Chore 0", "Chore 1", "Chore 2"]
+
+        with pytest.raises(CommandError) as err:
+            await _run(ctx, "famdo/export", cursor="bogus")
+        assert err.value.code == "invalid_cursor"
+
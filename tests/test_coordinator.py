@@ -332,3 +332,149 @@ class TestDataPersistence:
         found = coord2.famdo_data.get_member_by_id(member.id)
         assert found is not None
         assert found.name == "Persist"
+
+
+# ── TestQueries ─────────────────────────────────────────────────────
+
+
+class TestQueries:
+    @pytest.mark.asyncio
+    async def test_filter_by_status_and_member(self, coordinator):
+        child_id = await _add_child(coordinator)
+        claimed = await coordinator.async_add_chore("Mop")
+        await coordinator.async_add_chore("Sweep")
+        await coordinator.async_claim_chore(claimed.id, child_id)
+
+        result = coordinator.query("chores", status="claimed", member_id=child_id)
+        assert result["total"] == 1
+        assert result["items"][0]["id"] == claimed.id
+        assert result["next_cursor"] is None
+
+    @pytest.mark.asyncio
+    async def test_cursor_pagination_covers_all_records(self, coordinator):
+        for i in range(7):
+            await coordinator.async_add_todo(f"Todo {i}", due_date=f"2024-03-0{i + 1}")
+
+        seen = []
+        cursor = None
+        while True:
+            page = coordinator.query(
+                "todos", sort_by="due_date", descending=True, limit=3, cursor=cursor
+            )
+            seen.extend(t["due_date"] for t in page["items"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        assert seen == sorted(seen, reverse=True)
+        assert len(seen) == 7
+
+    @pytest.mark.asyncio
+    async def test_date_range_and_template(self, coordinator):
+        instance = await coordinator.async_add_chore("Trash", recurrence="daily", due_date="2024-05-10")
+        await coordinator.async_add_chore("Dishes", due_date="2024-06-01")
+
+        in_may = coordinator.query("chores", date_from="2024-05-01", date_to="2024-05-31")
+        assert [c["id"] for c in in_may["items"]] == [instance.id]
+
+        by_template = coordinator.query("chores", template_id=instance.template_id)
+        assert [c["id"] for c in by_template["items"]] == [instance.id]
+
+    @pytest.mark.asyncio
+    async def test_index_invalidated_after_mutation(self, coordinator):
+        todo = await coordinator.async_add_todo("Laundry")
+        assert coordinator.query("todos", status="active")["total"] == 1
+        await coordinator.async_complete_todo(todo.id)
+        assert coordinator.query("todos", status="active")["total"] == 0
+        assert coordinator.query("todos", status="completed")["total"] == 1
+
+    @pytest.mark.asyncio
+    async def test_invalid_query(self, coordinator):
+        from custom_components.famdo.query import QueryError
+
+        with pytest.raises(QueryError):
+            coordinator.query("events", status="pending")
+        with pytest.raises(QueryError):
+            coordinator.query("chores", sort_by="nope")
+        with pytest.raises(QueryError):
+            coordinator.query("chores", date_from="May 1st")
+
+    @pytest.mark.asyncio
+    async def test_date_filters_accept_datetimes(self, coordinator):
+        chore = await coordinator.async_add_chore("Trash", due_date="2024-05-10")
+        result = coordinator.query(
+            "chores", date_from="2024-05-10T00:00:00", date_to="2024-05-10"
+        )
+        assert [c["id"] for c in result["items"]] == [chore.id]
+
+    def test_cold_records_load_only_when_the_filters_can_match_them(self):
+        from custom_components.famdo.models import FamDoData, TodoItem
+        from custom_components.famdo.query import FamDoQueryIndex
+        from custom_components.famdo.versions import DataVersions
+
+        raw = FamDoData(todos=[
+            TodoItem(id="t1", completed=True, created_at="1"),
+            TodoItem(id="t2", created_at="2"),
+        ]).to_dict()
+        versions = DataVersions(FamDoData.from_dict(raw, lazy=True))
+        index = FamDoQueryIndex()
+        data = versions.current.data
+        assert index.query(data, "todos", status="active")["total"] == 1
+        assert not data.todos.loaded
+        assert index.query(data, "todos", status="completed")["total"] == 1
+        assert [t["id"] for t in index.query(data, "todos")["items"]] == ["t1", "t2"]
+
+        # The next version only re-indexes the record that changed
+        versions.edit("todos", versions.draft.todos[1]).completed = True
+        data = versions.commit().data
+        assert index.query(data, "todos", status="active")["total"] == 0
+        completed = index.query(data, "todos", status="completed", descending=True)
+        assert [t["id"] for t in completed["items"]] == ["t2", "t1"]
+
+
+# ── TestBulkDelete ──────────────────────────────────────────────────
+
+
+class TestBulkDelete:
+    @pytest.mark.asyncio
+    async def test_delete_all_chores_keeps_templates(self, coordinator):
+        instance = await coordinator.async_add_chore("Trash", recurrence="daily")
+        await coordinator.async_add_chore("Dishes")
+
+        assert await coordinator.async_delete_all_chores(keep_templates=True) == 2
+        assert [c.id for c in coordinator.famdo_data.chores] == [instance.template_id]
+
+    @pytest.mark.asyncio
+    async def test_delete_where_dry_run_then_delete(self, coordinator):
+        child_id = await _add_child(coordinator)
+        mine = await coordinator.async_add_chore("Mop", assigned_to=child_id)
+        await coordinator.async_add_chore("Sweep")
+        await coordinator.async_claim_chore(mine.id, child_id)
+
+        assert await coordinator.async_delete_where(
+            "chores", status="claimed", member_id=child_id, dry_run=True
+        ) == 1
+        assert len(coordinator.famdo_data.chores) == 2
+
+        assert await coordinator.async_delete_where(
+            "chores", status="claimed", member_id=child_id
+        ) == 1
+        assert [c.name for c in coordinator.famdo_data.chores] == ["Sweep"]
+        assert coordinator.query("chores", member_id=child_id)["total"] == 0
+
+    @pytest.mark.asyncio
+    async def test_delete_where_by_age(self, coordinator):
+        old = await coordinator.async_add_todo("Old")
+        await coordinator.async_update_todo(old.id, created_at="2020-01-01T00:00:00")
+        await coordinator.async_add_todo("New")
+
+        assert await coordinator.async_delete_where("todos", older_than_days=30) == 1
+        assert [t.title for t in coordinator.famdo_data.todos] == ["New"]
+
+    @pytest.mark.asyncio
+    async def test_delete_where_needs_a_supported_filter(self, coordinator):
+        from custom_components.famdo.query import QueryError
+
+        with pytest.raises(QueryError):
+            await coordinator.async_delete_where("chores")
+        with pytest.raises(QueryError):
+            await coordinator.async_delete_where("events", status="pending")
@@ -7,6 +7,7 @@ import os
 import socket
 import sys
 import tempfile
+from datetime import datetime, timedelta
 from typing import Any
 
 import aiohttp
@@ -84,8 +85,12 @@ async def send_command(
 # ---------------------------------------------------------------------------
 
 @pytest_asyncio.fixture
-async def dev_server():
-    """Start the dev server on a random port, yield the port, then tear down."""
+async def dev_server(request):
+    """Start the dev server on a random port, yield the port, then tear down.
+
+    Parametrize indirectly with a tuple to pass extra command line arguments.
+    """
+    extra_args = getattr(request, "param", ())
     port = _free_port()
     data_file = os.path.join(tempfile.mkdtemp(), "famdo_test_data.json")
     # Don't create the file — MockStore seeds fresh data when file is absent
@@ -94,6 +99,7 @@ async def dev_server():
         sys.executable, "devserver/server.py",
         "--port", str(port),
         "--data-file", data_file,
+        *extra_args,
         cwd=os.path.join(os.path.dirname(__file__), ".."),
         stdout=asyncio.subprocess.PIPE,
         stderr=asyncio.subprocess.PIPE,
@@ -195,6 +201,24 @@ class TestDataRetrieval:
             await ws_close(ws)
 
 
+    async def test_query_chores_paged(self, dev_server: int):
+        ws = await ws_connect(dev_server)
+        try:
+            first = await send_command(ws, "famdo/query_chores", {"limit": 2, "is_template": False})
+            assert len(first["items"]) == 2
+            assert first["total"] > 2
+            assert first["next_cursor"]
+
+            second = await send_command(
+                ws, "famdo/query_chores",
+                {"limit": 2, "is_template": False, "cursor": first["next_cursor"]},
+            )
+            first_ids = {c["id"] for c in first["items"]}
+            assert not first_ids & {c["id"] for c in second["items"]}
+        finally:
+            await ws_close(ws)
+
+
 # ---------------------------------------------------------------------------
 # Tests — Member CRUD
 # ---------------------------------------------------------------------------
@@ -347,3 +371,239 @@ class TestSubscription:
         finally:
             await ws_close(ws1)
             await ws_close(ws2)
+
+    async def test_burst_is_coalesced(self, dev_server: int):
+        ws1 = await ws_connect(dev_server)
+        ws2 = await ws_connect(dev_server)
+        try:
+            sub_id = _next_id()
+            await ws1.send_json({"id": sub_id, "type": "famdo/subscribe", "throttle_ms": 200})
+            await asyncio.wait_for(ws1.receive_json(), timeout=5)  # initial result
+
+            for i in range(5):
+                await send_command(ws2, "famdo/add_todo", {"title": f"Burst {i}"})
+
+            events = []
+            while True:
+                try:
+                    events.append(await asyncio.wait_for(ws1.receive_json(), timeout=0.6))
+                except asyncio.TimeoutError:
+                    break
+            assert 1 <= len(events) < 5
+            titles = [t["title"] for t in events[-1]["event"]["data"]["todos"]]
+            assert "Burst 4" in titles
+        finally:
+            await ws_close(ws1)
+            await ws_close(ws2)
+
+    async def test_delta_subscription(self, dev_server: int):
+        ws1 = await ws_connect(dev_server)
+        ws2 = await ws_connect(dev_server)
+        try:
+            sub_id = _next_id()
+            await ws1.send_json({"id": sub_id, "type": "famdo/subscribe", "delta": True})
+            initial = await asyncio.wait_for(ws1.receive_json(), timeout=5)
+            version = initial["result"]["version"]
+            assert initial["result"]["data"]["members"]
+
+            await send_command(ws2, "famdo/add_todo", {"title": "Delta"})
+
+            event = await asyncio.wait_for(ws1.receive_json(), timeout=5)
+            delta = event["event"]["delta"]
+            assert delta["base_version"] == version
+            assert delta["version"] > version
+            assert set(delta["changes"]) == {"todos"}
+            assert [t["title"] for t in delta["changes"]["todos"]["upserted"]] == ["Delta"]
+        finally:
+            await ws_close(ws1)
+            await ws_close(ws2)
+
+    async def test_invalid_subscribe_params(self, dev_server: int):
+        ws = await ws_connect(dev_server)
+        try:
+            for bad in ({"throttle_ms": -1}, {"throttle_ms": "100"}, {"delta": "yes"}):
+                sub_id = _next_id()
+                await ws.send_json({"id": sub_id, "type": "famdo/subscribe", **bad})
+                resp = await asyncio.wait_for(ws.receive_json(), timeout=5)
+                assert resp["id"] == sub_id
+                assert not resp["success"]
+                assert resp["error"]["code"] == "invalid_format"
+        finally:
+            await ws_close(ws)
+
+
+# ---------------------------------------------------------------------------
+# Tests — Import / export CLI
+# ---------------------------------------------------------------------------
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+class TestTransfer:
+    async def test_export_then_replace_import_round_trips(self, dev_server: int, tmp_path):
+        from devserver.transfer import export_file, import_file
+
+        url = f"ws://localhost:{dev_server}/api/websocket"
+        path = str(tmp_path / "backup.jsonl")
+        ws = await ws_connect(dev_server)
+        try:
+            before = await send_command(ws, "famdo/get_data")
+            count = await export_file(path, url=url, chunk=7)
+            assert count == sum(
+                len(before[name])
+                for name in ("members", "chores", "rewards", "reward_claims", "todos", "events")
+            )
+
+            await send_command(ws, "famdo/add_todo", {"title": "Not in backup"})
+            result = await import_file(path, url=url, chunk=7, replace=True)
+            assert result == {"added": count, "updated": 0}
+
+            after = await send_command(ws, "famdo/get_data")
+            assert after["todos"] == before["todos"]
+            assert after["chores"] == before["chores"]
+        finally:
+            await ws_close(ws)
+
+
+# ---------------------------------------------------------------------------
+# Tests — Merged calendar
+# ---------------------------------------------------------------------------
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+class TestMergedEvents:
+    async def test_merged_events_are_time_sorted(self, dev_server: int):
+        ws = await ws_connect(dev_server)
+        try:
+            today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+            result = await send_command(ws, "famdo/get_merged_events", {
+                "start": today.isoformat(),
+                "end": (today + timedelta(days=8)).isoformat(),
+                "entity_ids": ["calendar.school"],
+            })
+            uids = [event["uid"] for event in result["events"]]
+            assert {"event-soccer", "event-gamenight"} <= set(uids)
+            assert any(uid.startswith("chore_") for uid in uids)
+            assert len(uids) == len(set(uids))
+            starts = [datetime.fromisoformat(event["start"]) for event in result["events"]]
+            assert starts == sorted(starts, key=lambda s: s if s.tzinfo else s.astimezone())
+            assert result["failed"] == []
+        finally:
+            await ws_close(ws)
+
+    async def test_merged_events_rejects_bad_params(self, dev_server: int):
+        ws = await ws_connect(dev_server)
+        try:
+            today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+            window = {"start": today.isoformat(), "end": (today + timedelta(days=1)).isoformat()}
+            for bad in ({"start": "not a date"}, {"limit": 0}, {"limit": "5"}, {"limit": True}):
+                with pytest.raises(RuntimeError):
+                    await send_command(ws, "famdo/get_merged_events", {**window, **bad})
+            result = await send_command(ws, "famdo/get_merged_events", {**window, "limit": 1})
+            assert len(result["events"]) <= 1
+        finally:
+            await ws_close(ws)
+
+
+# ---------------------------------------------------------------------------
+# Tests — Prometheus metrics
+# ---------------------------------------------------------------------------
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+class TestMetricsEndpoint:
+    async def test_metrics_report_traffic_and_data(self, dev_server: int):
+        ws = await ws_connect(dev_server)
+        try:
+            await send_command(ws, "famdo/add_todo", {"title": "Scraped"})
+            async with aiohttp.ClientSession() as session:
+                async with session.get(f"http://localhost:{dev_server}/metrics") as resp:
+                    assert resp.status == 200
+                    assert resp.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+                    body = await resp.text()
+        finally:
+            await ws_close(ws)
+
+        samples = {
+            line.rsplit(" ", 1)[0]: float(line.rsplit(" ", 1)[1])
+            for line in body.splitlines()
+            if line and not line.startswith("#")
+        }
+        assert samples["famdo_ws_connections"] >= 1
+        assert samples['famdo_ws_messages_received_total{type="famdo/add_todo"}'] == 1
+        assert samples['famdo_ws_dispatch_seconds_count{type="famdo/add_todo"}'] == 1
+        assert samples['famdo_ws_dispatch_seconds_bucket{type="famdo/add_todo",le="+Inf"}'] == 1
+        assert samples['famdo_collection_records{collection="todos"}'] >= 1
+        assert samples["famdo_data_file_bytes"] > 0
+        if sys.platform == "linux":
+            assert samples["process_resident_memory_bytes"] > 0
+
+
+# ---------------------------------------------------------------------------
+# Tests — Traffic recording
+# ---------------------------------------------------------------------------
+
+_CAPTURE = os.path.join(tempfile.mkdtemp(), "capture.jsonl")
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+class TestRecording:
+    @pytest.mark.parametrize("dev_server", [("--record", _CAPTURE)], indirect=True)
+    async def test_record_captures_commands(self, dev_server: int):
+        from devserver.json_codec import get_codec
+        from devserver.recorder import read_capture
+
+        ws = await ws_connect(dev_server)
+        await send_command(ws, "famdo/add_todo", {"title": "Recorded"})
+        await ws_close(ws)
+        # The capture is flushed once the server has seen the connection
+        # close. The fixture's readiness probes are connections too, and one
+        # may close after ours, so find ours by its command.
+        ours: list = []
+        for _ in range(50):
+            header, events = read_capture(_CAPTURE, get_codec())
+            events = list(events)
+            conns = {e["c"] for e in events if e.get("msg", {}).get("type") == "famdo/add_todo"}
+            ours = [e for e in events if e["c"] in conns]
+            if ours and ours[-1].get("close"):
+                break
+            await asyncio.sleep(0.1)
+
+        assert os.path.exists(os.path.join(os.path.dirname(_CAPTURE), header["snapshot"]))
+        assert [e.get("open") or e.get("close") or e["msg"]["type"] for e in ours] == [
+            True, "famdo/add_todo", True,
+        ]
+        assert ours[1]["msg"]["title"] == "Recorded"
+        assert ours[0]["t"] <= ours[1]["t"] <= ours[2]["t"]
+
+
+# ---------------------------------------------------------------------------
+# Tests — Profiling
+# ---------------------------------------------------------------------------
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+class TestProfileEndpoint:
+    async def test_profile_window_over_live_traffic(self, dev_server: int):
+        base = f"http://localhost:{dev_server}/debug/profile"
+        ws = await ws_connect(dev_server)
+        try:
+            async with aiohttp.ClientSession() as session:
+                profile = asyncio.ensure_future(session.get(f"{base}?seconds=0.5&mode=sample"))
+                await asyncio.sleep(0.1)
+                async with session.get(f"{base}?seconds=0.1") as busy:
+                    assert busy.status == 409
+                for i in range(5):
+                    await send_command(ws, "famdo/add_todo", {"title": f"Profiled {i}"})
+                async with await profile as resp:
+                    assert resp.status == 200
+                    result = await resp.json()
+                async with session.get(f"{base}?seconds=-1") as bad:
+                    assert bad.status == 400
+        finally:
+            await ws_close(ws)
+
+        (path,) = result["files"]
+        assert path.endswith(".collapsed")
+        with open(path) as collapsed:
+            assert collapsed.read().strip()
@@ -0,0 +1,27 @@
+"""Tests for the dev server's pluggable JSON codec."""
+import pytest
+
+from devserver.json_codec import available_codecs, get_codec
+
+
+@pytest.mark.parametrize("name", available_codecs())
+class TestJsonCodec:
+    def test_round_trip_is_compact_utf8(self, name):
+        codec = get_codec(name)
+        payload = {"title": "Gâteau 🎂", "points": 10, "tags": [None, True]}
+        encoded = codec.dumps(payload)
+        assert isinstance(encoded, bytes)
+        assert b", " not in encoded and b": " not in encoded
+        assert "Gâteau 🎂".encode() in encoded  # not \\u-escaped
+        assert codec.loads(encoded) == payload
+        assert codec.loads(codec.dumps_pretty(payload)) == payload
+
+    def test_malformed_input_raises_value_error(self, name):
+        with pytest.raises(ValueError):
+            get_codec(name).loads(b"{not json")
+
+
+def test_stdlib_always_available():
+    assert "json" in available_codecs()
+    with pytest.raises(ValueError):
+        get_codec("yaml")
@@ -0,0 +1,84 @@
+"""Tests for merging FamDo and HA calendar events."""
+from datetime import datetime, timedelta, timezone
+
+from custom_components.famdo.merged_events import (
+    SOURCE_CHORES,
+    SOURCE_EVENTS,
+    calendar_events,
+    chore_events,
+    famdo_events,
+    merge_events,
+)
+from custom_components.famdo.models import CalendarEvent, Chore, FamDoData, FamilyMember
+
+TZ = timezone(timedelta(hours=2))
+START = datetime(2024, 6, 3, tzinfo=TZ)
+END = START + timedelta(days=7)
+
+
+def _data() -> FamDoData:
+    data = FamDoData()
+    data.members = [FamilyMember(id="kid", name="Alex")]
+    data.events = [
+        CalendarEvent(id="late", title="Dinner", start_date="2024-06-04", all_day=False,
+                      start_time="18:00", end_time="19:00"),
+        CalendarEvent(id="early", title="Trip", start_date="2024-06-04"),
+        CalendarEvent(id="past", title="Old", start_date="2024-05-01"),
+    ]
+    data.chores = [
+        Chore(id="dishes", name="Dishes", points=5, assigned_to="kid",
+              due_date="2024-06-04", due_time="17:30"),
+        Chore(id="tmpl", name="Template", due_date="2024-06-04", is_template=True),
+        Chore(id="none", name="Someday"),
+    ]
+    return data
+
+
+class TestMergedEvents:
+    def test_famdo_sources_are_windowed_and_sorted(self):
+        data = _data()
+        events = famdo_events(data, START, END, TZ)
+        chores = chore_events(data, START, END, TZ)
+
+        assert [payload["uid"] for _, _, payload in events] == ["early", "late"]
+        assert events[1][2]["start"] == "2024-06-04T18:00:00+02:00"
+        assert [payload["uid"] for _, _, payload in chores] == ["chore_dishes"]
+        assert chores[0][2]["summary"] == "Dishes (Alex) - 5 pts"
+        assert chores[0][2]["source"] == SOURCE_CHORES
+
+    def test_merge_interleaves_sources_in_time_order(self):
+        data = _data()
+        school = calendar_events([
+            {"summary": "School", "start": "2024-06-04T08:00:00+02:00",
+             "end": "2024-06-04T15:00:00+02:00", "uid": "s1"},
+            {"summary": "Bad", "start": None, "uid": "s2"},
+        ], "calendar.school", TZ)
+        merged = merge_events([
+            famdo_events(data, START, END, TZ),
+            chore_events(data, START, END, TZ),
+            school,
+        ])
+        assert [event["summary"] for event in merged] == [
+            "Trip", "School", "Dishes (Alex) - 5 pts", "Dinner",
+        ]
+        assert merged[1]["source"] == "calendar.school"
+
+    def test_duplicates_keep_earliest_source(self):
+        data = _data()
+        # The FamDo calendar entity reports the same events with the same uids
+        entity = calendar_events([
+            {"summary": "Trip", "start": "2024-06-04", "end": "2024-06-05", "uid": "early"},
+            {"summary": "Party", "start": "2024-06-05", "end": "2024-06-06"},
+            {"summary": "Party", "start": "2024-06-05", "end": "2024-06-06"},
+        ], "calendar.famdo_family_calendar", TZ)
+        merged = merge_events([famdo_events(data, START, END, TZ), entity])
+
+        assert [event["summary"] for event in merged] == ["Trip", "Dinner", "Party"]
+        assert merged[0]["source"] == SOURCE_EVENTS
+
+    def test_limit_stops_the_merge(self):
+        data = _data()
+        merged = merge_events(
+            [famdo_events(data, START, END, TZ), chore_events(data, START, END, TZ)], limit=2
+        )
+        assert [event["uid"] for event in merged] == ["early", "chore_dishes"]
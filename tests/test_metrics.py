@@ -0,0 +1,81 @@
+"""Tests for the latency histograms."""
+import pytest
+
+from custom_components.famdo.metrics import METRICS, Histogram, Metrics, bucket_bound
+
+
+class TestHistogram:
+    def test_percentiles_are_within_one_bucket(self):
+        histogram = Histogram()
+        for ms in range(1, 101):
+            histogram.observe(ms / 1000)
+
+        summary = histogram.summary()
+        assert summary["count"] == 100
+        assert summary["mean_ms"] == pytest.approx(50.5)
+        assert 50 <= summary["p50_ms"] <= 50 * 1.19
+        assert 95 <= summary["p95_ms"] <= 95 * 1.19
+        assert 99 <= summary["p99_ms"] <= 100
+        assert summary["max_ms"] == 100
+
+    def test_extremes_land_in_end_buckets(self):
+        histogram = Histogram()
+        histogram.observe(0)
+        histogram.observe(10_000)
+        assert histogram.buckets[0] == 1
+        assert histogram.buckets[-1] == 1
+        assert histogram.percentile(50) == bucket_bound(0)
+
+
+@pytest.mark.asyncio
+class TestMetrics:
+    async def test_disabled_records_nothing(self):
+        metrics = Metrics()
+
+        @metrics.timed("work")
+        async def work() -> int:
+            return 1
+
+        with metrics.timer("block"):
+            pass
+        assert await work() == 1
+        assert metrics.snapshot() == {}
+
+    async def test_timed_methods_and_timer(self):
+        metrics = Metrics()
+        metrics.enabled = True
+
+        @metrics.timed_methods("thing")
+        class Thing:
+            async def async_go(self) -> str:
+                return "went"
+
+            async def helper(self) -> None:
+                pass
+
+        thing = Thing()
+        assert await thing.async_go() == "went"
+        await thing.helper()
+        with metrics.timer("block"):
+            pass
+
+        assert set(metrics.snapshot()) == {"thing.go", "block"}
+        assert Thing.async_go.__name__ == "async_go"
+        metrics.reset()
+        assert metrics.snapshot() == {}
+
+
+@pytest.fixture
+def metrics_enabled():
+    METRICS.reset()
+    METRICS.enabled = True
+    yield METRICS
+    METRICS.enabled = False
+    METRICS.reset()
+
+
+def test_data_serialization_is_timed(metrics_enabled):
+    from custom_components.famdo.models import FamDoData
+
+    FamDoData.from_dict(FamDoData().to_dict())
+    assert {"data.to_dict", "data.from_dict"} <= set(metrics_enabled.snapshot())
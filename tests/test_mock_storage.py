@@ -0,0 +1,82 @@
+"""Tests for MockStore persistence: atomic writes, fsync, backups and formats."""
+import os
+
+import pytest
+
+from devserver.mock_storage import FSYNC_ALWAYS, MockStore
+from devserver.snapshot import (
+    COMPRESSIONS, SNAPSHOT_FORMATS, check_snapshot_support,
+)
+
+
+def _supported_snapshot_formats():
+    combos = []
+    for fmt in SNAPSHOT_FORMATS:
+        for compression in COMPRESSIONS:
+            try:
+                check_snapshot_support(fmt, compression)
+            except ValueError:
+                continue
+            combos.append((fmt, compression))
+    return combos
+
+
+async def _save_family(store: MockStore, name: str) -> None:
+    data = await store.async_load()
+    data.family_name = name
+    await store.async_save()
+
+
+class TestMockStore:
+    @pytest.mark.asyncio
+    async def test_save_replaces_file_atomically(self, tmp_path):
+        path = tmp_path / "data.json"
+        store = MockStore(data_file=str(path), fsync=FSYNC_ALWAYS)
+        await _save_family(store, "One")
+        await _save_family(store, "Two")
+        assert not os.path.exists(f"{path}.tmp")
+        assert (await MockStore(data_file=str(path)).async_load()).family_name == "Two"
+
+    @pytest.mark.asyncio
+    async def test_batched_fsync_is_flushed(self, tmp_path):
+        store = MockStore(data_file=str(tmp_path / "data.json"))
+        await _save_family(store, "One")
+        assert store._unsynced
+        await store.async_flush()
+        assert not store._unsynced
+        assert store._fsync_handle is None
+
+    @pytest.mark.asyncio
+    async def test_backups_rotate_and_recover_corrupt_file(self, tmp_path):
+        path = tmp_path / "data.json"
+        store = MockStore(data_file=str(path), backups=2, backup_interval=0)
+        for name in ("One", "Two", "Three", "Four"):
+            await _save_family(store, name)
+        await store.async_flush()
+
+        assert os.path.exists(f"{path}.1") and os.path.exists(f"{path}.2")
+        assert not os.path.exists(f"{path}.3")
+
+        path.write_bytes(b"{truncated")
+        recovered = await MockStore(data_file=str(path), backups=2).async_load()
+        assert recovered.family_name == "Three"
+
+    @pytest.mark.asyncio
+    async def test_corrupt_file_without_backup_raises(self, tmp_path):
+        path = tmp_path / "data.json"
+        path.write_bytes(b"{truncated")
+        with pytest.raises(ValueError):
+            await MockStore(data_file=str(path)).async_load()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("fmt,compression", _supported_snapshot_formats())
+    async def test_snapshot_format_detected_on_load(self, tmp_path, fmt, compression):
+        path = str(tmp_path / "data.json")
+        store = MockStore(data_file=path, snapshot_format=fmt, compression=compression)
+        await _save_family(store, "Packed")
+        # A store configured for plain JSON still reads it
+        assert (await MockStore(data_file=path).async_load()).family_name == "Packed"
+
+    def test_unknown_fsync_policy_rejected(self, tmp_path):
+        with pytest.raises(ValueError):
+            MockStore(data_file=str(tmp_path / "data.json"), fsync="sometimes")
@@ -249,6 +249,53 @@ class TestFamDoData:
         restored = FamDoData.from_dict(d)
         assert restored.to_dict() == d
 
+    def test_lazy_from_dict_defers_history(self):
+        raw = FamDoData(
+            todos=[TodoItem(id="t1", completed=True), TodoItem(id="t2")],
+            reward_claims=[RewardClaim(id="c1", status="fulfilled")],
+            events=[CalendarEvent(id="e1", start_date="2020-01-01")],
+        ).to_dict()
+        data = FamDoData.from_dict(raw, lazy=True)
+        assert [t.id for t in data.todos.loaded_items()] == ["t2"]
+        assert len(data.todos) == 2 and len(data.reward_claims) == 1
+        assert data.to_dict() == FamDoData.from_dict(raw).to_dict()
+        assert not data.todos.loaded
+        assert [t.id for t in data.todos] == ["t1", "t2"]
+
+    def test_get_record_loads_cold_records_only_on_a_miss(self):
+        raw = FamDoData(todos=[TodoItem(id="t1", completed=True), TodoItem(id="t2")]).to_dict()
+        data = FamDoData.from_dict(raw, lazy=True)
+        assert data.get_record("todos", "t2").id == "t2"
+        assert not data.todos.loaded
+        assert data.get_record("todos", "t1").id == "t1"
+        assert data.get_record("todos", "missing") is None
+
+    def test_lazy_from_dict_keeps_the_order(self):
+        raw = FamDoData(todos=[
+            TodoItem(id="t1"), TodoItem(id="t2", completed=True),
+            TodoItem(id="t3"), TodoItem(id="t4", completed=True),
+        ]).to_dict()
+        assert FamDoData.from_dict(raw, lazy=True).to_dict() == raw
+        assert [t.id for t in FamDoData.from_dict(raw, lazy=True).todos] == [
+            "t1", "t2", "t3", "t4",
+        ]
+
+    def test_lazy_chores_keep_each_templates_newest_instance(self):
+        raw = FamDoData(chores=[
+            Chore(id="t", is_template=True, recurrence=RECURRENCE_DAILY),
+            Chore(id="i1", template_id="t", status="completed", claimed_by="m1", created_at="2026-01-01"),
+            Chore(id="i2", template_id="t", status="rejected", claimed_by="m1", created_at="2026-01-02"),
+            Chore(id="x", status="completed", claimed_by="m1"),
+            Chore(id="o"),
+        ]).to_dict()
+        data = FamDoData.from_dict(raw, lazy=True)
+        assert [c.id for c in data.chores.loaded_items()] == ["t", "i2", "o"]
+        assert data.count_completed_chores("m1") == 2
+        assert data.get_chore_by_id("o").id == "o"
+        assert data.to_dict() == raw
+        assert not data.chores.loaded
+        assert data.get_chore_by_id("x").id == "x"
+
     def test_from_dict_empty(self):
         d = FamDoData.from_dict({})
         assert d.family_name == "My Family"
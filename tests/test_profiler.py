@@ -0,0 +1,75 @@
+"""Tests for the dev server's profiler hook."""
+import asyncio
+import sys
+import threading
+import time
+
+import pytest
+
+from devserver.profiler import PROFILE_SAMPLE, ProfileCapture, ProfilerBusy
+
+
+def _spin(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+class TestProfileCapture:
+    def test_cprofile_writes_stats_and_summary(self, tmp_path):
+        capture = ProfileCapture()
+        capture.start()
+        _spin(0.01)
+        capture.stop()
+        files = capture.write(str(tmp_path))
+
+        assert [path.rsplit(".", 1)[1] for path in files] == ["pstats", "txt"]
+        assert "_spin" in open(files[1]).read()
+
+    def test_sample_sees_worker_threads(self, tmp_path):
+        worker = threading.Thread(target=_spin, args=(0.2,), name="worker")
+        capture = ProfileCapture(PROFILE_SAMPLE, interval=0.001)
+        capture.start()
+        worker.start()
+        worker.join()
+        capture.stop()
+        (path,) = capture.write(str(tmp_path))
+
+        lines = open(path).read().splitlines()
+        worker_stacks = [line for line in lines if line.startswith("worker;")]
+        assert any("_spin (test_profiler.py:" in line for line in worker_stacks)
+        assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+
+    def test_one_capture_at_a_time(self, tmp_path):
+        first = ProfileCapture(PROFILE_SAMPLE)
+        first.start()
+        with pytest.raises(ProfilerBusy):
+            ProfileCapture().start()
+        first.stop()
+        second = ProfileCapture()
+        second.start()
+        second.stop()
+
+    @pytest.mark.asyncio
+    async def test_cprofile_is_unhooked_from_the_loop_thread(self, tmp_path):
+        # As /debug/profile does it: stop on the loop, write in a worker thread
+        capture = ProfileCapture()
+        capture.start()
+        await asyncio.sleep(0.01)
+        capture.stop()
+        await asyncio.to_thread(capture.write, str(tmp_path))
+        assert sys.getprofile() is None
+
+    def test_cprofile_stop_on_another_thread_fails(self):
+        capture = ProfileCapture()
+        capture.start()
+        try:
+            with pytest.raises(RuntimeError):
+                asyncio.run(asyncio.to_thread(capture.stop))
+        finally:
+            capture.stop()
+        assert sys.getprofile() is None
+
+    def test_unknown_mode(self):
+        with pytest.raises(ValueError):
+            ProfileCapture("perf")
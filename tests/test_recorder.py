@@ -0,0 +1,51 @@
+"""Tests for the WebSocket traffic recorder."""
+import gzip
+
+import pytest
+
+from devserver.json_codec import get_codec
+from devserver.recorder import CAPTURE_FORMAT, TrafficRecorder, read_capture
+
+
+@pytest.mark.parametrize("name", ["capture.jsonl", "capture.jsonl.gz"])
+def test_capture_round_trip(tmp_path, name):
+    data_file = tmp_path / "data.json"
+    data_file.write_text('{"family_name": "Recorded"}')
+    path = str(tmp_path / name)
+
+    recorder = TrafficRecorder(path, get_codec(), str(data_file))
+    conn = recorder.opened()
+    recorder.received(conn, {"id": 1, "type": "famdo/get_data"})
+    recorder.closed(conn)
+    recorder.close()
+
+    header, events = read_capture(path, get_codec())
+    assert header["format"] == CAPTURE_FORMAT
+    assert (tmp_path / header["snapshot"]).read_text() == data_file.read_text()
+    assert list(events) == [
+        {"t": pytest.approx(0, abs=1), "c": 1, "open": True},
+        {"t": pytest.approx(0, abs=1), "c": 1, "msg": {"id": 1, "type": "famdo/get_data"}},
+        {"t": pytest.approx(0, abs=1), "c": 1, "close": True},
+    ]
+
+
+def test_truncated_capture_ends_early(tmp_path):
+    path = str(tmp_path / "capture.jsonl.gz")
+    recorder = TrafficRecorder(path, get_codec())
+    recorder.received(recorder.opened(), {"id": 1, "type": "famdo/get_data"})
+    recorder.close()
+    raw = gzip.decompress(open(path, "rb").read())
+    # A crash mid-write: the last line is cut off and the gzip stream is unfinished
+    with open(path, "wb") as out:
+        out.write(gzip.compress(raw[:-5])[:-8])
+
+    header, events = read_capture(path, get_codec())
+    assert header["snapshot"] is None
+    assert [e.get("open") for e in events] == [True]
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "data.json"
+    path.write_text('{"family_name": "Not a capture"}\n')
+    with pytest.raises(ValueError):
+        read_capture(str(path), get_codec())
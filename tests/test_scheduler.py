@@ -0,0 +1,72 @@
+"""Tests for the dev server's per-connection command scheduler."""
+import asyncio
+
+import pytest
+
+from devserver.scheduler import CommandScheduler
+
+_READS = frozenset({"famdo/get_data", "famdo/subscribe"})
+
+
+def _job(log: list, name: str, gate: asyncio.Event | None = None):
+    async def _run() -> None:
+        log.append(f"start {name}")
+        if gate is not None:
+            await gate.wait()
+        await asyncio.sleep(0)
+        log.append(f"end {name}")
+    return _run
+
+
+class TestCommandScheduler:
+    @pytest.mark.asyncio
+    async def test_reads_not_blocked_by_later_writes(self):
+        log: list[str] = []
+        gate = asyncio.Event()
+        scheduler = CommandScheduler(_READS)
+        first = scheduler.submit("famdo/get_data", {}, _job(log, "first", gate))
+        scheduler.submit("famdo/clear_all_data", {}, _job(log, "clear"))
+        second = scheduler.submit("famdo/get_data", {}, _job(log, "second"))
+        await asyncio.wait_for(second, timeout=1)
+        # The later read waited for the write, not for the slow earlier read
+        assert log.index("end clear") < log.index("start second")
+        assert not first.done()
+        gate.set()
+        await scheduler.drain()
+        assert scheduler.pending == 0
+
+    @pytest.mark.asyncio
+    async def test_reads_see_earlier_writes(self):
+        log: list[str] = []
+        gate = asyncio.Event()
+        scheduler = CommandScheduler(_READS)
+        scheduler.submit("famdo/claim_chore", {"chore_id": "c1"}, _job(log, "claim", gate))
+        read = scheduler.submit("famdo/get_data", {}, _job(log, "read"))
+        await asyncio.sleep(0.01)
+        assert log == ["start claim"]
+        gate.set()
+        await asyncio.wait_for(read, timeout=1)
+        assert log.index("end claim") < log.index("start read")
+
+    @pytest.mark.asyncio
+    async def test_writes_apply_in_order_across_entities(self):
+        log: list[str] = []
+        gate = asyncio.Event()
+        scheduler = CommandScheduler(_READS)
+        scheduler.submit(
+            "famdo/approve_chore", {"chore_id": "c1", "approver_id": "p1"},
+            _job(log, "approve", gate),
+        )
+        scheduler.submit(
+            "famdo/claim_reward", {"reward_id": "r1", "member_id": "m1"}, _job(log, "reward")
+        )
+        scheduler.submit("famdo/delete_all_chores", {}, _job(log, "delete_all"))
+        scheduler.submit("famdo/claim_chore", {"chore_id": "c2"}, _job(log, "claim"))
+        await asyncio.sleep(0.01)
+        assert log == ["start approve"]
+        gate.set()
+        await scheduler.drain()
+        assert [entry for entry in log if entry.startswith("start")] == [
+            "start approve", "start reward", "start delete_all", "start claim",
+        ]
+        assert log.index("end reward") < log.index("start delete_all")
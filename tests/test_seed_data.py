@@ -0,0 +1,82 @@
+"""Tests for the synthetic dataset generator."""
+import asyncio
+import sys
+from collections import Counter
+from datetime import date
+
+import pytest
+
+from devserver.mock_coordinator import MockCoordinator
+from devserver.mock_storage import MockStore
+from devserver.seed_data import generate_data, main, params_for_records, record_count
+
+TODAY = date(2026, 3, 15)
+
+
+def test_same_seed_gives_same_data():
+    first = generate_data(seed=7, today=TODAY).to_dict()
+    assert generate_data(seed=7, today=TODAY).to_dict() == first
+    assert generate_data(seed=8, today=TODAY).to_dict() != first
+
+
+@pytest.mark.parametrize("records", [1_000, 10_000, 50_000])
+def test_params_for_records_hits_the_size(records):
+    data = generate_data(**params_for_records(records), today=TODAY)
+    assert records * 0.8 <= record_count(data) <= records * 1.2
+
+
+
+@pytest.mark.parametrize("argv", [["--records", "1000", "--years", "3"], ["--records", "300"]])
+def test_cli_keeps_the_requested_size(argv, tmp_path, monkeypatch):
+    path = str(tmp_path / "data.json")
+    monkeypatch.setattr(sys, "argv", ["seed_data", *argv, "--today", "2026-03-15", "-o", path])
+    main()
+    records = int(argv[1])
+    data = asyncio.run(MockStore(data_file=path).async_load())
+    assert records * 0.8 <= record_count(data) <= records * 1.2
+
+def test_recurrence_chains_have_one_open_instance():
+    data = generate_data(templates=6, years=0.5, today=TODAY)
+    templates = [c for c in data.chores if c.is_template]
+    assert len(templates) == 6
+    open_by_template = Counter(
+        c.template_id for c in data.chores
+        if c.template_id and c.status not in ("completed", "rejected")
+    )
+    assert all(open_by_template[t.id] <= 1 for t in templates)
+    statuses = Counter(c.status for c in data.chores if not c.is_template)
+    assert statuses["completed"] > 10 * statuses["rejected"] > 0
+    assert all(m.points >= 0 for m in data.members)
+
+
+@pytest.mark.asyncio
+async def test_generated_data_is_in_steady_state(tmp_path):
+    store = MockStore(data_file=str(tmp_path / "data.json"))
+    store._data = generate_data(templates=12, years=0.25)
+    await store.async_save()
+    coordinator = MockCoordinator(store)
+    await coordinator.async_init()
+    chores = len(coordinator.famdo_data.chores)
+
+    await coordinator._reset_recurring_chores()
+
+    assert len(coordinator.famdo_data.chores) == chores
+    reloaded = await MockStore(data_file=str(tmp_path / "data.json")).async_load()
+    assert record_count(reloaded) == record_count(coordinator.famdo_data)
+
+
+@pytest.mark.asyncio
+async def test_refresh_leaves_settled_chores_unloaded(tmp_path):
+    path = str(tmp_path / "data.json")
+    store = MockStore(data_file=path)
+    store._data = generate_data(templates=12, years=0.25)
+    await store.async_save()
+    coordinator = MockCoordinator(MockStore(data_file=path, lazy=True))
+    await coordinator.async_init()
+    chores = len(coordinator.famdo_data.chores)
+
+    await coordinator._check_overdue_chores()
+    await coordinator._reset_recurring_chores()
+
+    assert not coordinator.famdo_data.chores.loaded
+    assert len(coordinator.famdo_data.chores) == chores
@@ -0,0 +1,96 @@
+"""Tests for the dev server's per-connection send queue."""
+import asyncio
+
+import pytest
+
+from devserver.send_queue import ConnectionSendQueue, SendQueueMetrics
+
+
+class _SlowSocket:
+    """Fake WebSocket whose sends block until released."""
+
+    def __init__(self) -> None:
+        self.closed = False
+        self.sent: list[bytes] = []
+        self.release = asyncio.Event()
+
+    async def send_frame(self, payload: bytes, opcode) -> None:
+        await self.release.wait()
+        self.sent.append(payload)
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class _BrokenSocket(_SlowSocket):
+    """Fake WebSocket whose peer has gone away."""
+
+    async def send_frame(self, payload: bytes, opcode) -> None:
+        raise ConnectionResetError("gone")
+
+
+class TestConnectionSendQueue:
+    @pytest.mark.asyncio
+    async def test_messages_delivered_in_order(self):
+        ws = _SlowSocket()
+        ws.release.set()
+        queue = ConnectionSendQueue(ws, SendQueueMetrics())
+        queue.start()
+        for i in range(5):
+            queue.send(str(i).encode())
+        await asyncio.sleep(0.01)
+        assert ws.sent == [b"0", b"1", b"2", b"3", b"4"]
+        await queue.close()
+
+    @pytest.mark.asyncio
+    async def test_superseded_snapshots_are_dropped(self):
+        ws = _SlowSocket()
+        metrics = SendQueueMetrics()
+        queue = ConnectionSendQueue(ws, metrics)
+        queue.start()
+        queue.send(b"result")
+        await asyncio.sleep(0)  # writer is now blocked on the slow client
+
+        built = []
+        for i in range(50):
+            queue.send_snapshot(1, lambda i=i: built.append(i) or f"snap{i}".encode())
+        assert queue.depth == 1
+        assert metrics.snapshots_dropped == 49
+
+        ws.release.set()
+        await asyncio.sleep(0.01)
+        assert ws.sent == [b"result", b"snap49"]
+        assert built == [49]
+        assert metrics.queue_depth == 0
+        assert (metrics.snapshots_sent, metrics.snapshot_bytes_sent) == (1, len(b"snap49"))
+        await queue.close()
+
+    @pytest.mark.asyncio
+    async def test_overflow_disconnects_client(self):
+        ws = _SlowSocket()
+        metrics = SendQueueMetrics()
+        queue = ConnectionSendQueue(ws, metrics, max_pending=3)
+        queue.start()
+        for i in range(10):
+            queue.send(str(i).encode())
+        await asyncio.sleep(0)
+        assert ws.closed
+        assert metrics.overflow_disconnects == 1
+        await queue.close()
+        assert metrics.queue_depth == 0
+
+    @pytest.mark.asyncio
+    async def test_connection_loss_closes_the_queue(self):
+        metrics = SendQueueMetrics()
+        queue = ConnectionSendQueue(_BrokenSocket(), metrics, max_pending=3)
+        queue.start()
+        queue.send(b"lost")
+        await asyncio.sleep(0.01)
+        assert queue.closed
+        for i in range(10):
+            queue.send(str(i).encode())
+            queue.send_snapshot(1, lambda: b"snap")
+        assert queue.depth == 0
+        assert metrics.queue_depth == 0
+        assert metrics.overflow_disconnects == 0
+        await queue.close()
@@ -0,0 +1,239 @@
+"""Tests for the SQLite storage backend and lazily loaded collections."""
+import json
+import sqlite3
+import threading
+
+import pytest
+
+from custom_components.famdo.lazy import LazyList
+from custom_components.famdo.models import (
+    Chore, FamDoData, FamilyMember, RewardClaim, TodoItem,
+)
+from custom_components.famdo.sqlite_store import SCHEMA_VERSION, SQLiteBackend
+from custom_components.famdo.versions import DataVersions
+
+
+def _chores() -> list[Chore]:
+    return [
+        Chore(id="t", is_template=True, recurrence="daily"),
+        Chore(id="i1", template_id="t", status="completed", claimed_by="m1", created_at="2026-01-01"),
+        Chore(id="i2", template_id="t", status="completed", claimed_by="m1", created_at="2026-01-02"),
+        Chore(id="x", status="rejected", claimed_by="m1"),
+        Chore(id="o", name="Open"),
+    ]
+
+
+def _sample() -> FamDoData:
+    return FamDoData(
+        family_name="Smith",
+        members=[FamilyMember(id="m1", name="Emma")],
+        chores=[Chore(id="c1", name="Dishes"), Chore(id="c2", name="Trash", template_id="t1")],
+        reward_claims=[RewardClaim(id="r1", status="fulfilled"), RewardClaim(id="r2")],
+        todos=[TodoItem(id="d1", title="Done", completed=True), TodoItem(id="d2", title="Open")],
+        settings={"time_format": "24h"},
+    )
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "famdo.db")
+
+
+class TestSQLiteBackend:
+    def test_round_trip(self, db_path):
+        backend = SQLiteBackend(db_path)
+        assert backend.is_empty()
+        data = _sample()
+        backend.save(data)
+        backend.close()
+
+        reloaded = SQLiteBackend(db_path)
+        assert not reloaded.is_empty()
+        assert reloaded.load().to_dict() == data.to_dict()
+
+    def test_uses_wal(self, db_path):
+        SQLiteBackend(db_path).save(_sample())
+        mode = sqlite3.connect(db_path).execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode == "wal"
+
+    def test_saves_only_changed_rows(self, db_path):
+        SQLiteBackend(db_path).save(_sample())
+
+        backend = SQLiteBackend(db_path)
+        versions = DataVersions(backend.load())
+        assert not backend.prepare(versions.current.data)
+
+        versions.edit_at("chores", 0).status = "claimed"
+        versions.collection("members").clear()
+        data = versions.commit().data
+        batch = backend.prepare(data)
+        assert [row[0] for row in batch.upserts["chores"]] == ["c1"]
+        assert batch.deletes == {"members": ["m1"]}
+        backend.apply(batch)
+        assert not backend.prepare(data)
+
+    def test_serializes_only_new_records(self, db_path, monkeypatch):
+        SQLiteBackend(db_path).save(_sample())
+        backend = SQLiteBackend(db_path)
+        versions = DataVersions(backend.load())
+        versions.edit_at("chores", 1).status = "claimed"
+        versions.collection("todos").append(TodoItem(id="d3", title="New"))
+        data = versions.commit().data
+
+        serialized = []
+        # The records' own classes: other tests may load models.py a second time
+        records = [*data.members, *data.chores, *data.todos.loaded_items()]
+        for model in {type(item) for item in records}:
+            to_dict = model.to_dict
+            monkeypatch.setattr(
+                model, "to_dict",
+                lambda item, to_dict=to_dict: serialized.append(item.id) or to_dict(item),
+            )
+        batch = backend.prepare(data)
+        assert sorted(serialized) == ["c2", "d3"]
+        assert {name: [row[0] for row in rows] for name, rows in batch.upserts.items()} == {
+            "chores": ["c2"], "todos": ["d3"],
+        }
+
+    def test_archived_rows_load_lazily(self, db_path):
+        SQLiteBackend(db_path).save(_sample())
+        backend = SQLiteBackend(db_path)
+        data = backend.load()
+
+        assert isinstance(data.todos, LazyList) and not data.todos.loaded
+        assert [t.id for t in data.todos.loaded_items()] == ["d2"]
+
+        # A save before anyone reads the archive must not delete it
+        versions = DataVersions(data)
+        versions.collection("todos").append(TodoItem(id="d3", title="New"))
+        data = versions.commit().data
+        backend.apply(backend.prepare(data))
+        assert not data.todos.loaded
+
+        assert {t.id for t in data.todos} == {"d1", "d2", "d3"}
+        assert {c.id for c in data.reward_claims} == {"r1", "r2"}
+        assert {t.id for t in SQLiteBackend(db_path).load().todos} == {"d1", "d2", "d3"}
+
+    def test_reading_archived_rows_skips_the_database(self, db_path, monkeypatch):
+        SQLiteBackend(db_path).save(_sample())
+        backend = SQLiteBackend(db_path)
+        data = backend.load()
+
+        def fail():
+            raise AssertionError("archived rows read from the database")
+
+        # The first read may happen on the event loop
+        monkeypatch.setattr(backend, "_connect", fail)
+        assert {t.id for t in data.todos} == {"d1", "d2"}
+        monkeypatch.undo()
+        prepared = backend.prepare(DataVersions(data).commit().data)
+        assert not prepared.upserts and not prepared.deletes
+
+    def test_archived_rows_keep_their_place(self, db_path):
+        todos = [
+            TodoItem(id="a", title="Open"),
+            TodoItem(id="b", title="Done", completed=True),
+            TodoItem(id="c", title="Open"),
+            TodoItem(id="d", title="Done", completed=True),
+        ]
+        SQLiteBackend(db_path).save(FamDoData(todos=todos))
+        data = SQLiteBackend(db_path).load()
+        assert [t.id for t in data.todos] == ["a", "b", "c", "d"]
+
+
+    def test_settled_chores_are_archived_except_the_newest_instance(self, db_path):
+        SQLiteBackend(db_path).save(FamDoData(chores=_chores()))
+        data = SQLiteBackend(db_path).load()
+
+        assert [c.id for c in data.chores.loaded_items()] == ["t", "i2", "o"]
+        assert data.count_completed_chores("m1") == 2
+        assert not data.chores.loaded
+        assert [c.id for c in data.chores] == ["t", "i1", "i2", "x", "o"]
+
+    def test_upgrades_a_version_1_database(self, db_path):
+        conn = sqlite3.connect(db_path)
+        conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        conn.execute("INSERT INTO meta VALUES ('schema_version', '1')")
+        conn.execute(
+            "CREATE TABLE chores (id TEXT PRIMARY KEY, data TEXT NOT NULL, "
+            "archived INTEGER NOT NULL DEFAULT 0, status TEXT, template_id TEXT, due_date TEXT)"
+        )
+        conn.executemany(
+            "INSERT INTO chores (id, data, status, template_id) VALUES (?, ?, ?, ?)",
+            [
+                (c.id, json.dumps(c.to_dict()), c.status, c.template_id)
+                for c in _chores()
+            ],
+        )
+        conn.commit()
+        conn.close()
+
+        data = SQLiteBackend(db_path).load()
+        assert [c.id for c in data.chores.loaded_items()] == ["t", "i2", "o"]
+        assert [c.id for c in data.chores] == ["t", "i1", "i2", "x", "o"]
+        conn = sqlite3.connect(db_path)
+        assert conn.execute(
+            "SELECT value FROM meta WHERE key = 'schema_version'"
+        ).fetchone() == (str(SCHEMA_VERSION),)
+        conn.close()
+
+
+class TestLazyList:
+    def test_loads_once_on_first_read(self):
+        calls = []
+        items = LazyList([3], lambda: calls.append(1) or [1, 2])
+        items.append(4)
+        assert not calls
+        assert len(items) == 4
+        assert list(items) == [1, 2, 3, 4]
+        assert calls == [1]
+        items.remove(1)
+        assert items == [2, 3, 4]
+
+    def test_len_dump_and_repr_do_not_load(self):
+        calls = []
+        items = LazyList(
+            [3], lambda: calls.append(1) or [1, 2], dumper=lambda: [10, 20], cold_count=2
+        )
+        assert len(items) == 3
+        assert items.dump(lambda item: item * 10) == [10, 20, 30]
+        assert "2 not loaded" in repr(items)
+        assert not calls
+
+    def test_positions_restore_the_original_order(self):
+        items = LazyList(
+            ["b", "d"], lambda: ["a", "c", "e"], dumper=lambda: ["A", "C", "E"],
+            cold_count=3, positions=[0, 2, 4],
+        )
+        items.append("f")
+        assert items.dump(str.upper) == ["A", "B", "C", "D", "E", "F"]
+        derived = items.derive([*items.loaded_items(), "g"])
+        assert list(items) == ["a", "b", "c", "d", "e", "f"]
+        assert list(derived) == ["a", "b", "c", "d", "e", "f", "g"]
+
+    def test_dump_waits_for_a_load_in_progress(self):
+        started, release = threading.Event(), threading.Event()
+
+        def loader():
+            started.set()
+            release.wait(5)
+            return ["a"]
+
+        items = LazyList(["b"], loader, dumper=lambda: ["A"], cold_count=1, positions=[0])
+        thread = threading.Thread(target=items.load)
+        thread.start()
+        started.wait(5)
+        threading.Timer(0.05, release.set).start()
+        assert items.dump(str.upper) == ["A", "B"]
+        thread.join()
+        assert list(items) == ["a", "b"]
+
+    def test_lazy_copy_shares_cold_items_until_loaded(self):
+        items = LazyList(["b"], lambda: ["a"], cold_count=1, positions=[0])
+        copy = items.lazy_copy()
+        copy.append("c")
+        assert items.snapshot() == (["b"], False)
+        assert list(copy) == ["a", "b", "c"]
+        assert items.snapshot() == (["b"], False)
+        items.load()
+        assert type(items.lazy_copy()) is list
@@ -0,0 +1,148 @@
+"""Tests for FamDoStore, the Home Assistant storage wrapper."""
+import asyncio
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.famdo.const import (
+    SNAPSHOT_FILENAME,
+    SQLITE_FILENAME,
+    STORAGE_BACKEND_SNAPSHOT,
+    STORAGE_BACKEND_SQLITE,
+)
+from custom_components.famdo.models import TodoItem
+from custom_components.famdo.storage import FamDoStore
+
+
+class _FakeHass:
+    """Just enough of HomeAssistant for FamDoStore."""
+
+    def __init__(self, tmp_path):
+        self.config = SimpleNamespace(path=lambda *parts: str(tmp_path / parts[-1]))
+        # When set, the next executor job waits for it
+        self.gate: asyncio.Event | None = None
+
+    async def async_add_executor_job(self, func, *args):
+        if self.gate is not None:
+            gate, self.gate = self.gate, None
+            await gate.wait()
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+
+class _FakeStore:
+    """Stands in for homeassistant.helpers.storage.Store."""
+
+    def __init__(self, data=None):
+        self.data = data
+        self.saves = []
+
+    async def async_load(self):
+        return self.data
+
+    async def async_save(self, data):
+        self.saves.append(data)
+        self.data = data
+
+    async def async_remove(self):
+        self.data = None
+
+
+@pytest.fixture
+def hass(tmp_path):
+    return _FakeHass(tmp_path)
+
+
+async def _json_store(hass, data=None) -> FamDoStore:
+    return await _open_store(hass, _FakeStore(data))
+
+
+async def _open_store(hass, json_store: _FakeStore, **kwargs) -> FamDoStore:
+    store = FamDoStore(hass, **kwargs)
+    store._store = json_store
+    await store.async_load()
+    return store
+
+
+def _add_todo(store: FamDoStore, title: str) -> None:
+    store.versions.collection("todos").append(TodoItem(id=title, title=title))
+
+
+@pytest.mark.asyncio
+async def test_overlapping_saves_keep_the_newest_data(hass):
+    store = await _json_store(hass)
+    gate = hass.gate = asyncio.Event()
+    _add_todo(store, "first")
+    first = asyncio.create_task(store.async_save())
+    await asyncio.sleep(0.01)  # The first save is stuck in the executor
+    _add_todo(store, "second")
+    second = asyncio.create_task(store.async_save())
+    await asyncio.sleep(0.01)
+    gate.set()
+    await asyncio.gather(first, second)
+
+    saved = [[todo["title"] for todo in payload["todos"]] for payload in store._store.saves]
+    assert saved[-1] == ["first", "second"]
+
+
+@pytest.mark.asyncio
+async def test_switching_backends_keeps_every_write(hass, tmp_path):
+    json_store = _FakeStore({"todos": [{"id": "old", "title": "old"}]})
+
+    store = await _open_store(hass, json_store, backend=STORAGE_BACKEND_SQLITE)
+    _add_todo(store, "sqlite")
+    await store.async_save()
+    await store.async_close()
+
+    # Back to JSON: the database has the newer data
+    store = await _open_store(hass, json_store)
+    assert [todo.title for todo in store.data.todos] == ["old", "sqlite"]
+    assert not os.path.exists(tmp_path / SQLITE_FILENAME)
+    _add_todo(store, "json")
+    await store.async_save()
+
+    # And to SQLite again, which migrates the current JSON document
+    store = await _open_store(hass, json_store, backend=STORAGE_BACKEND_SQLITE)
+    assert [todo.title for todo in store.data.todos] == ["old", "sqlite", "json"]
+    await store.async_close()
+
+
+@pytest.mark.asyncio
+async def test_snapshot_backend_writes_a_compressed_file(hass, tmp_path):
+    json_store = _FakeStore({"todos": [{"id": "old", "title": "old"}]})
+
+    store = await _open_store(hass, json_store, backend=STORAGE_BACKEND_SNAPSHOT)
+    _add_todo(store, "snapshot")
+    await store.async_save()
+
+    with open(tmp_path / SNAPSHOT_FILENAME, "rb") as fh:
+        assert fh.read(2) == b"\x1f\x8b"  # gzip
+    assert json_store.saves == []
+    store = await _open_store(hass, json_store, backend=STORAGE_BACKEND_SNAPSHOT)
+    assert [todo.title for todo in store.data.todos] == ["old", "snapshot"]
+
+
+@pytest.mark.asyncio
+async def test_switching_from_snapshot_keeps_every_write(hass, tmp_path):
+    json_store = _FakeStore()
+
+    store = await _open_store(hass, json_store, backend=STORAGE_BACKEND_SNAPSHOT)
+    _add_todo(store, "snapshot")
+    await store.async_save()
+
+    # To SQLite: the snapshot is newer than the JSON document
+    store = await _open_store(hass, json_store, backend=STORAGE_BACKEND_SQLITE)
+    assert [todo.title for todo in store.data.todos] == ["snapshot"]
+    assert not os.path.exists(tmp_path / SNAPSHOT_FILENAME)
+    _add_todo(store, "sqlite")
+    await store.async_save()
+    await store.async_close()
+
+    # Back to the snapshot, then to JSON
+    store = await _open_store(hass, json_store, backend=STORAGE_BACKEND_SNAPSHOT)
+    _add_todo(store, "again")
+    await store.async_save()
+    store = await _open_store(hass, json_store)
+    assert [todo.title for todo in store.data.todos] == ["snapshot", "sqlite", "again"]
+    assert not os.path.exists(tmp_path / SNAPSHOT_FILENAME)
+    assert not os.path.exists(tmp_path / SQLITE_FILENAME)
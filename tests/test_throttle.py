@@ -0,0 +1,50 @@
+"""Tests for subscription push throttling."""
+import asyncio
+
+import pytest
+
+from custom_components.famdo.throttle import PushThrottler
+
+
+class TestPushThrottler:
+    @pytest.mark.asyncio
+    async def test_first_trigger_sends_immediately(self):
+        sent = []
+        throttler = PushThrottler(asyncio.get_running_loop(), 0.05, lambda: sent.append(1))
+        throttler.trigger()
+        assert sent == [1]
+
+    @pytest.mark.asyncio
+    async def test_burst_is_coalesced_with_trailing_send(self):
+        state = {"value": 0}
+        sent = []
+        throttler = PushThrottler(
+            asyncio.get_running_loop(), 0.05, lambda: sent.append(state["value"])
+        )
+        for i in range(1, 21):
+            state["value"] = i
+            throttler.trigger()
+        assert sent == [1]
+
+        await asyncio.sleep(0.1)
+        # One trailing send carrying the latest state
+        assert sent == [1, 20]
+
+    @pytest.mark.asyncio
+    async def test_zero_interval_sends_every_trigger(self):
+        sent = []
+        throttler = PushThrottler(asyncio.get_running_loop(), 0, lambda: sent.append(1))
+        for _ in range(3):
+            throttler.trigger()
+        assert len(sent) == 3
+
+    @pytest.mark.asyncio
+    async def test_cancel_drops_pending_send(self):
+        sent = []
+        throttler = PushThrottler(asyncio.get_running_loop(), 0.05, lambda: sent.append(1))
+        throttler.trigger()
+        throttler.trigger()
+        throttler.cancel()
+        await asyncio.sleep(0.1)
+        throttler.trigger()
+        assert sent == [1]
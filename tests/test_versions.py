@@ -0,0 +1,105 @@
+"""Tests for copy-on-write data versions."""
+import pytest
+import pytest_asyncio
+
+from custom_components.famdo.models import Chore, FamDoData, FamilyMember, TodoItem
+from custom_components.famdo.versions import DataVersions, diff_versions
+from devserver.mock_coordinator import MockCoordinator
+from devserver.mock_storage import MockStore
+
+
+def _data() -> FamDoData:
+    return FamDoData(
+        members=[FamilyMember(id="m1", name="Emma", points=5)],
+        chores=[Chore(id="c1", name="Dishes"), Chore(id="c2", name="Trash")],
+    )
+
+
+class TestDataVersions:
+    def test_commit_shares_untouched_collections(self):
+        versions = DataVersions(_data())
+        before = versions.current
+        versions.edit_at("chores", 0).status = "claimed"
+        after = versions.commit()
+
+        assert after.number == before.number + 1
+        assert after.data.members is before.data.members
+        assert after.data.chores is not before.data.chores
+        assert after.data.chores[1] is before.data.chores[1]
+        assert before.data.chores[0].status == "pending"
+        assert after.data.chores[0].status == "claimed"
+        assert (before.data.chores[0].version, after.data.chores[0].version) == (0, 1)
+
+    def test_published_version_is_not_affected_by_later_edits(self):
+        versions = DataVersions(_data())
+        published = versions.commit()
+        member = versions.edit("members", versions.draft.members[0])
+        member.points = 50
+        versions.collection("chores").clear()
+        versions.settings()["theme"] = "dark"
+
+        assert published.data.members[0].points == 5
+        assert len(published.data.chores) == 2
+        assert published.data.settings == {}
+        # Edits within one draft reuse the same copy and bump it once
+        assert versions.edit("members", member) is member
+        assert member.version == 1
+
+    def test_commit_without_changes_keeps_version(self):
+        versions = DataVersions(_data())
+        assert versions.commit() is versions.current
+        assert versions.current.number == 0
+
+    def test_diff_by_identity(self):
+        versions = DataVersions(_data())
+        old = versions.current
+        versions.edit_at("chores", 0).status = "claimed"
+        versions.collection("chores").remove(versions.draft.chores[1])
+        versions.collection("chores").append(Chore(id="c3", name="Laundry"))
+        versions.draft.family_name = "Smith"
+        new = versions.commit()
+
+        changes = diff_versions(old, new)
+        assert [c.id for c in changes.upserted["chores"]] == ["c1", "c3"]
+        assert changes.removed == {"chores": ["c2"]}
+        assert "members" not in changes.upserted
+        assert changes.to_dict()["changes"]["family_name"] == "Smith"
+        assert not diff_versions(new, new)
+
+
+    def test_edit_does_not_load_cold_records(self):
+        raw = FamDoData(todos=[
+            TodoItem(id="t1", completed=True), TodoItem(id="t2"), TodoItem(id="t3"),
+        ]).to_dict()
+        versions = DataVersions(FamDoData.from_dict(raw, lazy=True))
+        # Indices count the items in memory: t3 is the second
+        versions.edit_at("todos", 1).title = "Edited"
+        versions.edit("todos", versions.draft.todos.loaded_items()[0]).title = "Also"
+        todos = versions.commit().data.todos
+        assert not todos.loaded
+        assert [(t.id, t.title) for t in todos] == [("t1", ""), ("t2", "Also"), ("t3", "Edited")]
+
+
+@pytest_asyncio.fixture
+async def coordinator(tmp_path):
+    coord = MockCoordinator(MockStore(data_file=str(tmp_path / "data.json")))
+    await coord.async_init()
+    return coord
+
+
+class TestCoordinatorVersions:
+    @pytest.mark.asyncio
+    async def test_snapshot_survives_mutations(self, coordinator):
+        member = await coordinator.async_add_member("Emma")
+        chore = await coordinator.async_add_chore("Dishes")
+        snapshot = coordinator.snapshot()
+
+        await coordinator.async_claim_chore(chore.id, member.id)
+        await coordinator.async_add_points(member.id, 10)
+
+        assert snapshot.data.get_chore_by_id(chore.id).status == "pending"
+        assert snapshot.data.get_member_by_id(member.id).points == 0
+        latest = coordinator.snapshot()
+        assert latest.number > snapshot.number
+        assert latest.data.get_chore_by_id(chore.id).claimed_by == member.id
+        assert set(diff_versions(snapshot, latest).upserted) == {"chores", "members"}